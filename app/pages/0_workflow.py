@@ -3,6 +3,7 @@
 # 0.8 ReWOO 기반 Proposal End-to-End 데모 페이지
 
 import json
+import time
 from pathlib import Path
 from datetime import datetime
 
@@ -16,6 +17,10 @@ st.set_page_config(page_title="ReWOO Proposal Workflow", layout="wide")
 # ============================================
 API_BASE = st.secrets.get("API_BASE", "http://127.0.0.1:8001/api/v1/pm")
 PROPOSAL_URL = f"{API_BASE}/proposal/rewoo"
+PROPOSAL_JOB_URL = f"{API_BASE}/jobs/proposal/rewoo"
+JOB_URL = f"{API_BASE}/jobs"
+JOB_POLL_SEC = 2
+JOB_MAX_WAIT_SEC = 1800
 
 st.title("📦 ReWOO Proposal Workflow")
 st.caption("RFP 업로드 → Scope / Cost / Schedule / Change를 한 번에 생성하는 심층추론 파이프라인")
@@ -102,9 +107,9 @@ if submitted:
     st.info("📤 요청 Payload:")
     st.code(json.dumps(payload, ensure_ascii=False, indent=2), language="json")
 
+    # 비동기 job 제출 → 단계별 진행 polling (HTTP 연결을 오래 붙잡지 않음)
     try:
-        with st.spinner("ReWOO Proposal 파이프라인 실행 중..."):
-            res = requests.post(PROPOSAL_URL, json=payload, timeout=300)
+        res = requests.post(PROPOSAL_JOB_URL, json=payload, timeout=30)
     except Exception as e:
         st.error(f"❌ ReWOO Proposal API 호출 실패: {e}")
         st.stop()
@@ -114,7 +119,39 @@ if submitted:
         st.code(res.text)
         st.stop()
 
-    data = res.json()
+    job_id = res.json().get("job_id")
+    st.caption(f"Job ID: `{job_id}`")
+    progress_bar = st.progress(0.0, text="대기 중...")
+    step_box = st.empty()
+
+    job = {}
+    started = time.time()
+    while time.time() - started < JOB_MAX_WAIT_SEC:
+        try:
+            job = requests.get(f"{JOB_URL}/{job_id}", timeout=10).json()
+        except Exception as e:
+            st.warning(f"상태 조회 실패 (재시도): {e}")
+            time.sleep(JOB_POLL_SEC)
+            continue
+
+        steps = job.get("steps", {}) or {}
+        finished = sum(1 for v in steps.values() if v.get("status") in ("done", "skipped"))
+        running = [k for k, v in steps.items() if v.get("status") == "running"]
+        label = f"{job.get('status')} · " + (f"{running[0]} 실행 중" if running else f"{finished}/{len(steps)} 단계 완료")
+        progress_bar.progress(finished / max(len(steps), 1), text=label)
+        step_box.table([
+            {"Step": k, "Status": v.get("status"), "Elapsed(ms)": v.get("elapsed_ms", "")}
+            for k, v in steps.items()
+        ])
+        if job.get("status") in ("succeeded", "failed"):
+            break
+        time.sleep(JOB_POLL_SEC)
+
+    if job.get("status") != "succeeded":
+        st.error(f"❌ ReWOO Proposal 실패: {job.get('error') or job.get('status')}")
+        st.stop()
+
+    data = job.get("result") or {}
     st.success("✅ ReWOO Proposal 생성 완료")
 
     # ----------------------------------------
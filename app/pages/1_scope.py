@@ -7,6 +7,8 @@ import json
 from pathlib import Path
 
 API_BASE = st.secrets.get("API_BASE", "http://127.0.0.1:8001/api/v1/pm")
+DEFAULT_CHUNK_SIZE = 6000     # server: SCOPE_CHUNK_SIZE
+DEFAULT_CHUNK_OVERLAP = 400   # server: SCOPE_CHUNK_OVERLAP
 
 st.title("🔎 Scope Agent — RFP 분석")
 
@@ -83,8 +85,9 @@ with st.form("scope_form"):
         )
     
     with st.expander("⚙️ 옵션"):
-        chunk_size = st.number_input("Chunk Size", 100, 2000, 500, 50)
-        overlap = st.number_input("Overlap", 0, 500, 100, 10)
+        # 서버 기본값(SCOPE_CHUNK_SIZE / SCOPE_CHUNK_OVERLAP)과 동일, 바꾼 값만 전송
+        chunk_size = st.number_input("Chunk Size (문자)", 1000, 20000, DEFAULT_CHUNK_SIZE, 500)
+        overlap = st.number_input("Overlap (문자)", 0, 2000, DEFAULT_CHUNK_OVERLAP, 50)
     
     submitted = st.form_submit_button("🔎 Scope 추출 실행", type="primary")
 
@@ -92,6 +95,13 @@ with st.form("scope_form"):
 # 2. Scope 실행
 # ============================================
 if submitted:
+    # 기본값 그대로면 옵션을 보내지 않음 → 서버 env 설정(SCOPE_CHUNK_*)을 따름
+    chunk_options = {}
+    if chunk_size != DEFAULT_CHUNK_SIZE:
+        chunk_options["chunk_size"] = int(chunk_size)
+    if overlap != DEFAULT_CHUNK_OVERLAP:
+        chunk_options["overlap"] = int(overlap)
+
     # ✅ 입력 검증
     if input_method == "직접 입력":
         if not rfp_text or not rfp_text.strip():
@@ -103,7 +113,7 @@ if submitted:
             "project_id": project_id,
             "text": rfp_text,
             "methodology": methodology,
-            "options": {"chunk_size": chunk_size, "overlap": overlap}
+            "options": chunk_options
         }
     else:
         if not rfp_path or not rfp_path.strip():
@@ -115,7 +125,7 @@ if submitted:
             "project_id": project_id,
             "documents": [{"path": rfp_path, "type": "RFP"}],
             "methodology": methodology,
-            "options": {"chunk_size": chunk_size, "overlap": overlap}
+            "options": chunk_options
         }
     
     st.info(f"📤 요청 전송 중… {API_BASE}/scope/analyze")
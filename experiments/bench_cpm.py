@@ -0,0 +1,81 @@
+# experiments/bench_cpm.py
+"""
+CPM 엔진 벤치마크: dict 기반 CPMEngine vs 배열 기반 ArrayCPMEngine
+
+실행 (저장소 루트에서):
+    python -m experiments.bench_cpm
+    python -m experiments.bench_cpm --sizes 1000 10000 200000 --repeat 3
+"""
+import argparse
+import json
+import random
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from server.workflow.agents.schedule_agent.outputs.change_mgmt import CPMEngine
+from server.workflow.agents.schedule_agent.cpm_array import ArrayCPMEngine, CPMGraph
+
+
+def synthetic_wbs(n: int, max_preds: int = 3, window: int = 200, seed: int = 42) -> List[Dict[str, Any]]:
+    """앞쪽 window 개 작업 중에서 0~max_preds 개 선행작업을 고르는 임의 DAG"""
+    rnd = random.Random(seed)
+    tasks = []
+    for i in range(n):
+        lo = max(0, i - window)
+        k = min(i - lo, rnd.randint(0, max_preds))
+        preds = [f"T{j}" for j in rnd.sample(range(lo, i), k)] if k else []
+        tasks.append({"id": f"T{i}", "name": f"Task {i}", "duration": rnd.randint(1, 10), "predecessors": preds})
+    return tasks
+
+
+def _best(fn, tasks, repeat: int) -> Dict[str, Any]:
+    times, out = [], None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn(tasks)
+        times.append(time.perf_counter() - t0)
+    return {"sec": min(times), "result": out}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1_000, 5_000, 20_000, 50_000, 200_000])
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--out", default="experiments/results/bench_cpm.json")
+    args = ap.parse_args()
+
+    rows = []
+    for n in args.sizes:
+        tasks = synthetic_wbs(n)
+        base = _best(CPMEngine._build_dag_and_schedule_dict, tasks, args.repeat)
+        arr = _best(ArrayCPMEngine.build_dag_and_schedule, tasks, args.repeat)
+        # 그래프 인덱싱/ dict 변환을 제외한 순수 forward/backward 시간 (graph 재사용 시)
+        graph, dur = CPMGraph.from_tasks(tasks)
+        core = _best(lambda _: graph.schedule(dur), None, args.repeat)
+        same = all(base["result"][k] == arr["result"][k] for k in ("ES", "EF", "LS", "LF", "FLOAT"))
+        row = {
+            "tasks": n,
+            "dict_sec": round(base["sec"], 4),
+            "array_sec": round(arr["sec"], 4),
+            "array_core_sec": round(core["sec"], 4),
+            "levels": graph.n_levels,
+            "speedup": round(base["sec"] / arr["sec"], 2) if arr["sec"] else None,
+            "project_duration": arr["result"]["project_duration"],
+            "identical": same,
+        }
+        rows.append(row)
+        print(
+            f"n={n:>7}  dict={row['dict_sec']:.4f}s  array={row['array_sec']:.4f}s  "
+            f"core={row['array_core_sec']:.4f}s  "
+            f"x{row['speedup']}  identical={same}"
+        )
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(rows, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"[INFO] saved {out}")
+
+
+if __name__ == "__main__":
+    main()
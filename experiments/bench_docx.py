@@ -0,0 +1,177 @@
+# experiments/bench_docx.py
+"""
+DOCX 추출 벤치마크: python-docx DOM 경로 vs lxml iterparse 스트리밍 경로
+
+- 대상: data/101/inputs/*.docx (+ --synthetic-pages > 0 이면 대용량 합성 RFP 1개: 문단 + 병합 셀 포함 대형 표)
+- 측정 (변형마다 새 프로세스에서 실행 → import/캐시 영향 제거):
+  · 전체 추출 시간, 첫 줄까지 시간(스트리밍), 최대 RSS 증가량
+  · 두 경로 출력의 줄 집합 일치 여부 (순서는 스트리밍만 문서 순서)
+
+실행 (저장소 루트에서):
+    python -m experiments.bench_docx
+    python -m experiments.bench_docx --synthetic-pages 300 --repeat 3
+"""
+import argparse
+import glob
+import json
+import multiprocessing as mp
+import random
+import resource
+import shutil
+import statistics
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, List
+from xml.sax.saxutils import escape
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+WORDS = "시스템 구축 요구사항 데이터 연계 보안 인증 사용자 관리 화면 기능 성능 응답 시간 운영 유지보수 산출물 검수 일정".split()
+
+
+def _sentence(rnd: random.Random, n: int) -> str:
+    return " ".join(rnd.choice(WORDS) for _ in range(n))
+
+
+def _p(text: str, style: str = "") -> str:
+    ppr = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ""
+    return f"<w:p>{ppr}<w:r><w:t xml:space=\"preserve\">{escape(text)}</w:t></w:r></w:p>"
+
+
+def _table(rnd: random.Random, rows: int, cols: int) -> str:
+    grid = "".join('<w:gridCol w:w="1500"/>' for _ in range(cols))
+    out = [f'<w:tbl><w:tblPr><w:tblW w:w="0" w:type="auto"/></w:tblPr><w:tblGrid>{grid}</w:tblGrid>']
+    for r in range(rows):
+        cells = []
+        c = 0
+        while c < cols:
+            if r > 0 and c == 0:
+                # 첫 열은 5행 단위 세로 병합 (구분 열)
+                vm = '<w:vMerge w:val="restart"/>' if r % 5 == 1 else "<w:vMerge/>"
+                text = f"구분 {r // 5 + 1}" if r % 5 == 1 else ""
+                cells.append(f"<w:tc><w:tcPr>{vm}</w:tcPr>{_p(text)}</w:tc>")
+                c += 1
+            elif r > 0 and c == 1 and r % 7 == 0 and cols > 3:
+                cells.append(f'<w:tc><w:tcPr><w:gridSpan w:val="2"/></w:tcPr>{_p(_sentence(rnd, 6))}</w:tc>')
+                c += 2
+            else:
+                text = f"항목{c}" if r == 0 else _sentence(rnd, rnd.randint(3, 12))
+                cells.append(f"<w:tc>{_p(text)}{_p(_sentence(rnd, 4)) if rnd.random() < 0.3 else ''}</w:tc>")
+                c += 1
+        out.append("<w:tr>" + "".join(cells) + "</w:tr>")
+    out.append("</w:tbl>")
+    return "".join(out)
+
+
+def make_synthetic(template: Path, out: Path, pages: int, seed: int = 7) -> Path:
+    """템플릿 DOCX 의 document.xml 본문만 합성 내용으로 교체 (페이지당 문단 ~25개 + 5페이지마다 60행 표)"""
+    rnd = random.Random(seed)
+    body: List[str] = []
+    for pg in range(pages):
+        body.append(_p(f"{pg + 1}. {_sentence(rnd, 4)}", "Heading1"))
+        for _ in range(25):
+            style = "ListBullet" if rnd.random() < 0.3 else ""
+            body.append(_p(_sentence(rnd, rnd.randint(8, 30)), style))
+        if pg % 5 == 4:
+            body.append(_table(rnd, 60, 6))
+    xml = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<w:document xmlns:w="{W_NS}"><w:body>' + "".join(body) +
+        '<w:sectPr><w:pgSz w:w="11906" w:h="16838"/></w:sectPr></w:body></w:document>'
+    )
+    with zipfile.ZipFile(template) as src, zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as dst:
+        for item in src.infolist():
+            data = xml.encode("utf-8") if item.filename == "word/document.xml" else src.read(item.filename)
+            dst.writestr(item, data)
+    return out
+
+
+def _measure(variant: str, path: str) -> Dict[str, Any]:
+    """자식 프로세스에서 실행: 시간 / 첫 줄 시간 / 최대 RSS 증가(KB) / 출력"""
+    from server.utils import doc_reader
+    from server.utils.docx_stream import iter_docx_lines
+
+    base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    t0 = time.perf_counter()
+    first = None
+    if variant == "stream":
+        lines = []
+        for line in iter_docx_lines(path):
+            if first is None:
+                first = time.perf_counter() - t0
+            lines.append(line)
+        text = "\n".join(lines).strip()
+    else:
+        text, _ = doc_reader._read_docx_text_dom(Path(path))
+    elapsed = time.perf_counter() - t0
+    return {
+        "elapsed_s": elapsed,
+        "first_line_s": first,
+        "rss_growth_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base_rss,
+        "chars": len(text),
+        "lines": sorted(text.split("\n")),
+    }
+
+
+def run_file(path: Path, repeat: int, ctx) -> Dict[str, Any]:
+    out: Dict[str, Any] = {"file": path.name, "size_kb": round(path.stat().st_size / 1024, 1)}
+    lines = {}
+    for variant in ("dom", "stream"):
+        runs = []
+        for _ in range(repeat):
+            with ctx.Pool(1) as pool:
+                runs.append(pool.apply(_measure, (variant, str(path))))
+        lines[variant] = runs[-1].pop("lines")
+        for r in runs[:-1]:
+            r.pop("lines")
+        out[variant] = {
+            "mean_s": round(statistics.mean(r["elapsed_s"] for r in runs), 4),
+            "min_s": round(min(r["elapsed_s"] for r in runs), 4),
+            "first_line_s": round(runs[-1]["first_line_s"], 4) if runs[-1]["first_line_s"] is not None else None,
+            "peak_rss_growth_mb": round(max(r["rss_growth_kb"] for r in runs) / 1024, 1),
+            "chars": runs[-1]["chars"],
+        }
+    out["same_lines"] = lines["dom"] == lines["stream"]
+    out["speedup"] = round(out["dom"]["mean_s"] / out["stream"]["mean_s"], 2) if out["stream"]["mean_s"] else None
+    d, s = out["dom"], out["stream"]
+    print(f"[{path.name[:40]:40s}] dom={d['mean_s']:.3f}s/{d['peak_rss_growth_mb']}MB "
+          f"stream={s['mean_s']:.3f}s/{s['peak_rss_growth_mb']}MB first={s['first_line_s']}s "
+          f"x{out['speedup']} same_lines={out['same_lines']}")
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--inputs", default="data/101/inputs/*.docx")
+    ap.add_argument("--synthetic-pages", type=int, default=300, help="0 이면 합성 문서 생략")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--out", default="experiments/results/bench_docx.json")
+    args = ap.parse_args()
+
+    files = [Path(f) for f in sorted(glob.glob(args.inputs))]
+    if not files:
+        raise SystemExit(f"[ERROR] 입력 파일 없음: {args.inputs}")
+
+    ctx = mp.get_context("spawn")
+    tmp = Path(tempfile.mkdtemp(prefix="bench_docx_"))
+    results = []
+    try:
+        targets = list(files)
+        if args.synthetic_pages > 0:
+            syn = make_synthetic(files[0], tmp / f"synthetic_{args.synthetic_pages}p.docx", args.synthetic_pages)
+            print(f"[INFO] 합성 문서: {syn.name} ({syn.stat().st_size / 1024 / 1024:.1f}MB)")
+            targets.append(syn)
+        for f in targets:
+            results.append(run_file(f, args.repeat, ctx))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps({"repeat": args.repeat, "files": results}, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"[INFO] saved {out}")
+
+
+if __name__ == "__main__":
+    main()
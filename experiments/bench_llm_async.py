@@ -0,0 +1,205 @@
+# experiments/bench_llm_async.py
+"""
+LLM 동시 호출 벤치마크: asyncio.to_thread(llm.invoke) vs 네이티브 ainvoke (공유 httpx 커넥션 풀)
+
+- 로컬 스텁 서버(별도 프로세스, stdlib ThreadingHTTPServer)가 Azure OpenAI chat.completions 를 흉내냄
+  · 응답 지연 --latency-ms, stream=true 요청은 SSE 청크로 응답
+  · 서버가 받은 TCP 연결 수를 세어 keep-alive 재사용 여부 확인
+- LLM 은 실제 config.Settings._build_llm() 경로로 생성 (캐시/governor off, endpoint 만 스텁으로)
+  · thread: LLM_HTTP_POOL=False + asyncio.to_thread(invoke)  (기존 에이전트 방식, 기본 executor 크기에 묶임)
+  · async : LLM_HTTP_POOL=True  + ainvoke_llm()             (스레드 점유 없음)
+- 측정: 동시 요청 수별 전체 시간, 처리량(req/s), p50/p95 지연, 새 TCP 연결 수, 추가 스레드 수
+
+실행 (저장소 루트에서):
+    python -m experiments.bench_llm_async
+    python -m experiments.bench_llm_async --latency-ms 500 --concurrency 8 32 128
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing as mp
+import os
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List
+
+
+# ---------------- 스텁 서버 (자식 프로세스) ----------------
+def _serve(port_q, latency_ms: int, reply_tokens: int) -> None:
+    lock = threading.Lock()
+    stats = {"connections": 0, "requests": 0}
+    reply = ["tok "] * reply_tokens
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            with lock:
+                stats["connections"] += 1
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, body: bytes, ctype: str) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            with lock:
+                self._send(json.dumps(stats).encode(), "application/json")
+
+        def do_POST(self):
+            req = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+            with lock:
+                stats["requests"] += 1
+            time.sleep(latency_ms / 1000)
+            base = {"id": "stub", "created": int(time.time()), "model": req.get("model") or "stub"}
+            if req.get("stream"):
+                events = []
+                for i, t in enumerate(reply):
+                    delta = {"role": "assistant", "content": t} if i == 0 else {"content": t}
+                    events.append({**base, "object": "chat.completion.chunk",
+                                   "choices": [{"index": 0, "delta": delta, "finish_reason": None}]})
+                events.append({**base, "object": "chat.completion.chunk",
+                               "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+                body = "".join(f"data: {json.dumps(e)}\n\n" for e in events) + "data: [DONE]\n\n"
+                self._send(body.encode(), "text/event-stream")
+            else:
+                body = {**base, "object": "chat.completion",
+                        "choices": [{"index": 0, "finish_reason": "stop",
+                                     "message": {"role": "assistant", "content": "".join(reply)}}],
+                        "usage": {"prompt_tokens": 10, "completion_tokens": reply_tokens,
+                                  "total_tokens": 10 + reply_tokens}}
+                self._send(json.dumps(body).encode(), "application/json")
+
+    class Server(ThreadingHTTPServer):
+        daemon_threads = True
+        request_queue_size = 1024  # listen backlog (기본 5 → 동시 연결 시 SYN 재전송 지연)
+
+    srv = Server(("127.0.0.1", 0), Handler)
+    port_q.put(srv.server_address[1])
+    srv.serve_forever()
+
+
+def _server_stats(base_url: str) -> Dict[str, int]:
+    import httpx
+    stats = httpx.get(base_url + "/stats").json()
+    stats["connections"] -= 1  # 이 조회 자체의 연결 (새 연결로 조회)
+    return stats
+
+
+# ---------------- 클라이언트 ----------------
+def _build_llm(endpoint: str, pool: bool):
+    from server.utils.config import Settings
+    s = Settings(
+        AOAI_API_KEY="bench", AOAI_ENDPOINT=endpoint, AOAI_DEPLOY_GPT4O="bench",
+        AOAI_EMBEDDING_DEPLOYMENT="bench", AOAI_API_VERSION="2024-06-01",
+        LLM_CACHE_ENABLED=False, LLM_SHARED_CLIENT=False, LLM_HTTP_POOL=pool,
+        LLM_GOVERNOR_ENABLED=False,  # HTTP 계층만 비교 (governor 동시 실행 상한 제외)
+    )
+    return s.get_llm()
+
+
+async def _run(variant: str, llm, n: int) -> Dict[str, Any]:
+    from server.utils.llm_http import ainvoke_llm
+
+    lat: List[float] = []
+    base_threads = threading.active_count()
+    peak = {"threads": base_threads}
+    stop = asyncio.Event()
+
+    async def sample():
+        while not stop.is_set():
+            peak["threads"] = max(peak["threads"], threading.active_count())
+            await asyncio.sleep(0.01)
+
+    async def one(i: int):
+        msgs = [{"role": "user", "content": f"request {i}"}]
+        t = time.perf_counter()
+        if variant == "thread":
+            resp = await asyncio.to_thread(llm.invoke, msgs)
+        else:
+            resp = await ainvoke_llm(llm, msgs)
+        lat.append(time.perf_counter() - t)
+        assert resp.content, "empty response"
+
+    sampler = asyncio.create_task(sample())
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(n)))
+    wall = time.perf_counter() - t0
+    stop.set()
+    await sampler
+    lat.sort()
+    return {
+        "wall_s": round(wall, 3),
+        "rps": round(n / wall, 1),
+        "p50_ms": round(statistics.median(lat) * 1000, 1),
+        "p95_ms": round(lat[min(len(lat) - 1, int(len(lat) * 0.95))] * 1000, 1),
+        "extra_threads": peak["threads"] - base_threads,
+    }
+
+
+async def _bench_all(llms: Dict[str, Any], base_url: str, levels: List[int]) -> List[Dict[str, Any]]:
+    """한 이벤트 루프(서버 프로세스와 동일)에서 동시성 단계별로 두 변형 측정 → 단계 간 커넥션 재사용 포함"""
+    results = []
+    for n in levels:
+        row: Dict[str, Any] = {"concurrency": n}
+        for variant in ("thread", "async"):
+            before = (await asyncio.to_thread(_server_stats, base_url))["connections"]
+            r = await _run(variant, llms[variant], n)
+            # before 조회의 연결 1개 제외
+            r["new_connections"] = (await asyncio.to_thread(_server_stats, base_url))["connections"] - before - 1
+            row[variant] = r
+        row["speedup"] = round(row["thread"]["wall_s"] / row["async"]["wall_s"], 2)
+        t, a = row["thread"], row["async"]
+        print(f"[n={n:4d}] thread {t['wall_s']:.2f}s {t['rps']:7.1f}rps p95={t['p95_ms']}ms "
+              f"thr+={t['extra_threads']} conn+={t['new_connections']} | "
+              f"async {a['wall_s']:.2f}s {a['rps']:7.1f}rps p95={a['p95_ms']}ms "
+              f"thr+={a['extra_threads']} conn+={a['new_connections']} | x{row['speedup']}")
+        results.append(row)
+    return results
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--latency-ms", type=int, default=200)
+    ap.add_argument("--reply-tokens", type=int, default=20)
+    ap.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 64])
+    ap.add_argument("--out", default="experiments/results/bench_llm_async.json")
+    args = ap.parse_args()
+
+    # config 모듈 import 시 Settings() 가 필수 env 를 요구 → 벤치 전용 더미 값
+    for k in ("AOAI_API_KEY", "AOAI_ENDPOINT", "AOAI_DEPLOY_GPT4O", "AOAI_EMBEDDING_DEPLOYMENT", "AOAI_API_VERSION"):
+        os.environ.setdefault(k, "bench")
+
+    ctx = mp.get_context("spawn")
+    q = ctx.Queue()
+    server = ctx.Process(target=_serve, args=(q, args.latency_ms, args.reply_tokens), daemon=True)
+    server.start()
+    base_url = f"http://127.0.0.1:{q.get(timeout=30)}"
+    print(f"[INFO] stub {base_url} latency={args.latency_ms}ms executor_default={min(32, (os.cpu_count() or 1) + 4)}")
+
+    from server.utils.llm_http import http_client_info
+    results = []
+    try:
+        llms = {"thread": _build_llm(base_url, pool=False), "async": _build_llm(base_url, pool=True)}
+        results = asyncio.run(_bench_all(llms, base_url, args.concurrency))
+    finally:
+        server.terminate()
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps({"latency_ms": args.latency_ms, "http": http_client_info(), "runs": results},
+                              ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"[INFO] saved {out}")
+
+
+if __name__ == "__main__":
+    main()
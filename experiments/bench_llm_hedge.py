@@ -0,0 +1,99 @@
+# experiments/bench_llm_hedge.py
+"""
+Hedged request 시뮬레이션: HedgedLLM on/off 에서 꼬리 지연(p99)과 추가 호출 비율 비교
+
+- 가짜 async LLM: 대부분 --base-ms 범위 균등 분포, --tail-rate 확률로 --tail-ms 의 느린 응답 (Azure 간헐 지연 모사)
+- 동시 --concurrency 개씩 총 --calls 회 호출, 같은 seed 로 두 모드 실행
+- 측정: p50/p95/p99/max, 업스트림 호출 수, 취소된 loser 수, hedge 승리 수, 예산 거절 수
+
+실행 (저장소 루트에서):
+    python -m experiments.bench_llm_hedge
+    LLM_HEDGE_PERCENTILE=95 python -m experiments.bench_llm_hedge --tail-rate 0.01
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+os.environ.setdefault("LLM_HEDGE_MIN_DELAY_MS", "50")  # 시뮬레이션 지연이 ms 단위라 하한을 낮춤
+
+from server.utils.llm_hedge import HedgedLLM, LatencyTracker, llm_call_class  # noqa: E402
+
+
+class FakeLLM:
+    deployment_name = "sim"
+
+    def __init__(self, rnd: random.Random, base_ms, tail_ms: float, tail_rate: float):
+        self.rnd, self.base_ms, self.tail_ms, self.tail_rate = rnd, base_ms, tail_ms, tail_rate
+        self.calls = 0
+        self.cancelled = 0
+
+    async def ainvoke(self, input: Any, config: Any = None, **kwargs: Any) -> str:
+        self.calls += 1
+        ms = self.tail_ms if self.rnd.random() < self.tail_rate else self.rnd.uniform(*self.base_ms)
+        try:
+            await asyncio.sleep(ms / 1000)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return "ok"
+
+
+async def run(enabled: bool, args) -> Dict[str, Any]:
+    fake = FakeLLM(random.Random(args.seed), (args.base_min_ms, args.base_max_ms), args.tail_ms, args.tail_rate)
+    tracker = LatencyTracker()
+    llm = HedgedLLM(fake, tracker, enabled=enabled)
+    sem = asyncio.Semaphore(args.concurrency)
+    lat = []
+
+    async def one():
+        async with sem:
+            t = time.perf_counter()
+            with llm_call_class("bench"):
+                await llm.ainvoke("q")
+            lat.append((time.perf_counter() - t) * 1000)
+
+    await asyncio.gather(*(one() for _ in range(args.calls)))
+    lat.sort()
+    pick = lambda p: round(lat[min(len(lat) - 1, int(len(lat) * p))], 1)  # noqa: E731
+    st = tracker.stats()
+    series = st["series"]["sim|bench"]
+    return {
+        "hedge": enabled,
+        "p50_ms": pick(0.50), "p95_ms": pick(0.95), "p99_ms": pick(0.99), "max_ms": round(lat[-1], 1),
+        "upstream_calls": fake.calls, "cancelled_losers": fake.cancelled,
+        "extra_call_ratio": round((fake.calls - args.calls) / args.calls, 4),
+        **{k: series[k] for k in ("hedged", "hedge_wins", "primary_wins", "budget_denied", "hedge_threshold_ms")},
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--calls", type=int, default=1000)
+    ap.add_argument("--concurrency", type=int, default=20)
+    ap.add_argument("--base-min-ms", type=float, default=50)
+    ap.add_argument("--base-max-ms", type=float, default=120)
+    ap.add_argument("--tail-ms", type=float, default=2000)
+    ap.add_argument("--tail-rate", type=float, default=0.02)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--out", default="experiments/results/bench_llm_hedge.json")
+    args = ap.parse_args()
+
+    results = [asyncio.run(run(False, args)), asyncio.run(run(True, args))]
+    for r in results:
+        print(f"[hedge={str(r['hedge']):5s}] p50={r['p50_ms']}ms p95={r['p95_ms']}ms p99={r['p99_ms']}ms "
+              f"max={r['max_ms']}ms extra={r['extra_call_ratio']:.1%} wins={r['hedge_wins']} "
+              f"denied={r['budget_denied']} threshold={r['hedge_threshold_ms']}")
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps({"args": vars(args), "runs": results}, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"[INFO] saved {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# experiments/bench_monte_carlo.py
+"""
+일정 리스크 Monte Carlo 벤치마크 (2k 작업 × 10k 반복 기준)
+
+실행 (저장소 루트에서):
+    python -m experiments.bench_monte_carlo
+    python -m experiments.bench_monte_carlo --tasks 2000 --iterations 10000 100000 --workers 1 4
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+
+from experiments.bench_cpm import synthetic_wbs
+from server.workflow.agents.risk_agent.monte_carlo import simulate_schedule
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--tasks", type=int, nargs="+", default=[2_000])
+    ap.add_argument("--iterations", type=int, nargs="+", default=[10_000, 100_000])
+    ap.add_argument("--workers", type=int, nargs="+", default=[1])
+    ap.add_argument("--dist", nargs="+", default=["pert", "triangular"])
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--out", default="experiments/results/bench_monte_carlo.json")
+    args = ap.parse_args()
+
+    rows = []
+    for n in args.tasks:
+        tasks = synthetic_wbs(n)
+        for it in args.iterations:
+            for dist in args.dist:
+                for w in args.workers:
+                    best, res = None, None
+                    for _ in range(args.repeat):
+                        t0 = time.perf_counter()
+                        res = simulate_schedule(tasks, iterations=it, distribution=dist, seed=7, workers=w)
+                        sec = time.perf_counter() - t0
+                        best = sec if best is None else min(best, sec)
+                    row = {
+                        "tasks": n, "iterations": it, "distribution": dist, "workers": w,
+                        "sec": round(best, 4),
+                        "deterministic_days": res["deterministic_days"],
+                        "p50_days": res["p50_days"], "p80_days": res["p80_days"], "p95_days": res["p95_days"],
+                    }
+                    rows.append(row)
+                    print(
+                        f"n={n:>6} S={it:>7} {dist:<10} workers={w}  {best:.3f}s  "
+                        f"P50={row['p50_days']} P80={row['p80_days']} P95={row['p95_days']}"
+                    )
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(rows, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"[INFO] saved {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+# experiments/bench_sqlite.py
+"""
+SQLite 성능 프로파일 벤치마크: build_weekly_report (기본 엔진 vs WAL/PRAGMA/풀 + 복합 인덱스)
+
+- 액션아이템 N건(기본 1M) + 회의/문서를 임시 DB 에 seed → 같은 파일을 before/after 로 복사
+- before: 기본 create_engine, 복합 인덱스 없음 / after: create_tuned_engine + ensure_indexes + ANALYZE
+- 단일 호출 지연 + (옵션) 쓰기 1 스레드와 리포트 읽기 스레드 동시 실행 시 지연/lock 오류
+
+실행 (저장소 루트에서):
+    python -m experiments.bench_sqlite
+    python -m experiments.bench_sqlite --rows 1000000 --projects 100 --concurrent-sec 5
+"""
+import argparse
+import json
+import random
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from server.db import pm_models
+from server.db.database import Base, create_tuned_engine, ensure_indexes
+from server.workflow.agents.pm_report import build_weekly_report
+
+COMPOSITE_INDEXES = (
+    "ix_pm_action_items_project_status_due",
+    "ix_pm_tasks_project_parent",
+    "ix_pm_meetings_project_date",
+)
+STATUSES = ["Open", "Open", "In Progress", "Todo", "Done", "Closed"]
+PRIORITIES = ["High", "Medium", "Medium", "Low"]
+
+
+def seed(path: Path, rows: int, projects: int, seed_: int = 7) -> float:
+    """모델 스키마(복합 인덱스 제외)로 테이블 생성 후 raw sqlite3 executemany 로 적재"""
+    eng = create_tuned_engine(f"sqlite:///{path}", tuned=False)
+    Base.metadata.create_all(eng)
+    eng.dispose()
+
+    t0 = time.perf_counter()
+    rnd = random.Random(seed_)
+    today = date.today()
+    now = datetime.utcnow()
+    con = sqlite3.connect(path)
+    try:
+        for ix in COMPOSITE_INDEXES:
+            con.execute(f"DROP INDEX IF EXISTS {ix}")
+        con.executemany(
+            "INSERT INTO pm_projects (id, name) VALUES (?, ?)",
+            [(p, f"Project-{p}") for p in range(1, projects + 1)],
+        )
+        n_meet = max(rows // 100, projects)
+        con.executemany(
+            "INSERT INTO pm_meetings (project_id, date, title, raw_text, created_at) VALUES (?, ?, ?, ?, ?)",
+            (
+                (rnd.randint(1, projects), (today - timedelta(days=rnd.randint(0, 720))).isoformat(),
+                 f"회의 {i}", "...", now.isoformat(" "))
+                for i in range(n_meet)
+            ),
+        )
+        con.executemany(
+            "INSERT INTO pm_documents (project_id, title, content, doc_type, created_at, uploaded_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (rnd.randint(1, projects), f"문서 {i}", "...", "meeting",
+                 (now - timedelta(days=rnd.randint(0, 720))).isoformat(" "), now.isoformat(" "))
+                for i in range(n_meet)
+            ),
+        )
+        batch = 100_000
+        for start in range(0, rows, batch):
+            con.executemany(
+                "INSERT INTO pm_action_items (project_id, document_id, assignee, task, due_date, priority, status, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (rnd.randint(1, projects), rnd.randint(1, n_meet), f"user{rnd.randint(1, 50)}",
+                     f"action item {i}",
+                     (today + timedelta(days=rnd.randint(-365, 60))).isoformat() if rnd.random() < 0.8 else None,
+                     rnd.choice(PRIORITIES), rnd.choice(STATUSES), now.isoformat(" "))
+                    for i in range(start, min(start + batch, rows))
+                ),
+            )
+        con.commit()
+    finally:
+        con.close()
+    return time.perf_counter() - t0
+
+
+def _report_latency(Session, project_ids: List[int], repeat: int) -> Dict[str, Any]:
+    times = []
+    open_total = None
+    for _ in range(repeat):
+        for pid in project_ids:
+            db = Session()
+            try:
+                t0 = time.perf_counter()
+                rep = build_weekly_report(db, pid)
+                times.append(time.perf_counter() - t0)
+                open_total = rep["action_items"]["open_total"]
+            finally:
+                db.close()
+    return {
+        "calls": len(times),
+        "mean_ms": round(statistics.mean(times) * 1000, 2),
+        "p50_ms": round(statistics.median(times) * 1000, 2),
+        "max_ms": round(max(times) * 1000, 2),
+        "open_total_last": open_total,
+    }
+
+
+def _concurrent(Session, projects: int, seconds: float, readers: int) -> Dict[str, Any]:
+    """쓰기 1 스레드(작은 트랜잭션 반복) + 리포트 읽기 스레드 동시 실행"""
+    stop = time.perf_counter() + seconds
+    lat: List[float] = []
+    stats = {"writes": 0, "write_errors": 0, "read_errors": 0}
+    lock = threading.Lock()
+
+    def writer():
+        rnd = random.Random(1)
+        while time.perf_counter() < stop:
+            db = Session()
+            try:
+                db.add(pm_models.PM_ActionItem(project_id=rnd.randint(1, projects), task="concurrent", status="Open"))
+                db.commit()
+                with lock:
+                    stats["writes"] += 1
+            except OperationalError:
+                db.rollback()
+                with lock:
+                    stats["write_errors"] += 1
+            finally:
+                db.close()
+
+    def reader(k: int):
+        rnd = random.Random(100 + k)
+        while time.perf_counter() < stop:
+            db = Session()
+            try:
+                t0 = time.perf_counter()
+                build_weekly_report(db, rnd.randint(1, projects))
+                with lock:
+                    lat.append(time.perf_counter() - t0)
+            except OperationalError:
+                with lock:
+                    stats["read_errors"] += 1
+            finally:
+                db.close()
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader, args=(k,)) for k in range(readers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    lat.sort()
+    return {
+        **stats,
+        "reads": len(lat),
+        "read_p50_ms": round(lat[len(lat) // 2] * 1000, 2) if lat else None,
+        "read_p95_ms": round(lat[int(len(lat) * 0.95)] * 1000, 2) if lat else None,
+    }
+
+
+def _plan(eng) -> List[str]:
+    today = date.today().isoformat()
+    with eng.connect() as c:
+        rows = c.execute(text(
+            "EXPLAIN QUERY PLAN SELECT * FROM pm_action_items WHERE project_id = 1 "
+            "AND status IN ('Open','In Progress','Todo') AND due_date IS NOT NULL AND due_date < :d"
+        ), {"d": today}).all()
+    return [r[-1] for r in rows]
+
+
+def run_variant(name: str, path: Path, tuned: bool, args) -> Dict[str, Any]:
+    eng = create_tuned_engine(f"sqlite:///{path}", tuned=tuned)
+    if tuned:
+        created = ensure_indexes(eng)
+        with eng.begin() as c:
+            c.execute(text("ANALYZE"))
+        print(f"[{name}] 인덱스 {created}개 생성 + ANALYZE")
+    Session = sessionmaker(bind=eng, autocommit=False, autoflush=False)
+    with eng.connect() as c:
+        mode = c.execute(text("PRAGMA journal_mode")).scalar()
+    rnd = random.Random(3)
+    pids = [rnd.randint(1, args.projects) for _ in range(args.sample)]
+
+    out = {
+        "variant": name,
+        "journal_mode": mode,
+        "query_plan": _plan(eng),
+        "report": _report_latency(Session, pids, args.repeat),
+    }
+    if args.concurrent_sec > 0:
+        out["concurrent"] = _concurrent(Session, args.projects, args.concurrent_sec, args.readers)
+    eng.dispose()
+    r = out["report"]
+    print(f"[{name}] journal={mode} report mean={r['mean_ms']}ms p50={r['p50_ms']}ms max={r['max_ms']}ms")
+    print(f"[{name}] plan: {out['query_plan']}")
+    if "concurrent" in out:
+        print(f"[{name}] concurrent: {out['concurrent']}")
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--projects", type=int, default=100)
+    ap.add_argument("--sample", type=int, default=5, help="리포트를 만들 프로젝트 수")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--concurrent-sec", type=float, default=5.0)
+    ap.add_argument("--readers", type=int, default=4)
+    ap.add_argument("--out", default="experiments/results/bench_sqlite.json")
+    args = ap.parse_args()
+
+    tmp = Path(tempfile.mkdtemp(prefix="bench_sqlite_"))
+    try:
+        base = tmp / "seed.db"
+        sec = seed(base, args.rows, args.projects)
+        print(f"[INFO] seed {args.rows:,} action items / {args.projects} projects: {sec:.1f}s")
+        results = []
+        for name, tuned in (("before", False), ("after", True)):
+            path = tmp / f"{name}.db"
+            shutil.copy(base, path)
+            results.append(run_variant(name, path, tuned, args))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    b, a = results[0]["report"]["mean_ms"], results[1]["report"]["mean_ms"]
+    summary = {"rows": args.rows, "projects": args.projects, "speedup": round(b / a, 2) if a else None,
+               "variants": results}
+    print(f"[INFO] build_weekly_report speedup: x{summary['speedup']}")
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"[INFO] saved {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -169,15 +169,22 @@ def experiment_E2_schedule_all_modes(rfps: List[str]):
     results = []
 
     for idx, rfp in enumerate(rfps):
-        baseline = sched.create_schedule([])
+        reqs = naive_extract(rfp)
+        baseline = sched.create_schedule(reqs)
 
-        got_res = got_s.run([], [], {})
+        got_res = got_s.run(reqs, [], {"seed": idx})
+        best = got_res["best_plan"]
 
         results.append({
             "rfp_id": idx,
+            "num_requirements": len(reqs),
             "baseline_duration": baseline["total_duration"],
-            "got_best": got_res["best_plan"]["total_duration"],
-            "got_candidates": len(got_res["candidates"])
+            "got_best_duration": best["total_duration"],
+            "got_best_cost": best.get("metrics", {}).get("cost"),
+            "got_params": best.get("params"),
+            "got_candidates": len(got_res["candidates"]),
+            "pareto_size": len(got_res.get("pareto_front", [])),
+            "search_ms": got_res.get("search", {}).get("elapsed_ms"),
         })
 
     return results
@@ -420,8 +427,8 @@ def create_summary_report(e1, e2, e3, e4, results_dir: Path):
     # E2
     if e2:
         durations_base = [r.get("baseline_duration", 0) for r in e2]
-        durations_got = [r.get("got_best", 0) for r in e2]
-        candidate_counts = [r.get("num_candidates", 0) for r in e2]
+        durations_got = [r.get("got_best_duration", 0) for r in e2]
+        candidate_counts = [r.get("got_candidates", 0) for r in e2]
 
         report.append("📊 E2: Schedule — Heuristic vs GoT")
         report.append("-" * 60)
@@ -1,14 +1,109 @@
-from sqlalchemy import create_engine
+import logging
+
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from server.utils.config import settings
 
+logger = logging.getLogger("db.engine")
+
+
+def _sqlite_pragmas(wal: bool, synchronous: str, cache_size_kb: int, mmap_size_mb: int, busy_timeout_ms: int):
+    """연결 생성 시 적용할 PRAGMA 목록"""
+    return [
+        f"PRAGMA journal_mode={'WAL' if wal else 'DELETE'}",
+        f"PRAGMA synchronous={synchronous}",
+        f"PRAGMA cache_size={-int(cache_size_kb)}",          # 음수 = KiB 단위
+        f"PRAGMA mmap_size={int(mmap_size_mb) * 1024 * 1024}",
+        f"PRAGMA busy_timeout={int(busy_timeout_ms)}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+
+
+def create_tuned_engine(url: str, tuned: bool = True, **overrides):
+    """
+    SQLite 엔진 생성
+    - tuned=True: WAL + synchronous=NORMAL + cache/mmap + busy_timeout PRAGMA, 크기 지정 커넥션 풀
+    - tuned=False: 기본 설정 (벤치마크 비교용)
+    overrides: wal / synchronous / cache_size_kb / mmap_size_mb / busy_timeout_ms / pool_size / max_overflow / pool_timeout
+    """
+    is_sqlite = url.startswith("sqlite")
+    if not tuned:
+        return create_engine(url, connect_args={"check_same_thread": False} if is_sqlite else {})
+
+    opts = {
+        "wal": settings.DB_SQLITE_WAL,
+        "synchronous": settings.DB_SQLITE_SYNCHRONOUS,
+        "cache_size_kb": settings.DB_SQLITE_CACHE_SIZE_KB,
+        "mmap_size_mb": settings.DB_SQLITE_MMAP_SIZE_MB,
+        "busy_timeout_ms": settings.DB_SQLITE_BUSY_TIMEOUT_MS,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SEC,
+        **overrides,
+    }
+    kwargs = {"pool_pre_ping": True}
+    in_memory = url in ("sqlite://", "sqlite:///:memory:") or ":memory:" in url
+    if not in_memory:
+        kwargs.update(pool_size=opts["pool_size"], max_overflow=opts["max_overflow"], pool_timeout=opts["pool_timeout"])
+    if is_sqlite:
+        # sqlite3 자체 lock 대기(timeout, 초)도 busy_timeout 과 맞춤
+        kwargs["connect_args"] = {"check_same_thread": False, "timeout": opts["busy_timeout_ms"] / 1000}
+
+    eng = create_engine(url, **kwargs)
+
+    if is_sqlite:
+        pragmas = _sqlite_pragmas(
+            opts["wal"] and not in_memory, opts["synchronous"], opts["cache_size_kb"],
+            opts["mmap_size_mb"], opts["busy_timeout_ms"],
+        )
+
+        @event.listens_for(eng, "connect")
+        def _on_connect(dbapi_conn, _record):
+            # pysqlite 암묵 BEGIN 비활성화 → 아래 begin 이벤트에서 직접 BEGIN (SAVEPOINT 정상 동작)
+            dbapi_conn.isolation_level = None
+            cur = dbapi_conn.cursor()
+            try:
+                for p in pragmas:
+                    cur.execute(p)
+            finally:
+                cur.close()
+
+        @event.listens_for(eng, "begin")
+        def _on_begin(conn):
+            conn.exec_driver_sql("BEGIN")
+
+        logger.info("[DB] SQLite 엔진: %s (pool=%s+%s)", ", ".join(p.split(" ", 1)[1] for p in pragmas),
+                    opts["pool_size"], opts["max_overflow"])
+    return eng
+
+
+def ensure_indexes(bind=None) -> int:
+    """
+    모델에 선언된 인덱스 중 기존 DB 에 없는 것을 생성 (create_all 은 이미 있는 테이블의 인덱스를 추가하지 않음)
+    반환: 생성한 인덱스 수
+    """
+    from sqlalchemy import inspect
+
+    bind = bind or engine
+    insp = inspect(bind)
+    tables = set(insp.get_table_names())
+    created = 0
+    for table in Base.metadata.sorted_tables:
+        if table.name not in tables:
+            continue
+        existing = {ix["name"] for ix in insp.get_indexes(table.name)}
+        for ix in table.indexes:
+            if ix.name not in existing:
+                ix.create(bind=bind, checkfirst=True)
+                created += 1
+                logger.info("[DB] 인덱스 생성: %s", ix.name)
+    return created
+
+
 # SQLite 엔진 생성
-engine = create_engine(
-    settings.SQLALCHEMY_DATABASE_URI,
-    connect_args={"check_same_thread": False},  # SQLite 전용 설정
-)
+engine = create_tuned_engine(settings.SQLALCHEMY_DATABASE_URI)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # SQLAlchemy 모델 기본 클래스
@@ -0,0 +1,23 @@
+-- server/db/migrations/add_composite_indexes.sql
+-- 대시보드/리포트 주요 조회용 복합 인덱스 (server.db.database.ensure_indexes 와 동일)
+-- pm_requirements(project_id, req_id) 는 add_requirement_unique_index.sql 의 유니크 인덱스 사용
+
+BEGIN TRANSACTION;
+
+-- ✅ 액션아이템: 프로젝트별 상태/마감일 조회 (open / overdue / upcoming)
+CREATE INDEX IF NOT EXISTS ix_pm_action_items_project_status_due
+    ON pm_action_items (project_id, status, due_date);
+
+-- ✅ Task: 프로젝트별 WBS 트리 조회
+CREATE INDEX IF NOT EXISTS ix_pm_tasks_project_parent
+    ON pm_tasks (project_id, parent_id);
+
+-- ✅ 회의: 프로젝트별 최근 회의
+CREATE INDEX IF NOT EXISTS ix_pm_meetings_project_date
+    ON pm_meetings (project_id, date);
+
+COMMIT;
+
+-- WAL 은 DB 파일에 유지되는 설정 (트랜잭션 밖에서 실행)
+PRAGMA journal_mode=WAL;
+ANALYZE;
@@ -0,0 +1,17 @@
+-- server/db/migrations/add_requirement_unique_index.sql
+-- 요구사항 bulk upsert(ON CONFLICT) 대상 유니크 인덱스
+-- 런타임(pm_crud.ensure_requirement_unique_index)은 중복 행을 지우지 않고 실패하므로, 중복 정리는 이 스크립트로만 수행
+
+BEGIN TRANSACTION;
+
+-- ✅ (project_id, req_id) 중복 정리: 가장 최근 행만 유지
+DELETE FROM pm_requirements
+WHERE id NOT IN (
+    SELECT MAX(id) FROM pm_requirements GROUP BY project_id, req_id
+);
+
+-- ✅ 유니크 인덱스
+CREATE UNIQUE INDEX IF NOT EXISTS uq_pm_requirements_project_req
+    ON pm_requirements (project_id, req_id);
+
+COMMIT;
@@ -5,6 +5,8 @@ from typing import Iterable, Optional, Sequence, Dict, Any
 from sqlalchemy.orm import Session
 from server.db import pm_models
 from server.db.database import get_db, SessionLocal
+from server.db.writer import get_writer
+from server.db.pm_summary import mark_action_items_dirty
 import json
 import logging
 
@@ -123,6 +125,22 @@ def bulk_create_action_items(
     return list(items)
 
 
+def insert_action_items(db: Session, rows: List[Dict[str, Any]]) -> int:
+    """
+    Action item 일괄 INSERT (executemany 1회, commit 은 호출측 트랜잭션에서)
+    rows: PM_ActionItem 컬럼명 dict 목록
+    """
+    from sqlalchemy import insert
+
+    if not rows:
+        return 0
+    now = datetime.utcnow()
+    db.execute(insert(pm_models.PM_ActionItem), [{"created_at": now, **r} for r in rows])
+    # Core INSERT 는 mapper 이벤트가 없으므로 요약 캐시 무효화 대상 직접 등록
+    mark_action_items_dirty(db, {r.get("project_id") for r in rows})
+    return len(rows)
+
+
 # -------------------------
 # FupItem
 # -------------------------
@@ -239,6 +257,146 @@ def upsert_requirement(project_id: str, req: Dict[str, Any]) -> int:
     finally:
         db.close()
 
+_REQ_UPDATE_COLS = ("title", "type", "priority", "description", "source_doc")
+_req_index_ready = False
+
+
+def _dialect_insert(db: Session):
+    """ON CONFLICT 를 지원하는 방언별 insert (SQLite / PostgreSQL)"""
+    name = db.get_bind().dialect.name
+    if name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        raise NotImplementedError(f"bulk upsert not supported for dialect: {name}")
+    return insert
+
+
+def ensure_requirement_unique_index(bind=None) -> None:
+    """
+    pm_requirements(project_id, req_id) 유니크 인덱스 보장 (ON CONFLICT 대상)
+    - 인덱스 없이 만들어진 기존 DB 는 중복 행이 없을 때만 생성
+    - 중복 행이 있으면 데이터를 지우지 않고 목록을 로그로 남긴 뒤 실패
+      → migrations/add_requirement_unique_index.sql 로 정리 후 재시도
+    - 프로세스당 1회, writer 큐 밖에서 별도 연결로 실행
+    """
+    global _req_index_ready
+    if _req_index_ready:
+        return
+    from sqlalchemy import inspect, text
+    from server.db.database import engine
+
+    bind = bind or engine
+    insp = inspect(bind)
+    key = ["project_id", "req_id"]
+    found = any(u["column_names"] == key for u in insp.get_unique_constraints("pm_requirements")) or any(
+        ix.get("unique") and ix["column_names"] == key for ix in insp.get_indexes("pm_requirements")
+    )
+    if not found:
+        with bind.begin() as conn:
+            dups = conn.execute(text(
+                "SELECT project_id, req_id, COUNT(*) AS n, MIN(id) AS first_id, MAX(id) AS last_id "
+                "FROM pm_requirements GROUP BY project_id, req_id HAVING COUNT(*) > 1 "
+                "ORDER BY project_id, req_id"
+            )).fetchall()
+            if dups:
+                for d in dups[:50]:
+                    logger.error("[CRUD] pm_requirements 중복 project=%s req_id=%s rows=%d (id %s..%s)",
+                                 d.project_id, d.req_id, d.n, d.first_id, d.last_id)
+                raise RuntimeError(
+                    f"pm_requirements 에 (project_id, req_id) 중복 {len(dups)}건 → 유니크 인덱스 생성 불가. "
+                    "server/db/migrations/add_requirement_unique_index.sql 로 정리 후 재시도하세요"
+                )
+            conn.execute(text(
+                "CREATE UNIQUE INDEX IF NOT EXISTS uq_pm_requirements_project_req "
+                "ON pm_requirements (project_id, req_id)"
+            ))
+        logger.info("[CRUD] pm_requirements 유니크 인덱스 생성")
+    _req_index_ready = True
+
+
+def _upsert_requirements_tx(
+    db: Session, project_id: Any, reqs: List[Dict[str, Any]], source_doc: Optional[str], status: str
+) -> Dict[str, int]:
+    """bulk_upsert_requirements 본체 (commit 은 호출측)"""
+    from sqlalchemy import func
+
+    now = datetime.utcnow()
+    ts = int(now.timestamp())
+    rows: Dict[str, Dict[str, Any]] = {}
+    for i, r in enumerate(reqs or [], start=1):
+        req_id = str(r.get("req_id") or r.get("id") or f"AUTO-{ts}-{i}")
+        rows[req_id] = {
+            "project_id": project_id,
+            "req_id": req_id,
+            "title": (r.get("title") or (r.get("description") or "")[:200] or req_id)[:1000],
+            "type": r.get("type") or r.get("category") or None,
+            "priority": r.get("priority") or None,
+            "description": r.get("description") or None,
+            "source_doc": r.get("source_span") or r.get("source_doc") or source_doc,
+            "status": r.get("status") or status,
+            "created_at": now,
+            "updated_at": now,
+        }
+    if not rows:
+        return {"inserted": 0, "updated": 0, "total": 0}
+
+    T = pm_models.PM_Requirement
+    existing = {
+        k for (k,) in db.query(T.req_id).filter(T.project_id == project_id, T.req_id.in_(list(rows)))
+    }
+    for r in rows.values():
+        if r["req_id"] not in existing:
+            r["type"] = r["type"] or "functional"
+            r["priority"] = r["priority"] or "Medium"
+
+    stmt = _dialect_insert(db)(T)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[T.project_id, T.req_id],
+        set_={
+            **{c: func.coalesce(getattr(stmt.excluded, c), getattr(T, c)) for c in _REQ_UPDATE_COLS},
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    db.execute(stmt, list(rows.values()))
+    return {"inserted": len(rows) - len(existing), "updated": len(existing), "total": len(rows)}
+
+
+def bulk_upsert_requirements(
+    project_id: Any,
+    reqs: List[Dict[str, Any]],
+    *,
+    source_doc: Optional[str] = None,
+    status: str = "Open",
+    db: Optional[Session] = None,
+) -> Dict[str, int]:
+    """
+    요구사항 일괄 upsert: 기존 키 1회 조회 + INSERT ... ON CONFLICT(project_id, req_id) DO UPDATE, 단일 트랜잭션
+    - db 미지정 시 단일 writer 큐에서 실행 (commit 까지 대기)
+    - req_id 없으면 AUTO-<ts>-<n> 생성, 같은 배치 안의 중복 req_id 는 마지막 것 사용
+    - 비어 있는 필드는 기존 값 유지, status/created_at 은 신규 행에만 설정
+    반환: {"inserted", "updated", "total"}
+    """
+    try:
+        if db is None:
+            ensure_requirement_unique_index()
+            out = get_writer().call(_upsert_requirements_tx, project_id, reqs, source_doc, status)
+        else:
+            ensure_requirement_unique_index(db.get_bind())
+            try:
+                out = _upsert_requirements_tx(db, project_id, reqs, source_doc, status)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+    except Exception as e:
+        logger.exception("bulk_upsert_requirements failed: %s", e)
+        raise
+    logger.info("[CRUD] 요구사항 upsert project=%s: %s", project_id, out)
+    return out
+
+
 def list_requirements(project_id: str) -> List[Dict[str, Any]]:
     db: Session = SessionLocal()
     try:
@@ -436,32 +594,108 @@ def save_tasks(
     *,
     project_id: int,
     tasks: list
-) -> list:
-    """WBS Task 저장"""
-    saved_tasks = []
+) -> Dict[str, int]:
+    """
+    WBS Task 일괄 저장: INSERT ... ON CONFLICT(id) DO UPDATE, 단일 트랜잭션
+    (다른 프로젝트의 같은 id 행은 덮어쓰지 않음) 반환: {"inserted", "updated", "skipped"}
+    """
+    T = pm_models.PM_Task
+    rows: Dict[str, Dict[str, Any]] = {}
     for task_data in tasks:
-        task = pm_models.PM_Task(
-            id=task_data["id"],
-            project_id=project_id,
-            name=task_data["name"],
-            type=task_data.get("type", "task"),
-            parent_id=task_data.get("parent_id"),
-            duration_days=task_data.get("duration"),
-            story_points=task_data.get("story_points"),
-            es=task_data.get("ES"),
-            ef=task_data.get("EF"),
-            ls=task_data.get("LS"),
-            lf=task_data.get("LF"),
-            float=task_data.get("Float"),
-            planned_start=task_data.get("start"),
-            planned_end=task_data.get("end"),
-            assignee=task_data.get("assignee")
-        )
-        db.add(task)
-        saved_tasks.append(task)
-    
-    db.commit()
-    return saved_tasks
+        rows[str(task_data["id"])] = {
+            "id": str(task_data["id"]),
+            "project_id": project_id,
+            "name": task_data["name"],
+            "type": task_data.get("type", "task"),
+            "parent_id": task_data.get("parent_id"),
+            "duration_days": task_data.get("duration"),
+            "story_points": task_data.get("story_points"),
+            "es": task_data.get("ES"),
+            "ef": task_data.get("EF"),
+            "ls": task_data.get("LS"),
+            "lf": task_data.get("LF"),
+            "float": task_data.get("Float"),
+            "planned_start": task_data.get("start"),
+            "planned_end": task_data.get("end"),
+            "assignee": task_data.get("assignee"),
+        }
+    if not rows:
+        return {"inserted": 0, "updated": 0, "skipped": 0}
+
+    owner = dict(db.query(T.id, T.project_id).filter(T.id.in_(list(rows))).all())
+    stmt = _dialect_insert(db)(T)
+    cols = [c for c in next(iter(rows.values())) if c not in ("id", "project_id")]
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[T.id],
+        set_={c: getattr(stmt.excluded, c) for c in cols},
+        where=T.project_id == stmt.excluded.project_id,
+    )
+    try:
+        db.execute(stmt, list(rows.values()))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    updated = sum(1 for k in rows if owner.get(k) == project_id)
+    skipped = sum(1 for k in rows if k in owner and owner[k] != project_id)
+    if skipped:
+        logger.warning("[CRUD] 다른 프로젝트에 이미 있는 task id %d건은 저장하지 않음 (project=%s)", skipped, project_id)
+    return {"inserted": len(rows) - updated - skipped, "updated": updated, "skipped": skipped}
+
+
+def load_task_network(project_id: int) -> List[Dict[str, Any]]:
+    """CPM/자원 평준화 입력용 작업 목록: pm_tasks + pm_task_links(FS/SS/FF/SF, lag)"""
+    db: Session = SessionLocal()
+    try:
+        tasks = db.query(pm_models.PM_Task).filter(pm_models.PM_Task.project_id == project_id).all()
+        links = db.query(pm_models.PM_TaskLink).filter(pm_models.PM_TaskLink.project_id == project_id).all()
+        by_succ: Dict[str, List[Dict[str, Any]]] = {}
+        for l in links:
+            by_succ.setdefault(l.successor_id, []).append({
+                "id": l.predecessor_id,
+                "type": l.link_type or "FS",
+                "lag": l.lag_days or 0,
+            })
+        return [{
+            "id": t.id,
+            "name": t.name,
+            "duration": t.duration_days or 1,
+            "links": by_succ.get(t.id, []),
+            "assignee": t.assignee,
+            "story_points": t.story_points,
+        } for t in tasks]
+    finally:
+        db.close()
+
+
+def bulk_update_task_cpm(project_id: int, cpm: Dict[str, Any]) -> int:
+    """CPM 결과(ES/EF/LS/LF/FLOAT)를 PM_Task 에 한 번의 bulk UPDATE 로 반영"""
+    from sqlalchemy import update
+
+    db: Session = SessionLocal()
+    try:
+        ids = {
+            r[0] for r in db.query(pm_models.PM_Task.id)
+            .filter(pm_models.PM_Task.project_id == project_id).all()
+        }
+        rows = [{
+            "id": tid,
+            "es": es,
+            "ef": cpm["EF"][tid],
+            "ls": cpm["LS"][tid],
+            "lf": cpm["LF"][tid],
+            "float": cpm["FLOAT"][tid],
+        } for tid, es in cpm["ES"].items() if tid in ids]
+        if rows:
+            db.execute(update(pm_models.PM_Task), rows)
+            db.commit()
+        return len(rows)
+    except Exception as e:
+        db.rollback()
+        logger.exception("bulk_update_task_cpm failed: %s", e)
+        raise
+    finally:
+        db.close()
 
 
 # -------------------------
@@ -519,26 +753,31 @@ def save_output_version(
 # -------------------------
 # ✅ 이벤트 로그
 # -------------------------
+def _add_log(db: Session, event_type: str, message: str, details: Optional[Dict]) -> pm_models.PM_Log:
+    log = pm_models.PM_Log(event_type=event_type, message=message, details=details)
+    db.add(log)
+    db.flush()
+    return log
+
+
 def log_event(
-    db: Session,
+    db: Optional[Session] = None,
     *,
     event_type: str,
     message: str,
-    details: Optional[Dict] = None
-) -> pm_models.PM_Log:
-    """이벤트 로그 저장"""
+    details: Optional[Dict] = None,
+    wait: bool = True,
+):
+    """
+    이벤트 로그 저장 (단일 writer 큐 경유 → 동시에 들어온 이벤트들과 한 트랜잭션으로 commit)
+    db 인자는 하위호환용(사용 안 함). wait=False 면 commit 을 기다리지 않고 Future 반환
+    """
+    fut = get_writer().submit(_add_log, event_type, message, details)
+    if not wait:
+        return fut
     try:
-        log = pm_models.PM_Log(
-            event_type=event_type,
-            message=message,
-            details=details
-        )
-        db.add(log)
-        db.commit()
-        db.refresh(log)
-        return log
+        return fut.result()
     except Exception as e:
-        db.rollback()
         print(f"[log_event] Error: {e}")
         raise
 
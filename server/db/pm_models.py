@@ -11,6 +11,7 @@ from sqlalchemy import (
     JSON,
     ForeignKey,
     UniqueConstraint,
+    Index,
 )
 from sqlalchemy.orm import relationship
 
@@ -63,6 +64,7 @@ class PM_Document(Base):
 
 class Meeting(Base):
     __tablename__ = "pm_meetings"
+    __table_args__ = (Index("ix_pm_meetings_project_date", "project_id", "date"),)
 
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("pm_projects.id"), nullable=False)
@@ -90,6 +92,7 @@ class Meeting(Base):
 
 class PM_ActionItem(Base):
     __tablename__ = "pm_action_items"
+    __table_args__ = (Index("ix_pm_action_items_project_status_due", "project_id", "status", "due_date"),)
 
     id = Column(Integer, primary_key=True)
     project_id = Column(Integer, index=True, nullable=False)
@@ -228,6 +231,7 @@ class PM_Schedule(Base):
 # ✅ Task (WBS 아이템별 상세 정보)
 class PM_Task(Base):
     __tablename__ = "pm_tasks"
+    __table_args__ = (Index("ix_pm_tasks_project_parent", "project_id", "parent_id"),)
     
     id = Column(String(50), primary_key=True)  # WBS-1.1.2 형태
     project_id = Column(Integer, nullable=False, index=True)
@@ -317,4 +321,22 @@ class PM_Log(Base):
     event_type = Column(String(200))  # scope_generated/schedule_generated/task_updated
     message = Column(Text)
     details = Column(JSON, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
\ No newline at end of file
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+# ✅ 비동기 작업(Job) 상태 (server/workflow/job_queue.py)
+class PM_Job(Base):
+    __tablename__ = "pm_jobs"
+
+    id = Column(String(32), primary_key=True)              # uuid4 hex
+    kind = Column(String(50), nullable=False, index=True)  # proposal_rewoo / workflow_scope_schedule
+    status = Column(String(20), default="queued", index=True)  # queued/running/succeeded/failed
+    project_id = Column(String(100), nullable=True, index=True)
+    payload = Column(JSON)
+    steps = Column(JSON)      # {"scope": {"status": "done", "elapsed_ms": .., "artifacts": {..}}, ...}
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    owner_pid = Column(Integer, nullable=True)             # 실행 중인 프로세스 (재시작 복구용)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
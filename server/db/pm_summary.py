@@ -0,0 +1,267 @@
+# server/db/pm_summary.py
+"""
+Action item 요약 집계 (SQL 측 집계 + 프로젝트별 캐시)
+
+- 쿼리 1: (status, priority) GROUP BY + CASE 합계 → 상태/우선순위 히스토그램, open/overdue/upcoming 건수
+- 쿼리 2: open / overdue / upcoming 미리보기를 UNION ALL 로 한 번에 (각각 LIMIT)
+- 결과는 (project_id, 옵션, 오늘 날짜) 키로 캐시, action item 쓰기 commit 시 해당 프로젝트만 무효화
+  · ORM 경로: PM_ActionItem insert/update/delete mapper 이벤트
+  · Core 경로(insert_action_items 등): mark_action_items_dirty(db, project_ids) 호출
+- status 가 NULL 인 레거시 행은 모델 기본값(Open)으로 간주
+"""
+from __future__ import annotations
+
+import copy
+import logging
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import case, event, func, literal, or_, select, union_all
+from sqlalchemy.orm import Session
+
+from server.db import pm_models
+
+logger = logging.getLogger("pm.summary")
+
+ACTION_SUMMARY_CACHE_ENABLED = os.getenv("ACTION_SUMMARY_CACHE_ENABLED", "1") not in ("0", "false", "False")
+ACTION_SUMMARY_CACHE_TTL_SEC = float(os.getenv("ACTION_SUMMARY_CACHE_TTL_SEC", "300"))
+ACTION_SUMMARY_CACHE_MAX = int(os.getenv("ACTION_SUMMARY_CACHE_MAX", "1000"))
+
+OPEN_STATUSES: Tuple[str, ...] = ("Open", "In Progress", "Todo")
+_DIRTY_KEY = "pm_summary_dirty_projects"
+
+AI = pm_models.PM_ActionItem
+_PREVIEW_COLS = (
+    AI.id, AI.assignee, AI.task, AI.due_date, AI.priority, AI.status,
+    AI.module, AI.phase, AI.document_id, AI.meeting_id, AI.created_at,
+)
+_PREVIEW_KEYS = [c.key for c in _PREVIEW_COLS]
+
+
+# ---------------- cache ----------------
+_cache: Dict[Tuple, Tuple[float, Dict[str, Any]]] = {}
+_cache_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+# 프로젝트별 세대 번호(-1 = 전체): 계산 도중 무효화되면 그 결과는 캐시에 넣지 않음
+_generation: Dict[int, int] = {}
+
+
+def invalidate_action_summary(project_id: Optional[int] = None) -> int:
+    """project_id 의 캐시 제거 (None 이면 전체). 반환: 제거된 항목 수"""
+    with _cache_lock:
+        if project_id is None:
+            keys = list(_cache)
+            _generation[-1] = _generation.get(-1, 0) + 1
+        else:
+            pid = int(project_id)
+            keys = [k for k in _cache if k[0] == pid]
+            _generation[pid] = _generation.get(pid, 0) + 1
+        for k in keys:
+            _cache.pop(k, None)
+        _stats["invalidations"] += 1
+    return len(keys)
+
+
+def action_summary_cache_stats() -> Dict[str, Any]:
+    with _cache_lock:
+        return {**_stats, "entries": len(_cache), "enabled": ACTION_SUMMARY_CACHE_ENABLED,
+                "ttl_sec": ACTION_SUMMARY_CACHE_TTL_SEC}
+
+
+def mark_action_items_dirty(db: Session, project_ids: Iterable[Any]) -> None:
+    """Core 쿼리로 action item 을 쓴 경우 호출 → commit 시점에 해당 프로젝트 캐시 무효화"""
+    pids = {int(p) for p in project_ids if p is not None}
+    if not pids:
+        return
+    db.info.setdefault(_DIRTY_KEY, set()).update(pids)
+    # commit 전 다른 세션이 캐시를 채우는 경우 대비: 지금도 한 번 비움 (commit 후 다시 비움)
+    for pid in pids:
+        invalidate_action_summary(pid)
+
+
+@event.listens_for(AI, "after_insert")
+@event.listens_for(AI, "after_update")
+@event.listens_for(AI, "after_delete")
+def _on_action_item_write(_mapper, _conn, target) -> None:
+    sess = Session.object_session(target)
+    if sess is not None and target.project_id is not None:
+        sess.info.setdefault(_DIRTY_KEY, set()).add(int(target.project_id))
+
+
+@event.listens_for(Session, "after_commit")
+def _on_commit(sess: Session) -> None:
+    for pid in sess.info.pop(_DIRTY_KEY, ()):
+        invalidate_action_summary(pid)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _on_rollback(sess: Session, _previous_transaction) -> None:
+    if not sess.in_transaction():
+        sess.info.pop(_DIRTY_KEY, None)
+
+
+# ---------------- SQL 집계 ----------------
+def _open_clause(open_statuses: Sequence[str]):
+    cond = AI.status.in_(list(open_statuses))
+    if "Open" in open_statuses:
+        cond = or_(cond, AI.status.is_(None))
+    return cond
+
+
+def _open_order():
+    # High 우선 → 마감일 있는 것 먼저 → 마감일 오름차순 → id
+    return (
+        case((AI.priority == "High", 0), else_=1),
+        case((AI.due_date.is_(None), 1), else_=0),
+        AI.due_date.asc(),
+        AI.id.asc(),
+    )
+
+
+def _compute(db: Session, project_id: int, today: date, open_statuses: Sequence[str],
+             upcoming_days: int, preview_limit: int, list_limit: int) -> Dict[str, Any]:
+    is_open = _open_clause(open_statuses)
+    horizon = today + timedelta(days=upcoming_days)
+    has_due = AI.due_date.isnot(None)
+    overdue_c = is_open & has_due & (AI.due_date < today)
+    upcoming_c = is_open & has_due & (AI.due_date >= today) & (AI.due_date < horizon)
+
+    # 쿼리 1: 히스토그램 + 건수
+    grouped = db.execute(
+        select(
+            AI.status, AI.priority, func.count(AI.id),
+            func.sum(case((is_open, 1), else_=0)),
+            func.sum(case((overdue_c, 1), else_=0)),
+            func.sum(case((upcoming_c, 1), else_=0)),
+        )
+        .where(AI.project_id == project_id)
+        .group_by(AI.status, AI.priority)
+    ).all()
+
+    status_counts: Dict[Any, int] = {}
+    priority_counts: Dict[Any, int] = {}
+    total = open_total = overdue_total = upcoming_total = 0
+    for st, pr, n, n_open, n_over, n_up in grouped:
+        status_counts[st] = status_counts.get(st, 0) + n
+        priority_counts[pr] = priority_counts.get(pr, 0) + n
+        total += n
+        open_total += int(n_open or 0)
+        overdue_total += int(n_over or 0)
+        upcoming_total += int(n_up or 0)
+
+    previews: Dict[str, List[Dict[str, Any]]] = {"open": [], "overdue": [], "upcoming": []}
+    if open_total:
+        # 쿼리 2: 미리보기 3종 (UNION ALL, 각 LIMIT)
+        base = AI.project_id == project_id
+        parts = []
+        for kind, cond, order, limit in (
+            ("open", is_open, _open_order(), preview_limit),
+            ("overdue", overdue_c, (AI.due_date.asc(), AI.id.asc()), list_limit if overdue_total else 0),
+            ("upcoming", upcoming_c, (AI.due_date.asc(), AI.id.asc()), list_limit if upcoming_total else 0),
+        ):
+            if limit <= 0:
+                continue
+            sub = (
+                select(literal(kind).label("kind"), *_PREVIEW_COLS)
+                .where(base, cond)
+                .order_by(*order)
+                .limit(limit)
+                .subquery()
+            )
+            parts.append(select(sub))
+        if parts:
+            stmt = parts[0] if len(parts) == 1 else union_all(*parts)
+            for row in db.execute(stmt):
+                previews[row[0]].append(dict(zip(_PREVIEW_KEYS, row[1:])))
+
+    return {
+        "project_id": project_id,
+        "as_of": today.isoformat(),
+        "total": total,
+        "open_total": open_total,
+        "overdue_total": overdue_total,
+        "upcoming_total": upcoming_total,
+        "open_preview": previews["open"],
+        "overdue": previews["overdue"],
+        "upcoming": previews["upcoming"],
+        "status_counts": status_counts,
+        "priority_counts": priority_counts,
+    }
+
+
+def _has_own_action_writes(db: Session) -> bool:
+    """세션에 아직 commit 안 된 action item 쓰기가 있는지 (flush 된 것 포함)"""
+    if db.info.get(_DIRTY_KEY):
+        return True
+    return any(isinstance(o, AI) for o in (*db.new, *db.dirty, *db.deleted))
+
+
+def action_item_summary(
+    db: Session,
+    project_id: int,
+    *,
+    today: Optional[date] = None,
+    open_statuses: Sequence[str] = OPEN_STATUSES,
+    upcoming_days: int = 7,
+    preview_limit: int = 20,
+    list_limit: int = 20,
+    use_cache: bool = True,
+) -> Dict[str, Any]:
+    """
+    프로젝트 action item 요약 (SQL 2회)
+    - open_total / overdue_total / upcoming_total: 전체 건수
+    - open_preview / overdue / upcoming: 각각 최대 preview_limit / list_limit 행 (컬럼 dict, 날짜는 date/datetime)
+    - upcoming: today <= due_date < today + upcoming_days
+    - status_counts / priority_counts: 원본 값(NULL 포함) 기준 히스토그램
+    - db 가 이미 트랜잭션 안이면 새 세션(새 스냅샷)으로 계산해 캐시 (자기 미커밋 쓰기가 있으면 캐시 없이 db 로 계산)
+    """
+    project_id = int(project_id)
+    today = today or datetime.utcnow().date()
+    key = (project_id, tuple(open_statuses), int(upcoming_days), int(preview_limit), int(list_limit), today)
+    # 자기 미커밋 action item 쓰기가 있으면 그걸 봐야 하므로 캐시 조회/저장 모두 생략
+    cacheable = use_cache and ACTION_SUMMARY_CACHE_ENABLED and not _has_own_action_writes(db)
+
+    gen = None
+    if cacheable:
+        now = time.monotonic()
+        with _cache_lock:
+            gen = (_generation.get(project_id, 0), _generation.get(-1, 0))
+            hit = _cache.get(key)
+            if hit is not None and now - hit[0] <= ACTION_SUMMARY_CACHE_TTL_SEC:
+                _stats["hits"] += 1
+                return copy.deepcopy(hit[1])
+            _stats["misses"] += 1
+
+    t0 = time.perf_counter()
+    args = (project_id, today, open_statuses, upcoming_days, preview_limit, list_limit)
+    if cacheable and db.in_transaction():
+        # 이미 열린 트랜잭션의 읽기 스냅샷은 gen 캡처보다 앞설 수 있음 → 그 결과를 캐시하면
+        # 그 사이 commit 된 쓰기가 무효화 뒤에 다시 옛 값으로 캐시됨.
+        # 새 세션 = gen 캡처 이후 열린 스냅샷 → 캐시 가능
+        with Session(bind=db.get_bind()) as fresh:
+            summary = _compute(fresh, *args)
+    else:
+        summary = _compute(db, *args)
+    logger.debug("[SUMMARY] project=%s total=%s (%.1fms)", project_id, summary["total"],
+                 (time.perf_counter() - t0) * 1000)
+
+    if cacheable:
+        with _cache_lock:
+            if gen == (_generation.get(project_id, 0), _generation.get(-1, 0)):
+                if len(_cache) >= ACTION_SUMMARY_CACHE_MAX:
+                    _cache.pop(next(iter(_cache)))
+                _cache[key] = (time.monotonic(), summary)
+        return copy.deepcopy(summary)
+    return summary
+
+
+__all__ = [
+    "OPEN_STATUSES",
+    "action_item_summary",
+    "invalidate_action_summary",
+    "mark_action_items_dirty",
+    "action_summary_cache_stats",
+]
@@ -0,0 +1,264 @@
+# server/db/writer.py
+"""
+단일 writer DB 큐 (SQLite 쓰기 lock 경합 제거)
+
+- 모든 쓰기 작업은 fn(session) 형태로 큐에 넣고, 전용 스레드 1개가 순서대로 실행
+- 큐에 쌓인 작업은 flush 간격(DB_WRITER_FLUSH_MS) / 최대 묶음(DB_WRITER_MAX_BATCH) 단위로 한 트랜잭션에 묶어 commit
+- 작업별 SAVEPOINT: 한 작업이 실패해도 같은 묶음의 다른 작업은 commit
+  (작업이 받는 세션의 commit/rollback/close 는 묶음 트랜잭션을 닫지 않음 → _JobSession)
+- 묶음 처리가 실패하면 결과가 없는 작업 전부를 작업별 트랜잭션으로 재실행 (Future 가 미확정으로 남지 않음)
+- submit() 은 Future 반환 (commit 이후 결과 확정 → 생성 id 가 필요하면 fn 에서 flush 후 id 반환)
+- 읽기는 기존 pooled engine(SessionLocal) 그대로 사용 (WAL 이라 긴 쓰기 중에도 읽기 가능)
+- DB_WRITER_ENABLED=0 이면 호출 스레드에서 바로 실행 (스크립트/디버깅용)
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from server.db.database import engine
+
+logger = logging.getLogger("db.writer")
+
+DB_WRITER_ENABLED = os.getenv("DB_WRITER_ENABLED", "1") not in ("0", "false", "False")
+DB_WRITER_FLUSH_MS = float(os.getenv("DB_WRITER_FLUSH_MS", "20"))
+DB_WRITER_MAX_BATCH = int(os.getenv("DB_WRITER_MAX_BATCH", "200"))
+
+WriteFn = Callable[[Session], Any]
+_STOP = object()
+
+
+class _JobSession:
+    """
+    묶음 안 작업에 넘기는 세션 프록시 (작업별 SAVEPOINT).
+    작업이 commit/rollback/close 를 불러도 묶음 트랜잭션은 닫히지 않음:
+    commit → flush, rollback → 이 작업의 SAVEPOINT 만 되돌리고 새로 시작, close → 무시
+    """
+
+    def __init__(self, db: Session):
+        self._db = db
+        self._sp = db.begin_nested()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._db, name)
+
+    def commit(self) -> None:
+        self._db.flush()
+
+    def rollback(self) -> None:
+        if self._sp.is_active:
+            self._sp.rollback()
+        self._sp = self._db.begin_nested()
+
+    def close(self) -> None:
+        pass
+
+    def _release(self) -> None:
+        self._db.flush()
+        self._sp.commit()
+
+    def _discard(self) -> None:
+        if self._sp.is_active:
+            self._sp.rollback()
+
+
+class DBWriter:
+    """전용 스레드 1개로 쓰기를 직렬화하는 큐"""
+
+    def __init__(self, bind=None, flush_ms: float = DB_WRITER_FLUSH_MS, max_batch: int = DB_WRITER_MAX_BATCH,
+                 enabled: bool = DB_WRITER_ENABLED):
+        # commit 후에도 반환 객체 속성 접근 가능하도록 expire_on_commit=False
+        self._Session = sessionmaker(bind=bind or engine, autoflush=False, expire_on_commit=False)
+        self.flush_sec = max(flush_ms, 0.0) / 1000
+        self.max_batch = max(int(max_batch), 1)
+        self.enabled = enabled
+        self._q: "queue.Queue[Any]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._m = {
+            "submitted": 0, "completed": 0, "failed": 0, "batches": 0,
+            "last_batch_size": 0, "max_batch_size": 0, "max_queue_depth": 0,
+            "commit_ms_total": 0.0, "retried_batches": 0,
+        }
+
+    # ---------------- lifecycle ----------------
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._loop, name="db-writer", daemon=True)
+            self._thread.start()
+            logger.info("[DB_WRITER] 시작 (flush=%.0fms, max_batch=%d)", self.flush_sec * 1000, self.max_batch)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """남은 작업을 모두 commit 한 뒤 종료"""
+        t = self._thread
+        if t is None or not t.is_alive():
+            return
+        self._q.put(_STOP)
+        t.join(timeout)
+        self._thread = None
+        logger.info("[DB_WRITER] 종료: %s", self.metrics())
+
+    # ---------------- producer API ----------------
+    def submit(self, fn: WriteFn, *args, **kwargs) -> Future:
+        """fn(session, *args, **kwargs) 를 writer 스레드에서 실행 → commit 후 결과가 설정되는 Future"""
+        fut: Future = Future()
+        with self._lock:
+            self._m["submitted"] += 1
+        if not self.enabled or threading.current_thread() is self._thread:
+            self._run_inline(fut, fn, args, kwargs)
+            return fut
+        self.start()
+        self._q.put((fut, fn, args, kwargs))
+        with self._lock:
+            self._m["max_queue_depth"] = max(self._m["max_queue_depth"], self._q.qsize())
+        return fut
+
+    def call(self, fn: WriteFn, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """동기 호출: commit 될 때까지 대기 후 결과 반환 (예외는 그대로 전파)"""
+        return self.submit(fn, *args, **kwargs).result(timeout)
+
+    async def run(self, fn: WriteFn, *args, **kwargs) -> Any:
+        """async 호출: 이벤트 루프를 막지 않고 commit 결과 대기"""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            m = dict(self._m)
+        batches = m["batches"] or 1
+        m.update(
+            enabled=self.enabled,
+            running=bool(self._thread and self._thread.is_alive()),
+            queue_depth=self._q.qsize(),
+            avg_batch_size=round(m["completed"] / batches, 2) if m["batches"] else 0.0,
+            avg_commit_ms=round(m["commit_ms_total"] / batches, 2) if m["batches"] else 0.0,
+            flush_ms=self.flush_sec * 1000,
+            max_batch=self.max_batch,
+        )
+        m["commit_ms_total"] = round(m["commit_ms_total"], 1)
+        return m
+
+    # ---------------- writer thread ----------------
+    def _loop(self) -> None:
+        while True:
+            first = self._q.get()
+            if first is _STOP:
+                return
+            batch = [first]
+            stop = False
+            deadline = time.monotonic() + self.flush_sec
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._q.get(timeout=remaining) if remaining > 0 else self._q.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            self._run_batch(batch)
+            if stop:
+                return
+
+    def _run_batch(self, batch: List[Tuple[Future, WriteFn, tuple, dict]]) -> None:
+        t0 = time.perf_counter()
+        db = self._Session()
+        done: List[Tuple[Future, Any]] = []
+        try:
+            for fut, fn, args, kwargs in batch:
+                if not fut.set_running_or_notify_cancel():
+                    continue
+                job = _JobSession(db)
+                try:
+                    res = fn(job, *args, **kwargs)
+                    job._release()
+                    done.append((fut, res))
+                except Exception as e:
+                    job._discard()
+                    self._fail(fut, e)
+            db.commit()
+        except Exception as e:
+            # commit 실패 / SAVEPOINT 처리 실패: 묶음을 풀어 아직 결과가 없는 작업 전부
+            # (성공 대기 + 진행 중이던 작업 + 아직 실행 안 된 작업) 를 작업별 트랜잭션으로 재실행
+            try:
+                db.rollback()
+            except Exception:
+                pass
+            db.close()
+            rest = [b for b in batch if not b[0].done()]
+            logger.warning("[DB_WRITER] 묶음 처리 실패(%s) → 작업별 재실행 %d건", e, len(rest))
+            with self._lock:
+                self._m["retried_batches"] += 1
+            for fut, fn, args, kwargs in rest:
+                if fut.running() or fut.set_running_or_notify_cancel():
+                    self._run_single(fut, fn, args, kwargs)
+            done = []
+        finally:
+            db.close()
+        for fut, res in done:
+            fut.set_result(res)
+        with self._lock:
+            self._m["completed"] += len(done)
+            self._m["batches"] += 1
+            self._m["last_batch_size"] = len(batch)
+            self._m["max_batch_size"] = max(self._m["max_batch_size"], len(batch))
+            self._m["commit_ms_total"] += (time.perf_counter() - t0) * 1000
+
+    def _run_single(self, fut: Future, fn: WriteFn, args: tuple, kwargs: dict) -> None:
+        db = self._Session()
+        try:
+            res = fn(db, *args, **kwargs)
+            db.commit()
+        except Exception as e:
+            try:
+                db.rollback()
+            except Exception:
+                pass
+            self._fail(fut, e)
+            return
+        finally:
+            db.close()
+        fut.set_result(res)
+        with self._lock:
+            self._m["completed"] += 1
+
+    def _run_inline(self, fut: Future, fn: WriteFn, args: tuple, kwargs: dict) -> None:
+        fut.set_running_or_notify_cancel()
+        self._run_single(fut, fn, args, kwargs)
+
+    def _fail(self, fut: Future, e: BaseException) -> None:
+        with self._lock:
+            self._m["failed"] += 1
+        logger.warning("[DB_WRITER] 작업 실패: %s", e)
+        fut.set_exception(e)
+
+
+_writer: Optional[DBWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_writer() -> DBWriter:
+    """프로세스 공용 writer (첫 submit 시 스레드 시작)"""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = DBWriter()
+        return _writer
+
+
+def shutdown_writer() -> None:
+    if _writer is not None:
+        _writer.stop()
+
+
+__all__ = ["DBWriter", "get_writer", "shutdown_writer", "DB_WRITER_ENABLED"]
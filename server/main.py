@@ -8,6 +8,9 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../'
 
 from server.workflow.state import AgentType, ReviewState
 
+import logging
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
 
@@ -15,7 +18,7 @@ from fastapi import FastAPI
 from server.routers import workflow
 
 # ✅ 모델/DB 임포트 순서 정리
-from server.db.database import Base, engine
+from server.db.database import Base, engine, ensure_indexes
 # 🔑 모델을 먼저 등록 (사이드이펙트 없이 레지스트리에만 올림)
 from server.db import pm_models  # noqa: F401
 
@@ -28,12 +31,41 @@ from server.routers import history
 
 # 데이터베이스 초기화 (모델 등록/매퍼 구성 뒤에 실행)
 Base.metadata.create_all(bind=engine)
+# 기존 DB 에 없는 복합 인덱스 추가 (create_all 은 기존 테이블 인덱스를 만들지 않음)
+ensure_indexes(engine)
+
+from server.workflow.agent_registry import agent_registry
+from server.workflow.job_queue import job_manager
+from server.db.writer import shutdown_writer
+from server.utils.doc_reader import shutdown_pdf_pool
+from server.utils.llm_http import aclose_http_clients
+
+logger = logging.getLogger("server.main")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Scope/Schedule agent warm pool 을 시작 시 1회 생성 (요청마다 생성하지 않음)
+    report = await agent_registry.startup()
+    logger.info("[STARTUP] agent warm pool %.1fms: %s", report.get("elapsed_ms", 0.0),
+                {n: p.get("construct_ms") for n, p in report.get("pools", {}).items()})
+    # 비동기 job worker 시작 (재시작 전 queued 작업 복구)
+    await job_manager.start()
+    yield
+    await job_manager.stop()
+    # writer 큐에 남은 쓰기 commit 후 종료
+    shutdown_writer()
+    shutdown_pdf_pool()
+    # LLM 공유 커넥션 풀 정리
+    await aclose_http_clients()
+
 
 # FastAPI 인스턴스 생성
 app = FastAPI(
     title="PM Agent v0.9",
     description="AI PM Copilot 서비스를 위한 API",
     version="0.4.1",
+    lifespan=lifespan,
 )
 
 print(">>> AOAI_DEPLOY_GPT5O =", os.getenv("AOAI_DEPLOY_GPT4O"))
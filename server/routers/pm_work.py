@@ -1,6 +1,7 @@
 # server/routers/pm_work.py
 from typing import Dict, Any, Optional, List
-from fastapi import APIRouter, Request, HTTPException, Query, UploadFile, File, Depends, Body
+from fastapi import APIRouter, Request, HTTPException, Query, UploadFile, File, Depends, Body, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 import traceback
@@ -14,8 +15,10 @@ from server.db.database import get_db
 from server.db import pm_crud, pm_models
 from server.workflow.pm_graph import run_pipeline
 from server.workflow.meta_planner import MetaPlanner
-from server.utils.doc_reader import read_texts, ingest_text, DocReadError
-import shutil, re, time
+from server.workflow.job_queue import job_manager
+from server.utils.doc_reader import read_texts, ingest_text, resolve_path, DocReadError, EXTRACTOR_VERSIONS, warm_extraction_cache
+from server.utils import llm_cache
+import shutil, re, time, asyncio, os
 
 
 router = APIRouter(prefix="/api/v1/pm", tags=["pm"])
@@ -44,6 +47,9 @@ except Exception:
 # ✅ DOCX 확장자 추가
 ALLOWED_EXTS = {".pdf", ".txt", ".md", ".docx"}
 
+# /scope/analyze: PDF 가 포함되면 미리 전부 읽지 않고 경로를 넘겨 ScopeAgent 가 페이지 스트리밍으로 추출
+SCOPE_STREAM_DOCUMENTS = os.getenv("SCOPE_STREAM_DOCUMENTS", "1") not in ("0", "false", "False")
+
 def _safe_filename(name: str) -> str:
     """간단 슬러그화: 위험문자 -> '_', 공백 -> '_'"""
     name = name.strip().replace(" ", "_")
@@ -240,6 +246,7 @@ class CalendarModel(BaseModel):
 class ResourceModel(BaseModel):
     role: str
     capacity_pct: Optional[int] = 100
+    unavailable: Optional[List[Any]] = Field(default_factory=list, description="불가 구간 [시작, 종료] (날짜 또는 작업일 index)")
 
 
 class ScheduleRequest(BaseModel):
@@ -275,6 +282,10 @@ class ScheduleRequest(BaseModel):
     # 추가 옵션
     estimation_mode: Optional[str] = Field(default="heuristic", description="추정 모드: llm or heuristic")
 
+    # 자원 평준화 (resource_pool 의 role = 작업 assignee)
+    resource_leveling: Optional[bool] = Field(default=False, description="담당자 capacity 기준 자원 평준화")
+    leveling_priority: Optional[str] = Field(default="lst", description="우선순위 규칙: lst | lft | float | spt | order")
+
 
 class ScheduleResponse(BaseModel):
     """Schedule Agent Response"""
@@ -303,6 +314,9 @@ class ScheduleResponse(BaseModel):
     # Change Request 결과
     change_requests: Optional[Dict[str, Any]] = None
 
+    # 자원 평준화 요약
+    resource_leveling: Optional[Dict[str, Any]] = None
+
 
 # ============================================================
 # 신규: ReWOO / Meta-Planner Proposal API
@@ -344,41 +358,47 @@ class RewooRequest(BaseModel):
     scope_options: dict = {}
     schedule_options: dict = {}
 
+def _rewoo_payload(request: RewooRequest) -> Dict[str, Any]:
+    return {
+        "project_id": request.project_id,
+        "project_name": request.project_name,
+        "methodology": request.methodology,
+        "rfp_text": request.rfp_text,
+        "scope_options": request.scope_options,
+        "schedule_options": request.schedule_options,
+    }
+
+
+def _rewoo_response(result: Dict[str, Any]) -> Dict[str, Any]:
+    # Streamlit이 기대하는 summary 필드 생성
+    summary = {
+        "requirements_count": len(result["scope"].get("requirements", [])),
+        "total_cost": result["cost"].get("total_cost"),
+        "schedule_duration": result["schedule"].get("total_duration"),
+    }
+
+    return {
+        "status": "ok",
+        "summary": summary,
+        "scope": result["scope"],
+        "cost": result["cost"],
+        "schedule": result["schedule"],
+        "risk": result.get("risk"),
+        "integrator": result.get("integrator"),
+    }
+
+
 @router.post("/proposal/rewoo")
 async def proposal_rewoo(request: RewooRequest):
     """
     ReWOO Proposal Workflow (Meta-Planner 기반)
     Scope → Cost → Schedule → Risk → Integrator (선택)
+    장시간 실행되므로 UI에서는 POST /jobs/proposal/rewoo (비동기 job) 사용 권장
     """
     try:
-        payload = {
-            "project_id": request.project_id,
-            "project_name": request.project_name,
-            "methodology": request.methodology,
-            "rfp_text": request.rfp_text,
-            "scope_options": request.scope_options,
-            "schedule_options": request.schedule_options,
-        }
-
         # Meta-Planner 실행
-        result = await meta_planner.generate(payload)
-
-        # Streamlit이 기대하는 summary 필드 생성
-        summary = {
-            "requirements_count": len(result["scope"].get("requirements", [])),
-            "total_cost": result["cost"].get("total_cost"),
-            "schedule_duration": result["schedule"].get("total_duration"),
-        }
-
-        return {
-            "status": "ok",
-            "summary": summary,
-            "scope": result["scope"],
-            "cost": result["cost"],
-            "schedule": result["schedule"],
-            "risk": result.get("risk"),
-            "integrator": result.get("integrator"),
-        }
+        result = await meta_planner.generate(_rewoo_payload(request))
+        return _rewoo_response(result)
 
     except Exception as e:
         logger.exception(f"[ReWOO Proposal API] Error: {e}")
@@ -474,9 +494,97 @@ async def graph_report(project_id: int = Query(..., description="프로젝트 ID
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/llm/cache/stats")
+async def llm_cache_stats():
+    """LLM 응답 캐시 hit/miss 및 용량 통계"""
+    return {"status": "ok", "data": llm_cache.cache_stats()}
+
+
+@router.get("/llm/http/stats")
+async def llm_http_stats():
+    """LLM 공유 HTTP 커넥션 풀 설정 (HTTP/2 여부, keep-alive 한도, 루프별 풀 수)"""
+    from server.utils.llm_http import http_client_info
+    return {"status": "ok", "data": http_client_info()}
+
+
+@router.get("/llm/governor/stats")
+async def llm_governor_stats():
+    """LLM 전역 스케줄러 상태 (우선순위별 큐 길이, 대기 시간, RPM/TPM 잔량, 429 재시도 수)"""
+    from server.utils.llm_governor import governor_stats
+    return {"status": "ok", "data": governor_stats()}
+
+
+@router.get("/llm/coalesce/stats")
+async def llm_coalesce_stats():
+    """동일 LLM/임베딩 요청 병합 지표 (실제 호출 수, 절약된 호출 수, 종류별)"""
+    from server.utils.llm_coalesce import coalesce_stats
+    return {"status": "ok", "data": coalesce_stats()}
+
+
+@router.get("/llm/latency/stats")
+async def llm_latency_stats():
+    """LLM 지연 히스토그램 (deployment|prompt class 별 p50~p99, hedge 임계값) + hedge 횟수/승리 수/예산"""
+    from server.utils.config import settings
+    from server.utils.llm_hedge import hedge_stats
+    return {"status": "ok", "data": {"hedge_enabled": settings.LLM_HEDGE_ENABLED, **hedge_stats()}}
+
+
+@router.get("/llm/prompt/stats")
+async def llm_prompt_stats():
+    """PromptManager 토큰 예산 조립/로컬 압축: 누적 압축 전/후 토큰, 절약량, 최근 요청별 내역"""
+    from server.workflow.agents.scope_agent.prompt_budget import prompt_budget_stats
+    return {"status": "ok", "data": prompt_budget_stats()}
+
+
+@router.get("/db/writer/stats")
+async def db_writer_stats():
+    """단일 writer DB 큐 상태 (큐 길이, 묶음 크기, commit 시간, 실패 수)"""
+    from server.db.writer import get_writer
+    return {"status": "ok", "data": get_writer().metrics()}
+
+
+@router.get("/docs/cache/stats")
+async def doc_cache_stats():
+    """문서 텍스트 추출 캐시 상태 (hit/miss, 저장 수, 추출기 버전)"""
+    from server.utils.doc_reader import extraction_cache_stats
+    return {"status": "ok", "data": extraction_cache_stats()}
+
+
+@router.get("/db/summary/stats")
+async def action_summary_stats():
+    """action item 요약 캐시 상태 (hit/miss, 무효화 횟수, 항목 수)"""
+    from server.db.pm_summary import action_summary_cache_stats
+    return {"status": "ok", "data": action_summary_cache_stats()}
+
+
+@router.get("/agents/pool/stats")
+async def agent_pool_stats():
+    """agent warm pool 상태 (인스턴스 수, 생성 시간, 대기 횟수)"""
+    from server.workflow.agent_registry import agent_registry
+    return {"status": "ok", "data": agent_registry.stats()}
+
+
+@router.get("/rag/index/status")
+async def rag_index_status():
+    """PromptManager 템플릿/룰 벡터 인덱스 상태 (VECTOR_DIR, 마지막 동기화 결과)"""
+    from server.workflow.agents.scope_agent.prompt_index import prompt_index_status
+    return {"status": "ok", "data": prompt_index_status()}
+
+
+@router.post("/rag/index/rebuild")
+async def rag_index_rebuild(force: bool = False):
+    """templates/ rules/ 변경분 재임베딩 (force=true면 전체 재구축)"""
+    from server.workflow.agents.scope_agent.prompt_index import rebuild_prompt_index
+    report = await asyncio.to_thread(rebuild_prompt_index, force)
+    if report.get("status") == "error":
+        raise HTTPException(status_code=500, detail=report.get("error"))
+    return {"status": "ok", "data": report}
+
+
 # server/routers/pm_work.py
 @router.post("/upload/rfp")
 async def upload_rfp(
+    background_tasks: BackgroundTasks,
     project_id: str = Query(..., description="프로젝트 ID"),
     file: UploadFile = File(...)
 ):
@@ -585,6 +693,11 @@ async def upload_rfp(
             "ext": ext,
             "message": f"파일 업로드: {relative_path}"
         }
+
+        # PDF/DOCX 는 응답 후 백그라운드에서 텍스트 추출 캐시를 미리 채움 (이후 /scope/analyze 는 파싱 생략)
+        if ext in EXTRACTOR_VERSIONS:
+            background_tasks.add_task(warm_extraction_cache, str(file_path))
+            response["extraction_cache"] = "scheduled"
         
         print(f"✅ [UPLOAD] 성공반환: {relative_path}")
         logger.info(f"[UPLOAD] 성공: {relative_path}")
@@ -631,19 +744,27 @@ async def scope_analyze(request: ScopeRequest):
                 print(f"🔴 [SCOPE] 경로 없음")
                 raise HTTPException(status_code=400, detail="경로 필요")
 
-            print(f"🔵 [SCOPE] 파일읽기: {paths}")
-            merged_text, metas = read_texts(
-                paths,
-                header=True,
-                search_roots=[Path(f"data/{project_id}/inputs"), Path("data")]
-            )
-            if not merged_text.strip():
-                print(f"🔴 [SCOPE] 텍스트 없음")
-                raise HTTPException(status_code=400, detail="텍스트 없음")
-
-            print(f"🔵 [SCOPE] 텍스트길이: {len(merged_text)}")
-            payload["text"] = merged_text
-            source_label = ", ".join([Path(m.get("resolved_path") or m["path"]).name for m in metas])
+            search_roots = [Path(f"data/{project_id}/inputs"), Path("data")]
+            resolved = [resolve_path(p, search_roots=search_roots) for p in paths]
+            if SCOPE_STREAM_DOCUMENTS and all(resolved) and any(r.suffix.lower() == ".pdf" for r in resolved):
+                # 텍스트는 ScopeAgent 가 읽으면서 청크별 추출 (빈 문서는 파이프라인이 status=error 반환)
+                print(f"🔵 [SCOPE] 스트리밍 추출: {[r.name for r in resolved]}")
+                payload["documents"] = [{"path": str(r)} for r in resolved]
+                source_label = ", ".join(r.name for r in resolved)
+            else:
+                print(f"🔵 [SCOPE] 파일읽기: {paths}")
+                merged_text, metas = read_texts(
+                    paths,
+                    header=True,
+                    search_roots=search_roots
+                )
+                if not merged_text.strip():
+                    print(f"🔴 [SCOPE] 텍스트 없음")
+                    raise HTTPException(status_code=400, detail="텍스트 없음")
+
+                print(f"🔵 [SCOPE] 텍스트길이: {len(merged_text)}")
+                payload["text"] = merged_text
+                source_label = ", ".join([Path(m.get("resolved_path") or m["path"]).name for m in metas])
 
         else:
             print(f"🔴 [SCOPE] 입력 없음")
@@ -698,35 +819,15 @@ async def scope_analyze(request: ScopeRequest):
         srs_path = _write_srs_md(project_id, requirements, source_label)
         print(f"🔵 [SCOPE] srs.md 생성: {srs_path}")
 
-    if _DB_AVAILABLE and requirements:
-        db = SessionLocal()
-        saved = 0
+    # ScopeAgent 가 이미 저장한 경우(db_saved_requirements)는 다시 쓰지 않음
+    if _DB_AVAILABLE and requirements and "db_saved_requirements" not in result:
         try:
-            for i, r in enumerate(requirements, start=1):
-                req_key = r.get("req_id") or f"REQ-{i:03d}"
-                try:
-                    obj = pm_models.PM_Requirement(
-                        project_id=project_id,
-                        req_key=req_key,
-                        title=r.get("title") or "",
-                        description=r.get("description") or "",
-                        priority=r.get("priority") or "Medium",
-                        req_type=r.get("type") or "General",
-                        source_span=r.get("source_span") or source_label,
-                        created_at=datetime.utcnow()
-                    )
-                    db.add(obj)
-                    saved += 1
-                except Exception as e:
-                    logger.debug(f"[SCOPE] 스킵: {req_key}")
-                    continue
-            db.commit()
-            print(f"✅ [SCOPE] DB저장: {saved}개")
+            counts = await asyncio.to_thread(
+                pm_crud.bulk_upsert_requirements, project_id, requirements, source_doc=source_label
+            )
+            print(f"✅ [SCOPE] DB저장: 신규 {counts['inserted']}개 / 갱신 {counts['updated']}개")
         except Exception as e:
-            db.rollback()
             print(f"🔴 [SCOPE] DB오류: {e}")
-        finally:
-            db.close()
 
     response = ScopeResponse(
         status="ok",
@@ -825,6 +926,16 @@ async def schedule_analyze(request: ScheduleRequest):
         if request.change_requests:
             payload["change_requests"] = request.change_requests
 
+        # 자원 평준화
+        if request.resource_leveling:
+            from server.workflow.agents.schedule_agent.resource_leveling import PRIORITY_RULES
+            if request.leveling_priority not in PRIORITY_RULES:
+                raise ValueError(f"leveling_priority must be one of {PRIORITY_RULES}")
+            payload["resource_leveling"] = {
+                "priority": request.leveling_priority,
+                "resources": [r.model_dump() for r in request.resource_pool or []],
+            }
+
         # 2) ScheduleAgent 실행
         result = await run_pipeline("schedule", payload)
 
@@ -883,6 +994,7 @@ async def schedule_analyze(request: ScheduleRequest):
             pmp_outputs=result.get("pmp_outputs"),
             data=result.get("data"),
             change_requests=result.get("change_requests"),
+            resource_leveling=result.get("resource_leveling"),
         )
 
     except ValueError as e:
@@ -898,6 +1010,32 @@ async def schedule_analyze(request: ScheduleRequest):
 
 
 
+@router.post("/schedule/cpm")
+async def schedule_cpm(project_id: int = Query(...), persist: bool = Query(True)):
+    """
+    pm_tasks / pm_task_links(FS/SS/FF/SF + lag) 기준 CPM 재계산 → PM_Task.es/ef/ls/lf/float 일괄 반영
+    """
+    from server.workflow.agents.schedule_agent.outputs.change_mgmt import CPMEngine
+    from server.workflow.agents.schedule_agent.cpm_links import format_cycle
+
+    try:
+        cpm = await asyncio.to_thread(CPMEngine.schedule_project, project_id, persist)
+    except Exception as e:
+        logger.exception(f"[Schedule CPM] Error: {e}")
+        raise HTTPException(status_code=500, detail=f"CPM failed: {e}")
+
+    cycles = cpm.get("cycles", [])
+    return {
+        "status": "ok" if not cycles else "cycle",
+        "project_id": project_id,
+        "tasks": cpm["tasks"],
+        "updated": cpm["updated"],
+        "project_duration": cpm["project_duration"],
+        "critical_path": cpm["critical_path"],
+        "cycles": [{"path": c, "text": format_cycle(c)} for c in cycles],
+    }
+
+
 @router.get("/schedule/timeline")
 async def schedule_timeline(project_id: str = Query(..., description="프로젝트 ID")):
     """
@@ -918,6 +1056,94 @@ async def schedule_timeline(project_id: str = Query(..., description="프로젝
 # 신규: 통합 Workflow
 # ===============================
 
+def _workflow_payload(request: WorkflowRequest) -> Dict[str, Any]:
+    # Payload 구성
+    payload = {
+        "project_id": request.project_id,
+        "methodology": request.methodology or "waterfall",
+        "calendar": request.calendar.model_dump() if request.calendar else {},
+        "sprint_length_weeks": request.sprint_length_weeks or 2,
+    }
+    
+    # Text or documents
+    if request.text:
+        payload["text"] = request.text
+    elif request.documents:
+        payload["documents"] = [doc.model_dump() for doc in request.documents]
+    else:
+        raise ValueError("Either 'text' or 'documents' must be provided")
+    return payload
+
+
+def _workflow_response(request: WorkflowRequest, result: Dict[str, Any]) -> WorkflowResponse:
+    if result.get("status") != "ok":
+        raise ValueError(result.get("message", "Workflow failed"))
+    
+    # Scope 결과 파싱
+    scope_result = result.get("scope", {})
+    scope_response = ScopeResponse(
+        status=scope_result.get("status", "ok"),
+        message=scope_result.get("message"),
+        project_id=request.project_id,
+        requirements_json=scope_result.get("requirements_json"),
+        srs_path=scope_result.get("srs_path"),
+        rtm_csv=scope_result.get("rtm_csv"),
+        charter_path=scope_result.get("charter_path"),
+        business_plan_path=scope_result.get("business_plan_path"),
+        requirements=scope_result.get("requirements", []),
+        functions=scope_result.get("functions", []),
+        deliverables=scope_result.get("deliverables", []),
+        acceptance_criteria=scope_result.get("acceptance_criteria", []),
+        rtm_json=scope_result.get("rtm_json"),
+        pmp_outputs=scope_result.get("pmp_outputs"),
+        stats=scope_result.get("stats")
+    )
+    
+    # Schedule 결과 파싱
+    schedule_result = result.get("schedule", {})
+    
+    # Critical path
+    critical_path_data = schedule_result.get("_parsed_critical_path", [])
+    
+    # Timeline
+    timeline_data = []
+    if schedule_result.get("timeline") and isinstance(schedule_result["timeline"], str):
+        try:
+            timeline_path = Path(schedule_result["timeline"])
+            if timeline_path.exists():
+                timeline_content = json.loads(timeline_path.read_text(encoding="utf-8"))
+                if isinstance(timeline_content, dict) and "tasks" in timeline_content:
+                    timeline_data = timeline_content["tasks"]
+        except Exception:
+            pass
+    
+    schedule_response = ScheduleResponse(
+        status=schedule_result.get("status", "ok"),
+        message=schedule_result.get("message"),
+        project_id=request.project_id,
+        methodology=schedule_result.get("methodology", request.methodology),
+        wbs_json_path=schedule_result.get("wbs_json_path"),
+        plan_csv=schedule_result.get("plan_csv"),
+        gantt_json=schedule_result.get("gantt_json"),
+        timeline_path=schedule_result.get("timeline"),
+        burndown_json=schedule_result.get("burndown_json"),
+        critical_path=critical_path_data,
+        timeline=timeline_data,
+        pmp_outputs=schedule_result.get("pmp_outputs"),
+        data=schedule_result.get("data"),
+        change_requests=schedule_result.get("change_requests")
+    )
+    
+    return WorkflowResponse(
+        status=result.get("status", "ok"),
+        message=result.get("message", "Workflow completed successfully"),
+        project_id=request.project_id,
+        scope=scope_response,
+        schedule=schedule_response,
+        summary=result.get("summary")
+    )
+
+
 @router.post("/workflow/scope-schedule", response_model=WorkflowResponse)
 async def workflow_scope_then_schedule(request: WorkflowRequest):
     """
@@ -933,91 +1159,11 @@ async def workflow_scope_then_schedule(request: WorkflowRequest):
         }
     """
     try:
-        # Payload 구성
-        payload = {
-            "project_id": request.project_id,
-            "methodology": request.methodology or "waterfall",
-            "calendar": request.calendar.model_dump() if request.calendar else {},
-            "sprint_length_weeks": request.sprint_length_weeks or 2,
-        }
-        
-        # Text or documents
-        if request.text:
-            payload["text"] = request.text
-        elif request.documents:
-            payload["documents"] = [doc.model_dump() for doc in request.documents]
-        else:
-            raise ValueError("Either 'text' or 'documents' must be provided")
-        
+        payload = _workflow_payload(request)
+
         # Workflow 실행
         result = await run_pipeline("workflow_scope_then_schedule", payload)
-        
-        if result.get("status") != "ok":
-            raise ValueError(result.get("message", "Workflow failed"))
-        
-        # Scope 결과 파싱
-        scope_result = result.get("scope", {})
-        scope_response = ScopeResponse(
-            status=scope_result.get("status", "ok"),
-            message=scope_result.get("message"),
-            project_id=request.project_id,
-            requirements_json=scope_result.get("requirements_json"),
-            srs_path=scope_result.get("srs_path"),
-            rtm_csv=scope_result.get("rtm_csv"),
-            charter_path=scope_result.get("charter_path"),
-            business_plan_path=scope_result.get("business_plan_path"),
-            requirements=scope_result.get("requirements", []),
-            functions=scope_result.get("functions", []),
-            deliverables=scope_result.get("deliverables", []),
-            acceptance_criteria=scope_result.get("acceptance_criteria", []),
-            rtm_json=scope_result.get("rtm_json"),
-            pmp_outputs=scope_result.get("pmp_outputs"),
-            stats=scope_result.get("stats")
-        )
-        
-        # Schedule 결과 파싱
-        schedule_result = result.get("schedule", {})
-        
-        # Critical path
-        critical_path_data = schedule_result.get("_parsed_critical_path", [])
-        
-        # Timeline
-        timeline_data = []
-        if schedule_result.get("timeline") and isinstance(schedule_result["timeline"], str):
-            try:
-                timeline_path = Path(schedule_result["timeline"])
-                if timeline_path.exists():
-                    timeline_content = json.loads(timeline_path.read_text(encoding="utf-8"))
-                    if isinstance(timeline_content, dict) and "tasks" in timeline_content:
-                        timeline_data = timeline_content["tasks"]
-            except Exception:
-                pass
-        
-        schedule_response = ScheduleResponse(
-            status=schedule_result.get("status", "ok"),
-            message=schedule_result.get("message"),
-            project_id=request.project_id,
-            methodology=schedule_result.get("methodology", request.methodology),
-            wbs_json_path=schedule_result.get("wbs_json_path"),
-            plan_csv=schedule_result.get("plan_csv"),
-            gantt_json=schedule_result.get("gantt_json"),
-            timeline_path=schedule_result.get("timeline"),
-            burndown_json=schedule_result.get("burndown_json"),
-            critical_path=critical_path_data,
-            timeline=timeline_data,
-            pmp_outputs=schedule_result.get("pmp_outputs"),
-            data=schedule_result.get("data"),
-            change_requests=schedule_result.get("change_requests")
-        )
-        
-        return WorkflowResponse(
-            status=result.get("status", "ok"),
-            message=result.get("message", "Workflow completed successfully"),
-            project_id=request.project_id,
-            scope=scope_response,
-            schedule=schedule_response,
-            summary=result.get("summary")
-        )
+        return _workflow_response(request, result)
         
     except ValueError as e:
         logger.error(f"[Workflow] Validation Error: {e}")
@@ -1027,4 +1173,79 @@ async def workflow_scope_then_schedule(request: WorkflowRequest):
         raise HTTPException(
             status_code=500,
             detail=f"Workflow execution failed: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+# ===============================
+# 비동기 Job: 장시간 워크플로우 제출 → 상태 조회 / SSE 진행 스트림
+# ===============================
+
+async def _run_rewoo_job(payload: Dict[str, Any], progress) -> Dict[str, Any]:
+    request = RewooRequest(**payload)
+    result = await meta_planner.generate(_rewoo_payload(request), progress=progress)
+    return _rewoo_response(result)
+
+
+async def _run_workflow_job(payload: Dict[str, Any], progress) -> Dict[str, Any]:
+    request = WorkflowRequest(**payload)
+    result = await run_pipeline("workflow_scope_then_schedule", _workflow_payload(request), progress=progress)
+    return _workflow_response(request, result).model_dump(mode="json")
+
+
+job_manager.register("proposal_rewoo", _run_rewoo_job, steps=["scope", "cost", "schedule", "risk"])
+job_manager.register("workflow_scope_schedule", _run_workflow_job, steps=["scope", "schedule"])
+
+
+def _job_links(job_id: str) -> Dict[str, str]:
+    return {
+        "job_id": job_id,
+        "status_url": f"{router.prefix}/jobs/{job_id}",
+        "events_url": f"{router.prefix}/jobs/{job_id}/events",
+    }
+
+
+@router.post("/jobs/proposal/rewoo")
+async def submit_proposal_rewoo_job(request: RewooRequest):
+    """ReWOO Proposal 을 비동기 job 으로 제출 (즉시 job_id 반환)"""
+    job_id = await job_manager.submit("proposal_rewoo", request.model_dump(), project_id=request.project_id)
+    return {"status": "queued", **_job_links(job_id)}
+
+
+@router.post("/jobs/workflow/scope-schedule")
+async def submit_workflow_job(request: WorkflowRequest):
+    """Scope → Schedule 통합 Workflow 를 비동기 job 으로 제출 (즉시 job_id 반환)"""
+    try:
+        _workflow_payload(request)  # text/documents 누락은 제출 시점에 400
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    job_id = await job_manager.submit(
+        "workflow_scope_schedule", request.model_dump(mode="json"), project_id=request.project_id
+    )
+    return {"status": "queued", **_job_links(job_id)}
+
+
+@router.get("/jobs/stats")
+async def job_queue_stats():
+    return {"status": "ok", "data": job_manager.stats()}
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """job 상태 / 단계별 진행 / 산출물 경로 / 결과"""
+    job = await asyncio.to_thread(job_manager.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="job not found")
+    return job
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str):
+    """SSE: snapshot → step(running/done/failed) … → done"""
+    async def _gen():
+        async for ev in job_manager.events(job_id):
+            yield f"event: {ev.get('type', 'message')}\ndata: {json.dumps(ev, ensure_ascii=False, default=str)}\n\n"
+
+    return StreamingResponse(
+        _gen(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
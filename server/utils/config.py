@@ -1,12 +1,23 @@
 # server/utils/config.py  (덮어쓰기할 파일)
 import os
+import threading
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from langchain_openai import AzureChatOpenAI, AzureOpenAIEmbeddings
 
+from server.utils.llm_cache import CachedLLM, get_llm_cache
+from server.utils.llm_http import get_async_http_client, get_sync_http_client
+from server.utils.llm_governor import GovernedLLM, get_governor
+from server.utils.llm_coalesce import CoalescedEmbeddings, CoalescedLLM, get_singleflight
+from server.utils.llm_hedge import HedgedLLM, get_latency_tracker
+
 # .env 파일에서 환경 변수 로드
 load_dotenv()
 
+# 프로세스 공용 LLM/Embeddings 클라이언트 (LLM_SHARED_CLIENT)
+_SHARED: dict = {}
+_SHARED_LOCK = threading.Lock()
+
 
 class Settings(BaseSettings):
     # Azure OpenAI 설정
@@ -37,28 +48,101 @@ class Settings(BaseSettings):
     # Standard DATABASE_URL (예: sqlite:///./pm_agent.db)
 #    DATABASE_URL: str = "sqlite:///./pm_agent.db" 수정할것!!!
     DATABASE_URL: str = "sqlite:///./history.db"
+
+    # SQLite 성능 프로파일 (server/db/database.py, 연결마다 PRAGMA 적용)
+    DB_SQLITE_WAL: bool = True
+    DB_SQLITE_SYNCHRONOUS: str = "NORMAL"
+    DB_SQLITE_CACHE_SIZE_KB: int = 64 * 1024
+    DB_SQLITE_MMAP_SIZE_MB: int = 256
+    DB_SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    DB_POOL_SIZE: int = 8
+    DB_MAX_OVERFLOW: int = 8
+    DB_POOL_TIMEOUT_SEC: int = 30
+
+    # LLM 응답 캐시 (server/utils/llm_cache.py)
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_PATH: str = "data/cache/llm_cache.sqlite3"
+    LLM_CACHE_TTL_SEC: int = 7 * 24 * 3600
+    LLM_CACHE_MAX_ENTRIES: int = 5000
+
+    # LLM 클라이언트 공유 (프로세스당 1개 → HTTP 커넥션 풀 재사용)
+    LLM_SHARED_CLIENT: bool = True
+    # 공유 httpx 커넥션 풀 주입 (keep-alive/HTTP2, ainvoke 네이티브 async 경로) → server/utils/llm_http.py
+    LLM_HTTP_POOL: bool = True
+    # invoke/ainvoke 내부 토큰 스트리밍. 토큰 단위 소비처가 없고(graph.stream 은 updates 모드),
+    # SDK 스트림은 [DONE] 에서 응답을 닫아 keep-alive 커넥션이 재사용되지 않으므로 기본 off
+    # (llm.stream()/astream() 은 이 값과 무관하게 동작)
+    LLM_STREAMING: bool = False
+    # 전역 RPM/TPM 스케줄러 + 429 백오프 (server/utils/llm_governor.py, 한도는 LLM_GOV_* env)
+    LLM_GOVERNOR_ENABLED: bool = True
+    # 동일 요청 in-flight 병합 (server/utils/llm_coalesce.py, 캐시 on/off 와 무관)
+    LLM_COALESCE_ENABLED: bool = True
+    # 지연 히스토그램은 항상 기록, 느린 요청 hedge(중복 요청)는 옵션 (server/utils/llm_hedge.py, LLM_HEDGE_* env)
+    LLM_HEDGE_ENABLED: bool = False
+
     # Pydantic 설정: .env 읽기, 대/소문자 구분, extra 허용(안전)
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=True, extra="ignore")
 
     def get_llm(self):
-        """Azure OpenAI LLM 인스턴스를 반환합니다."""
-        return AzureChatOpenAI(
+        """Azure OpenAI LLM 인스턴스를 반환합니다.
+        LLM_SHARED_CLIENT 시 프로세스 공용 인스턴스를 재사용하고, LLM_GOVERNOR_ENABLED 시 전역 스케줄러, LLM_COALESCE_ENABLED 시 동일 요청 병합, LLM_HEDGE_ENABLED 시 느린 요청 hedge,
+        LLM_CACHE_ENABLED 시 응답 캐시로 래핑합니다 (CachedLLM → CoalescedLLM → HedgedLLM → GovernedLLM → AzureChatOpenAI)."""
+        if self.LLM_SHARED_CLIENT:
+            with _SHARED_LOCK:
+                if "llm" not in _SHARED:
+                    _SHARED["llm"] = self._build_llm()
+                return _SHARED["llm"]
+        return self._build_llm()
+
+    def _http_clients(self) -> dict:
+        if not self.LLM_HTTP_POOL:
+            return {}
+        return {"http_client": get_sync_http_client(), "http_async_client": get_async_http_client()}
+
+    def _build_llm(self):
+        llm = AzureChatOpenAI(
             openai_api_key=self.AOAI_API_KEY,
             azure_endpoint=self.AOAI_ENDPOINT,
             azure_deployment=self.AOAI_DEPLOY_GPT4O,
             api_version=self.AOAI_API_VERSION,
             # temperature=0.7,
-            streaming=True,  # 스트리밍 활성화
+            streaming=self.LLM_STREAMING,
+            # governor 사용 시 429 재시도는 governor 가 전담 (SDK 자체 재시도와 중복 방지)
+            **({"max_retries": 0} if self.LLM_GOVERNOR_ENABLED else {}),
+            **self._http_clients(),
+        )
+        if self.LLM_GOVERNOR_ENABLED:
+            llm = GovernedLLM(llm, get_governor())
+        llm = HedgedLLM(llm, get_latency_tracker(), enabled=self.LLM_HEDGE_ENABLED)
+        if self.LLM_COALESCE_ENABLED:
+            llm = CoalescedLLM(llm, get_singleflight())
+        if not self.LLM_CACHE_ENABLED:
+            return llm
+        cache = get_llm_cache(
+            self.LLM_CACHE_PATH,
+            ttl_sec=self.LLM_CACHE_TTL_SEC,
+            max_entries=self.LLM_CACHE_MAX_ENTRIES,
         )
+        return CachedLLM(llm, cache)
 
     def get_embeddings(self):
-        """Azure OpenAI Embeddings 인스턴스를 반환합니다."""
-        return AzureOpenAIEmbeddings(
+        """Azure OpenAI Embeddings 인스턴스를 반환합니다. (LLM_SHARED_CLIENT 시 공용 인스턴스, LLM_COALESCE_ENABLED 시 동일 요청 병합)"""
+        if self.LLM_SHARED_CLIENT:
+            with _SHARED_LOCK:
+                if "embeddings" not in _SHARED:
+                    _SHARED["embeddings"] = self._build_embeddings()
+                return _SHARED["embeddings"]
+        return self._build_embeddings()
+
+    def _build_embeddings(self):
+        emb = AzureOpenAIEmbeddings(
             model=self.AOAI_EMBEDDING_DEPLOYMENT,
             openai_api_version=self.AOAI_API_VERSION,
             api_key=self.AOAI_API_KEY,
             azure_endpoint=self.AOAI_ENDPOINT,
+            **self._http_clients(),
         )
+        return CoalescedEmbeddings(emb, get_singleflight()) if self.LLM_COALESCE_ENABLED else emb
 
 
 # 설정 인스턴스 생성
@@ -1,8 +1,37 @@
 # server/utils/doc_reader.py
 from __future__ import annotations
 from pathlib import Path
-from typing import Optional, Tuple, List, Union
+from typing import Any, Dict, Iterator, Optional, Tuple, List, Union
+import hashlib
+import json
+import logging
 import mimetypes
+import os
+import threading
+import time
+
+logger = logging.getLogger("doc.reader")
+
+# 추출 결과 캐시 (content-addressed: 파일 sha256 + 추출기 버전)
+DOC_CACHE_ENABLED = os.getenv("DOC_CACHE_ENABLED", "1") not in ("0", "false", "False")
+DOC_CACHE_DIR = Path(os.getenv("DOC_CACHE_DIR", "data/cache/extract"))
+
+# 추출 로직이 바뀌면 해당 형식의 버전을 올린다 → 이전 캐시는 자동으로 무시됨
+EXTRACTOR_VERSIONS = {".pdf": "pdf-2", ".docx": "docx-2"}
+
+# PDF 페이지 구간 병렬 추출 (프로세스 풀). 작은 PDF 는 풀 없이 현재 프로세스에서 순차 처리
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "64"))
+PDF_MIN_SLICE_PAGES = int(os.getenv("PDF_MIN_SLICE_PAGES", "16"))
+
+# DOCX 스트리밍 추출기 (lxml iterparse, 문서 순서 유지 + 메모리 평탄). 실패 시 python-docx 경로로 폴백
+DOCX_STREAMING = os.getenv("DOCX_STREAMING", "1") not in ("0", "false", "False")
+try:
+    from server.utils.docx_stream import iter_docx_lines
+    _DOCX_STREAM_AVAILABLE = True
+except Exception:  # lxml 미설치
+    iter_docx_lines = None
+    _DOCX_STREAM_AVAILABLE = False
 
 # --------------------------------------
 # Exceptions
@@ -48,53 +77,182 @@ def _read_text_utf8(p: Path) -> str:
     except UnicodeDecodeError:
         return p.read_bytes().decode("utf-8", errors="ignore")
 
-def _read_pdf_text(p: Path) -> Tuple[str, str]:
-    """
-    PDF 텍스트 추출 (다중 폴백). (text, extractor_name) 반환.
-    폴백 순서는 PyMuPDF -> pypdf -> pdfplumber.
-    """
-    # 1) PyMuPDF
+# PDF 페이지 처리 순서 (페이지 단위 폴백: 앞 추출기가 빈 페이지만 다음 추출기로)
+PDF_EXTRACTORS = ("PyMuPDF", "pypdf", "pdfplumber")
+
+
+def _pdf_page_count(path: str) -> int:
     try:
         import fitz  # PyMuPDF
-        chunks = []
-        with fitz.open(p) as doc:
-            for page in doc:
-                chunks.append(page.get_text("text") or page.get_text() or "")
-        txt = "\n".join(chunks).strip()
-        if txt:
-            return txt, "PyMuPDF"
+        with fitz.open(path) as doc:
+            return doc.page_count
     except Exception:
         pass
-
-    # 2) pypdf
     try:
         from pypdf import PdfReader
-        reader = PdfReader(str(p))
-        txt = "\n".join(page.extract_text() or "" for page in reader.pages).strip()
-        if txt:
-            return txt, "pypdf"
+        return len(PdfReader(path).pages)
     except Exception:
         pass
-
-    # 3) pdfplumber
     try:
         import pdfplumber
-        with pdfplumber.open(str(p)) as pdf:
-            txt = "\n".join(page.extract_text() or "" for page in pdf.pages).strip()
-        if txt:
-            return txt, "pdfplumber"
+        with pdfplumber.open(path) as pdf:
+            return len(pdf.pages)
     except Exception:
-        pass
+        return 0
+
+
+def _pdf_try_pages(name: str, path: str, pages: List[int]) -> Dict[int, str]:
+    """추출기 하나로 지정 페이지들만 추출 → {page_index: text} (추출기 자체 실패 시 빈 dict)"""
+    out: Dict[int, str] = {}
+    try:
+        if name == "PyMuPDF":
+            import fitz
+            with fitz.open(path) as doc:
+                for i in pages:
+                    page = doc.load_page(i)
+                    out[i] = page.get_text("text") or page.get_text() or ""
+        elif name == "pypdf":
+            from pypdf import PdfReader
+            reader = PdfReader(path)
+            for i in pages:
+                out[i] = reader.pages[i].extract_text() or ""
+        elif name == "pdfplumber":
+            import pdfplumber
+            with pdfplumber.open(path) as pdf:
+                for i in pages:
+                    out[i] = pdf.pages[i].extract_text() or ""
+    except Exception as e:
+        logger.debug("[PDF] %s 실패 (%s, pages=%d): %s", name, Path(path).name, len(pages), e)
+    return out
 
-    return "", "none"
+
+def _pdf_extract_pages(path: str, start: int, end: int) -> List[Tuple[int, str, str]]:
+    """
+    [start, end) 페이지 구간 추출 (프로세스 풀 워커에서도 실행: 워커마다 파일을 직접 연다)
+    반환: [(page_index, text, extractor_name)] — 모든 추출기가 비면 ("", "none")
+    """
+    pending = list(range(start, end))
+    got: Dict[int, Tuple[str, str]] = {}
+    for name in PDF_EXTRACTORS:
+        if not pending:
+            break
+        res = _pdf_try_pages(name, path, pending)
+        for i, txt in res.items():
+            if txt.strip():
+                got[i] = (txt, name)
+        pending = [i for i in pending if i not in got]
+    return [(i, *got.get(i, ("", "none"))) for i in range(start, end)]
+
+
+_pdf_pool = None
+_pdf_pool_lock = threading.Lock()
+
+
+def _get_pdf_pool(workers: int):
+    """페이지 구간 추출용 프로세스 풀 (첫 사용 시 생성 후 재사용, spawn: writer 등 스레드와 fork 충돌 방지)"""
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            import multiprocessing as mp
+            from concurrent.futures import ProcessPoolExecutor
+            _pdf_pool = ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn"))
+            logger.info("[PDF] 페이지 추출 프로세스 풀 생성: workers=%d", workers)
+        return _pdf_pool
+
+
+def shutdown_pdf_pool() -> None:
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is not None:
+            _pdf_pool.shutdown(wait=False, cancel_futures=True)
+            _pdf_pool = None
+
+
+def iter_pdf_pages(path: Union[str, Path], workers: Optional[int] = None,
+                   slice_pages: Optional[int] = None) -> Iterator[Tuple[int, str, str]]:
+    """
+    PDF 페이지 generator: (page_index, text, extractor_name) 를 페이지 순서대로 yield
+    - PDF_PARALLEL_MIN_PAGES 이상이면 페이지 구간을 프로세스 풀에 나눠 제출하고,
+      앞 구간이 끝나는 대로 바로 내보낸다 (뒤 페이지 파싱을 기다리지 않음)
+    - 페이지별 폴백: PyMuPDF 결과가 빈 페이지만 pypdf → pdfplumber 로 재시도
+    """
+    path = str(path)
+    n = _pdf_page_count(path)
+    if n <= 0:
+        return
+    workers = max(int(workers or PDF_WORKERS), 1)
+    if not slice_pages:
+        # 워커당 2구간 이상 → 첫 구간이 빨리 끝나고 부하도 고르게
+        slice_pages = max(PDF_MIN_SLICE_PAGES, -(-n // (workers * 2)))
+    ranges = [(s, min(s + slice_pages, n)) for s in range(0, n, slice_pages)]
+
+    if workers == 1 or n < PDF_PARALLEL_MIN_PAGES or len(ranges) == 1:
+        for s, e in ranges:
+            yield from _pdf_extract_pages(path, s, e)
+        return
+
+    futures = [_get_pdf_pool(workers).submit(_pdf_extract_pages, path, s, e) for s, e in ranges]
+    try:
+        for (s, e), fut in zip(ranges, futures):
+            try:
+                pages = fut.result()
+            except Exception as ex:
+                # 워커 비정상 종료 등 → 해당 구간만 현재 프로세스에서 재시도
+                logger.warning("[PDF] 구간 %d-%d 워커 실패 → 직접 추출: %s", s, e, ex)
+                pages = _pdf_extract_pages(path, s, e)
+            yield from pages
+    finally:
+        for fut in futures:
+            fut.cancel()
+
+
+def _pdf_extractor_label(names: List[str]) -> str:
+    used = [x for x in PDF_EXTRACTORS if x in names]
+    return "+".join(used) if used else "none"
+
+
+def _read_pdf_text(p: Path) -> Tuple[str, str]:
+    """
+    PDF 텍스트 추출 (페이지 구간 병렬 + 페이지 단위 폴백). (text, extractor_name) 반환.
+    extractor_name 은 실제 사용된 추출기 조합 (예: "PyMuPDF", "PyMuPDF+pypdf")
+    """
+    chunks: List[str] = []
+    names: List[str] = []
+    for _, txt, name in iter_pdf_pages(p):
+        chunks.append(txt)
+        names.append(name)
+    txt = "\n".join(chunks).strip()
+    if not txt:
+        return "", "none"
+    return txt, _pdf_extractor_label(names)
 
 def _read_docx_text(p: Path) -> str:
+    return _read_docx_text_ex(p)[0]
+
+
+def _read_docx_text_ex(p: Path) -> Tuple[str, str]:
+    """
+    DOCX 추출 → (text, extractor_name)
+    스트리밍 추출기(lxml-stream) 우선, 예외/빈 결과면 python-docx 경로(_read_docx_text_dom)
+    """
+    if DOCX_STREAMING and _DOCX_STREAM_AVAILABLE:
+        try:
+            text = "\n".join(iter_docx_lines(p)).strip()
+            if text:
+                return text, "lxml-stream"
+        except Exception as e:
+            logger.warning("[DOCX] 스트리밍 추출 실패 → python-docx 폴백: %s (%s)", p.name, e)
+    return _read_docx_text_dom(p)
+
+
+def _read_docx_text_dom(p: Path) -> Tuple[str, str]:
     """
-    DOCX 문서에서:
+    python-docx 전체 DOM 경로. DOCX 문서에서:
       - 본문 문단(글머리표 감지)
       - 표(마크다운 테이블로 변환)
       - 1번째 섹션 헤더/푸터
     까지 텍스트화. 내용이 비어있으면 docx2txt fallback 시도.
+    (text, extractor_name) 반환.
     """
     try:
         import docx  # pip install python-docx
@@ -152,19 +310,21 @@ def _read_docx_text(p: Path) -> str:
             pass
 
         text = "\n".join(lines).strip()
+        extractor = "python-docx"
 
         # 내용이 여전히 비어있다면 docx2txt로 보조 시도
         if not text:
             try:
                 import docx2txt  # pip install docx2txt (선택)
                 text = (docx2txt.process(str(p)) or "").strip()
+                extractor = "docx2txt"
             except Exception:
                 pass
 
         if not text:
             raise DocReadError("DOCX에서 텍스트를 추출하지 못했습니다. (문단/표가 비어있거나 특수 구조)")
 
-        return text
+        return text, extractor
 
     except DocReadError:
         raise
@@ -172,37 +332,219 @@ def _read_docx_text(p: Path) -> str:
         raise DocReadError(f"DOCX 추출 오류: {e}")
 
 
-def read_text_from_path(path_str: str) -> str:
-    """단일 파일에서 텍스트 추출 (PDF, DOCX, TXT 등 지원)"""
-    p = Path(path_str)
-    if not p.exists() or not p.is_file():
-        raise DocReadError(f"파일이 존재하지 않습니다: {path_str}")
+# --------------------------------------
+# Extraction cache
+# --------------------------------------
+_hash_memo: Dict[Tuple[str, int, int], str] = {}   # (경로, mtime_ns, size) → sha256 (재해시 생략)
+_key_locks: Dict[str, threading.Lock] = {}         # 같은 파일 동시 추출 방지 (업로드 직후 warm + analyze)
+_cache_lock = threading.Lock()
+_cache_stats = {"hits": 0, "misses": 0, "writes": 0, "errors": 0}
+
+
+def file_sha256(p: Path) -> str:
+    """파일 sha256 (경로/mtime/size 가 같으면 메모리 메모 사용)"""
+    st = p.stat()
+    memo_key = (str(p), st.st_mtime_ns, st.st_size)
+    with _cache_lock:
+        h = _hash_memo.get(memo_key)
+    if h:
+        return h
+    hasher = hashlib.sha256()
+    with p.open("rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            hasher.update(chunk)
+    h = hasher.hexdigest()
+    with _cache_lock:
+        if len(_hash_memo) > 4096:
+            _hash_memo.clear()
+        _hash_memo[memo_key] = h
+    return h
+
+
+def _cache_file(sha: str, version: str) -> Path:
+    return DOC_CACHE_DIR / sha[:2] / f"{sha}.{version}.json"
+
+
+def _cache_get(sha: str, version: str) -> Optional[Dict[str, Any]]:
+    f = _cache_file(sha, version)
+    try:
+        with f.open("r", encoding="utf-8") as fh:
+            entry = json.load(fh)
+        if isinstance(entry, dict) and isinstance(entry.get("text"), str):
+            return entry
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning("[DOC_CACHE] 손상된 캐시 무시: %s (%s)", f, e)
+    return None
+
+
+def _cache_put(sha: str, version: str, entry: Dict[str, Any]) -> None:
+    f = _cache_file(sha, version)
+    try:
+        f.parent.mkdir(parents=True, exist_ok=True)
+        tmp = f.with_name(f"{f.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, f)  # 원자적 교체 (동시 writer 안전)
+        with _cache_lock:
+            _cache_stats["writes"] += 1
+    except Exception as e:
+        with _cache_lock:
+            _cache_stats["errors"] += 1
+        logger.warning("[DOC_CACHE] 저장 실패: %s (%s)", f, e)
+
 
+def _extract_uncached(p: Path) -> Tuple[str, str]:
+    """형식별 추출 → (text, extractor_name)"""
     suf = p.suffix.lower()
-    
+
     # 텍스트 파일들
     if suf in {".txt", ".md", ".csv", ".tsv", ".log", ".rst"}:
-        return _read_text_utf8(p)
+        return _read_text_utf8(p), "text"
 
     # PDF
     if suf == ".pdf":
         text, extractor = _read_pdf_text(p)
         if not text:
             raise DocReadError("PDF에서 텍스트를 추출하지 못했습니다.")
-        return text
+        return text, extractor
 
     # DOCX
     if suf == ".docx":
-        return _read_docx_text(p)
+        return _read_docx_text_ex(p)
 
     # MIME 타입 기반 텍스트 파일
     mime, _ = mimetypes.guess_type(str(p))
     if mime and mime.startswith("text/"):
-        return _read_text_utf8(p)
+        return _read_text_utf8(p), "text"
 
     raise DocReadError(f"지원하지 않는 파일 형식입니다: {p.suffix}")
 
 
+def extract_text(path_str: Union[str, Path], use_cache: bool = True) -> Tuple[str, Dict[str, Any]]:
+    """
+    단일 파일 텍스트 추출 + 메타 (extractor, sha256, cache_hit, extract_ms = 실제 파싱 소요 시간)
+    - PDF/DOCX 는 sha256 + EXTRACTOR_VERSIONS 키로 DOC_CACHE_DIR 에 캐시 (같은 내용이면 경로/파일명이 달라도 hit)
+    - 텍스트 파일은 파싱 비용이 없어 캐시하지 않음
+    """
+    p = Path(path_str)
+    if not p.exists() or not p.is_file():
+        raise DocReadError(f"파일이 존재하지 않습니다: {path_str}")
+
+    version = EXTRACTOR_VERSIONS.get(p.suffix.lower())
+    if not (use_cache and DOC_CACHE_ENABLED and version):
+        t0 = time.perf_counter()
+        text, extractor = _extract_uncached(p)
+        return text, {"extractor": extractor, "cache_hit": False,
+                      "extract_ms": round((time.perf_counter() - t0) * 1000, 1)}
+
+    sha = file_sha256(p)
+    with _cache_lock:
+        lock = _key_locks.setdefault(f"{sha}.{version}", threading.Lock())
+
+    with lock:
+        entry = _cache_get(sha, version)
+        if entry is not None:
+            with _cache_lock:
+                _cache_stats["hits"] += 1
+            return entry["text"], {"extractor": entry.get("extractor"), "extractor_version": version,
+                                   "sha256": sha, "cache_hit": True,
+                                   "extract_ms": entry.get("extract_ms")}
+
+        with _cache_lock:
+            _cache_stats["misses"] += 1
+        t0 = time.perf_counter()
+        text, extractor = _extract_uncached(p)
+        elapsed_ms = round((time.perf_counter() - t0) * 1000, 1)
+        _cache_put(sha, version, {
+            "text": text,
+            "extractor": extractor,
+            "extractor_version": version,
+            "sha256": sha,
+            "source_name": p.name,
+            "size": p.stat().st_size,
+            "extract_ms": elapsed_ms,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        })
+        logger.info("[DOC_CACHE] 추출 저장: %s (%s, %.0fms, %d chars)", p.name, extractor, elapsed_ms, len(text))
+
+    with _cache_lock:
+        _key_locks.pop(f"{sha}.{version}", None)
+    return text, {"extractor": extractor, "extractor_version": version, "sha256": sha,
+                  "cache_hit": False, "extract_ms": elapsed_ms}
+
+
+def iter_text_segments(path_str: Union[str, Path], use_cache: bool = True) -> Iterator[str]:
+    """
+    파일 텍스트를 앞부분부터 조각 단위로 yield ("\n" 으로 이으면 extract_text 결과와 동일)
+    - 추출 캐시 hit: 전체 텍스트 1조각
+    - PDF: 페이지 단위 (iter_pdf_pages) → 청커가 마지막 페이지 파싱 전에 시작 가능, 끝까지 소비되면 캐시 저장
+    - 그 외 형식: extract_text 결과 1조각
+    """
+    p = Path(path_str)
+    if p.suffix.lower() != ".pdf":
+        yield extract_text(p, use_cache=use_cache)[0]
+        return
+    if not p.exists() or not p.is_file():
+        raise DocReadError(f"파일이 존재하지 않습니다: {path_str}")
+
+    version = EXTRACTOR_VERSIONS[".pdf"]
+    cacheable = use_cache and DOC_CACHE_ENABLED
+    sha = file_sha256(p) if cacheable else None
+    if cacheable:
+        entry = _cache_get(sha, version)
+        if entry is not None:
+            with _cache_lock:
+                _cache_stats["hits"] += 1
+            yield entry["text"]
+            return
+        with _cache_lock:
+            _cache_stats["misses"] += 1
+
+    t0 = time.perf_counter()
+    parts: List[str] = []
+    names: List[str] = []
+    for _, txt, name in iter_pdf_pages(p):
+        parts.append(txt)
+        names.append(name)
+        yield txt
+    text = "\n".join(parts).strip()
+    if not text:
+        raise DocReadError("PDF에서 텍스트를 추출하지 못했습니다.")
+    if cacheable:
+        _cache_put(sha, version, {
+            "text": text,
+            "extractor": _pdf_extractor_label(names),
+            "extractor_version": version,
+            "sha256": sha,
+            "source_name": p.name,
+            "size": p.stat().st_size,
+            "extract_ms": round((time.perf_counter() - t0) * 1000, 1),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        })
+
+
+def warm_extraction_cache(path_str: Union[str, Path]) -> Dict[str, Any]:
+    """업로드 직후 백그라운드에서 호출: 추출 캐시 미리 채우기 (실패는 로그만)"""
+    try:
+        text, meta = extract_text(path_str)
+        return {"ok": True, "chars": len(text), **meta}
+    except Exception as e:
+        logger.warning("[DOC_CACHE] warm 실패: %s (%s)", path_str, e)
+        return {"ok": False, "error": str(e)}
+
+
+def extraction_cache_stats() -> Dict[str, Any]:
+    with _cache_lock:
+        return {**_cache_stats, "enabled": DOC_CACHE_ENABLED, "dir": str(DOC_CACHE_DIR),
+                "versions": dict(EXTRACTOR_VERSIONS)}
+
+
+def read_text_from_path(path_str: str) -> str:
+    """단일 파일에서 텍스트 추출 (PDF, DOCX, TXT 등 지원, PDF/DOCX 는 추출 캐시 사용)"""
+    return extract_text(path_str)[0]
+
+
 def read_texts(
     paths: list[str], 
     header: bool = True,
@@ -230,8 +572,8 @@ def read_texts(
         if not resolved:
             raise DocReadError(f"파일을 찾을 수 없습니다: {path}")
         
-        # 텍스트 추출
-        text = read_text_from_path(str(resolved))
+        # 텍스트 추출 (캐시)
+        text, info = extract_text(str(resolved))
         
         # 병합
         if header:
@@ -248,7 +590,8 @@ def read_texts(
         metas.append({
             "path": path,
             "resolved_path": str(resolved),
-            "size": size
+            "size": size,
+            **info,
         })
     
     return ("\n".join(merged)).strip(), metas
@@ -308,6 +651,13 @@ __all__ = [
     "DocReadError",
     "resolve_path",
     "read_text_from_path",
+    "extract_text",
+    "iter_text_segments",
+    "iter_pdf_pages",
+    "shutdown_pdf_pool",
+    "warm_extraction_cache",
+    "extraction_cache_stats",
+    "file_sha256",
     "read_texts",
     "ingest_text",
 ]
\ No newline at end of file
@@ -0,0 +1,257 @@
+# server/utils/docx_stream.py
+"""
+스트리밍 DOCX 텍스트 추출 (lxml iterparse)
+
+- word/document.xml 을 iterparse 로 순회하며 문단/표를 "문서 순서대로" 한 줄씩 yield
+- 처리한 body 자식 요소는 즉시 clear + 이전 형제 삭제 → 문서 크기와 무관하게 메모리 평탄
+- 출력 형식은 python-docx 경로(doc_reader._read_docx_text_dom)와 동일
+  · 목록 스타일(List/Bulleted/Numbered) 문단 → "- " 접두
+  · 표 → "### Table N" + 마크다운 테이블 (가로 병합은 칸 반복, 세로 병합은 위 칸 텍스트 반복)
+  · 1번째 섹션 기본 헤더/푸터 → "[Header] ..." (맨 앞) / "[Footer] ..." (맨 뒤)
+- 차이: 표 안의 중첩 표/텍스트박스 문단도 포함, mc:Fallback(VML 중복본)은 제외
+"""
+from __future__ import annotations
+
+import posixpath
+import re
+import zipfile
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from lxml import etree
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+MC_NS = "http://schemas.openxmlformats.org/markup-compatibility/2006"
+PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+
+def _w(tag: str) -> str:
+    return f"{{{W_NS}}}{tag}"
+
+
+W_BODY, W_P, W_TBL, W_TR, W_TC = _w("body"), _w("p"), _w("tbl"), _w("tr"), _w("tc")
+W_T, W_TAB, W_BR, W_CR = _w("t"), _w("tab"), _w("br"), _w("cr")
+W_PPR, W_PSTYLE, W_TCPR, W_GRIDSPAN, W_VMERGE = _w("pPr"), _w("pStyle"), _w("tcPr"), _w("gridSpan"), _w("vMerge")
+W_VAL = _w("val")
+MC_FALLBACK = f"{{{MC_NS}}}Fallback"
+
+_LIST_STYLE_KEYS = ("List", "Bulleted", "Numbered")
+_TEXT_TAGS = {W_T: None, W_TAB: "\t", W_BR: "\n", W_CR: "\n"}
+
+
+# ---------------- 보조 파트 (styles / rels / header·footer) ----------------
+def _paragraph_styles(zf: zipfile.ZipFile) -> Tuple[Dict[str, str], str]:
+    """styleId → 스타일 이름, 기본 문단 스타일 이름"""
+    try:
+        root = etree.fromstring(zf.read("word/styles.xml"))
+    except KeyError:
+        return {}, "Normal"
+    names: Dict[str, str] = {}
+    default = "Normal"
+    for st in root.iter(_w("style")):
+        if st.get(_w("type")) != "paragraph":
+            continue
+        sid = st.get(_w("styleId")) or ""
+        name_el = st.find(_w("name"))
+        name = name_el.get(W_VAL) if name_el is not None else sid
+        names[sid] = name
+        if st.get(_w("default")) in ("1", "true", "on"):
+            default = name
+    return names, default
+
+
+def _document_rels(zf: zipfile.ZipFile) -> Dict[str, str]:
+    try:
+        root = etree.fromstring(zf.read("word/_rels/document.xml.rels"))
+    except KeyError:
+        return {}
+    out = {}
+    for rel in root.iter(f"{{{PKG_REL_NS}}}Relationship"):
+        target = rel.get("Target") or ""
+        if rel.get("TargetMode") == "External":
+            continue
+        out[rel.get("Id")] = posixpath.normpath(posixpath.join("word", target)) if not target.startswith("/") else target[1:]
+    return out
+
+
+_SECTPR_END = b"</w:sectPr>"
+_SECTPR_START_RE = re.compile(rb"<w:sectPr[\s>]")
+_HDR_REF_RE = re.compile(rb"<w:(header|footer)Reference\b([^>]*)/?>")
+_ATTR_RE = re.compile(rb'([\w:]+)="([^"]*)"')
+
+
+def _first_section_refs(zf: zipfile.ZipFile, chunk_size: int = 1 << 20) -> Dict[str, str]:
+    """
+    1번째 sectPr 의 기본(default) header/footer r:id (python-docx sections[0] 과 동일)
+    헤더를 본문보다 먼저 내보내기 위해 첫 </w:sectPr> 까지 바이트 단위로만 읽는다 (XML 파싱 없음).
+    """
+    buf = b""
+    with zf.open("word/document.xml") as fh:
+        while True:
+            chunk = fh.read(chunk_size)
+            if not chunk:
+                return {}
+            buf += chunk
+            end = buf.find(_SECTPR_END)
+            starts = [m.start() for m in _SECTPR_START_RE.finditer(buf, 0, end if end >= 0 else len(buf))]
+            if end < 0:
+                # 열린 sectPr 이후만 유지 (없으면 태그가 청크 경계에 걸릴 만큼만)
+                buf = buf[starts[-1]:] if starts else buf[-16:]
+                continue
+            sect = buf[starts[-1] if starts else 0:end]
+            refs: Dict[str, str] = {}
+            for kind, attrs in _HDR_REF_RE.findall(sect):
+                a = dict(_ATTR_RE.findall(attrs))
+                if a.get(b"w:type", b"default") == b"default" and b"r:id" in a:
+                    refs[kind.decode()] = a[b"r:id"].decode()
+            return refs
+
+
+def _part_paragraph_text(zf: zipfile.ZipFile, name: Optional[str]) -> str:
+    """header/footer 파트의 최상위 문단 텍스트 (빈 문단 제외, 줄바꿈 결합)"""
+    if not name:
+        return ""
+    try:
+        root = etree.fromstring(zf.read(name))
+    except KeyError:
+        return ""
+    texts = [_paragraph_text(p).strip() for p in root.iterchildren(W_P)]
+    return "\n".join(t for t in texts if t)
+
+
+# ---------------- 본문 ----------------
+def _paragraph_text(p) -> str:
+    parts: List[str] = []
+    for el in p.iter(*_TEXT_TAGS):
+        rep = _TEXT_TAGS[el.tag]
+        parts.append(el.text or "" if rep is None else rep)
+    return "".join(parts)
+
+
+def _cell_props(tc) -> Tuple[int, bool]:
+    """(gridSpan, 세로 병합 continue 여부)"""
+    span, cont = 1, False
+    tcpr = tc.find(W_TCPR)
+    if tcpr is not None:
+        gs = tcpr.find(W_GRIDSPAN)
+        if gs is not None:
+            try:
+                span = max(int(gs.get(W_VAL) or 1), 1)
+            except ValueError:
+                span = 1
+        vm = tcpr.find(W_VMERGE)
+        if vm is not None and (vm.get(W_VAL) or "continue") == "continue":
+            cont = True
+    return span, cont
+
+
+def _table_lines(rows: List[List[str]], index: int) -> Iterator[str]:
+    yield ""  # 표 앞 빈 줄
+    yield f"### Table {index}"
+    headers = [c or f"col{ci + 1}" for ci, c in enumerate(rows[0])]
+    yield "| " + " | ".join(headers) + " |"
+    yield "| " + " | ".join("---" for _ in headers) + " |"
+    for r in rows[1:]:
+        yield "| " + " | ".join(r) + " |"
+
+
+def _body_lines(zf: zipfile.ZipFile, styles: Dict[str, str], default_style: str) -> Iterator[str]:
+    tbl_depth = 0
+    fallback_depth = 0
+    table_index = 0
+    rows: List[List[str]] = []          # 최상위 표의 완성된 행 (그리드 칸 단위)
+    row: List[str] = []
+    cell: List[str] = []
+    prev_row: List[str] = []
+
+    with zf.open("word/document.xml") as fh:
+        for event, el in etree.iterparse(fh, events=("start", "end"), huge_tree=True, remove_blank_text=True):
+            tag = el.tag
+            if event == "start":
+                if tag == W_TBL:
+                    tbl_depth += 1
+                    if tbl_depth == 1:
+                        rows, prev_row = [], []
+                elif tag == W_TR and tbl_depth == 1:
+                    row = []
+                elif tag == W_TC and tbl_depth == 1:
+                    cell = []
+                elif tag == MC_FALLBACK:
+                    fallback_depth += 1
+                continue
+
+            # ---- end ----
+            if tag == MC_FALLBACK:
+                fallback_depth -= 1
+                el.clear()
+            elif tag == W_P:
+                if fallback_depth:
+                    continue
+                text = _paragraph_text(el).strip()
+                if tbl_depth:
+                    if text:
+                        cell.append(text)
+                elif text:
+                    ppr = el.find(W_PPR)
+                    ps = ppr.find(W_PSTYLE) if ppr is not None else None
+                    # 정의 없는 styleId 는 기본 스타일로 간주 (python-docx 동일)
+                    style = styles.get(ps.get(W_VAL), default_style) if ps is not None else default_style
+                    yield f"- {text}" if any(k in (style or "") for k in _LIST_STYLE_KEYS) else text
+                # 처리한 문단은 비움 (바깥 문단/셀이 같은 텍스트를 다시 읽지 않도록)
+                el.clear(keep_tail=True)
+            elif tag == W_TC and tbl_depth == 1:
+                span, cont = _cell_props(el)
+                col = len(row)
+                for k in range(span):
+                    if cont and col + k < len(prev_row):
+                        row.append(prev_row[col + k])
+                    else:
+                        row.append("\n".join(cell))
+                el.clear(keep_tail=True)
+            elif tag == W_TR and tbl_depth == 1:
+                rows.append(row)
+                prev_row = row
+                el.clear(keep_tail=True)
+            elif tag == W_TBL:
+                tbl_depth -= 1
+                if tbl_depth == 0:
+                    table_index += 1
+                    if rows:
+                        yield from _table_lines(rows, table_index)
+                    rows = []
+            else:
+                continue
+
+            # body 직계 자식 처리 완료 → 이미 처리한 앞 형제까지 해제 (메모리 평탄)
+            parent = el.getparent()
+            if parent is not None and parent.tag == W_BODY:
+                el.clear(keep_tail=True)
+                while el.getprevious() is not None:
+                    del parent[0]
+
+
+def iter_docx_lines(path: Union[str, Path]) -> Iterator[str]:
+    """
+    DOCX → 텍스트 줄 generator (문서 순서)
+    [Header] → 본문 문단/표 → [Footer]
+    """
+    with zipfile.ZipFile(str(path)) as zf:
+        styles, default_style = _paragraph_styles(zf)
+        rels = _document_rels(zf)
+        refs = _first_section_refs(zf)
+
+        htxt = _part_paragraph_text(zf, rels.get(refs.get("header", "")))
+        if htxt:
+            yield f"[Header] {htxt}"
+        yield from _body_lines(zf, styles, default_style)
+        ftxt = _part_paragraph_text(zf, rels.get(refs.get("footer", "")))
+        if ftxt:
+            yield f"[Footer] {ftxt}"
+
+
+def read_docx_text_stream(path: Union[str, Path]) -> str:
+    return "\n".join(iter_docx_lines(path)).strip()
+
+
+__all__ = ["iter_docx_lines", "read_docx_text_stream"]
@@ -6,6 +6,8 @@ import logging
 import json
 from typing import Any, Dict, Optional
 
+from server.utils.llm_http import get_async_http_client
+
 # load .env automatically if dotenv installed
 try:
     from dotenv import load_dotenv
@@ -66,7 +68,10 @@ class MockLLM:
         return {"choices": [{"message": {"content": f"[MOCK] {text}"}}], "model": "mock"}
 
     async def agenerate(self, messages_or_prompt: Any) -> Dict[str, Any]:
-        return await asyncio.to_thread(self.generate, messages_or_prompt)
+        return self.generate(messages_or_prompt)
+
+    async def ainvoke(self, messages_or_prompt: Any, **kwargs: Any) -> Dict[str, Any]:
+        return await self.agenerate(messages_or_prompt)
 
     def __call__(self, prompt: Any) -> Dict[str, Any]:
         return self.generate(prompt)
@@ -74,7 +79,7 @@ class MockLLM:
 class OpenAIWrapper:
     """
     Minimal wrapper for openai.ChatCompletion that supports both OpenAI and Azure OpenAI settings.
-    Exposes .generate() and .agenerate() used by pipeline.
+    Exposes .generate() and native-async .agenerate()/.ainvoke() used by pipeline.
     """
     def __init__(
         self,
@@ -92,6 +97,10 @@ class OpenAIWrapper:
         self.temperature = temperature
         self.azure = azure
         self.deployment = deployment or model
+        self._api_key = api_key
+        self._azure_base = azure_base
+        self._api_version = api_version
+        self._aclient = None
         # configure openai client for azure if requested
         if api_key:
             _openai.api_key = api_key
@@ -134,8 +143,36 @@ class OpenAIWrapper:
             )
         return resp
 
+    def _async_client(self):
+        """openai>=1 AsyncOpenAI/AsyncAzureOpenAI (공유 httpx 커넥션 풀 사용), 구형 SDK 면 None"""
+        if self._aclient is None:
+            if not hasattr(_openai, "AsyncOpenAI"):
+                return None
+            http_client = get_async_http_client()
+            if self.azure:
+                self._aclient = _openai.AsyncAzureOpenAI(
+                    api_key=self._api_key,
+                    azure_endpoint=(self._azure_base or "").rstrip("/"),
+                    api_version=self._api_version,
+                    http_client=http_client,
+                )
+            else:
+                self._aclient = _openai.AsyncOpenAI(api_key=self._api_key, http_client=http_client)
+        return self._aclient
+
     async def agenerate(self, messages_or_prompt: Any) -> Dict[str, Any]:
-        return await asyncio.to_thread(self.generate, messages_or_prompt)
+        client = self._async_client()
+        if client is None:
+            return await asyncio.to_thread(self.generate, messages_or_prompt)
+        resp = await client.chat.completions.create(
+            model=self.deployment if self.azure else self.model,
+            messages=self._format_messages(messages_or_prompt),
+            temperature=self.temperature,
+        )
+        return resp.model_dump()
+
+    async def ainvoke(self, messages_or_prompt: Any, **kwargs: Any) -> Dict[str, Any]:
+        return await self.agenerate(messages_or_prompt)
 
     def __call__(self, prompt: Any) -> Dict[str, Any]:
         return self.generate(prompt)
@@ -155,7 +192,7 @@ def _auto_detect_provider() -> str:
 
 def get_llm() -> Any:
     """
-    Return an LLM-like object with .generate() and optional .agenerate().
+    Return an LLM-like object with .generate() and async .agenerate()/.ainvoke() (shared async HTTP pool).
     Supports AOAI_ env (preferred), OPENAI_ env, or returns MockLLM.
     """
     provider = _auto_detect_provider()
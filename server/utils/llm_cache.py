@@ -0,0 +1,355 @@
+# server/utils/llm_cache.py
+"""
+LLM 응답 캐시 (content-addressed, SQLite 디스크 저장)
+
+- 키: sha256(model/deployment, temperature, 정규화된 messages, 추가 kwargs)
+- 저장소: SQLite 단일 파일 (TTL + 크기 제한 LRU 축출)
+- hit/miss 카운터 제공
+- 요청 단위 우회: options["bypass_cache"] = True  →  bypass() 컨텍스트
+- config.get_llm()이 반환하는 LLM을 CachedLLM으로 감싸므로 에이전트 코드 변경 없이 적용됨
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger("llm.cache")
+
+# 요청 단위 캐시 우회 플래그 (asyncio.to_thread 로 넘어가도 context가 복사되어 유지됨)
+_BYPASS: ContextVar[bool] = ContextVar("llm_cache_bypass", default=False)
+
+
+# ---------------------------------------------------------------------
+# 키 생성
+# ---------------------------------------------------------------------
+def _message_role_content(m: Any) -> Dict[str, str]:
+    if isinstance(m, dict):
+        role = m.get("role") or "user"
+        content = m.get("content") or m.get("text") or ""
+    elif isinstance(m, (list, tuple)) and len(m) == 2:
+        # ("user", "...") 튜플 형식
+        role, content = m[0], m[1]
+    elif hasattr(m, "content"):
+        # langchain BaseMessage (type: system/human/ai)
+        role = getattr(m, "type", None) or getattr(m, "role", None) or "user"
+        content = m.content
+    else:
+        role, content = "user", m
+    if not isinstance(content, str):
+        content = json.dumps(content, ensure_ascii=False, sort_keys=True, default=str)
+    return {"role": str(role), "content": content}
+
+
+def normalize_messages(messages: Any) -> List[Dict[str, str]]:
+    """
+    str / dict / langchain 메시지 등 다양한 입력을 [{role, content}] 로 정규화.
+    cache_control 같은 전송용 메타 키는 제외하고, 개행/앞뒤 공백 차이는 무시한다.
+    """
+    if messages is None:
+        items: List[Any] = []
+    elif isinstance(messages, str):
+        items = [{"role": "user", "content": messages}]
+    elif isinstance(messages, (list, tuple)):
+        items = list(messages)
+    else:
+        items = [messages]
+
+    out = []
+    for m in items:
+        rc = _message_role_content(m)
+        rc["content"] = rc["content"].replace("\r\n", "\n").strip()
+        out.append(rc)
+    return out
+
+
+def make_cache_key(model: Optional[str], temperature: Optional[float], messages: Any, extra: Optional[Dict[str, Any]] = None) -> str:
+    body = {
+        "model": model or "",
+        "temperature": temperature,
+        "messages": normalize_messages(messages),
+        "extra": extra or {},
+    }
+    raw = json.dumps(body, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+# ---------------------------------------------------------------------
+# 요청 단위 우회
+# ---------------------------------------------------------------------
+@contextmanager
+def bypass(enabled: bool = True) -> Iterator[None]:
+    """with bypass(): 블록 안의 LLM 호출은 캐시를 읽지도 쓰지도 않는다."""
+    token = _BYPASS.set(bool(enabled))
+    try:
+        yield
+    finally:
+        _BYPASS.reset(token)
+
+
+def is_bypassed() -> bool:
+    return _BYPASS.get()
+
+
+def bypass_requested(payload: Optional[Dict[str, Any]]) -> bool:
+    """payload 최상위 또는 options/scope_options 의 bypass_cache 플래그 확인"""
+    if not isinstance(payload, dict):
+        return False
+    if payload.get("bypass_cache"):
+        return True
+    for key in ("options", "scope_options", "schedule_options"):
+        opts = payload.get(key)
+        if isinstance(opts, dict) and opts.get("bypass_cache"):
+            return True
+    return False
+
+
+# ---------------------------------------------------------------------
+# 저장소
+# ---------------------------------------------------------------------
+class LLMResponseCache:
+    """SQLite 기반 응답 저장소 (TTL + LRU 축출, thread-safe)"""
+
+    def __init__(self, path: str | Path, ttl_sec: int = 7 * 24 * 3600, max_entries: int = 5000):
+        self.path = Path(path)
+        self.ttl_sec = int(ttl_sec)
+        self.max_entries = int(max_entries)
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "bypassed": 0, "writes": 0, "evictions": 0, "expired": 0}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                payload TEXT NOT NULL,
+                size_bytes INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                hit_count INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_last_access ON llm_cache(last_access)")
+        logger.info("[LLM_CACHE] opened %s (ttl=%ss, max_entries=%d)", self.path, self.ttl_sec, self.max_entries)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._counters["misses"] += 1
+                return None
+            payload, created_at = row
+            if self.ttl_sec > 0 and now - created_at > self.ttl_sec:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._counters["expired"] += 1
+                self._counters["misses"] += 1
+                return None
+            self._conn.execute(
+                "UPDATE llm_cache SET last_access = ?, hit_count = hit_count + 1 WHERE key = ?",
+                (now, key),
+            )
+            self._counters["hits"] += 1
+        try:
+            return json.loads(payload)
+        except Exception:
+            return None
+
+    def put(self, key: str, payload: Dict[str, Any], model: Optional[str] = None) -> None:
+        data = json.dumps(payload, ensure_ascii=False, default=str)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, model, payload, size_bytes, created_at, last_access, hit_count) "
+                "VALUES (?, ?, ?, ?, ?, ?, 0)",
+                (key, model, data, len(data.encode("utf-8")), now, now),
+            )
+            self._counters["writes"] += 1
+            self._evict_locked(now)
+
+    def _evict_locked(self, now: float) -> None:
+        if self.ttl_sec > 0:
+            cur = self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_sec,))
+            self._counters["expired"] += max(cur.rowcount, 0)
+        if self.max_entries <= 0:
+            return
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN "
+                "(SELECT key FROM llm_cache ORDER BY last_access ASC LIMIT ?)",
+                (excess,),
+            )
+            self._counters["evictions"] += excess
+
+    def record_bypass(self) -> None:
+        with self._lock:
+            self._counters["bypassed"] += 1
+
+    def clear(self) -> int:
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM llm_cache")
+            return max(cur.rowcount, 0)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, total_bytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM llm_cache"
+            ).fetchone()
+            counters = dict(self._counters)
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            **counters,
+            "hit_rate": round(counters["hits"] / lookups, 4) if lookups else 0.0,
+            "entries": entries,
+            "total_bytes": total_bytes,
+            "max_entries": self.max_entries,
+            "ttl_sec": self.ttl_sec,
+            "path": str(self.path),
+        }
+
+
+# ---------------------------------------------------------------------
+# 응답 직렬화
+# ---------------------------------------------------------------------
+def _dump_response(resp: Any) -> Optional[Dict[str, Any]]:
+    try:
+        from langchain_core.messages import BaseMessage, message_to_dict
+        if isinstance(resp, BaseMessage):
+            return {"kind": "message", "data": message_to_dict(resp)}
+    except Exception:
+        pass
+    if isinstance(resp, str):
+        return {"kind": "str", "data": resp}
+    return None  # 알 수 없는 응답 형식은 캐시하지 않음
+
+
+def _load_response(payload: Dict[str, Any]) -> Any:
+    kind = payload.get("kind")
+    if kind == "message":
+        from langchain_core.messages import messages_from_dict
+        return messages_from_dict([payload["data"]])[0]
+    return payload.get("data")
+
+
+# ---------------------------------------------------------------------
+# LLM 래퍼
+# ---------------------------------------------------------------------
+class CachedLLM:
+    """
+    invoke/ainvoke 를 캐시로 감싸는 얇은 프록시.
+    그 외 속성(stream, bind 등)은 원본 LLM으로 그대로 위임한다.
+    """
+
+    def __init__(self, llm: Any, cache: LLMResponseCache):
+        self._llm = llm
+        self._cache = cache
+
+    @property
+    def wrapped(self) -> Any:
+        return self._llm
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._llm, name)
+
+    def _model_name(self) -> str:
+        for attr in ("deployment_name", "azure_deployment", "model_name", "model"):
+            v = getattr(self._llm, attr, None)
+            if v:
+                return str(v)
+        return self._llm.__class__.__name__
+
+    def _key(self, input: Any, kwargs: Dict[str, Any]) -> str:
+        return make_cache_key(
+            self._model_name(),
+            getattr(self._llm, "temperature", None),
+            input,
+            extra=kwargs,
+        )
+
+    def invoke(self, input: Any, config: Any = None, **kwargs: Any) -> Any:
+        if is_bypassed():
+            self._cache.record_bypass()
+            return self._llm.invoke(input, config=config, **kwargs)
+
+        key = self._key(input, kwargs)
+        hit = self._cache.get(key)
+        if hit is not None:
+            logger.debug("[LLM_CACHE] hit %s", key[:12])
+            return _load_response(hit)
+
+        resp = self._llm.invoke(input, config=config, **kwargs)
+        dumped = _dump_response(resp)
+        if dumped is not None:
+            self._cache.put(key, dumped, model=self._model_name())
+        return resp
+
+    async def ainvoke(self, input: Any, config: Any = None, **kwargs: Any) -> Any:
+        if is_bypassed():
+            self._cache.record_bypass()
+            return await self._llm.ainvoke(input, config=config, **kwargs)
+
+        key = self._key(input, kwargs)
+        hit = self._cache.get(key)
+        if hit is not None:
+            logger.debug("[LLM_CACHE] hit %s", key[:12])
+            return _load_response(hit)
+
+        resp = await self._llm.ainvoke(input, config=config, **kwargs)
+        dumped = _dump_response(resp)
+        if dumped is not None:
+            self._cache.put(key, dumped, model=self._model_name())
+        return resp
+
+    def __repr__(self) -> str:
+        return f"CachedLLM({self._llm.__class__.__name__})"
+
+
+# ---------------------------------------------------------------------
+# 프로세스 단일 인스턴스
+# ---------------------------------------------------------------------
+_CACHE: Optional[LLMResponseCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_llm_cache(path: str | Path = "data/cache/llm_cache.sqlite3", ttl_sec: int = 7 * 24 * 3600, max_entries: int = 5000) -> LLMResponseCache:
+    global _CACHE
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = LLMResponseCache(path, ttl_sec=ttl_sec, max_entries=max_entries)
+    return _CACHE
+
+
+def cache_stats() -> Dict[str, Any]:
+    if _CACHE is None:
+        return {"enabled": False}
+    return {"enabled": True, **_CACHE.stats()}
+
+
+__all__ = [
+    "LLMResponseCache",
+    "CachedLLM",
+    "bypass",
+    "is_bypassed",
+    "bypass_requested",
+    "make_cache_key",
+    "normalize_messages",
+    "get_llm_cache",
+    "cache_stats",
+]
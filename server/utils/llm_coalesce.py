@@ -0,0 +1,280 @@
+# server/utils/llm_coalesce.py
+"""
+동일 LLM / 임베딩 요청의 in-flight 병합 (single-flight)
+
+- 같은 키의 요청이 진행 중이면 새 호출은 업스트림에 보내지 않고 그 결과를 함께 받음
+  · LLM 키: llm_cache.make_cache_key 와 동일 (model, temperature, 정규화 messages, kwargs)
+  · 임베딩 키: sha256(model, 종류, 텍스트 목록)
+- 응답 캐시와 독립: CachedLLM → CoalescedLLM → GovernedLLM 순서라 캐시 miss 끼리만 병합되고,
+  캐시가 꺼져 있어도 동작. 결과는 공유하지 않고 완료 후 키를 지움 (캐시 역할 없음)
+- sync(스레드) / async(여러 이벤트 루프) 호출이 섞여도 concurrent.futures.Future 로 결과 공유
+  · leader 가 취소되면(timeout 등) follower 는 에러 대신 다시 시도 (새 leader 선출)
+  · 같은 루프 스레드에서 sync 호출이 async leader 를 기다리면 교착 → 그 경우는 병합하지 않음
+- 지표: leader(실제 호출) / coalesced(절약된 호출) / 종류별 / 공유된 에러 수
+"""
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from server.utils.llm_cache import make_cache_key
+
+try:
+    from langchain_core.embeddings import Embeddings as _EmbeddingsBase
+except Exception:
+    _EmbeddingsBase = object  # type: ignore
+
+logger = logging.getLogger("llm.coalesce")
+
+LLM_COALESCE_ENABLED = os.getenv("LLM_COALESCE_ENABLED", "1") not in ("0", "false", "False")
+
+
+class _LeaderCancelled(Exception):
+    """leader 취소 → follower 는 재시도"""
+
+
+class _Flight:
+    __slots__ = ("future", "loop", "thread", "followers")
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop]):
+        self.future: concurrent.futures.Future = concurrent.futures.Future()
+        self.loop = loop
+        self.thread = threading.get_ident()
+        self.followers = 0
+
+
+class SingleFlight:
+    """키별 in-flight 호출 1개만 업스트림으로 보내는 그룹 (thread-safe)"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, kind: str, field: str, n: int = 1) -> None:
+        c = self._counters.setdefault(kind, {"leaders": 0, "coalesced": 0, "shared_errors": 0, "retried": 0})
+        c[field] += n
+
+    def _join(self, key: str, kind: str, loop: Optional[asyncio.AbstractEventLoop], sync: bool):
+        """(flight, is_leader). 교착 위험이면 (None, False) → 병합 없이 직접 호출"""
+        with self._lock:
+            fl = self._flights.get(key)
+            if fl is None:
+                fl = _Flight(loop)
+                self._flights[key] = fl
+                self._count(kind, "leaders")
+                return fl, True
+            if sync and fl.loop is not None and fl.thread == threading.get_ident():
+                return None, False
+            fl.followers += 1
+            self._count(kind, "coalesced")
+            return fl, False
+
+    def _finish(self, key: str, fl: _Flight, kind: str, result: Any = None,
+                exc: Optional[BaseException] = None) -> None:
+        with self._lock:
+            if self._flights.get(key) is fl:
+                del self._flights[key]
+            if exc is not None and fl.followers and not isinstance(exc, _LeaderCancelled):
+                self._count(kind, "shared_errors", fl.followers)
+        if fl.future.done():
+            return
+        if exc is not None:
+            fl.future.set_exception(exc)
+        else:
+            fl.future.set_result(result)
+
+    def do(self, key: str, fn: Callable[[], Any], kind: str = "llm") -> Any:
+        while True:
+            fl, leader = self._join(key, kind, None, sync=True)
+            if fl is None:
+                return fn()
+            if not leader:
+                try:
+                    # follower 는 복사본 (응답 객체를 호출자끼리 공유하지 않음)
+                    return copy.deepcopy(fl.future.result())
+                except _LeaderCancelled:
+                    self._retried(kind)
+                    continue
+            try:
+                result = fn()
+            except BaseException as e:
+                self._finish(key, fl, kind, exc=e)
+                raise
+            self._finish(key, fl, kind, result=result)
+            return result
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[Any]], kind: str = "llm") -> Any:
+        loop = asyncio.get_running_loop()
+        while True:
+            fl, leader = self._join(key, kind, loop, sync=False)
+            if not leader:
+                try:
+                    # 다른 루프/스레드의 leader 도 call_soon_threadsafe 로 깨어남.
+                    # shield: follower 가 취소돼도 공유 future 는 취소하지 않음
+                    return copy.deepcopy(await asyncio.shield(asyncio.wrap_future(fl.future)))
+                except _LeaderCancelled:
+                    self._retried(kind)
+                    continue
+            try:
+                result = await fn()
+            except asyncio.CancelledError:
+                self._finish(key, fl, kind, exc=_LeaderCancelled())
+                raise
+            except BaseException as e:
+                self._finish(key, fl, kind, exc=e)
+                raise
+            self._finish(key, fl, kind, result=result)
+            return result
+
+    def _retried(self, kind: str) -> None:
+        with self._lock:
+            self._count(kind, "retried")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            by_kind = {k: dict(v) for k, v in self._counters.items()}
+            in_flight = len(self._flights)
+        leaders = sum(v["leaders"] for v in by_kind.values())
+        saved = sum(v["coalesced"] for v in by_kind.values())
+        total = leaders + saved
+        return {
+            "upstream_calls": leaders,
+            "saved_calls": saved,
+            "saved_ratio": round(saved / total, 4) if total else 0.0,
+            "in_flight_keys": in_flight,
+            "by_kind": by_kind,
+        }
+
+
+# ---------------------------------------------------------------------
+# LLM / 임베딩 래퍼
+# ---------------------------------------------------------------------
+def _model_name(obj: Any) -> str:
+    for attr in ("deployment_name", "azure_deployment", "deployment", "model_name", "model"):
+        v = getattr(obj, attr, None)
+        if v:
+            return str(v)
+    return obj.__class__.__name__
+
+
+class CoalescedLLM:
+    """invoke/ainvoke 를 single-flight 로 감싸는 프록시. 그 외 속성은 원본으로 위임"""
+
+    def __init__(self, llm: Any, group: "SingleFlight"):
+        self._llm = llm
+        self._group = group
+
+    @property
+    def wrapped(self) -> Any:
+        return self._llm
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__") or name == "_llm":
+            raise AttributeError(name)
+        return getattr(self._llm, name)
+
+    def _key(self, input: Any, config: Any, kwargs: Dict[str, Any]) -> Optional[str]:
+        if config is not None:
+            return None  # 콜백/태그가 호출마다 달라 공유하면 추적이 섞임
+        return make_cache_key(_model_name(self._llm), getattr(self._llm, "temperature", None), input, extra=kwargs)
+
+    def invoke(self, input: Any, config: Any = None, **kwargs: Any) -> Any:
+        key = self._key(input, config, kwargs)
+        call = lambda: self._llm.invoke(input, config=config, **kwargs)  # noqa: E731
+        return call() if key is None else self._group.do(key, call, kind="llm")
+
+    async def ainvoke(self, input: Any, config: Any = None, **kwargs: Any) -> Any:
+        key = self._key(input, config, kwargs)
+        call = lambda: self._llm.ainvoke(input, config=config, **kwargs)  # noqa: E731
+        return await (call() if key is None else self._group.ado(key, call, kind="llm"))
+
+    def __repr__(self) -> str:
+        return f"CoalescedLLM({self._llm.__class__.__name__})"
+
+
+class CoalescedEmbeddings(_EmbeddingsBase):
+    """embed_query / embed_documents (+async) 를 single-flight 로 감싸는 Embeddings"""
+
+    def __init__(self, embeddings: Any, group: "SingleFlight"):
+        self._emb = embeddings
+        self._group = group
+
+    @property
+    def wrapped(self) -> Any:
+        return self._emb
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__") or name == "_emb":
+            raise AttributeError(name)
+        return getattr(self._emb, name)
+
+    def _key(self, kind: str, texts: List[str]) -> str:
+        raw = json.dumps([_model_name(self._emb), kind, texts], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._group.do(self._key("query", [text]), lambda: self._emb.embed_query(text), kind="embed_query")
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        texts = list(texts)
+        return self._group.do(self._key("documents", texts), lambda: self._emb.embed_documents(texts),
+                              kind="embed_documents")
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return await self._group.ado(self._key("query", [text]), lambda: self._emb.aembed_query(text),
+                                     kind="embed_query")
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        texts = list(texts)
+        return await self._group.ado(self._key("documents", texts), lambda: self._emb.aembed_documents(texts),
+                                     kind="embed_documents")
+
+    def __repr__(self) -> str:
+        return f"CoalescedEmbeddings({self._emb.__class__.__name__})"
+
+
+# ---------------------------------------------------------------------
+# 프로세스 단일 인스턴스
+# ---------------------------------------------------------------------
+_GROUP: Optional[SingleFlight] = None
+_GROUP_LOCK = threading.Lock()
+
+
+def get_singleflight() -> SingleFlight:
+    global _GROUP
+    if _GROUP is None:
+        with _GROUP_LOCK:
+            if _GROUP is None:
+                _GROUP = SingleFlight()
+    return _GROUP
+
+
+def coalesce_embeddings(embeddings: Any) -> Any:
+    """LLM_COALESCE_ENABLED 면 공용 그룹으로 감싼 임베딩 반환 (None 은 그대로)"""
+    if embeddings is None or not LLM_COALESCE_ENABLED or isinstance(embeddings, CoalescedEmbeddings):
+        return embeddings
+    return CoalescedEmbeddings(embeddings, get_singleflight())
+
+
+def coalesce_stats() -> Dict[str, Any]:
+    if _GROUP is None:
+        return {"enabled": LLM_COALESCE_ENABLED, "upstream_calls": 0, "saved_calls": 0}
+    return {"enabled": LLM_COALESCE_ENABLED, **_GROUP.stats()}
+
+
+__all__ = [
+    "SingleFlight",
+    "CoalescedLLM",
+    "CoalescedEmbeddings",
+    "get_singleflight",
+    "coalesce_embeddings",
+    "coalesce_stats",
+]
@@ -0,0 +1,534 @@
+# server/utils/llm_governor.py
+"""
+프로세스 전역 LLM 호출 스케줄러 (RPM/TPM 토큰 버킷 + 우선순위 큐 + 429 백오프)
+
+- 요청마다 토큰 추정 (tiktoken, 인코딩 로드 실패 시 문자 수 기반 근사) + 응답 예약분(max_tokens)
+- RPM/TPM 버킷: 분당 한도를 초 단위로 연속 보충, 응답의 실제 usage 로 TPM 차이를 정산
+- 우선순위: interactive(0) > normal(1) > background(2), 대기 시간에 따른 aging 으로 기아 방지
+  · 맨 앞 요청이 버킷을 기다리는 동안 뒤 요청이 새치기하지 않음 (큰 interactive 요청 보호)
+- 429: Retry-After(-ms) 헤더를 따르는 지터 백오프 재시도 + 전역 cooldown (다른 요청도 그동안 보내지 않음)
+- sync(invoke, 스레드) / async(ainvoke, 여러 이벤트 루프) 호출 모두 하나의 dispatcher 스레드가 순서대로 허가
+- 우선순위 지정: with llm_priority("background"): ...  (ContextVar → to_thread 로 넘어가도 유지)
+- 이벤트 루프 스레드에서의 sync invoke 는 큐에서 기다리지 않음 (루프가 멈추면 그 루프의 async 요청이 슬롯을
+  반납하지 못해 교착) → 큐를 건너뛰어 즉시 허가하고 버킷만 차감, 429 재시도 없이 예외 전달.
+  async 코드에서는 ainvoke_llm 또는 asyncio.to_thread 로 호출할 것
+- config.get_llm() 이 GovernedLLM 으로 감싸므로 에이전트 코드는 그대로 (캐시 hit 는 버킷을 쓰지 않음)
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from server.utils.llm_cache import normalize_messages
+
+logger = logging.getLogger("llm.governor")
+
+try:
+    import tiktoken
+    _TIKTOKEN_AVAILABLE = True
+except Exception:
+    tiktoken = None
+    _TIKTOKEN_AVAILABLE = False
+
+LLM_GOV_RPM = int(os.getenv("LLM_GOV_RPM", "300"))            # 0 = 무제한
+LLM_GOV_TPM = int(os.getenv("LLM_GOV_TPM", "50000"))          # 0 = 무제한
+LLM_GOV_MAX_CONCURRENCY = int(os.getenv("LLM_GOV_MAX_CONCURRENCY", "16"))
+LLM_GOV_COMPLETION_RESERVE = int(os.getenv("LLM_GOV_COMPLETION_RESERVE", "1024"))
+LLM_GOV_MAX_RETRIES = int(os.getenv("LLM_GOV_MAX_RETRIES", "4"))
+LLM_GOV_BACKOFF_BASE_SEC = float(os.getenv("LLM_GOV_BACKOFF_BASE_SEC", "1.0"))
+LLM_GOV_BACKOFF_MAX_SEC = float(os.getenv("LLM_GOV_BACKOFF_MAX_SEC", "60"))
+LLM_GOV_AGING_SEC = float(os.getenv("LLM_GOV_AGING_SEC", "30"))  # 이 시간만큼 기다리면 한 등급 올라감
+LLM_GOV_ENCODING = os.getenv("LLM_GOV_ENCODING", "o200k_base")
+
+PRIORITIES: Dict[str, int] = {"interactive": 0, "normal": 1, "background": 2}
+_PRIORITY: ContextVar[str] = ContextVar("llm_priority", default="normal")
+
+
+# ---------------------------------------------------------------------
+# 우선순위 컨텍스트
+# ---------------------------------------------------------------------
+@contextmanager
+def llm_priority(name: str) -> Iterator[None]:
+    """with llm_priority("interactive"|"normal"|"background"): 블록 안 LLM 호출의 큐 우선순위"""
+    if name not in PRIORITIES:
+        raise ValueError(f"unknown llm priority: {name}")
+    token = _PRIORITY.set(name)
+    try:
+        yield
+    finally:
+        _PRIORITY.reset(token)
+
+
+def current_priority() -> str:
+    return _PRIORITY.get()
+
+
+# ---------------------------------------------------------------------
+# 토큰 추정
+# ---------------------------------------------------------------------
+_ENCODER: Any = None
+_ENCODER_FAILED = False
+_ENCODER_LOCK = threading.Lock()
+
+
+def _encoder() -> Any:
+    """tiktoken 인코더 (BPE 파일이 없고 다운로드도 불가하면 1회 실패 후 근사치 사용)"""
+    global _ENCODER, _ENCODER_FAILED
+    if _ENCODER is not None or _ENCODER_FAILED or not _TIKTOKEN_AVAILABLE:
+        return _ENCODER
+    with _ENCODER_LOCK:
+        if _ENCODER is None and not _ENCODER_FAILED:
+            try:
+                _ENCODER = tiktoken.get_encoding(LLM_GOV_ENCODING)
+            except Exception as e:
+                _ENCODER_FAILED = True
+                logger.warning("[LLM_GOV] tiktoken encoding %s unavailable (%s); using char estimate",
+                               LLM_GOV_ENCODING, e.__class__.__name__)
+    return _ENCODER
+
+
+def count_tokens(text: str) -> int:
+    enc = _encoder()
+    if enc is not None:
+        return len(enc.encode(text, disallowed_special=()))
+    # 근사: 영문 ~4자/토큰, 한글 등 비 ASCII ~1자/토큰
+    ascii_n = sum(1 for ch in text if ord(ch) < 128)
+    return math.ceil(ascii_n / 4) + (len(text) - ascii_n)
+
+
+def estimate_prompt_tokens(messages: Any) -> int:
+    """chat 메시지 토큰 추정 (메시지당 role/구분자 오버헤드 4 + 응답 프라이밍 3)"""
+    msgs = normalize_messages(messages)
+    return sum(4 + count_tokens(m["content"]) for m in msgs) + 3
+
+
+def usage_tokens(resp: Any) -> Optional[int]:
+    """응답의 실제 total_tokens (langchain usage_metadata / openai dict usage), 없으면 None"""
+    meta = getattr(resp, "usage_metadata", None)
+    if isinstance(meta, dict) and meta.get("total_tokens"):
+        return int(meta["total_tokens"])
+    if isinstance(resp, dict):
+        usage = resp.get("usage") or {}
+        if usage.get("total_tokens"):
+            return int(usage["total_tokens"])
+    return None
+
+
+# ---------------------------------------------------------------------
+# 429 판별 / 백오프
+# ---------------------------------------------------------------------
+def _status_code(exc: BaseException) -> Optional[int]:
+    for obj in (exc, getattr(exc, "response", None)):
+        code = getattr(obj, "status_code", None)
+        if isinstance(code, int):
+            return code
+    return None
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        return None  # HTTP-date 형식 등은 지수 백오프로
+    return None
+
+
+def is_rate_limited(exc: BaseException) -> bool:
+    return _status_code(exc) == 429 or exc.__class__.__name__ == "RateLimitError"
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float]) -> float:
+    """Retry-After 가 있으면 그 이상 + 최대 25% 지터, 없으면 full-jitter 지수 백오프"""
+    if retry_after is not None:
+        return min(retry_after * (1 + random.random() * 0.25), LLM_GOV_BACKOFF_MAX_SEC)
+    return random.uniform(0, min(LLM_GOV_BACKOFF_BASE_SEC * (2 ** attempt), LLM_GOV_BACKOFF_MAX_SEC))
+
+
+# ---------------------------------------------------------------------
+# 스케줄러
+# ---------------------------------------------------------------------
+def _on_event_loop() -> bool:
+    """현재 스레드에서 이벤트 루프가 실행 중인지 (sync 대기를 하면 그 루프 전체가 멈춤)"""
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+class _Bucket:
+    """분당 한도 토큰 버킷 (초당 limit/60 연속 보충). limit<=0 이면 무제한"""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.level = float(per_minute)
+        self.rate = per_minute / 60.0
+        self._t = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.capacity <= 0
+
+    def refill(self, now: float) -> None:
+        if not self.unlimited:
+            self.level = min(self.capacity, self.level + (now - self._t) * self.rate)
+        self._t = now
+
+    def wait_for(self, amount: float) -> float:
+        """amount 확보까지 남은 시간(초), 0 이면 즉시 가능"""
+        if self.unlimited or self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+
+class _Ticket:
+    __slots__ = ("priority", "cost", "enqueued", "seq", "granted", "event", "loop", "future")
+
+    def __init__(self, priority: int, cost: int, seq: int):
+        self.priority = priority
+        self.cost = cost
+        self.enqueued = time.monotonic()
+        self.seq = seq
+        self.granted = False
+        self.event: Optional[threading.Event] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.future: Optional[asyncio.Future] = None
+
+    def effective(self, now: float) -> float:
+        aging = (now - self.enqueued) / LLM_GOV_AGING_SEC if LLM_GOV_AGING_SEC > 0 else 0.0
+        return self.priority - aging
+
+
+class LLMGovernor:
+    """RPM/TPM 버킷 + 동시 실행 상한 + 우선순위 큐 (thread-safe, 이벤트 루프 무관)"""
+
+    def __init__(self, rpm: int = LLM_GOV_RPM, tpm: int = LLM_GOV_TPM,
+                 max_concurrency: int = LLM_GOV_MAX_CONCURRENCY):
+        self.rpm = _Bucket(rpm)
+        self.tpm = _Bucket(tpm)
+        self.max_concurrency = max(1, int(max_concurrency))
+        self._cond = threading.Condition()
+        self._queue: List[_Ticket] = []
+        self._seq = 0
+        self._in_flight = 0
+        self._cooldown_until = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self._waits: Deque[float] = deque(maxlen=1000)
+        self._counters = {"granted": 0, "completed": 0, "retries_429": 0, "failed_429": 0,
+                          "cancelled": 0, "est_tokens": 0, "actual_tokens": 0, "loop_bypass": 0}
+        self._max_depth = 0
+
+    # ---------------- 허가 ----------------
+    def _cost(self, tokens: int) -> int:
+        # 한 요청이 버킷 용량보다 크면 영원히 못 나가므로 용량으로 제한
+        return int(min(tokens, self.tpm.capacity)) if not self.tpm.unlimited else int(tokens)
+
+    def _enqueue(self, priority: str, tokens: int) -> _Ticket:
+        self._seq += 1
+        t = _Ticket(PRIORITIES.get(priority, 1), self._cost(tokens), self._seq)
+        self._queue.append(t)
+        self._max_depth = max(self._max_depth, len(self._queue))
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._dispatch, name="llm-governor", daemon=True)
+            self._thread.start()
+        self._cond.notify_all()
+        return t
+
+    def _grant_locked(self) -> Optional[float]:
+        """허가 가능한 만큼 허가. 반환: 다음 시도까지 대기(초), None 이면 notify 까지 대기"""
+        while self._queue and self._in_flight < self.max_concurrency:
+            now = time.monotonic()
+            if now < self._cooldown_until:
+                return self._cooldown_until - now
+            self.rpm.refill(now)
+            self.tpm.refill(now)
+            head = min(self._queue, key=lambda t: (t.effective(now), t.seq))
+            wait = max(self.rpm.wait_for(1), self.tpm.wait_for(head.cost))
+            if wait > 0:
+                return wait
+            if not self.rpm.unlimited:
+                self.rpm.level -= 1
+            if not self.tpm.unlimited:
+                self.tpm.level -= head.cost
+            self._queue.remove(head)
+            self._in_flight += 1
+            head.granted = True
+            self._waits.append(now - head.enqueued)
+            self._counters["granted"] += 1
+            self._counters["est_tokens"] += head.cost
+            if head.event is not None:
+                head.event.set()
+            elif head.loop is not None and head.future is not None:
+                fut = head.future
+                head.loop.call_soon_threadsafe(lambda f=fut: f.done() or f.set_result(None))
+        return None
+
+    def _dispatch(self) -> None:
+        with self._cond:
+            while True:
+                timeout = self._grant_locked()
+                self._cond.wait(timeout=timeout)
+
+    def acquire(self, tokens: int, priority: Optional[str] = None) -> _Ticket:
+        if _on_event_loop():
+            raise RuntimeError("LLMGovernor.acquire() blocks; use acquire_async() or acquire_nowait() on an event loop")
+        with self._cond:
+            t = self._enqueue(priority or current_priority(), tokens)
+            t.event = threading.Event()
+        t.event.wait()
+        return t
+
+    def acquire_nowait(self, tokens: int, priority: Optional[str] = None) -> _Ticket:
+        """큐를 거치지 않고 즉시 허가 (이벤트 루프 스레드의 sync 호출용). 버킷은 음수까지 차감 → 뒤 요청이 그만큼 늦어짐"""
+        with self._cond:
+            now = time.monotonic()
+            self.rpm.refill(now)
+            self.tpm.refill(now)
+            self._seq += 1
+            t = _Ticket(PRIORITIES.get(priority or current_priority(), 1), self._cost(tokens), self._seq)
+            if not self.rpm.unlimited:
+                self.rpm.level -= 1
+            if not self.tpm.unlimited:
+                self.tpm.level -= t.cost
+            self._in_flight += 1
+            t.granted = True
+            self._counters["granted"] += 1
+            self._counters["est_tokens"] += t.cost
+            self._counters["loop_bypass"] += 1
+        return t
+
+    async def acquire_async(self, tokens: int, priority: Optional[str] = None) -> _Ticket:
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        with self._cond:
+            t = self._enqueue(priority or current_priority(), tokens)
+            t.loop, t.future = loop, fut
+        try:
+            await fut
+        except asyncio.CancelledError:
+            # 대기 중 취소(timeout 등): 큐에서 빼거나, 이미 허가됐으면 슬롯 반납
+            with self._cond:
+                self._counters["cancelled"] += 1
+                if t.granted:
+                    self._release_locked(t, None)
+                elif t in self._queue:
+                    self._queue.remove(t)
+                self._cond.notify_all()
+            raise
+        return t
+
+    # ---------------- 반납 / 정산 ----------------
+    def _release_locked(self, ticket: _Ticket, actual_tokens: Optional[int]) -> None:
+        self._in_flight -= 1
+        self._counters["completed"] += 1
+        if actual_tokens is not None:
+            self._counters["actual_tokens"] += actual_tokens
+            if not self.tpm.unlimited:
+                # 예약(추정+응답 예약분)과 실제 사용량의 차이를 정산 (부족분은 음수 잔고로 다음 허가를 늦춤)
+                self.tpm.refill(time.monotonic())
+                self.tpm.level = min(self.tpm.capacity, self.tpm.level + ticket.cost - actual_tokens)
+
+    def release(self, ticket: _Ticket, actual_tokens: Optional[int] = None) -> None:
+        with self._cond:
+            self._release_locked(ticket, actual_tokens)
+            self._cond.notify_all()
+
+    def penalize(self, delay: float) -> None:
+        """429 수신: delay 동안 전체 허가 중지 (이미 진행 중인 요청은 그대로)"""
+        with self._cond:
+            self._cooldown_until = max(self._cooldown_until, time.monotonic() + delay)
+            self._counters["retries_429"] += 1
+            self._cond.notify_all()
+
+    def record_429_failure(self) -> None:
+        with self._cond:
+            self._counters["failed_429"] += 1
+
+    # ---------------- 지표 ----------------
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            now = time.monotonic()
+            self.rpm.refill(now)
+            self.tpm.refill(now)
+            depth: Dict[str, int] = {name: 0 for name in PRIORITIES}
+            names = {v: k for k, v in PRIORITIES.items()}
+            for t in self._queue:
+                depth[names.get(t.priority, "normal")] += 1
+            waits = sorted(self._waits)
+            oldest = max((now - t.enqueued for t in self._queue), default=0.0)
+            out = {
+                **self._counters,
+                "queue_depth": len(self._queue),
+                "queue_depth_by_priority": depth,
+                "max_queue_depth": self._max_depth,
+                "oldest_wait_ms": round(oldest * 1000, 1),
+                "in_flight": self._in_flight,
+                "max_concurrency": self.max_concurrency,
+                "rpm_limit": int(self.rpm.capacity),
+                "tpm_limit": int(self.tpm.capacity),
+                "rpm_available": None if self.rpm.unlimited else round(self.rpm.level, 1),
+                "tpm_available": None if self.tpm.unlimited else round(self.tpm.level, 1),
+                "cooldown_remaining_ms": round(max(0.0, self._cooldown_until - now) * 1000, 1),
+                "tokenizer": "tiktoken" if _ENCODER is not None else "char-estimate",
+            }
+        if waits:
+            out["wait_ms"] = {
+                "count": len(waits),
+                "avg": round(sum(waits) / len(waits) * 1000, 1),
+                "p50": round(waits[len(waits) // 2] * 1000, 1),
+                "p95": round(waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000, 1),
+                "max": round(waits[-1] * 1000, 1),
+            }
+        return out
+
+
+# ---------------------------------------------------------------------
+# LLM 래퍼
+# ---------------------------------------------------------------------
+class GovernedLLM:
+    """
+    invoke/ainvoke 를 governor 허가 + 429 재시도로 감싸는 프록시.
+    그 외 속성은 원본 LLM 으로 위임 (CachedLLM 안쪽에 두어 캐시 hit 는 버킷을 쓰지 않음).
+    """
+
+    def __init__(self, llm: Any, governor: LLMGovernor, max_retries: int = LLM_GOV_MAX_RETRIES):
+        self._llm = llm
+        self._gov = governor
+        self._max_retries = max_retries
+
+    @property
+    def wrapped(self) -> Any:
+        return self._llm
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._llm, name)
+
+    def _estimate(self, input: Any, kwargs: Dict[str, Any]) -> int:
+        reserve = kwargs.get("max_tokens") or getattr(self._llm, "max_tokens", None) or LLM_GOV_COMPLETION_RESERVE
+        return estimate_prompt_tokens(input) + int(reserve)
+
+    def _retry_delay(self, exc: BaseException, attempt: int) -> Optional[float]:
+        if not is_rate_limited(exc):
+            return None
+        if attempt >= self._max_retries:
+            self._gov.record_429_failure()
+            return None
+        ra = retry_after_seconds(exc)
+        delay = backoff_delay(attempt, ra)
+        # Retry-After 는 서버가 지정한 쿼터 창 → 그동안 다른 요청도 보내지 않음
+        self._gov.penalize(ra if ra is not None else delay)
+        logger.warning("[LLM_GOV] 429 (attempt %d/%d), retry in %.2fs (retry-after=%s)",
+                       attempt + 1, self._max_retries, delay, ra)
+        return delay
+
+    def invoke(self, input: Any, config: Any = None, **kwargs: Any) -> Any:
+        est = self._estimate(input, kwargs)
+        if _on_event_loop():
+            # 루프 스레드에서 큐/백오프 대기 = 루프 정지 + 그 루프의 허가된 async 요청이 반납 불가 → 교착
+            logger.warning("[LLM_GOV] sync invoke on event loop thread; bypassing queue (use ainvoke_llm/to_thread)")
+            ticket = self._gov.acquire_nowait(est)
+            actual = None
+            try:
+                resp = self._llm.invoke(input, config=config, **kwargs)
+                actual = usage_tokens(resp)
+                return resp
+            except Exception as e:
+                if is_rate_limited(e):
+                    # 재시도(sleep)는 하지 않지만 쿼터 창 동안 다른 요청은 멈춤
+                    self._gov.record_429_failure()
+                    ra = retry_after_seconds(e)
+                    self._gov.penalize(ra if ra is not None else backoff_delay(0, None))
+                raise
+            finally:
+                self._gov.release(ticket, actual)
+        attempt = 0
+        while True:
+            ticket = self._gov.acquire(est)
+            actual = None
+            try:
+                resp = self._llm.invoke(input, config=config, **kwargs)
+                actual = usage_tokens(resp)
+                return resp
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+            finally:
+                self._gov.release(ticket, actual)
+            time.sleep(delay)
+            attempt += 1
+
+    async def ainvoke(self, input: Any, config: Any = None, **kwargs: Any) -> Any:
+        est = self._estimate(input, kwargs)
+        attempt = 0
+        while True:
+            ticket = await self._gov.acquire_async(est)
+            actual = None
+            try:
+                resp = await self._llm.ainvoke(input, config=config, **kwargs)
+                actual = usage_tokens(resp)
+                return resp
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+            finally:
+                self._gov.release(ticket, actual)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def __repr__(self) -> str:
+        return f"GovernedLLM({self._llm.__class__.__name__})"
+
+
+# ---------------------------------------------------------------------
+# 프로세스 단일 인스턴스
+# ---------------------------------------------------------------------
+_GOVERNOR: Optional[LLMGovernor] = None
+_GOVERNOR_LOCK = threading.Lock()
+
+
+def get_governor() -> LLMGovernor:
+    global _GOVERNOR
+    if _GOVERNOR is None:
+        with _GOVERNOR_LOCK:
+            if _GOVERNOR is None:
+                _GOVERNOR = LLMGovernor()
+                logger.info("[LLM_GOV] rpm=%d tpm=%d max_concurrency=%d",
+                            LLM_GOV_RPM, LLM_GOV_TPM, LLM_GOV_MAX_CONCURRENCY)
+    return _GOVERNOR
+
+
+def governor_stats() -> Dict[str, Any]:
+    if _GOVERNOR is None:
+        return {"enabled": False}
+    return {"enabled": True, **_GOVERNOR.stats()}
+
+
+__all__ = [
+    "LLMGovernor",
+    "GovernedLLM",
+    "PRIORITIES",
+    "llm_priority",
+    "current_priority",
+    "count_tokens",
+    "estimate_prompt_tokens",
+    "usage_tokens",
+    "get_governor",
+    "governor_stats",
+]
@@ -0,0 +1,287 @@
+# server/utils/llm_hedge.py
+"""
+LLM 지연 히스토그램 + hedged request (느린 꼬리 지연 완화)
+
+- (deployment, prompt class) 별 최근 지연 rolling window → 백분위 / 로그 구간 히스토그램
+- hedging (LLM_HEDGE_ENABLED, async ainvoke 만):
+  · 1차 요청이 임계값(해당 키의 p{LLM_HEDGE_PERCENTILE}, 표본 부족 시 hedge 안 함)을 넘기면 같은 요청을 1번 더 보냄
+  · 먼저 끝난 쪽 결과 사용, 나머지는 취소 (취소 시 governor 슬롯/HTTP 요청도 함께 정리됨)
+  · 예산: 1차 요청마다 LLM_HEDGE_BUDGET(기본 5%) 만큼 credit 적립, hedge 1회 = credit 1 → 장기적으로 추가 호출 ≤ 5%
+- 호출 단위 지정: with llm_call_class("scope_extract", hedge=True, slo_ms=8000): ...
+  · slo_ms 를 주면 백분위 대신 그 값이 hedge 임계값, 초과 건수는 slo_violations 로 집계
+- 1차 요청이 hedge 로 취소되면 그때까지의 경과 시간(하한값)을 기록 → 임계값이 낮아지는 쪽으로 치우치지 않음
+- 순서: CachedLLM → CoalescedLLM → HedgedLLM → GovernedLLM (hedge 요청도 RPM/TPM 버킷을 거침)
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger("llm.hedge")
+
+LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "0") not in ("0", "false", "False")
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "98"))  # 예산(5%)보다 충분히 낮은 발동률
+LLM_HEDGE_BUDGET = float(os.getenv("LLM_HEDGE_BUDGET", "0.05"))
+LLM_HEDGE_MAX_CREDIT = float(os.getenv("LLM_HEDGE_MAX_CREDIT", "3"))
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+LLM_HEDGE_MIN_DELAY_MS = float(os.getenv("LLM_HEDGE_MIN_DELAY_MS", "500"))
+LLM_HEDGE_WINDOW = int(os.getenv("LLM_HEDGE_WINDOW", "500"))
+
+# 히스토그램 구간 상한(ms), 마지막은 +inf
+_BUCKETS_MS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000, 128000)
+
+_CALL_CLASS: ContextVar[Tuple[str, Optional[bool], Optional[float]]] = ContextVar(
+    "llm_call_class", default=("default", None, None)
+)
+
+
+@contextmanager
+def llm_call_class(name: str, hedge: Optional[bool] = None, slo_ms: Optional[float] = None) -> Iterator[None]:
+    """블록 안 LLM 호출의 prompt class (히스토그램 키), hedge 강제 on/off, 호출 SLO(ms)"""
+    token = _CALL_CLASS.set((name, hedge, slo_ms))
+    try:
+        yield
+    finally:
+        _CALL_CLASS.reset(token)
+
+
+def _percentile(sorted_vals: List[float], pct: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    idx = min(len(sorted_vals) - 1, max(0, int(round(pct / 100 * (len(sorted_vals) - 1)))))
+    return sorted_vals[idx]
+
+
+class _Series:
+    """한 (deployment, class) 의 rolling 지연 표본 + 카운터"""
+
+    def __init__(self) -> None:
+        self.samples: Deque[float] = deque(maxlen=LLM_HEDGE_WINDOW)
+        self.counters = {"calls": 0, "errors": 0, "hedged": 0, "hedge_wins": 0, "primary_wins": 0,
+                         "budget_denied": 0, "slo_violations": 0}
+
+    def threshold_ms(self) -> Optional[float]:
+        if len(self.samples) < LLM_HEDGE_MIN_SAMPLES:
+            return None
+        return max(_percentile(sorted(self.samples), LLM_HEDGE_PERCENTILE), LLM_HEDGE_MIN_DELAY_MS)
+
+    def snapshot(self) -> Dict[str, Any]:
+        vals = sorted(self.samples)
+        hist: Dict[str, int] = {}
+        lo = 0
+        for hi in _BUCKETS_MS:
+            hist[f"<{hi}ms"] = sum(1 for v in vals if lo <= v < hi)
+            lo = hi
+        hist[f">={_BUCKETS_MS[-1]}ms"] = sum(1 for v in vals if v >= _BUCKETS_MS[-1])
+        out: Dict[str, Any] = {**self.counters, "samples": len(vals), "histogram_ms": hist,
+                               "hedge_threshold_ms": None}
+        th = self.threshold_ms()
+        if th is not None:
+            out["hedge_threshold_ms"] = round(th, 1)
+        if vals:
+            out.update({f"p{p}_ms": round(_percentile(vals, p), 1) for p in (50, 90, 95, 99)})
+            out["max_ms"] = round(vals[-1], 1)
+        return out
+
+
+class LatencyTracker:
+    """키별 지연 히스토그램 + 전역 hedge 예산 (thread-safe)"""
+
+    def __init__(self, budget: float = LLM_HEDGE_BUDGET, max_credit: float = LLM_HEDGE_MAX_CREDIT):
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, str], _Series] = {}
+        self._budget = budget
+        self._max_credit = max_credit
+        self._credit = 0.0
+        self._primary = 0
+        self._hedges = 0
+
+    def _get(self, key: Tuple[str, str]) -> _Series:
+        s = self._series.get(key)
+        if s is None:
+            s = self._series[key] = _Series()
+        return s
+
+    def record(self, key: Tuple[str, str], ms: float, ok: bool = True, slo_ms: Optional[float] = None) -> None:
+        with self._lock:
+            s = self._get(key)
+            s.samples.append(ms)
+            if not ok:
+                s.counters["errors"] += 1
+            if slo_ms is not None and ms > slo_ms:
+                s.counters["slo_violations"] += 1
+
+    def count(self, key: Tuple[str, str], field: str) -> None:
+        with self._lock:
+            self._get(key).counters[field] += 1
+
+    def start_call(self, key: Tuple[str, str], hedgeable: bool = True) -> Optional[float]:
+        """1차 호출 시작: (hedge 가능한 async 호출만) 예산 적립, 현재 hedge 임계값(ms) 반환 (없으면 None)"""
+        with self._lock:
+            s = self._get(key)
+            s.counters["calls"] += 1
+            if hedgeable:
+                self._primary += 1
+                self._credit = min(self._max_credit, self._credit + self._budget)
+            return s.threshold_ms()
+
+    def try_hedge(self, key: Tuple[str, str]) -> bool:
+        with self._lock:
+            s = self._get(key)
+            if self._credit < 1.0:
+                s.counters["budget_denied"] += 1
+                return False
+            self._credit -= 1.0
+            self._hedges += 1
+            s.counters["hedged"] += 1
+            return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            series = {f"{dep}|{cls}": s.snapshot() for (dep, cls), s in self._series.items()}
+            primary, hedges, credit = self._primary, self._hedges, self._credit
+        return {
+            "primary_calls": primary,
+            "hedge_calls": hedges,
+            "hedge_ratio": round(hedges / primary, 4) if primary else 0.0,
+            "budget": self._budget,
+            "credit": round(credit, 3),
+            "series": series,
+        }
+
+
+# ---------------------------------------------------------------------
+# LLM 래퍼
+# ---------------------------------------------------------------------
+def _deployment(llm: Any) -> str:
+    for attr in ("deployment_name", "azure_deployment", "model_name", "model"):
+        v = getattr(llm, attr, None)
+        if v:
+            return str(v)
+    return llm.__class__.__name__
+
+
+class HedgedLLM:
+    """invoke/ainvoke 지연을 기록하고, ainvoke 는 임계값 초과 시 hedge 요청을 보내는 프록시"""
+
+    def __init__(self, llm: Any, tracker: LatencyTracker, enabled: bool = LLM_HEDGE_ENABLED):
+        self._llm = llm
+        self._tracker = tracker
+        self._enabled = enabled
+
+    @property
+    def wrapped(self) -> Any:
+        return self._llm
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__") or name == "_llm":
+            raise AttributeError(name)
+        return getattr(self._llm, name)
+
+    def _key(self) -> Tuple[Tuple[str, str], Optional[bool], Optional[float]]:
+        cls, hedge, slo_ms = _CALL_CLASS.get()
+        return (_deployment(self._llm), cls), hedge, slo_ms
+
+    def invoke(self, input: Any, config: Any = None, **kwargs: Any) -> Any:
+        key, _, slo_ms = self._key()
+        self._tracker.start_call(key, hedgeable=False)
+        t0 = time.perf_counter()
+        ok = False
+        try:
+            resp = self._llm.invoke(input, config=config, **kwargs)
+            ok = True
+            return resp
+        finally:
+            self._tracker.record(key, (time.perf_counter() - t0) * 1000, ok=ok, slo_ms=slo_ms)
+
+    async def ainvoke(self, input: Any, config: Any = None, **kwargs: Any) -> Any:
+        key, hedge, slo_ms = self._key()
+        threshold = self._tracker.start_call(key)
+        if slo_ms is not None:
+            threshold = slo_ms
+        if not (hedge if hedge is not None else self._enabled) or threshold is None:
+            return await self._timed(key, slo_ms, input, config, kwargs)
+
+        t0 = time.perf_counter()
+        primary = asyncio.ensure_future(self._llm.ainvoke(input, config=config, **kwargs))
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=threshold / 1000)
+            if not done and self._tracker.try_hedge(key):
+                logger.debug("[LLM_HEDGE] %s slow > %.0fms, hedging", key, threshold)
+                tasks.append(asyncio.ensure_future(self._llm.ainvoke(input, config=config, **kwargs)))
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # 같은 wakeup 에 둘 다 끝났으면 성공한 쪽 우선 (집합 순서와 무관)
+                ok = [t for t in done if t.exception() is None]
+                if ok:
+                    return self._settle(key, slo_ms, t0, ok[0], primary, len(tasks) > 1)
+                if not pending:
+                    failed = primary if primary in done else next(iter(done))
+                    return self._settle(key, slo_ms, t0, failed, primary, len(tasks) > 1)
+                # 한쪽 실패 → 남은 쪽 결과를 기다림
+        finally:
+            for t in tasks:
+                if not t.done():
+                    t.cancel()
+
+    def _settle(self, key, slo_ms, t0, winner, primary, hedged: bool) -> Any:
+        ms = (time.perf_counter() - t0) * 1000
+        ok = winner.exception() is None
+        # 1차 요청 지연 기록 (hedge 로 취소되면 경과 시간 = 하한값)
+        self._tracker.record(key, ms, ok=ok, slo_ms=slo_ms)
+        if hedged and ok:
+            self._tracker.count(key, "hedge_wins" if winner is not primary else "primary_wins")
+        return winner.result()
+
+    async def _timed(self, key, slo_ms, input, config, kwargs) -> Any:
+        t0 = time.perf_counter()
+        ok = False
+        try:
+            resp = await self._llm.ainvoke(input, config=config, **kwargs)
+            ok = True
+            return resp
+        finally:
+            self._tracker.record(key, (time.perf_counter() - t0) * 1000, ok=ok, slo_ms=slo_ms)
+
+    def __repr__(self) -> str:
+        return f"HedgedLLM({self._llm.__class__.__name__})"
+
+
+# ---------------------------------------------------------------------
+# 프로세스 단일 인스턴스
+# ---------------------------------------------------------------------
+_TRACKER: Optional[LatencyTracker] = None
+_TRACKER_LOCK = threading.Lock()
+
+
+def get_latency_tracker() -> LatencyTracker:
+    global _TRACKER
+    if _TRACKER is None:
+        with _TRACKER_LOCK:
+            if _TRACKER is None:
+                _TRACKER = LatencyTracker()
+    return _TRACKER
+
+
+def hedge_stats() -> Dict[str, Any]:
+    if _TRACKER is None:
+        return {"primary_calls": 0, "series": {}}
+    return {"percentile": LLM_HEDGE_PERCENTILE, **_TRACKER.stats()}
+
+
+__all__ = [
+    "LatencyTracker",
+    "HedgedLLM",
+    "llm_call_class",
+    "get_latency_tracker",
+    "hedge_stats",
+]
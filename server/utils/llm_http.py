@@ -0,0 +1,158 @@
+# server/utils/llm_http.py
+"""
+LLM 호출용 공유 HTTP 클라이언트 (keep-alive 커넥션 풀, 가능하면 HTTP/2)
+
+- 프로세스당 sync/async httpx 클라이언트 1개씩 → AzureChatOpenAI / AzureOpenAIEmbeddings / OpenAIWrapper 가 공유
+- async 클라이언트는 이벤트 루프별 transport 로 분기 (uvicorn 루프, job worker, asyncio.run 스크립트가 섞여도
+  다른 루프의 커넥션을 재사용하지 않음)
+- HTTP/2 는 h2 패키지가 있을 때만 사용, 없으면 HTTP/1.1 keep-alive 로 폴백
+- ainvoke_llm(llm, input): 에이전트용 async 호출 헬퍼 (native ainvoke → agenerate → to_thread 순 폴백)
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import weakref
+from typing import Any, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger("llm.http")
+
+try:
+    import h2  # noqa: F401  (httpx http2=True 필요 패키지)
+    _H2_AVAILABLE = True
+except Exception:
+    _H2_AVAILABLE = False
+
+LLM_HTTP2 = os.getenv("LLM_HTTP2", "1") not in ("0", "false", "False")
+LLM_HTTP_MAX_CONNECTIONS = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "100"))
+LLM_HTTP_MAX_KEEPALIVE = int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "32"))
+LLM_HTTP_KEEPALIVE_EXPIRY_SEC = float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY_SEC", "60"))
+LLM_HTTP_TIMEOUT_SEC = float(os.getenv("LLM_HTTP_TIMEOUT_SEC", "120"))
+LLM_HTTP_CONNECT_TIMEOUT_SEC = float(os.getenv("LLM_HTTP_CONNECT_TIMEOUT_SEC", "10"))
+
+
+def _http2_enabled() -> bool:
+    return LLM_HTTP2 and _H2_AVAILABLE
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=LLM_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=LLM_HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=LLM_HTTP_KEEPALIVE_EXPIRY_SEC,
+    )
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(LLM_HTTP_TIMEOUT_SEC, connect=LLM_HTTP_CONNECT_TIMEOUT_SEC)
+
+
+class _LoopLocalTransport(httpx.AsyncBaseTransport):
+    """실행 중인 이벤트 루프마다 별도 AsyncHTTPTransport (커넥션 풀) 를 두는 transport"""
+
+    def __init__(self) -> None:
+        self._transports: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncHTTPTransport]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def _for_loop(self) -> httpx.AsyncHTTPTransport:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            tr = self._transports.get(loop)
+            if tr is None:
+                tr = httpx.AsyncHTTPTransport(http2=_http2_enabled(), limits=_limits())
+                self._transports[loop] = tr
+            return tr
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._for_loop().handle_async_request(request)
+
+    async def aclose(self) -> None:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            tr = self._transports.pop(loop, None)
+        if tr is not None:
+            await tr.aclose()
+
+    def pool_count(self) -> int:
+        with self._lock:
+            return len(self._transports)
+
+
+_SYNC_CLIENT: Optional[httpx.Client] = None
+_ASYNC_CLIENT: Optional[httpx.AsyncClient] = None
+_ASYNC_TRANSPORT: Optional[_LoopLocalTransport] = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_sync_http_client() -> httpx.Client:
+    """프로세스 공용 sync 클라이언트 (기존 invoke 경로용)"""
+    global _SYNC_CLIENT
+    if _SYNC_CLIENT is None:
+        with _CLIENT_LOCK:
+            if _SYNC_CLIENT is None:
+                _SYNC_CLIENT = httpx.Client(http2=_http2_enabled(), limits=_limits(), timeout=_timeout())
+    return _SYNC_CLIENT
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """프로세스 공용 async 클라이언트 (루프별 커넥션 풀)"""
+    global _ASYNC_CLIENT, _ASYNC_TRANSPORT
+    if _ASYNC_CLIENT is None:
+        with _CLIENT_LOCK:
+            if _ASYNC_CLIENT is None:
+                _ASYNC_TRANSPORT = _LoopLocalTransport()
+                _ASYNC_CLIENT = httpx.AsyncClient(transport=_ASYNC_TRANSPORT, timeout=_timeout())
+                logger.info("[LLM_HTTP] shared client http2=%s max_conn=%d keepalive=%d",
+                            _http2_enabled(), LLM_HTTP_MAX_CONNECTIONS, LLM_HTTP_MAX_KEEPALIVE)
+    return _ASYNC_CLIENT
+
+
+async def aclose_http_clients() -> None:
+    """현재 루프의 async 커넥션 풀 + sync 클라이언트 정리 (lifespan 종료 시)"""
+    global _SYNC_CLIENT
+    if _ASYNC_TRANSPORT is not None:
+        await _ASYNC_TRANSPORT.aclose()
+    with _CLIENT_LOCK:
+        client, _SYNC_CLIENT = _SYNC_CLIENT, None
+    if client is not None:
+        client.close()
+
+
+def http_client_info() -> Dict[str, Any]:
+    return {
+        "http2": _http2_enabled(),
+        "h2_available": _H2_AVAILABLE,
+        "max_connections": LLM_HTTP_MAX_CONNECTIONS,
+        "max_keepalive": LLM_HTTP_MAX_KEEPALIVE,
+        "keepalive_expiry_sec": LLM_HTTP_KEEPALIVE_EXPIRY_SEC,
+        "timeout_sec": LLM_HTTP_TIMEOUT_SEC,
+        "async_loops": _ASYNC_TRANSPORT.pool_count() if _ASYNC_TRANSPORT is not None else 0,
+    }
+
+
+async def ainvoke_llm(llm: Any, input: Any, **kwargs: Any) -> Any:
+    """
+    LLM 비동기 호출: ainvoke(네이티브 async) → agenerate → invoke/callable 을 스레드로 (구형 래퍼 호환)
+    """
+    if hasattr(llm, "ainvoke"):
+        return await llm.ainvoke(input, **kwargs)
+    if hasattr(llm, "agenerate"):
+        return await llm.agenerate(input)
+    if hasattr(llm, "invoke"):
+        return await asyncio.to_thread(llm.invoke, input, **kwargs)
+    return await asyncio.to_thread(llm, input)
+
+
+__all__ = [
+    "get_sync_http_client",
+    "get_async_http_client",
+    "aclose_http_clients",
+    "http_client_info",
+    "ainvoke_llm",
+]
@@ -0,0 +1,169 @@
+# server/workflow/agent_registry.py
+"""
+프로세스 공용 Agent 레지스트리 / warm pool
+
+- ScopeAgent / ScheduleAgent 등은 생성 비용이 크므로(LLM 클라이언트, PromptManager, ToT/Self-Refine)
+  요청마다 만들지 않고 FastAPI 시작 시(lifespan) 미리 N개를 만들어 대여한다
+- 각 인스턴스는 한 번에 한 요청만 사용 (acquire/release) → 풀 크기 = 타입별 동시 처리 수
+- 시작 전(스크립트 실행 등)에 acquire 되면 그 시점에 lazy 생성
+- 풀 크기: AGENT_POOL_SIZE (기본 2), 타입별 AGENT_POOL_SIZE_<NAME> 로 override
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger("pm.agents")
+
+DEFAULT_POOL_SIZE = int(os.getenv("AGENT_POOL_SIZE", "2"))
+
+
+def _pool_size(name: str, size: Optional[int]) -> int:
+    env = os.getenv(f"AGENT_POOL_SIZE_{name.upper()}")
+    if env:
+        return max(int(env), 1)
+    return max(int(size or DEFAULT_POOL_SIZE), 1)
+
+
+class AgentPool:
+    """동일 타입 agent 인스턴스 풀 (asyncio.Queue 기반 대여)"""
+
+    def __init__(self, name: str, factory: Callable[[], Any], size: Optional[int] = None):
+        self.name = name
+        self.factory = factory
+        self.size = _pool_size(name, size)
+        self._queue: Optional[asyncio.Queue] = None
+        self._created = 0
+        self._lock = threading.Lock()
+        self.construct_ms: List[float] = []
+        self.acquired = 0
+        self.waited = 0
+        self.wait_ms_total = 0.0
+
+    def _construct(self) -> Any:
+        t0 = time.perf_counter()
+        agent = self.factory()
+        ms = round((time.perf_counter() - t0) * 1000, 1)
+        self.construct_ms.append(ms)
+        logger.info("[AGENTS] %s 인스턴스 생성 %.1fms (%d/%d)", self.name, ms, len(self.construct_ms), self.size)
+        return agent
+
+    def _reserve(self) -> bool:
+        with self._lock:
+            if self._created >= self.size:
+                return False
+            self._created += 1
+            return True
+
+    def _release_slot(self) -> None:
+        with self._lock:
+            self._created -= 1
+
+    def _q(self) -> asyncio.Queue:
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        return self._queue
+
+    async def warm(self) -> None:
+        """남은 슬롯만큼 인스턴스를 미리 생성 (생성은 스레드에서 병렬)"""
+        n = 0
+        while self._reserve():
+            n += 1
+        if not n:
+            return
+        agents = await asyncio.gather(
+            *(asyncio.to_thread(self._construct) for _ in range(n)), return_exceptions=True
+        )
+        errors = [a for a in agents if isinstance(a, Exception)]
+        for a in agents:
+            if isinstance(a, Exception):
+                self._release_slot()
+            else:
+                self._q().put_nowait(a)
+        if errors:
+            raise errors[0]
+
+    @asynccontextmanager
+    async def acquire(self):
+        q = self._q()
+        agent = None
+        if q.empty() and self._reserve():
+            try:
+                agent = await asyncio.to_thread(self._construct)
+            except Exception:
+                self._release_slot()
+                raise
+        if agent is None:
+            t0 = time.perf_counter()
+            if q.empty():
+                self.waited += 1
+            agent = await q.get()
+            self.wait_ms_total += (time.perf_counter() - t0) * 1000
+        self.acquired += 1
+        try:
+            yield agent
+        finally:
+            q.put_nowait(agent)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": self.size,
+            "created": len(self.construct_ms),
+            "idle": self._queue.qsize() if self._queue is not None else 0,
+            "construct_ms": list(self.construct_ms),
+            "acquired": self.acquired,
+            "waited": self.waited,
+            "wait_ms_total": round(self.wait_ms_total, 1),
+        }
+
+
+class AgentRegistry:
+    def __init__(self):
+        self._pools: Dict[str, AgentPool] = {}
+        self.startup_report: Dict[str, Any] = {}
+
+    def register(self, name: str, factory: Callable[[], Any], size: Optional[int] = None) -> None:
+        if name not in self._pools:
+            self._pools[name] = AgentPool(name, factory, size)
+
+    def has(self, name: str) -> bool:
+        return name in self._pools
+
+    def acquire(self, name: str):
+        """async with registry.acquire("scope") as agent: ..."""
+        if name not in self._pools:
+            raise RuntimeError(f"agent '{name}' is not registered")
+        return self._pools[name].acquire()
+
+    async def startup(self) -> Dict[str, Any]:
+        """FastAPI lifespan 에서 호출: 등록된 모든 풀을 warm-up"""
+        t0 = time.perf_counter()
+        results = await asyncio.gather(*(p.warm() for p in self._pools.values()), return_exceptions=True)
+        errors = {
+            name: str(r) for name, r in zip(self._pools, results) if isinstance(r, Exception)
+        }
+        for name, err in errors.items():
+            logger.error("[AGENTS] %s warm-up 실패 (요청 시 lazy 생성): %s", name, err)
+        self.startup_report = {
+            "elapsed_ms": round((time.perf_counter() - t0) * 1000, 1),
+            "pools": {n: p.stats() for n, p in self._pools.items()},
+            "errors": errors,
+        }
+        logger.info("[AGENTS] warm pool 준비 완료: %s", self.startup_report)
+        return self.startup_report
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "startup": {k: v for k, v in self.startup_report.items() if k != "pools"},
+            "pools": {n: p.stats() for n, p in self._pools.items()},
+        }
+
+
+agent_registry = AgentRegistry()
+
+__all__ = ["AgentPool", "AgentRegistry", "agent_registry"]
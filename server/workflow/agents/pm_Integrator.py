@@ -1,6 +1,7 @@
 # server/workflow/agents/pm_integrator.py
 
 from __future__ import annotations
+from datetime import date
 from typing import Any, Dict, List, Optional
 
 import logging
@@ -10,8 +11,9 @@ from sqlalchemy.orm import Session
 from server.workflow.agents.pm_analyzer import PM_AnalyzerAgent
 from server.workflow.agents.pm_report import build_weekly_report
 
-# DB 모델
-from server.db import pm_models
+# DB 모델 / 단일 writer 큐
+from server.db import pm_crud, pm_models
+from server.db.writer import get_writer
 
 logger = logging.getLogger(__name__)
 
@@ -55,18 +57,7 @@ class PM_Integrator:
         logger.info(f"[Integrator] 회의 인제스트 시작: {project_id}, title={title}")
 
         # -----------------------
-        # 1) Meeting 저장
-        # -----------------------
-        meeting = pm_models.Meeting(
-            project_id=project_id,
-            title=title,
-            raw_text=text,
-        )
-        self.db.add(meeting)
-        self.db.flush()  # meeting.id 확보
-
-        # -----------------------
-        # 2) LLM 기반 액션아이템 생성 (재사용)
+        # 1) LLM 기반 액션아이템 생성 (재사용) - DB 쓰기 lock 없이 먼저 수행
         # -----------------------
         items = self.analyzer.analyze_minutes(
             text,
@@ -74,32 +65,38 @@ class PM_Integrator:
         )
 
         # -----------------------
-        # 3) DB 저장
+        # 2) Meeting + ActionItem 저장 (단일 writer 큐, 한 트랜잭션)
         # -----------------------
-        created = 0
-        for item in items:
-            ai = pm_models.PM_ActionItem(
+        def _persist(db: Session):
+            meeting = pm_models.Meeting(
                 project_id=project_id,
-                meeting_id=meeting.id,
-                assignee=item.get("assignee"),
-                task=item.get("task"),
-                due_date=item.get("due_date"),
-                priority=item.get("priority"),
-                status=item.get("status"),
-                module=item.get("module"),
-                phase=item.get("phase"),
+                date=date.today(),
+                title=title,
+                raw_text=text,
             )
-            self.db.add(ai)
-            created += 1
-
-        self.db.commit()
+            db.add(meeting)
+            db.flush()  # meeting.id 확보
+            created = pm_crud.insert_action_items(db, [{
+                "project_id": project_id,
+                "meeting_id": meeting.id,
+                "assignee": item.get("assignee"),
+                "task": item.get("task"),
+                "due_date": item.get("due_date"),
+                "priority": item.get("priority"),
+                "status": item.get("status"),
+                "module": item.get("module"),
+                "phase": item.get("phase"),
+            } for item in items])
+            return meeting.id, created
+
+        meeting_id, created = get_writer().call(_persist)
 
         logger.info(
-            f"[Integrator] 회의 인제스트 완료: meeting_id={meeting.id}, 생성된 AI={created}"
+            f"[Integrator] 회의 인제스트 완료: meeting_id={meeting_id}, 생성된 AI={created}"
         )
 
         return {
-            "meeting_id": meeting.id,
+            "meeting_id": meeting_id,
             "action_items_created": created,
             "items": items,
         }
@@ -121,17 +118,7 @@ class PM_Integrator:
 
         logger.info(f"[Integrator] 문서 인제스트 시작: {project_id}, type={doc_type}")
 
-        # 1) 문서 저장
-        doc = pm_models.PM_Document(
-            project_id=project_id,
-            title=title,
-            raw_text=text,
-            doc_type=doc_type,
-        )
-        self.db.add(doc)
-        self.db.flush()
-
-        # 2) 분석 (필요 시)
+        # 1) 분석 (필요 시)
         if doc_type in ("issue", "report"):
             items = self.analyzer.analyze_issue(
                 text, project_meta=meta or {"project_id": project_id}
@@ -139,23 +126,31 @@ class PM_Integrator:
         else:
             items = []
 
-        # 3) 액션아이템 저장
-        for item in items:
-            ai = pm_models.PM_ActionItem(
+        # 2) 문서 + 액션아이템 저장 (단일 writer 큐, 한 트랜잭션)
+        def _persist(db: Session):
+            doc = pm_models.PM_Document(
                 project_id=project_id,
-                document_id=doc.id,
-                assignee=item.get("assignee"),
-                task=item.get("task"),
-                due_date=item.get("due_date"),
-                priority=item.get("priority"),
-                status=item.get("status"),
+                title=title,
+                content=text,
+                doc_type=doc_type,
             )
-            self.db.add(ai)
-
-        self.db.commit()
+            db.add(doc)
+            db.flush()
+            pm_crud.insert_action_items(db, [{
+                "project_id": project_id,
+                "document_id": doc.id,
+                "assignee": item.get("assignee"),
+                "task": item.get("task"),
+                "due_date": item.get("due_date"),
+                "priority": item.get("priority"),
+                "status": item.get("status"),
+            } for item in items])
+            return doc.id
+
+        doc_id = get_writer().call(_persist)
 
         return {
-            "document_id": doc.id,
+            "document_id": doc_id,
             "action_items_created": len(items),
             "items": items,
         }
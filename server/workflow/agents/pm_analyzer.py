@@ -7,6 +7,7 @@ import logging
 from typing import Any, Dict, List, Optional
 
 from server.utils.config import get_llm
+from server.utils.llm_http import ainvoke_llm
 
 # 로거 설정
 logger = logging.getLogger(__name__)
@@ -188,17 +189,31 @@ class PM_AnalyzerAgent:
             logger.error(f"❌ {error_msg}")
             raise TypeError(error_msg)
 
-    def _run(self, doc_kind: str, text: str, project_meta: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _prompts(self, doc_kind: str, text: str, project_meta: Optional[Dict[str, Any]]):
         logger.info(f"{'='*60}")
         logger.info(f"🔍 분석 시작 - 문서 유형: {doc_kind}")
         logger.info(f"📄 입력 텍스트 길이: {len(text)} 문자")
-        
+
         sys_prompt = _make_system_prompt(doc_kind)
         user_prompt = _make_user_prompt(text, project_meta)
-        
+
         logger.info(f"📝 시스템 프롬프트 길이: {len(sys_prompt)} 문자")
         logger.info(f"📝 사용자 프롬프트 길이: {len(user_prompt)} 문자")
-        
+        return sys_prompt, user_prompt
+
+    def _finish(self, content: Optional[str], text: str) -> List[Dict[str, Any]]:
+        j = _json_first(content or "")
+        if not j:
+            logger.warning("⚠️ JSON 추출 실패")
+            return _fallback_rules(text)
+
+        result = _postprocess(j, text)
+        logger.info(f"✅ 분석 완료 - 총 {len(result)}개 항목 추출")
+        logger.info(f"{'='*60}\n")
+        return result
+
+    def _run(self, doc_kind: str, text: str, project_meta: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        sys_prompt, user_prompt = self._prompts(doc_kind, text, project_meta)
         try:
             logger.info("🤖 LLM 호출 시작 (메시지 형식)...")
             messages = [
@@ -209,7 +224,7 @@ class PM_AnalyzerAgent:
             content = getattr(resp, "content", None) or str(resp)
             logger.info(f"✅ LLM 응답 수신 - 길이: {len(content)} 문자")
             logger.debug(f"LLM 응답 내용 (처음 500자):\n{content[:500]}")
-            
+
         except Exception as e1:
             logger.warning(f"⚠️ 메시지 형식 실패: {e1}")
             try:
@@ -219,26 +234,48 @@ class PM_AnalyzerAgent:
                 content = getattr(content, "content", None) or str(content)
                 logger.info(f"✅ LLM 응답 수신 (재시도) - 길이: {len(content)} 문자")
                 logger.debug(f"LLM 응답 내용 (처음 500자):\n{content[:500]}")
-                
+
+            except Exception as e2:
+                logger.error(f"❌ LLM 호출 완전 실패: {e2}")
+                logger.info("폴백 규칙으로 전환")
+                return _fallback_rules(text)
+
+        return self._finish(content, text)
+
+    async def _arun(self, doc_kind: str, text: str, project_meta: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """_run 의 async 버전 (ainvoke 네이티브 경로, 취소 시 HTTP 요청도 함께 취소됨)"""
+        sys_prompt, user_prompt = self._prompts(doc_kind, text, project_meta)
+        try:
+            logger.info("🤖 LLM 비동기 호출 시작 (메시지 형식)...")
+            messages = [
+                {"role": "system", "content": sys_prompt},
+                {"role": "user", "content": user_prompt},
+            ]
+            resp = await ainvoke_llm(self.llm, messages)
+            content = getattr(resp, "content", None) or str(resp)
+            logger.info(f"✅ LLM 응답 수신 - 길이: {len(content)} 문자")
+        except Exception as e1:
+            logger.warning(f"⚠️ 메시지 형식 실패: {e1}")
+            try:
+                logger.info("🤖 LLM 비동기 호출 재시도 (단일 프롬프트 형식)...")
+                resp = await ainvoke_llm(self.llm, sys_prompt + "\n\n" + user_prompt)
+                content = getattr(resp, "content", None) or str(resp)
+                logger.info(f"✅ LLM 응답 수신 (재시도) - 길이: {len(content)} 문자")
             except Exception as e2:
                 logger.error(f"❌ LLM 호출 완전 실패: {e2}")
                 logger.info("폴백 규칙으로 전환")
                 return _fallback_rules(text)
-        
-        j = _json_first(content or "")
-        if not j:
-            logger.warning("⚠️ JSON 추출 실패")
-            return _fallback_rules(text)
-        
-        result = _postprocess(j, text)
-        logger.info(f"✅ 분석 완료 - 총 {len(result)}개 항목 추출")
-        logger.info(f"{'='*60}\n")
-        return result
+
+        return self._finish(content, text)
 
     def analyze_minutes(self, text: str, project_meta: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         logger.info("📋 회의록 분석 요청")
         return self._run("meeting minutes", text, project_meta)
 
+    async def aanalyze_minutes(self, text: str, project_meta: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        logger.info("📋 회의록 분석 요청 (async)")
+        return await self._arun("meeting minutes", text, project_meta)
+
     def analyze_rfp(self, text: str, project_meta: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         logger.info("📋 RFP 분석 요청")
         return self._run("RFP", text, project_meta)
@@ -3,9 +3,10 @@ from datetime import datetime, timedelta, date
 from typing import Any, Dict, List, Optional
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func, desc
+from sqlalchemy import desc
 
 from server.db import pm_models
+from server.db.pm_summary import action_item_summary
 
 
 def _to_str(dt: Optional[date]) -> Optional[str]:
@@ -16,19 +17,20 @@ def _to_str(dt: Optional[date]) -> Optional[str]:
     return dt.strftime("%Y-%m-%d")
 
 
-def _row_action_item(ai: "pm_models.PM_ActionItem") -> Dict[str, Any]:
+def _row_action_item(ai: Dict[str, Any]) -> Dict[str, Any]:
+    # ai: pm_summary.action_item_summary 미리보기 행 (컬럼 dict)
     return {
-        "id": ai.id,
-        "assignee": ai.assignee,
-        "task": ai.task,
-        "due_date": _to_str(ai.due_date),
-        "priority": ai.priority,
-        "status": ai.status,
-        "module": ai.module,
-        "phase": ai.phase,
-        "document_id": ai.document_id,
-        "meeting_id": ai.meeting_id,
-        "created_at": _to_str(ai.created_at),
+        "id": ai["id"],
+        "assignee": ai["assignee"],
+        "task": ai["task"],
+        "due_date": _to_str(ai["due_date"]),
+        "priority": ai["priority"],
+        "status": ai["status"],
+        "module": ai["module"],
+        "phase": ai["phase"],
+        "document_id": ai["document_id"],
+        "meeting_id": ai["meeting_id"],
+        "created_at": _to_str(ai["created_at"]),
     }
 
 
@@ -86,61 +88,8 @@ def build_weekly_report(db: Session, project_id: int, lookback_days: int = 14) -
     )
 
     # ---------- 액션 아이템 요약 ----------
-    # 전체 오픈
-    open_items = (
-        db.query(pm_models.PM_ActionItem)
-        .filter(
-            pm_models.PM_ActionItem.project_id == project_id,
-            pm_models.PM_ActionItem.status.in_(["Open", "In Progress", "Todo"]),
-        )
-        .order_by(
-            desc(pm_models.PM_ActionItem.priority == "High"),
-            pm_models.PM_ActionItem.due_date.is_(None),
-            pm_models.PM_ActionItem.due_date.asc(),
-        )
-        .all()
-    )
-
-    # 지각(Overdue)
-    overdue_items = (
-        db.query(pm_models.PM_ActionItem)
-        .filter(
-            pm_models.PM_ActionItem.project_id == project_id,
-            pm_models.PM_ActionItem.status.in_(["Open", "In Progress", "Todo"]),
-            pm_models.PM_ActionItem.due_date.isnot(None),
-            pm_models.PM_ActionItem.due_date < today,
-        )
-        .order_by(pm_models.PM_ActionItem.due_date.asc())
-        .all()
-    )
-
-    # 이번주 마감 (다음 7일)
-    upcoming_items = (
-        db.query(pm_models.PM_ActionItem)
-        .filter(
-            pm_models.PM_ActionItem.project_id == project_id,
-            pm_models.PM_ActionItem.status.in_(["Open", "In Progress", "Todo"]),
-            pm_models.PM_ActionItem.due_date.isnot(None),
-            pm_models.PM_ActionItem.due_date >= today,
-            pm_models.PM_ActionItem.due_date < today + timedelta(days=7),
-        )
-        .order_by(pm_models.PM_ActionItem.due_date.asc())
-        .all()
-    )
-
-    # 상태별/우선순위별 카운트
-    status_counts = dict(
-        db.query(pm_models.PM_ActionItem.status, func.count(pm_models.PM_ActionItem.id))
-        .filter(pm_models.PM_ActionItem.project_id == project_id)
-        .group_by(pm_models.PM_ActionItem.status)
-        .all()
-    )
-    priority_counts = dict(
-        db.query(pm_models.PM_ActionItem.priority, func.count(pm_models.PM_ActionItem.id))
-        .filter(pm_models.PM_ActionItem.project_id == project_id)
-        .group_by(pm_models.PM_ActionItem.priority)
-        .all()
-    )
+    # 오픈/지각/이번주 마감(다음 7일) 건수 + 미리보기 + 상태/우선순위 카운트 (SQL 집계 2회, 프로젝트별 캐시)
+    summary = action_item_summary(db, project_id, today=today, upcoming_days=7, preview_limit=20, list_limit=20)
 
     report = {
         "project_id": project_id,
@@ -149,12 +98,14 @@ def build_weekly_report(db: Session, project_id: int, lookback_days: int = 14) -
         "meetings_recent": [_row_meeting(m) for m in recent_meetings],
         "documents_recent": [_row_document(d) for d in recent_docs],
         "action_items": {
-            "open_total": len(open_items),
-            "open_preview": [_row_action_item(ai) for ai in open_items[:20]],
-            "overdue": [_row_action_item(ai) for ai in overdue_items[:20]],
-            "upcoming_7d": [_row_action_item(ai) for ai in upcoming_items[:20]],
-            "status_counts": status_counts,
-            "priority_counts": priority_counts,
+            "open_total": summary["open_total"],
+            "overdue_total": summary["overdue_total"],
+            "upcoming_7d_total": summary["upcoming_total"],
+            "open_preview": [_row_action_item(ai) for ai in summary["open_preview"]],
+            "overdue": [_row_action_item(ai) for ai in summary["overdue"]],
+            "upcoming_7d": [_row_action_item(ai) for ai in summary["upcoming"]],
+            "status_counts": summary["status_counts"],
+            "priority_counts": summary["priority_counts"],
         },
     }
     return report
@@ -4,6 +4,8 @@ from typing import Any, Dict, List, Optional
 import json
 import logging
 
+from server.utils.llm_governor import llm_priority
+
 logger = logging.getLogger(__name__)
 
 class QualityAgent:
@@ -115,7 +117,9 @@ class QualityAgent:
                 {"role": "system", "content": "You are a requirements quality expert."},
                 {"role": "user", "content": prompt}
             ]
-            response = self.llm.invoke(messages)
+            # 품질 검증은 백그라운드 우선순위 (governor 큐)
+            with llm_priority("background"):
+                response = self.llm.invoke(messages)
             
             # 응답에서 content 추출
             if hasattr(response, 'content'):
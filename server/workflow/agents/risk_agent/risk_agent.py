@@ -1,11 +1,14 @@
 # server/workflow/agents/risk_agent/risk_agent.py
 
 from __future__ import annotations
+from pathlib import Path
 from typing import Any, Dict, List, Optional
+import json
 import logging
 
 # 기존 규칙 기반 리스크 엔진 재사용
-from server.workflow.agents.pm_risk import draft_risks_from_actions
+from server.workflow.agents.risk_agent.pm_risk import draft_risks_from_actions
+from server.workflow.agents.risk_agent.monte_carlo import MC_ITERATIONS, simulate_schedule
 
 logger = logging.getLogger(__name__)
 
@@ -15,7 +18,7 @@ class RiskAgent:
     High-Level Risk Agent
 
     - 액션아이템 기반 리스크 초안 생성 (pm_risk.py 재사용)
-    - Scope/Cost/Schedule 기반 프로젝트 리스크 Skeleton
+    - Scope/Cost/Schedule 기반 프로젝트 리스크 + WBS 일정 Monte Carlo (monte_carlo.py)
     """
 
     def __init__(self) -> None:
@@ -31,18 +34,54 @@ class RiskAgent:
             "risks": risks,
         }
 
-    # 2) Scope/Cost/Schedule 기반 프로젝트 리스크 (Skeleton)
+    # 2) Scope/Cost/Schedule 기반 프로젝트 리스크 + 일정 Monte Carlo
     def analyze_project(
         self,
         project_id: str,
         scope: Dict[str, Any],
         cost: Dict[str, Any],
         schedule: Dict[str, Any],
+        simulation: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
+        """
+        simulation: {"iterations", "distribution"("pert"|"triangular"), "workers", "seed", "start_date"}
+        """
         req_count = len(scope.get("requirements", []))
         total_cost = cost.get("total_cost", 0)
         cp_days = schedule.get("critical_path_length_days")
 
+        comments = []
+        schedule_risk: Dict[str, Any] = {"status": "skipped", "reason": "WBS 없음"}
+        tasks = self._load_tasks(project_id, scope, schedule)
+        if tasks:
+            opts = dict(simulation or {})
+            try:
+                schedule_risk = simulate_schedule(
+                    tasks,
+                    iterations=int(opts.get("iterations", MC_ITERATIONS)),
+                    distribution=opts.get("distribution", "pert"),
+                    seed=opts.get("seed"),
+                    workers=int(opts.get("workers", 1)),
+                    start_date=opts.get("start_date") or (schedule.get("calendar") or {}).get("start_date"),
+                )
+            except Exception as e:
+                logger.warning("[RiskAgent] Monte Carlo 실패: %s", e)
+                schedule_risk = {"status": "error", "reason": str(e)}
+
+        if schedule_risk.get("status") == "ok":
+            if cp_days is None:
+                cp_days = schedule_risk["deterministic_days"]
+            buffer = schedule_risk["p80_days"] - schedule_risk["deterministic_days"]
+            comments.append(
+                f"P80 완료까지 {schedule_risk['p80_days']}일 (확정 일정 대비 +{buffer:.1f}일 버퍼 필요), "
+                f"확정 일정 내 완료 확률 {schedule_risk['prob_within_deterministic'] * 100:.0f}%."
+            )
+            top = [t["id"] for t in schedule_risk.get("top_critical", [])[:5]]
+            if top:
+                comments.append(f"주공정 빈도가 높은 작업: {', '.join(top)}")
+        else:
+            comments.append("WBS 를 찾지 못해 일정 Monte Carlo 를 건너뜀.")
+
         return {
             "project_id": project_id,
             "summary": {
@@ -50,12 +89,34 @@ class RiskAgent:
                 "total_cost": total_cost,
                 "critical_path_days": cp_days,
             },
-            "comments": [
-                "Skeleton RiskAgent — 상세 모델은 향후 Monte Carlo/CP 기반으로 확장 예정.",
-                "요구사항 수가 많고, CP 길이가 길수록 일정 리스크가 증가할 수 있음.",
-            ],
+            "schedule_risk": schedule_risk,
+            "comments": comments,
         }
 
+    @staticmethod
+    def _load_tasks(project_id: str, scope: Dict[str, Any], schedule: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """schedule["wbs"] 또는 WBS JSON 경로(schedule/scope 결과, data/<project_id>) → 평탄화 작업 목록"""
+        from server.workflow.agents.schedule_agent.outputs.change_mgmt import ChangeManagementGenerator
+
+        wbs = schedule.get("wbs") if isinstance(schedule.get("wbs"), dict) else None
+        if wbs is None:
+            candidates = [
+                schedule.get("wbs_json_path"),
+                (schedule.get("inputs") or {}).get("wbs_structure"),
+                scope.get("wbs_json") if isinstance(scope.get("wbs_json"), str) else None,
+                str(Path("data") / str(project_id) / "wbs_structure.json"),
+            ]
+            for c in candidates:
+                if c and Path(c).exists():
+                    try:
+                        wbs = json.loads(Path(c).read_text(encoding="utf-8"))
+                        break
+                    except Exception as e:
+                        logger.warning("[RiskAgent] WBS 로드 실패(%s): %s", c, e)
+        if isinstance(scope.get("wbs_json"), dict) and wbs is None:
+            wbs = scope["wbs_json"]
+        return ChangeManagementGenerator._flatten_wbs(wbs) if wbs else []
+
     # 3) 통합 엔드포인트
     def analyze(
         self,
@@ -64,6 +125,7 @@ class RiskAgent:
         cost: Dict[str, Any],
         schedule: Dict[str, Any],
         actions: Optional[List[Dict[str, Any]]] = None,
+        simulation: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         actions = actions or []
         action_risks = self.analyze_actions(actions) if actions else {
@@ -71,7 +133,7 @@ class RiskAgent:
             "count": 0,
             "risks": [],
         }
-        project_risks = self.analyze_project(project_id, scope, cost, schedule)
+        project_risks = self.analyze_project(project_id, scope, cost, schedule, simulation=simulation)
 
         return {
             "status": "ok",
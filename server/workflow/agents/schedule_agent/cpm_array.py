@@ -0,0 +1,245 @@
+# server/workflow/agents/schedule_agent/cpm_array.py
+"""
+배열 기반 CPM 엔진 (대형 WBS용)
+
+- 작업 id 를 한 번만 정수 인덱스로 바꾸고 선행/후행 관계를 CSR(정렬된 edge 배열)로 보관
+- 최장경로 깊이(level) 단위로 forward / backward pass 를 이웃 슬롯별 NumPy maximum/minimum 으로 계산
+- CPMEngine.build_dag_and_schedule 와 같은 ES/EF/LS/LF/FLOAT dict 계약을 반환
+- duration 은 (n,) 또는 (n, S) 배열 모두 지원 → 몬테카를로 등 S개 시나리오를 한 번에 계산
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from server.workflow.agents.schedule_agent.cpm_links import find_cycles, format_cycle, task_links
+
+logger = logging.getLogger("schedule.cpm")
+
+
+def _ragged_take(ptr: np.ndarray, idx: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+    """CSR(ptr, idx) 에서 nodes 각각의 이웃을 이어붙여 반환"""
+    starts = ptr[nodes]
+    counts = ptr[nodes + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return idx[:0]
+    offsets = np.repeat(starts - np.concatenate(([0], np.cumsum(counts)[:-1])), counts)
+    return idx[offsets + np.arange(total)]
+
+
+def _levels(n: int, src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+    """frontier 단위 Kahn 위상정렬. level[v] = 소스로부터의 최장 edge 수, 순환에 걸린 노드는 -1"""
+    level = np.full(n, -1, dtype=np.int64)
+    if n == 0:
+        return level
+    order = np.argsort(src, kind="stable")
+    ptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=ptr[1:])
+    succ = dst[order]
+    indeg = np.bincount(dst, minlength=n).astype(np.int64)
+
+    frontier = np.flatnonzero(indeg == 0)
+    depth = 0
+    while frontier.size:
+        level[frontier] = depth
+        nxt = _ragged_take(ptr, succ, frontier)
+        if nxt.size == 0:
+            break
+        # level 마다 O(n) 이 되지 않도록 이번 frontier 의 후행작업만 갱신
+        np.subtract.at(indeg, nxt, 1)
+        cand = np.unique(nxt)
+        frontier = cand[indeg[cand] == 0]
+        depth += 1
+    return level
+
+
+@dataclass
+class _LevelSlots:
+    """한 level 에서 이웃(forward: 선행, backward: 후행)이 있는 노드들의 이웃을 슬롯 단위로 보관"""
+    nodes: np.ndarray          # key 노드 (이웃 수 내림차순)
+    slots: List[np.ndarray]    # slots[j] = 이웃이 j개 초과인 노드(앞쪽 prefix)들의 j번째 이웃
+
+
+def _segments(key: np.ndarray, other: np.ndarray, level: np.ndarray, n_levels: int) -> List[Optional[_LevelSlots]]:
+    """
+    level 별 슬롯 구성. max/min 을 reduceat(axis=0) 대신 슬롯마다 prefix 에 누적하면
+    (n, S) 시나리오 행렬에서 훨씬 빠름
+    """
+    order = np.lexsort((key, level[key]))
+    k, o = key[order], other[order]
+    out: List[Optional[_LevelSlots]] = [None] * n_levels
+    if not k.size:
+        return out
+    seg_start = np.flatnonzero(np.concatenate(([True], k[1:] != k[:-1])))
+    seg_node = k[seg_start]
+    seg_cnt = np.diff(np.append(seg_start, k.size))
+    lvl_bounds = np.searchsorted(level[seg_node], np.arange(n_levels + 1), side="left")
+    for L in range(n_levels):
+        a, b = lvl_bounds[L], lvl_bounds[L + 1]
+        if b == a:
+            continue
+        srt = np.argsort(-seg_cnt[a:b], kind="stable")
+        cnt, st = seg_cnt[a:b][srt], seg_start[a:b][srt]
+        slots = []
+        for j in range(int(cnt[0])):
+            p = int(np.count_nonzero(cnt > j))
+            slots.append(o[st[:p] + j])
+        out[L] = _LevelSlots(seg_node[a:b][srt], slots)
+    return out
+
+
+class CPMGraph:
+    """정수 인덱스화된 DAG (한 번 만들어 여러 duration 시나리오에 재사용)"""
+
+    def __init__(self, ids: Sequence[str], src: np.ndarray, dst: np.ndarray):
+        self.ids: List[str] = list(ids)
+        self.n = len(self.ids)
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+
+        level = _levels(self.n, src, dst)
+        self.cyclic = np.flatnonzero(level < 0)
+        self.cycles: List[List[str]] = []
+        if self.cyclic.size:
+            src, dst, level = self._break_cycles(src, dst, level)
+
+        self.src, self.dst, self.level = src, dst, level
+        self.n_levels = int(level.max()) + 1 if self.n else 0
+        # level 순 노드 배열 (같은 level 은 입력 순서 유지) = 위상 순서
+        self.order = np.argsort(level, kind="stable")
+        self.node_bounds = np.searchsorted(level[self.order], np.arange(self.n_levels + 1), side="left")
+        self._fwd = _segments(dst, src, level, self.n_levels)
+        self._bwd = _segments(src, dst, level, self.n_levels)
+
+    def _break_cycles(self, src: np.ndarray, dst: np.ndarray, level: np.ndarray):
+        """CPMEngine._topo 와 동일: 순환 경로를 찾아 순환을 닫는 마지막 edge 만 빼고 다시 정렬 (순환 없을 때까지)"""
+        while (level < 0).any():
+            inside = np.flatnonzero(level < 0)
+            mask = np.zeros(self.n, dtype=bool)
+            mask[inside] = True
+            sub = mask[src] & mask[dst]
+            succs: Dict[int, List[int]] = {}
+            for u, v in zip(src[sub].tolist(), dst[sub].tolist()):
+                succs.setdefault(u, []).append(v)
+            found = find_cycles(inside.tolist(), succs)
+            if not found:  # 방어: 경로를 못 찾으면 순환 노드 사이 edge 전체 무시
+                keep = ~sub
+            else:
+                for c in found:
+                    path = [self.ids[i] for i in c]
+                    logger.warning(f"[CPM] 순환 감지: {format_cycle(path)} - 마지막 관계 무시, 입력 WBS 확인 필요")
+                    self.cycles.append(path)
+                drop = np.array([c[-2] * self.n + c[-1] for c in found], dtype=np.int64)
+                keep = ~np.isin(src * self.n + dst, drop)
+            src, dst = src[keep], dst[keep]
+            level = _levels(self.n, src, dst)
+        return src, dst, level
+
+    # ---------------- construction ----------------
+    @classmethod
+    def from_tasks(cls, tasks: List[Dict[str, Any]]) -> Tuple["CPMGraph", np.ndarray]:
+        """tasks([{"id","duration","predecessors"/"dependencies"/"links"}]) → (graph, duration 배열)"""
+        index: Dict[str, int] = {}
+        ids: List[str] = []
+        dur: List[int] = []
+        preds: List[Any] = []
+        for t in tasks:
+            tid = t["id"]
+            p = [pid for pid, _, _ in task_links(t)]  # lag 없는 FS 관계만 (CPMEngine 이 분기)
+            d = int(t.get("duration", 1) or 1)
+            if tid in index:  # 중복 id 는 마지막 정의 사용 (dict 기반 엔진과 동일)
+                dur[index[tid]] = d
+                preds[index[tid]] = list(p or [])
+                continue
+            index[tid] = len(ids)
+            ids.append(tid)
+            dur.append(d)
+            preds.append(list(p or []))
+
+        src, dst, unknown = [], [], 0
+        for j, plist in enumerate(preds):
+            for pid in plist:
+                i = index.get(pid)
+                if i is None:
+                    unknown += 1
+                    continue
+                src.append(i)
+                dst.append(j)
+        if unknown:
+            logger.warning("[CPM] 존재하지 않는 선행작업 참조 %d건 무시", unknown)
+        return cls(ids, np.array(src, dtype=np.int64), np.array(dst, dtype=np.int64)), np.array(dur, dtype=np.int64)
+
+    # ---------------- passes ----------------
+    def forward(self, dur: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """ES, EF (dur 이 (n,S) 이면 (n,S))"""
+        dur = np.asarray(dur)
+        ES = np.zeros_like(dur)
+        EF = np.empty_like(dur)
+        for L in range(self.n_levels):
+            ls = self._fwd[L]
+            if ls is not None:
+                acc = EF[ls.slots[0]]
+                for sl in ls.slots[1:]:
+                    head = acc[:sl.shape[0]]
+                    np.maximum(head, EF[sl], out=head)
+                ES[ls.nodes] = acc
+            nodes = self.order[self.node_bounds[L]:self.node_bounds[L + 1]]
+            EF[nodes] = ES[nodes] + dur[nodes]
+        return ES, EF
+
+    def backward(self, dur: np.ndarray, finish) -> Tuple[np.ndarray, np.ndarray]:
+        """LS, LF (finish: 프로젝트 완료 시점, 스칼라 또는 (S,))"""
+        dur = np.asarray(dur)
+        LF = np.empty_like(dur)
+        LS = np.empty_like(dur)
+        LF[...] = finish
+        for L in range(self.n_levels - 1, -1, -1):
+            ls = self._bwd[L]
+            if ls is not None:
+                acc = LS[ls.slots[0]]
+                for sl in ls.slots[1:]:
+                    head = acc[:sl.shape[0]]
+                    np.minimum(head, LS[sl], out=head)
+                LF[ls.nodes] = acc
+            nodes = self.order[self.node_bounds[L]:self.node_bounds[L + 1]]
+            LS[nodes] = LF[nodes] - dur[nodes]
+        return LS, LF
+
+    def schedule(self, dur: np.ndarray) -> Dict[str, np.ndarray]:
+        ES, EF = self.forward(dur)
+        finish = EF.max(axis=0) if self.n else np.zeros(dur.shape[1:], dtype=dur.dtype)
+        LS, LF = self.backward(dur, finish)
+        return {"ES": ES, "EF": EF, "LS": LS, "LF": LF, "FLOAT": LS - ES, "finish": finish}
+
+
+class ArrayCPMEngine:
+    """CPMEngine 과 같은 입력/출력 계약의 배열 기반 구현"""
+
+    @staticmethod
+    def build_dag_and_schedule(tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
+        graph, dur = CPMGraph.from_tasks(tasks)
+        if graph.cyclic.size:
+            # 순환 입력은 드묾 → 무시할 관계/위상 순서까지 dict 엔진과 똑같도록 그쪽으로 계산 (cycles 보고 포함)
+            from server.workflow.agents.schedule_agent.outputs.change_mgmt import CPMEngine
+            return CPMEngine._build_dag_and_schedule_dict(tasks)
+        res = graph.schedule(dur)
+        ids = graph.ids
+        topo = graph.order.tolist()
+        ES, EF, LS, LF, FL = (res[k].tolist() for k in ("ES", "EF", "LS", "LF", "FLOAT"))
+        return {
+            "ES": {ids[i]: ES[i] for i in topo},
+            "EF": {ids[i]: EF[i] for i in topo},
+            "LS": {ids[i]: LS[i] for i in reversed(topo)},
+            "LF": {ids[i]: LF[i] for i in reversed(topo)},
+            "FLOAT": {ids[i]: FL[i] for i in range(graph.n)},
+            "critical_path": [ids[i] for i in range(graph.n) if FL[i] == 0],
+            "project_duration": int(res["finish"]) if graph.n else 0,
+            "cycles": graph.cycles,
+        }
+
+
+__all__ = ["CPMGraph", "ArrayCPMEngine"]
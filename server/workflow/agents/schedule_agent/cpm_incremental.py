@@ -0,0 +1,477 @@
+# server/workflow/agents/schedule_agent/cpm_incremental.py
+"""
+증분 CPM (변경요청 영향 분석용)
+
+- 마지막 ES/EF/LS/LF 상태를 프로젝트별 스냅샷(cpm_state.json)으로 보관
+- 기간/선후행 변경 시 영향받는 후행(forward) / 선행(backward) 작업만 위상 순서로 재계산
+- 변경요청별 실제 schedule_delta_days(프로젝트 완료일 변화)와 critical_path_impact 계산
+- FS/SS/FF/SF + lag 관계는 CPMEngine 과 같은 제약식(cpm_links) 사용
+- 결과 dict 는 CPMEngine.build_dag_and_schedule 와 같은 계약
+"""
+from __future__ import annotations
+
+import hashlib
+import heapq
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from server.workflow.agents.schedule_agent.cpm_links import (
+    Link, backward_lf, find_cycles, format_cycle, forward_es, task_links,
+)
+
+logger = logging.getLogger("schedule.cpm")
+
+STATE_VERSION = 2
+
+
+def _normalize(tasks: List[Dict[str, Any]]) -> Tuple[Dict[str, int], Dict[str, List[Link]]]:
+    """tasks → (duration, links). 중복 id 는 마지막 정의, 존재하지 않는 선행작업은 무시"""
+    dur: Dict[str, int] = {}
+    preds: Dict[str, List[Link]] = {}
+    for t in tasks:
+        dur[t["id"]] = int(t.get("duration", 1) or 1)
+        preds[t["id"]] = task_links(t)
+    for tid, links in preds.items():
+        preds[tid] = [l for l in links if l[0] in dur]
+    return dur, preds
+
+
+def task_signature(tasks: List[Dict[str, Any]]) -> str:
+    """duration / 선후행 구조 해시 (같으면 CPM 결과도 같음)"""
+    dur, preds = _normalize(tasks)
+    blob = json.dumps([[k, dur[k], sorted(preds[k])] for k in dur], ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class CycleError(ValueError):
+    """선후행 추가로 순환이 생기는 경우"""
+
+
+class IncrementalCPM:
+    """CPM 상태 + 증분 재계산"""
+
+    def __init__(self, dur: Dict[str, int], preds: Dict[str, List[Link]]):
+        self.dur = dict(dur)
+        self.preds: Dict[str, List[Link]] = {k: [tuple(l) for l in v] for k, v in preds.items()}
+        self.succs: Dict[str, List[Link]] = {k: [] for k in self.dur}  # (후행작업, type, lag)
+        for v, links in self.preds.items():
+            for u, typ, lag in links:
+                self.succs[u].append((v, typ, lag))
+        self.rank: Dict[str, int] = {}
+        self.ES: Dict[str, int] = {}
+        self.EF: Dict[str, int] = {}
+        self.LS: Dict[str, int] = {}
+        self.LF: Dict[str, int] = {}
+        self.finish = 0
+        self.signature: Optional[str] = None
+
+    # ---------------- construction ----------------
+    @classmethod
+    def from_tasks(cls, tasks: List[Dict[str, Any]]) -> "IncrementalCPM":
+        """전체 CPM 1회 계산 (대형 WBS 는 CPMEngine 이 배열 엔진으로 분기)"""
+        from server.workflow.agents.schedule_agent.outputs.change_mgmt import CPMEngine
+
+        dur, preds = _normalize(tasks)
+        eng = cls(dur, preds)
+        res = CPMEngine.build_dag_and_schedule(tasks)
+        eng.ES, eng.EF = dict(res["ES"]), dict(res["EF"])
+        eng.LS, eng.LF = dict(res["LS"]), dict(res["LF"])
+        eng.finish = int(res["project_duration"])
+        eng._retopo()
+        eng.signature = task_signature(tasks)
+        return eng
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "IncrementalCPM":
+        tasks = state["tasks"]
+        eng = cls({k: v["duration"] for k, v in tasks.items()}, {k: v["preds"] for k, v in tasks.items()})
+        for k, v in tasks.items():
+            eng.ES[k], eng.EF[k], eng.LS[k], eng.LF[k] = v["ES"], v["EF"], v["LS"], v["LF"]
+        eng.finish = int(state["finish"])
+        eng.signature = state.get("signature")
+        eng._retopo()
+        return eng
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            "version": STATE_VERSION,
+            "signature": self.signature,
+            "finish": self.finish,
+            "tasks": {
+                k: {
+                    "duration": self.dur[k], "preds": [list(l) for l in self.preds[k]],
+                    "ES": self.ES[k], "EF": self.EF[k], "LS": self.LS[k], "LF": self.LF[k],
+                }
+                for k in self.dur
+            },
+        }
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(self.to_state(), ensure_ascii=False), encoding="utf-8")
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["IncrementalCPM"]:
+        try:
+            state = json.loads(path.read_text(encoding="utf-8"))
+            if state.get("version") != STATE_VERSION:
+                return None
+            return cls.from_state(state)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("[CPM] 상태 스냅샷 로드 실패(%s): %s → 전체 계산", path, e)
+            return None
+
+    @classmethod
+    def load_or_build(cls, tasks: List[Dict[str, Any]], state_path: Path) -> Tuple["IncrementalCPM", Dict[str, Any]]:
+        """
+        스냅샷이 있으면 WBS 와의 차이(기간/선후행)만 증분 반영, 없거나 작업 집합이 다르면 전체 계산.
+        반환: (engine, {"mode": "reused"|"incremental"|"full", "changed_tasks": [...]})
+        """
+        sig = task_signature(tasks)
+        eng = cls.load(state_path)
+        if eng is not None and eng.signature == sig:
+            return eng, {"mode": "reused", "changed_tasks": []}
+
+        if eng is not None:
+            dur, preds = _normalize(tasks)
+            if set(dur) == set(eng.dur):
+                edits = []
+                for tid in dur:
+                    new, old = set(preds[tid]), set(eng.preds[tid])
+                    add = [{"id": p, "type": typ, "lag": lag} for p, typ, lag in preds[tid] if (p, typ, lag) not in old]
+                    rem = [p for p, typ, lag in eng.preds[tid] if (p, typ, lag) not in new]
+                    if dur[tid] != eng.dur[tid] or add or rem:
+                        edits.append({"task_id": tid, "duration": dur[tid],
+                                      "add_predecessors": add, "remove_predecessors": rem})
+                try:
+                    impact = eng.apply(edits)
+                    eng.signature = sig
+                    return eng, {"mode": "incremental", "changed_tasks": impact["changed_tasks"]}
+                except CycleError as e:
+                    logger.warning("[CPM] 증분 반영 실패: %s → 전체 계산", e)
+
+        eng = cls.from_tasks(tasks)
+        return eng, {"mode": "full", "changed_tasks": list(eng.dur)}
+
+    # ---------------- helpers ----------------
+    def _retopo(self) -> None:
+        """Kahn 위상순서 → rank. 순환을 닫는 관계는 CPMEngine 과 같이 제거"""
+        indeg = {k: len(v) for k, v in self.preds.items()}
+        stack = [k for k, d in indeg.items() if d == 0]
+        order: List[str] = []
+        while stack:
+            u = stack.pop()
+            order.append(u)
+            for v, _, _ in self.succs[u]:
+                indeg[v] -= 1
+                if indeg[v] == 0:
+                    stack.append(v)
+        if len(order) != len(self.dur):
+            seen = set(order)
+            rest = [k for k in self.dur if k not in seen]
+            for c in find_cycles(rest, {k: [v for v, _, _ in self.succs[k]] for k in rest}):
+                logger.warning("[CPM] 순환 감지: %s - 마지막 관계 무시", format_cycle(c))
+                p, tid = c[-2], c[-1]
+                for link in [l for l in self.preds[tid] if l[0] == p]:
+                    self._unlink(tid, link)
+            self._retopo()
+            return
+        self.rank = {k: i for i, k in enumerate(order)}
+
+    def _path(self, src: str, dst: str) -> Optional[List[str]]:
+        """src → dst 후행 경로 (없으면 None)"""
+        parent: Dict[str, Optional[str]] = {src: None}
+        stack = [src]
+        while stack:
+            u = stack.pop()
+            if u == dst:
+                path = [u]
+                while parent[path[-1]] is not None:
+                    path.append(parent[path[-1]])
+                return path[::-1]
+            for v, _, _ in self.succs[u]:
+                if v not in parent:
+                    parent[v] = u
+                    stack.append(v)
+        return None
+
+    def critical(self) -> List[str]:
+        return [k for k in self.dur if self.LS[k] - self.ES[k] == 0]
+
+    def result(self) -> Dict[str, Any]:
+        """CPMEngine.build_dag_and_schedule 와 같은 dict"""
+        order = sorted(self.dur, key=self.rank.__getitem__)
+        return {
+            "ES": {k: self.ES[k] for k in order},
+            "EF": {k: self.EF[k] for k in order},
+            "LS": {k: self.LS[k] for k in reversed(order)},
+            "LF": {k: self.LF[k] for k in reversed(order)},
+            "FLOAT": {k: self.LS[k] - self.ES[k] for k in self.dur},
+            "critical_path": self.critical(),
+            "project_duration": self.finish,
+        }
+
+    # ---------------- incremental update ----------------
+    def _edit_graph(self, edits: List[Dict[str, Any]], undo: List[Tuple]) -> Tuple[set, set]:
+        """기간/선후행 변경 적용 → (forward seed, backward seed)"""
+        fwd, bwd = set(), set()
+        for e in edits:
+            tid = e["task_id"]
+            if tid not in self.dur:
+                raise KeyError(tid)
+            new = e.get("duration")
+            if new is None and e.get("delta") is not None:
+                new = self.dur[tid] + int(e["delta"])
+            if new is not None and int(new) != self.dur[tid]:
+                undo.append(("dur", tid, self.dur[tid]))
+                self.dur[tid] = max(int(new), 0) or 1  # CPMEngine 과 동일하게 0 → 1
+                fwd.add(tid)
+                bwd.add(tid)
+            for p in e.get("remove_predecessors") or []:
+                for link in [l for l in self.preds[tid] if l[0] == p]:
+                    self._unlink(tid, link)
+                    undo.append(("del", tid, link))
+                    fwd.add(tid)
+                    bwd.add(p)
+            for link in task_links({"id": tid, "predecessors": e.get("add_predecessors") or []}):
+                p = link[0]
+                if p not in self.dur or p == tid or link in self.preds[tid]:
+                    continue
+                for old in [l for l in self.preds[tid] if l[0] == p]:  # 같은 선행작업의 관계 유형/lag 변경
+                    self._unlink(tid, old)
+                    undo.append(("del", tid, old))
+                path = self._path(tid, p)
+                if path:
+                    raise CycleError(f"{p} → {tid} 추가 시 순환 발생: {format_cycle(path + [tid])}")
+                self._link(tid, link)
+                undo.append(("add", tid, link))
+                if self.rank[p] > self.rank[tid]:
+                    self._retopo()
+                fwd.add(tid)
+                bwd.add(p)
+        return fwd, bwd
+
+    def _link(self, tid: str, link: Link) -> None:
+        p, typ, lag = link
+        self.preds[tid].append(link)
+        self.succs[p].append((tid, typ, lag))
+
+    def _unlink(self, tid: str, link: Link) -> None:
+        p, typ, lag = link
+        self.preds[tid].remove(link)
+        self.succs[p].remove((tid, typ, lag))
+
+    def _propagate(self, fwd: Iterable[str], bwd: Iterable[str], undo: List[Tuple]) -> set:
+        touched = set()
+        # forward: 위상 순서로 영향받는 후행작업만
+        heap = [(self.rank[k], k) for k in set(fwd)]
+        heapq.heapify(heap)
+        queued = {k for _, k in heap}
+        while heap:
+            _, u = heapq.heappop(heap)
+            queued.discard(u)
+            d = self.dur[u]
+            es = max([forward_es(typ, lag, self.ES[p], self.EF[p], d) for p, typ, lag in self.preds[u]] + [0])
+            ef = es + d
+            if es == self.ES[u] and ef == self.EF[u]:
+                continue
+            undo.append(("fwd", u, self.ES[u], self.EF[u]))
+            self.ES[u], self.EF[u] = es, ef
+            touched.add(u)
+            for v, _, _ in self.succs[u]:
+                if v not in queued:
+                    queued.add(v)
+                    heapq.heappush(heap, (self.rank[v], v))
+
+        finish = max(self.EF.values(), default=0)
+        seeds = set(bwd)
+        if finish != self.finish:
+            # LF = min(후행 제약, 완료일) 이므로 완료일에 걸려 있던/걸리게 될 작업만 다시 계산
+            bound = min(finish, self.finish)
+            undo.append(("finish", self.finish))
+            self.finish = finish
+            seeds.update(k for k, s in self.succs.items() if not s or self.LF[k] >= bound)
+
+        # backward: 역위상 순서로 영향받는 선행작업만
+        heap = [(-self.rank[k], k) for k in seeds]
+        heapq.heapify(heap)
+        queued = set(seeds)
+        while heap:
+            _, u = heapq.heappop(heap)
+            queued.discard(u)
+            d = self.dur[u]
+            lf = min([backward_lf(typ, lag, self.LS[s], self.LF[s], d) for s, typ, lag in self.succs[u]] + [self.finish])
+            ls = lf - d
+            if lf == self.LF[u] and ls == self.LS[u]:
+                continue
+            undo.append(("bwd", u, self.LS[u], self.LF[u]))
+            self.LS[u], self.LF[u] = ls, lf
+            touched.add(u)
+            for p, _, _ in self.preds[u]:
+                if p not in queued:
+                    queued.add(p)
+                    heapq.heappush(heap, (-self.rank[p], p))
+        return touched
+
+    def _rollback(self, undo: List[Tuple]) -> None:
+        retopo = False
+        for rec in reversed(undo):
+            kind = rec[0]
+            if kind == "dur":
+                self.dur[rec[1]] = rec[2]
+            elif kind == "del":
+                self._link(rec[1], rec[2])
+            elif kind == "add":
+                self._unlink(rec[1], rec[2])
+                retopo = True
+            elif kind == "fwd":
+                self.ES[rec[1]], self.EF[rec[1]] = rec[2], rec[3]
+            elif kind == "bwd":
+                self.LS[rec[1]], self.LF[rec[1]] = rec[2], rec[3]
+            elif kind == "finish":
+                self.finish = rec[1]
+        if retopo:
+            self._retopo()
+
+    def apply(self, edits: List[Dict[str, Any]], commit: bool = True) -> Dict[str, Any]:
+        """
+        edits: [{"task_id", "duration" | "delta", "add_predecessors", "remove_predecessors"}]
+        commit=False 이면 영향만 계산하고 상태는 되돌림 (what-if)
+        """
+        before_cp = set(self.critical())
+        before_finish = self.finish
+        undo: List[Tuple] = []
+        try:
+            fwd, bwd = self._edit_graph(edits, undo)
+            touched = self._propagate(fwd, bwd, undo)
+        except Exception:
+            self._rollback(undo)
+            raise
+
+        # 되돌리기 기록에서 변경 전 값을 복원해 실제로 달라진 작업만 추림
+        old: Dict[str, Dict[str, int]] = {}
+        for rec in undo:
+            if rec[0] == "fwd":
+                old.setdefault(rec[1], {}).setdefault("ES", rec[2])
+                old[rec[1]].setdefault("EF", rec[3])
+            elif rec[0] == "bwd":
+                old.setdefault(rec[1], {}).setdefault("LS", rec[2])
+                old[rec[1]].setdefault("LF", rec[3])
+        changed = []
+        for k in sorted(touched, key=self.rank.__getitem__):
+            o = old.get(k, {})
+            es0, ef0 = o.get("ES", self.ES[k]), o.get("EF", self.EF[k])
+            fl0 = o.get("LS", self.LS[k]) - es0
+            fl = self.LS[k] - self.ES[k]
+            if es0 != self.ES[k] or ef0 != self.EF[k] or fl0 != fl:
+                changed.append({
+                    "id": k, "ES": self.ES[k], "EF": self.EF[k], "FLOAT": fl,
+                    "ES_before": es0, "EF_before": ef0, "FLOAT_before": fl0,
+                })
+
+        after_cp = set(self.critical()) if touched else before_cp
+        delta = self.finish - before_finish
+        edited = {e["task_id"] for e in edits}
+        impact = {
+            "schedule_delta_days": delta,
+            "critical_path_impact": bool(delta) or after_cp != before_cp or bool(edited & (before_cp | after_cp)),
+            "critical_added": sorted(after_cp - before_cp, key=self.rank.__getitem__),
+            "critical_removed": sorted(before_cp - after_cp, key=self.rank.__getitem__),
+            "changed_tasks": [c["id"] for c in changed],
+            "changed": changed,
+            "recomputed": len(touched),
+            "project_duration": self.finish,
+        }
+        if not commit:
+            self._rollback(undo)
+        return impact
+
+    def what_if(self, edits: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return self.apply(edits, commit=False)
+
+
+# ---------------- change request → edits ----------------
+def _days(text: str) -> Optional[int]:
+    m = re.search(r"([+-]?\d+)\s*일", text or "")
+    return int(m.group(1)) if m else None
+
+
+def _first(entry: Dict[str, Any], *keys: str) -> Any:
+    """None 이 아닌 첫 값 (키가 있어도 값이 None 이면 다음 키로)"""
+    return next((entry[k] for k in keys if entry.get(k) is not None), None)
+
+
+def _as_days(value: Any, tid: str, field: str) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        logger.warning("[CPM] %s: %s=%r 는 정수가 아니어서 무시", tid, field, value)
+        return None
+
+
+def _edit_from(entry: Dict[str, Any], default_delta: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    tid = entry.get("task_id") or entry.get("id") or entry.get("wbs_id")
+    if not tid:
+        return None
+    e: Dict[str, Any] = {"task_id": str(tid)}
+    dur = _first(entry, "new_duration", "duration")
+    if dur is not None:
+        dur = _as_days(dur, e["task_id"], "duration")
+        if dur is not None:
+            e["duration"] = dur
+    else:
+        d = _first(entry, "duration_delta", "delta_days")
+        d = default_delta if d is None else d
+        if d is not None:
+            d = _as_days(d, e["task_id"], "delta")
+            if d is not None:
+                e["delta"] = d
+    for src, dst in (("add_predecessors", "add_predecessors"), ("remove_predecessors", "remove_predecessors")):
+        if entry.get(src):
+            e[dst] = [str(x) for x in entry[src]]
+    return e
+
+
+def change_to_edits(change: Dict[str, Any], known_ids: Iterable[str]) -> List[Dict[str, Any]]:
+    """
+    변경요청 1건 → 작업 단위 edit 목록
+    - 명시 필드: task_id / tasks[{id, duration|duration_delta, add/remove_predecessors}]
+    - PM_ChangeRequest.impact: {"tasks": [...], "est_days": N} → 각 작업 기간 +N
+    - 텍스트 impact/description: 본문에 등장하는 작업 id + "N일"
+    """
+    known = set(known_ids)
+    edits: List[Dict[str, Any]] = []
+    impact = change.get("impact")
+
+    if change.get("task_id"):
+        edits.append(_edit_from(change))
+    for t in change.get("tasks") or []:
+        edits.append(_edit_from(t if isinstance(t, dict) else {"task_id": t}))
+
+    if not edits and isinstance(impact, dict):
+        est = impact.get("est_days")
+        for t in impact.get("tasks") or []:
+            edits.append(_edit_from(t if isinstance(t, dict) else {"task_id": t}, default_delta=est))
+
+    if not edits:
+        text = " ".join(str(change.get(k) or "") for k in ("impact", "description", "title"))
+        delta = _days(str(impact or ""))
+        if delta is None:
+            delta = _days(text)
+        if delta is not None:
+            for tid in known:
+                if re.search(rf"(?<![\w.-]){re.escape(tid)}(?![\w-]|\.\d)", text):
+                    edits.append({"task_id": tid, "delta": delta})
+
+    return [e for e in edits if e and e["task_id"] in known
+            and ("duration" in e or "delta" in e or e.get("add_predecessors") or e.get("remove_predecessors"))]
+
+
+__all__ = ["IncrementalCPM", "CycleError", "change_to_edits", "task_signature"]
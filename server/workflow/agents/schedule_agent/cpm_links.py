@@ -0,0 +1,115 @@
+# server/workflow/agents/schedule_agent/cpm_links.py
+"""
+CPM 선후행 관계(link) 공통 규칙
+
+- 입력: predecessors/dependencies (문자열 id 또는 {"id","type","lag"} dict) + links(pm_task_links 형태)
+- FS/SS/FF/SF 4가지 관계와 lag(음수 = lead) 지원
+- forward/backward 제약식은 dict 엔진(CPMEngine)과 증분 엔진(IncrementalCPM)이 같이 사용
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger("schedule.cpm")
+
+LINK_TYPES = ("FS", "SS", "FF", "SF")
+
+# (선행작업 id, 관계 유형, lag 일수)
+Link = Tuple[str, str, int]
+
+
+def task_links(t: Dict[str, Any]) -> List[Link]:
+    """작업 1건의 선행 관계 목록 (중복 선행작업은 마지막 정의 사용)"""
+    p = t.get("predecessors")
+    if p is None:
+        p = t.get("dependencies", [])
+    if isinstance(p, str):
+        p = [x.strip() for x in p.split(",") if x.strip()]
+    out: Dict[str, Link] = {}
+    for x in list(p or []) + list(t.get("links") or []):
+        if isinstance(x, dict):
+            pid = x.get("id") or x.get("task_id") or x.get("predecessor_id")
+            typ = str(x.get("type") or x.get("link_type") or "FS").upper()
+            lag = int(x.get("lag", x.get("lag_days", 0)) or 0)
+        else:
+            pid, typ, lag = x, "FS", 0
+        if not pid:
+            continue
+        if typ not in LINK_TYPES:
+            logger.warning("[CPM] 알 수 없는 관계 유형 %s (%s → %s) → FS 로 처리", typ, pid, t.get("id"))
+            typ = "FS"
+        out[str(pid)] = (str(pid), typ, lag)
+    return list(out.values())
+
+
+def is_plain_fs(links: Iterable[Link]) -> bool:
+    """lag 없는 FS 관계만 있으면 True (배열 엔진 사용 가능)"""
+    return all(typ == "FS" and lag == 0 for _, typ, lag in links)
+
+
+def forward_es(typ: str, lag: int, es_p: int, ef_p: int, dur: int) -> int:
+    """선행작업(es_p, ef_p) 관계가 후행작업 ES 에 주는 하한"""
+    if typ == "SS":
+        return es_p + lag
+    if typ == "FF":
+        return ef_p + lag - dur
+    if typ == "SF":
+        return es_p + lag - dur
+    return ef_p + lag
+
+
+def backward_lf(typ: str, lag: int, ls_s: int, lf_s: int, dur: int) -> int:
+    """후행작업(ls_s, lf_s) 관계가 선행작업 LF 에 주는 상한"""
+    if typ == "SS":
+        return ls_s - lag + dur
+    if typ == "FF":
+        return lf_s - lag
+    if typ == "SF":
+        return lf_s - lag + dur
+    return ls_s - lag
+
+
+def find_cycles(nodes: Sequence[str], succs: Dict[str, List[str]], limit: int = 10) -> List[List[str]]:
+    """nodes 로 제한한 부분 그래프에서 순환 경로를 찾아 [a, b, ..., a] 형태로 반환"""
+    inside = set(nodes)
+    color: Dict[str, int] = {}  # 1: 탐색 중, 2: 완료
+    cycles: List[List[str]] = []
+    for root in nodes:
+        if color.get(root) or len(cycles) >= limit:
+            continue
+        path: List[str] = [root]
+        pos = {root: 0}
+        color[root] = 1
+        stack = [iter(succs.get(root, []))]
+        while stack:
+            nxt: Optional[str] = None
+            for v in stack[-1]:
+                if v not in inside:
+                    continue
+                if color.get(v) == 1:
+                    cycles.append(path[pos[v]:] + [v])
+                elif not color.get(v):
+                    nxt = v
+                    break
+            if nxt is None:
+                done = path.pop()
+                pos.pop(done, None)
+                color[done] = 2
+                stack.pop()
+            else:
+                color[nxt] = 1
+                pos[nxt] = len(path)
+                path.append(nxt)
+                stack.append(iter(succs.get(nxt, [])))
+    return cycles[:limit]
+
+
+def format_cycle(path: Sequence[str]) -> str:
+    return " → ".join(path)
+
+
+__all__ = [
+    "LINK_TYPES", "Link", "task_links", "is_plain_fs",
+    "forward_es", "backward_lf", "find_cycles", "format_cycle",
+]
@@ -1,19 +1,299 @@
 # server/workflow/agents/schedule_agent/got_scheduler.py
+"""
+GoT(Graph of Thoughts) 기반 일정 후보 탐색
 
-from typing import Dict, List, Any, Tuple
-import copy
+- Thought = 일정 전략 파라미터 (병렬 lane 수, fast-tracking 비율/범위, 버퍼 전략, phase 별 투입 강도)
+- 실제 WBS DAG 에 전략을 적용해 CPM(FS/SS + lag) 으로 평가: 기간, 최대 자원부하, float 여유, 비용
+- 초기 무작위 후보 → beam 상위 후보의 이웃(한 파라미터 변경) + 교배(phase 강도 병합)로 확장
+- 평가는 process pool 에서 병렬 수행, 전체 평가 후보 중 Pareto front 와 최종안 반환
+"""
+from __future__ import annotations
+
+import logging
+import math
+import os
 import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from server.workflow.agents.schedule_agent.cpm_links import task_links
+from server.workflow.agents.schedule_agent.outputs.change_mgmt import CPMEngine
+
+logger = logging.getLogger("schedule.got")
+
+GOT_WORKERS = int(os.getenv("GOT_WORKERS", str(os.cpu_count() or 1)))
+GOT_POOL_MIN_BATCH = int(os.getenv("GOT_POOL_MIN_BATCH", "32"))
+
+# 탐색 공간 (options 로 override)
+LANES = [1, 2, 3, 4, 6, 8]
+FAST_TRACK = [0.0, 0.25, 0.5]
+FAST_TRACK_SCOPE = ["critical", "all"]
+BUFFERS = ["none", "task", "project"]
+INTENSITY = [0.8, 1.0, 1.25, 1.5]
+
+DEFAULT_WEIGHTS = {"duration": 0.4, "cost": 0.3, "peak_load": 0.15, "slack": 0.15}
+
+TASK_BUFFER = 0.1        # task 버퍼: 작업별 +10%
+PROJECT_BUFFER = 0.15    # project 버퍼: CPM 기간의 15%
+CRASH_PENALTY = 0.2      # 투입 강도 1 초과 시 공수 비효율
+REWORK_RATE = 0.3        # fast-tracking 중첩 일수당 재작업 공수
+LANE_OVERHEAD = 0.05     # lane 1개 추가당 기간 대비 조정 공수
+
+_METRICS = ("duration", "cost", "peak_load", "slack")
+
+
+# ---------------- WBS → 탐색 컨텍스트 ----------------
+def wbs_from_requirements(requirements: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """요구사항별 설계(1)→개발(3)→테스트(1) 작업 (create_schedule 의 요구사항당 5일 가정과 동일)"""
+    phases = {"설계": ("D", 1), "개발": ("B", 3), "테스트": ("T", 1)}
+    nodes = {name: {"id": f"PH-{code}", "name": name, "children": []} for name, (code, _) in phases.items()}
+    for i, r in enumerate(requirements):
+        rid = str(r.get("req_id") or r.get("id") or f"R{i + 1}")
+        prev = None
+        for name, (code, days) in phases.items():
+            tid = f"{code}-{rid}"
+            nodes[name]["children"].append({
+                "id": tid,
+                "name": f"{name}: {r.get('title') or rid}",
+                "duration": days,
+                "dependencies": [prev] if prev else [],
+            })
+            prev = tid
+    return {"nodes": [n for n in nodes.values() if n["children"]]}
+
+
+def _leaf_tasks(wbs: Any) -> Tuple[List[Dict[str, Any]], List[str], Dict[str, str]]:
+    """
+    WBS(dict 트리 또는 평탄 목록) → (leaf 작업, phase id 목록, phase 이름)
+    - 상위 노드의 선후행 관계는 하위 leaf 전체로 전개
+    - phase = 루트가 하나면 그 자식, 아니면 루트
+    """
+    if isinstance(wbs, list):
+        tasks = [{
+            "id": t["id"], "name": t.get("name") or t["id"], "duration": int(t.get("duration", 1) or 1),
+            "preds": [p for p, _, _ in task_links(t)], "parent": t.get("parent") or "ALL",
+            "phase": t.get("phase") or "ALL",
+        } for t in wbs]
+        phases = list(dict.fromkeys(t["phase"] for t in tasks))
+        return tasks, phases, {p: p for p in phases}
+
+    roots = (wbs or {}).get("nodes", []) or []
+    leaves: List[Dict[str, Any]] = []
+    leaves_of: Dict[str, List[str]] = {}
+    node_preds: Dict[str, List[str]] = {}
+    phase_names: Dict[str, str] = {}
+
+    def walk(node, parent, phase, depth):
+        nid = node.get("id") or node.get("name")
+        children = node.get("children") or []
+        if phase is None and (len(roots) > 1 or depth == 1 or not children):
+            phase = nid
+            phase_names[nid] = node.get("name") or nid
+        node_preds[nid] = [p for p, _, _ in task_links({"id": nid, **node})]
+        if not children:
+            leaves.append({
+                "id": nid, "name": node.get("name") or nid, "duration": int(node.get("duration", 1) or 1),
+                "parent": parent or "ROOT", "phase": phase or nid,
+            })
+            leaves_of[nid] = [nid]
+            return [nid]
+        out: List[str] = []
+        for c in children:
+            out += walk(c, nid, phase, depth + 1)
+        leaves_of[nid] = out
+        return out
+
+    for r in roots:
+        walk(r, None, None, 0)
+
+    # 상위 노드 관계 전개: 노드 X 의 선행 P → X 의 모든 leaf 가 P 의 모든 leaf 뒤에
+    inherited: Dict[str, List[str]] = {}
+    for nid, preds in node_preds.items():
+        if not preds or nid not in leaves_of:
+            continue
+        pred_leaves = [l for p in preds for l in leaves_of.get(p, [])]
+        for leaf in leaves_of[nid]:
+            inherited.setdefault(leaf, []).extend(pred_leaves)
+    for t in leaves:
+        t["preds"] = [p for p in dict.fromkeys(inherited.get(t["id"], [])) if p != t["id"]]
+    phases = list(dict.fromkeys(t["phase"] for t in leaves))
+    return leaves, phases, phase_names
+
+
+def _topo_rank(tasks: List[Dict[str, Any]]) -> Dict[str, int]:
+    order, _ = CPMEngine._topo([t["id"] for t in tasks], [(p, t["id"]) for t in tasks for p in t["preds"]])
+    return {tid: i for i, tid in enumerate(order)}
+
+
+# ---------------- 후보 평가 (process pool 에서도 실행) ----------------
+_CTX: Dict[str, Any] = {}
+
+
+def _init_worker(ctx: Dict[str, Any]) -> None:
+    global _CTX
+    _CTX = ctx
+
+
+def _apply_params(ctx: Dict[str, Any], p: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Dict[str, float], Dict[str, float]]:
+    """전략 파라미터 → (CPM 입력 작업 목록, 작업별 투입 강도, fast-tracking 중첩 일수)"""
+    tasks = ctx["tasks"]
+    inten_of = dict(zip(ctx["phases"], p["intensity"]))
+    scale = 1 + TASK_BUFFER if p["buffer"] == "task" else 1.0
+    dur = {t["id"]: max(1, math.ceil(t["duration"] * scale / inten_of[t["phase"]])) for t in tasks}
+    inten = {t["id"]: inten_of[t["phase"]] for t in tasks}
+
+    # 병렬 lane: 같은 부모 아래 서로 선후행이 없는 작업을 위상 순서대로 L개 chain 으로 묶음
+    lane_pred: Dict[str, str] = {}
+    lanes = int(p["lanes"])
+    for group in ctx["free_groups"]:
+        for j in range(lanes, len(group)):
+            lane_pred[group[j]] = group[j - lanes]
+
+    base = [{"id": t["id"], "duration": dur[t["id"]],
+             "predecessors": t["preds"] + ([lane_pred[t["id"]]] if t["id"] in lane_pred else [])}
+            for t in tasks]
+    overlap: Dict[str, float] = {}
+    f = float(p["fast_track"])
+    if f <= 0:
+        return base, inten, overlap
+
+    critical = None
+    if p["ft_scope"] == "critical":
+        critical = set(CPMEngine.build_dag_and_schedule(base)["critical_path"])
+    out = []
+    for t in base:
+        links = []
+        for pid in t["predecessors"]:
+            orig = pid != lane_pred.get(t["id"])
+            if orig and (critical is None or (pid in critical and t["id"] in critical)):
+                lag = math.ceil(dur[pid] * (1 - f))
+                links.append({"id": pid, "type": "SS", "lag": lag})
+                overlap[t["id"]] = overlap.get(t["id"], 0) + dur[pid] - lag
+            else:
+                links.append(pid)
+        out.append({"id": t["id"], "duration": t["duration"], "predecessors": links})
+    return out, inten, overlap
+
+
+def _evaluate_with(ctx: Dict[str, Any], p: Dict[str, Any], detail: bool = False) -> Dict[str, Any]:
+    tasks, inten, overlap = _apply_params(ctx, p)
+    cpm = CPMEngine.build_dag_and_schedule(tasks)
+    cpm_days = int(cpm["project_duration"])
+    buffer_days = math.ceil(cpm_days * PROJECT_BUFFER) if p["buffer"] == "project" else 0
+
+    ids = [t["id"] for t in tasks]
+    es = np.array([cpm["ES"][i] for i in ids], dtype=np.int64)
+    ef = np.array([cpm["EF"][i] for i in ids], dtype=np.int64)
+    load = np.array([inten[i] for i in ids])
+    diff = np.zeros(cpm_days + 2)
+    np.add.at(diff, es, load)
+    np.add.at(diff, ef, -load)
+    peak = float(np.cumsum(diff).max()) if ids else 0.0
+
+    dur = ef - es
+    effort = dur * load * (1 + CRASH_PENALTY * np.maximum(load - 1, 0))
+    cost = float(effort.sum()) + REWORK_RATE * sum(overlap.values()) \
+        + LANE_OVERHEAD * (int(p["lanes"]) - 1) * cpm_days
+    slack = float(np.mean([cpm["FLOAT"][i] for i in ids])) + buffer_days if ids else 0.0
+
+    out = {
+        "duration": cpm_days + buffer_days,
+        "cost": round(cost * ctx["daily_rate"], 2),
+        "peak_load": round(peak, 2),
+        "slack": round(slack, 2),
+        "critical_tasks": len(cpm["critical_path"]),
+        "buffer_days": buffer_days,
+    }
+    if detail:
+        out["cpm"] = cpm
+    return out
+
+
+def _evaluate_in_worker(p: Dict[str, Any]) -> Dict[str, Any]:
+    return _evaluate_with(_CTX, p)
+
 
 class ScheduleGoT:
     """
     GoT(Graph of Thoughts) 기반 일정 생성기
-    기존 ScheduleAgent의 create_schedule() 위에서
-    여러 후보 스케줄을 생성하고 평가해 최적안을 선택한다.
+    기존 ScheduleAgent 의 WBS 위에서 여러 후보 스케줄(전략)을 만들고
+    CPM 으로 평가해 Pareto front 와 최적안을 고른다.
     """
 
-    def __init__(self, base_scheduler):
-        # base_scheduler = ScheduleAgent()
+    def __init__(self, base_scheduler=None, workers: int = GOT_WORKERS):
+        # base_scheduler = ScheduleAgent() (요구사항 기반 휴리스틱 일정 비교용)
         self.base = base_scheduler
+        self.workers = max(int(workers or 1), 1)
+        self._ctx: Dict[str, Any] = {}
+        self._space: Dict[str, List[Any]] = {}
+        self._weights = dict(DEFAULT_WEIGHTS)
+        self._ref: Dict[str, float] = {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._rng = random.Random(0)
+
+    # ------------------------------------------------------------
+    # 준비
+    # ------------------------------------------------------------
+    def _prepare(self, requirements: List[Dict], wbs: Any, options: Dict) -> bool:
+        if not wbs:
+            wbs = wbs_from_requirements(requirements or [])
+        tasks, phases, phase_names = _leaf_tasks(wbs)
+        if not tasks:
+            return False
+        known = {t["id"] for t in tasks}
+        for t in tasks:
+            t["preds"] = [p for p in t["preds"] if p in known]
+        rank = _topo_rank(tasks)
+
+        # 같은 부모 아래 형제끼리 선후행이 없는 작업 묶음 (lane 대상)
+        groups: Dict[str, List[str]] = {}
+        sib = {}
+        for t in tasks:
+            groups.setdefault(t["parent"], []).append(t["id"])
+            sib[t["id"]] = t["parent"]
+        linked = {t["id"] for t in tasks for p in t["preds"] if sib.get(p) == t["parent"]}
+        linked |= {p for t in tasks for p in t["preds"] if sib.get(p) == t["parent"]}
+        free_groups = []
+        for members in groups.values():
+            free = sorted((m for m in members if m not in linked), key=rank.__getitem__)
+            if len(free) > 1:
+                free_groups.append(free)
+
+        self._ctx = {
+            "tasks": tasks,
+            "phases": phases,
+            "phase_names": phase_names,
+            "free_groups": free_groups,
+            "daily_rate": float(options.get("daily_rate", 1.0)),
+        }
+        self._space = {
+            "lanes": list(options.get("lanes", LANES)),
+            "fast_track": list(options.get("fast_track", FAST_TRACK)),
+            "ft_scope": list(options.get("ft_scope", FAST_TRACK_SCOPE)),
+            "buffer": list(options.get("buffers", BUFFERS)),
+            "intensity": list(options.get("intensity", INTENSITY)),
+        }
+        self._weights = {**DEFAULT_WEIGHTS, **(options.get("weights") or {})}
+        self._rng = random.Random(options.get("seed", 0))
+        self._ref = {}
+        return True
+
+    def _base_params(self) -> Dict[str, Any]:
+        sp = self._space
+        inten = 1.0 if 1.0 in sp["intensity"] else sp["intensity"][0]
+        lanes = 2 if 2 in sp["lanes"] else sp["lanes"][0]
+        return {
+            "lanes": lanes, "fast_track": sp["fast_track"][0], "ft_scope": sp["ft_scope"][0],
+            "buffer": sp["buffer"][0], "intensity": tuple(inten for _ in self._ctx["phases"]),
+        }
+
+    @staticmethod
+    def _key(p: Dict[str, Any]) -> tuple:
+        return (p["lanes"], p["fast_track"], p["ft_scope"], p["buffer"], tuple(p["intensity"]))
 
     # ------------------------------------------------------------
     # ① 후보 스케줄(Thoughts) 생성
@@ -21,70 +301,223 @@ class ScheduleGoT:
     def generate_candidates(
         self,
         requirements: List[Dict],
-        wbs: List[Dict],
+        wbs: Any,
         options: Dict,
-        num_candidates: int = 3
+        num_candidates: int = 120,
     ) -> List[Dict]:
         """
-        다양한 파라미터 조합으로 여러 후보 스케줄 생성
-        예: 병렬도, 버퍼 전략, 리소스 강도 등 변형
+        병렬 lane / fast-tracking / 버퍼 전략 / phase 별 투입 강도를 무작위 조합한 후보 생성
+        (기준안 포함, 중복 제외)
         """
-        candidates = []
+        if not self._ctx and not self._prepare(requirements, wbs, options or {}):
+            return []
+        sp, n_ph = self._space, len(self._ctx["phases"])
+        seen, out = set(), []
+        for p in [self._base_params()] + [
+            {
+                "lanes": self._rng.choice(sp["lanes"]),
+                "fast_track": self._rng.choice(sp["fast_track"]),
+                "ft_scope": self._rng.choice(sp["ft_scope"]),
+                "buffer": self._rng.choice(sp["buffer"]),
+                "intensity": tuple(self._rng.choice(sp["intensity"]) for _ in range(n_ph)),
+            }
+            for _ in range(num_candidates * 2)
+        ]:
+            k = self._key(p)
+            if k not in seen:
+                seen.add(k)
+                out.append({"params": p})
+            if len(out) >= num_candidates:
+                break
+        return out
 
-        for i in range(num_candidates):
+    def _expand(self, beam: List[Dict], seen: set) -> List[Dict]:
+        """beam 후보의 이웃(파라미터 1개를 한 단계 변경) + 상위 후보 간 phase 강도 교배"""
+        sp = self._space
+        new: List[Dict] = []
 
-            # 예시 파라미터: 병렬도 계수
-            parallel_factor = random.choice([0.5, 0.7, 0.9])
+        def add(p):
+            k = self._key(p)
+            if k not in seen:
+                seen.add(k)
+                new.append({"params": p})
 
-            plan = self.base.create_schedule(requirements)
-
-            candidates.append({
-                "plan": plan,
-                "parallel_factor": parallel_factor,
-            })
-
-        return candidates
+        for c in beam:
+            p = c["params"]
+            for field in ("lanes", "fast_track", "ft_scope", "buffer"):
+                vals = sp[field]
+                i = vals.index(p[field]) if p[field] in vals else 0
+                for j in (i - 1, i + 1):
+                    if 0 <= j < len(vals):
+                        add({**p, field: vals[j]})
+            vals = sp["intensity"]
+            for ph in range(len(p["intensity"])):
+                i = vals.index(p["intensity"][ph]) if p["intensity"][ph] in vals else 0
+                for j in (i - 1, i + 1):
+                    if 0 <= j < len(vals):
+                        inten = list(p["intensity"])
+                        inten[ph] = vals[j]
+                        add({**p, "intensity": tuple(inten)})
+        for a in range(len(beam)):
+            for b in range(a + 1, len(beam)):
+                pa, pb = beam[a]["params"], beam[b]["params"]
+                mix = tuple(x if self._rng.random() < 0.5 else y for x, y in zip(pa["intensity"], pb["intensity"]))
+                add({**pa, "intensity": mix})
+                add({**pb, "buffer": pa["buffer"], "fast_track": pa["fast_track"]})
+        return new
 
     # ------------------------------------------------------------
     # ② 후보 평가
     # ------------------------------------------------------------
+    def _evaluate_batch(self, candidates: List[Dict]) -> None:
+        params = [c["params"] for c in candidates]
+        if self._pool is not None and len(params) >= GOT_POOL_MIN_BATCH:
+            chunk = max(1, len(params) // (self.workers * 4))
+            results = list(self._pool.map(_evaluate_in_worker, params, chunksize=chunk))
+        else:
+            results = [_evaluate_with(self._ctx, p) for p in params]
+        for c, m in zip(candidates, results):
+            c["metrics"] = m
+            self.evaluate(c)
+
     def evaluate(self, candidate: Dict) -> float:
         """
-        후보 스케줄을 점수화한다.
-        기본 예: 기간이 짧고, 일정이 균형적일수록 점수가 높음.
+        후보 점수 (높을수록 좋음): 기준안 대비 정규화한 기간·비용·최대부하(작을수록 좋음)와
+        float 여유(클수록 좋음)의 가중합
         """
-        plan = candidate["plan"]
-        duration = plan.get("total_duration", 9999)
-
-        # 기본 점수: 1/duration
-        score = 1.0 / max(duration, 1)
-
-        candidate["score"] = score
+        if "metrics" not in candidate:
+            candidate["metrics"] = _evaluate_with(self._ctx, candidate["params"])
+        m = candidate["metrics"]
+        if not self._ref:
+            self._ref = {k: max(float(m[k]), 1e-9) for k in _METRICS}
+        w, ref = self._weights, self._ref
+        score = -(
+            w["duration"] * m["duration"] / ref["duration"]
+            + w["cost"] * m["cost"] / ref["cost"]
+            + w["peak_load"] * m["peak_load"] / ref["peak_load"]
+        ) + w["slack"] * m["slack"] / (ref["slack"] + 1.0)
+        candidate["score"] = round(score, 6)
         return score
 
     # ------------------------------------------------------------
     # ③ 최적안 선택
     # ------------------------------------------------------------
     def select_best(self, candidates: List[Dict]) -> Tuple[Dict, List[Dict]]:
-        scored = []
-
         for c in candidates:
-            score = self.evaluate(c)
-            scored.append((score, c))
+            if "score" not in c:
+                self.evaluate(c)
+        scored = sorted(candidates, key=lambda c: c["score"], reverse=True)
+        return scored[0], scored
 
-        scored.sort(key=lambda x: x[0], reverse=True)
-        best = scored[0][1]
-
-        return best, scored
+    @staticmethod
+    def pareto_front(candidates: List[Dict]) -> List[Dict]:
+        """기간·비용·최대부하 최소, float 여유 최대 기준 비지배 후보"""
+        if not candidates:
+            return []
+        X = np.array([[c["metrics"]["duration"], c["metrics"]["cost"],
+                       c["metrics"]["peak_load"], -c["metrics"]["slack"]] for c in candidates])
+        le = (X[:, None, :] <= X[None, :, :]).all(axis=2)
+        lt = (X[:, None, :] < X[None, :, :]).any(axis=2)
+        dominated = (le & lt).any(axis=0)
+        front = [c for c, d in zip(candidates, dominated) if not d]
+        return sorted(front, key=lambda c: (c["metrics"]["duration"], c["metrics"]["cost"]))
 
     # ------------------------------------------------------------
-    # ④ 고수준 실행
+    # ④ 고수준 실행 (beam search)
     # ------------------------------------------------------------
     def run(self, requirements, wbs, options):
-        candidates = self.generate_candidates(requirements, wbs, options)
-        best, scored = self.select_best(candidates)
+        """
+        options: num_candidates(120), beam_width(12), rounds(4), lanes/fast_track/ft_scope/buffers/intensity,
+                 weights, daily_rate, seed, workers
+        """
+        options = dict(options or {})
+        t0 = time.perf_counter()
+        if not self._prepare(requirements or [], wbs, options):
+            plan = self.base.create_schedule(requirements or []) if self.base is not None else {}
+            return {"best_plan": plan, "candidates": [], "pareto_front": [],
+                    "search": {"evaluated": 0, "note": "WBS/요구사항 없음 → 휴리스틱 일정"}}
+
+        beam_width = int(options.get("beam_width", 12))
+        rounds = int(options.get("rounds", 4))
+        workers = max(int(options.get("workers", self.workers)), 1)
+
+        candidates = self.generate_candidates(requirements, wbs, options, int(options.get("num_candidates", 120)))
+        seen = {self._key(c["params"]) for c in candidates}
+        evaluated: List[Dict] = []
+        self.workers = workers
+        if workers > 1:
+            self._pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self._ctx,))
+        try:
+            # 기준안(첫 후보)을 먼저 평가해 정규화 기준으로 사용
+            self._evaluate_batch(candidates[:1])
+            self._evaluate_batch(candidates[1:])
+            evaluated += candidates
+            done_rounds = 0
+            for _ in range(rounds):
+                beam = sorted(evaluated, key=lambda c: c["score"], reverse=True)[:beam_width]
+                new = self._expand(beam, seen)
+                if not new:
+                    break
+                self._evaluate_batch(new)
+                evaluated += new
+                done_rounds += 1
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+        best, scored = self.select_best(evaluated)
+        front = self.pareto_front(evaluated)
+        elapsed = round((time.perf_counter() - t0) * 1000, 1)
+        logger.info(
+            "[GoT] 후보 %d개 평가 (rounds=%d, beam=%d, workers=%d) %.1fms → 기간 %s일, 비용 %s, Pareto %d개",
+            len(evaluated), done_rounds, beam_width, workers, elapsed,
+            best["metrics"]["duration"], best["metrics"]["cost"], len(front),
+        )
+        baseline = self.base.create_schedule(requirements) if (self.base is not None and requirements) else None
+        return {
+            "best_plan": self._plan(best),
+            "candidates": scored,
+            "pareto_front": front,
+            "baseline": baseline,
+            "search": {
+                "evaluated": len(evaluated),
+                "rounds": done_rounds,
+                "beam_width": beam_width,
+                "workers": workers,
+                "tasks": len(self._ctx["tasks"]),
+                "elapsed_ms": elapsed,
+            },
+        }
 
+    def _plan(self, cand: Dict) -> Dict[str, Any]:
+        """최종 후보 → create_schedule 와 같은 형태의 일정 (phase 별 기간 + CPM 결과)"""
+        m = _evaluate_with(self._ctx, cand["params"], detail=True)
+        cpm = m.pop("cpm")
+        names = self._ctx["phase_names"]
+        phase_span: Dict[str, List[int]] = {}
+        for t in self._ctx["tasks"]:
+            s = phase_span.setdefault(t["phase"], [math.inf, 0])
+            s[0] = min(s[0], cpm["ES"][t["id"]])
+            s[1] = max(s[1], cpm["EF"][t["id"]])
+        phases = [
+            {"name": names.get(ph, ph), "start": int(a), "end": int(b), "duration": int(b - a)}
+            for ph, (a, b) in sorted(phase_span.items(), key=lambda kv: kv[1][0])
+        ]
+        total = int(m["duration"])
+        params = dict(cand["params"])
+        params["intensity"] = dict(zip((names.get(p, p) for p in self._ctx["phases"]), params["intensity"]))
         return {
-            "best_plan": best["plan"],
-            "candidates": scored
+            "total_duration": total,
+            "phases": phases,
+            "critical_path": cpm["critical_path"],
+            "start_date": datetime.now().strftime("%Y-%m-%d"),
+            "end_date": (datetime.now() + timedelta(days=total)).strftime("%Y-%m-%d"),
+            "params": params,
+            "metrics": {**m, "score": cand.get("score")},
+            "ES": cpm["ES"],
+            "EF": cpm["EF"],
         }
+
+
+__all__ = ["ScheduleGoT", "wbs_from_requirements"]
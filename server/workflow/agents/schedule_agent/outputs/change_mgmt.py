@@ -1,5 +1,6 @@
 from __future__ import annotations
 import json
+import os
 from pathlib import Path
 from typing import List, Dict, Any
 import logging
@@ -19,13 +20,21 @@ try:
 except Exception:
     _PLOTLY_OK = False
 
+from server.workflow.agents.schedule_agent.cpm_links import (
+    backward_lf, find_cycles, format_cycle, forward_es, is_plain_fs, task_links,
+)
+
 logger = logging.getLogger("schedule.change")
 
+# 이 작업 수 이상이면 배열 기반 엔진(cpm_array.ArrayCPMEngine) 사용
+CPM_ARRAY_MIN_TASKS = int(os.getenv("CPM_ARRAY_MIN_TASKS", "1000"))
+
 
 class CPMEngine:
-    """DAG 기반 CPM 계산 (Forward / Backward / Float / Critical Path)"""
+    """DAG 기반 CPM 계산 (Forward / Backward / Float / Critical Path, FS/SS/FF/SF + lag)"""
     @staticmethod
-    def _topo(nodes: List[str], edges: List[tuple]) -> List[str]:
+    def _topo(nodes: List[str], edges: List[tuple]) -> tuple:
+        """Kahn 위상정렬 → (order, cycles). 순환이 있으면 순환을 닫는 edge 를 빼고 다시 정렬"""
         from collections import defaultdict, deque
         indeg = defaultdict(int)
         graph = {n: [] for n in nodes}
@@ -43,46 +52,66 @@ class CPMEngine:
                 indeg[nx] -= 1
                 if indeg[nx] == 0:
                     q.append(nx)
+        cycles = []
         if len(order) != len(nodes):
-            logger.warning("[CPM] 순환 의심 - 입력 WBS 확인 필요")
-        return order
+            seen = set(order)
+            cycles = find_cycles([n for n in nodes if n not in seen], graph)
+            for c in cycles:
+                logger.warning(f"[CPM] 순환 감지: {format_cycle(c)} - 마지막 관계 무시, 입력 WBS 확인 필요")
+            drop = {(c[-2], c[-1]) for c in cycles}
+            order, more = CPMEngine._topo(nodes, [e for e in edges if e not in drop])
+            cycles += more
+        return order, cycles
 
     @staticmethod
     def build_dag_and_schedule(tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
-        # tasks: [{"id","name","duration","dependencies"/"predecessors"}]
-        nodes = [t["id"] for t in tasks]
+        # tasks: [{"id","name","duration","dependencies"/"predecessors","links"}]
+        # 배열 엔진은 lag 없는 FS 관계만 지원
+        if len(tasks) >= CPM_ARRAY_MIN_TASKS and all(is_plain_fs(task_links(t)) for t in tasks):
+            from server.workflow.agents.schedule_agent.cpm_array import ArrayCPMEngine
+            return ArrayCPMEngine.build_dag_and_schedule(tasks)
+        return CPMEngine._build_dag_and_schedule_dict(tasks)
+
+    @staticmethod
+    def _build_dag_and_schedule_dict(tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """dict 기반 구현: 위상 순서로 forward/backward 1회씩 (O(V+E))"""
         duration = {t["id"]: int(t.get("duration", 1) or 1) for t in tasks}
+        nodes = list(duration)  # 중복 id 는 마지막 정의 사용
+
+        # 선행 관계 통일: (pred, type, lag)
+        links = {t["id"]: task_links(t) for t in tasks}
+        unknown = 0
+        for n, ls in links.items():
+            kept = [l for l in ls if l[0] in duration]
+            unknown += len(ls) - len(kept)
+            links[n] = kept
+        if unknown:
+            logger.warning(f"[CPM] 존재하지 않는 선행작업 참조 {unknown}건 무시")
+        edges = [(p, n) for n in nodes for p, _, _ in links[n]]
 
-        # predecessors 통일
-        preds = {}
-        edges = []
-        for t in tasks:
-            p = t.get("predecessors")
-            if p is None:
-                p = t.get("dependencies", [])
-            if isinstance(p, str):
-                p = [x.strip() for x in p.split(",") if x.strip()]
-            preds[t["id"]] = list(p or [])
-            for d in preds[t["id"]]:
-                edges.append((d, t["id"]))
-
-        order = CPMEngine._topo(nodes, edges)
+        order, cycles = CPMEngine._topo(nodes, edges)
+        rank = {n: i for i, n in enumerate(order)}
+        # 순환으로 무시된 관계(위상 순서상 역방향)는 계산에서 제외
+        links = {n: [l for l in links[n] if rank[l[0]] < rank[n]] for n in nodes}
 
         # Forward pass
         ES, EF = {}, {}
         for n in order:
-            ES[n] = max([EF[p] for p in preds.get(n, [])], default=0)
-            EF[n] = ES[n] + duration[n]
+            d = duration[n]
+            ES[n] = max([forward_es(typ, lag, ES[p], EF[p], d) for p, typ, lag in links[n]] + [0])
+            EF[n] = ES[n] + d
 
         # Backward pass
         proj_finish = max(EF.values()) if EF else 0
         succs = {n: [] for n in nodes}
-        for u, v in edges:
-            succs[u].append(v)
+        for n in nodes:
+            for p, typ, lag in links[n]:
+                succs[p].append((n, typ, lag))
         LS, LF = {}, {}
         for n in reversed(order):
-            LF[n] = min([LS[s] for s in succs.get(n, [])], default=proj_finish)
-            LS[n] = LF[n] - duration[n]
+            d = duration[n]
+            LF[n] = min([backward_lf(typ, lag, LS[s], LF[s], d) for s, typ, lag in succs[n]] + [proj_finish])
+            LS[n] = LF[n] - d
 
         FLOAT = {n: LS[n] - ES[n] for n in nodes}
         critical_path = [n for n in nodes if FLOAT[n] == 0]
@@ -90,9 +119,21 @@ class CPMEngine:
         return {
             "ES": ES, "EF": EF, "LS": LS, "LF": LF,
             "FLOAT": FLOAT, "critical_path": critical_path,
-            "project_duration": proj_finish
+            "project_duration": proj_finish,
+            "cycles": cycles,
         }
 
+    @staticmethod
+    def schedule_project(project_id: int, persist: bool = True) -> Dict[str, Any]:
+        """pm_tasks + pm_task_links 로 CPM 계산 후 PM_Task.es/ef/ls/lf/float 에 일괄 반영"""
+        from server.db import pm_crud
+
+        tasks = pm_crud.load_task_network(project_id)
+        cpm = CPMEngine.build_dag_and_schedule(tasks)
+        updated = pm_crud.bulk_update_task_cpm(project_id, cpm) if persist and tasks else 0
+        logger.info(f"[CPM] project={project_id} 작업 {len(tasks)}개 계산, {updated}건 저장")
+        return {**cpm, "tasks": len(tasks), "updated": updated}
+
     @staticmethod
     def visualize_cpm_png(result: Dict[str, Any], output_png: Path):
         cp = result.get("critical_path", [])
@@ -180,24 +221,48 @@ class ChangeManagementGenerator:
         project_id: str,
         output_path: Path,
         wbs_data: Dict[str, Any] | None = None,
-        changes: List[Dict[str, Any]] | None = None
+        changes: List[Dict[str, Any]] | None = None,
+        incremental: bool = True,
     ) -> Dict[str, Any]:
+        """
+        incremental=True: 이전 실행의 CPM 스냅샷(<output 폴더>/cpm_state.json)을 재사용해
+        바뀐 작업만 재계산하고, 일정이 그대로면 차트도 다시 그리지 않는다.
+        변경요청별 영향은 기준 일정에 대한 what-if 로 계산 (서로 누적하지 않음)
+        """
+        from server.workflow.agents.schedule_agent.cpm_incremental import (
+            CycleError, IncrementalCPM, change_to_edits,
+        )
+
         changes = changes or []
         tasks = ChangeManagementGenerator._flatten_wbs(wbs_data) if wbs_data else []
+        html_path = output_path.with_name(output_path.stem + "_critical_path.html")
+        png_path = output_path.with_name(output_path.stem + "_critical_path.png")
+        state_path = output_path.with_name("cpm_state.json")
+        engine = None
+        recalc = {"mode": "full"}
 
         if tasks:
-            cpm = CPMEngine.build_dag_and_schedule(tasks)
-            # HTML(가능 시) + PNG 생성
-            html_path = output_path.with_name(output_path.stem + "_critical_path.html")
-            png_path = output_path.with_name(output_path.stem + "_critical_path.png")
-            try:
-                CPMEngine.visualize_cpm_html(tasks, cpm, html_path)
-            except Exception as e:
-                logger.warning(f"[CPM] HTML 시각화 실패: {e} → PNG만 생성")
-            try:
-                CPMEngine.visualize_cpm_png(cpm, png_path)
-            except Exception as e:
-                logger.warning(f"[CPM] PNG 시각화 실패: {e}")
+            if incremental:
+                engine, recalc = IncrementalCPM.load_or_build(tasks, state_path)
+                cpm = engine.result()
+                engine.save(state_path)
+            else:
+                cpm = CPMEngine.build_dag_and_schedule(tasks)
+            logger.info(f"[CPM] {recalc['mode']} 계산 (변경 작업 {len(recalc.get('changed_tasks', []))}개)")
+
+            # HTML(가능 시) + PNG 생성 (일정이 그대로고 파일이 있으면 생략)
+            rerender = recalc["mode"] != "reused" or not png_path.exists()
+            if rerender:
+                try:
+                    CPMEngine.visualize_cpm_html(tasks, cpm, html_path)
+                except Exception as e:
+                    logger.warning(f"[CPM] HTML 시각화 실패: {e} → PNG만 생성")
+                try:
+                    CPMEngine.visualize_cpm_png(cpm, png_path)
+                except Exception as e:
+                    logger.warning(f"[CPM] PNG 시각화 실패: {e}")
+            if not html_path.exists():
+                html_path = None
         else:
             cpm = {
                 "ES": {}, "EF": {}, "LS": {}, "LF": {}, "FLOAT": {},
@@ -206,11 +271,28 @@ class ChangeManagementGenerator:
             html_path = None
             png_path = None
 
-        # 변경요청에 일정영향/주공정영향 간단 표기
+        # 변경요청별 일정영향/주공정영향 (영향 작업을 식별 못하면 0 / N)
+        if changes and tasks and engine is None:
+            engine = IncrementalCPM.from_tasks(tasks)
         for ch in changes:
-            impact = ch.get("impact", "")
-            ch["schedule_delta_days"] = ChangeManagementGenerator._parse_days(impact)
-            ch["critical_path_impact"] = bool(cpm["critical_path"])
+            edits = change_to_edits(ch, engine.dur) if engine is not None else []
+            if not edits:
+                ch["schedule_delta_days"] = 0
+                ch["critical_path_impact"] = False
+                ch["affected_tasks"] = []
+                continue
+            try:
+                impact = engine.what_if(edits)
+            except CycleError as e:
+                logger.warning(f"[CHANGE] {ch.get('change_id') or ch.get('id')} 적용 불가: {e}")
+                ch["schedule_delta_days"] = 0
+                ch["critical_path_impact"] = True
+                ch["affected_tasks"] = []
+                ch["cpm_error"] = str(e)
+                continue
+            ch["schedule_delta_days"] = impact["schedule_delta_days"]
+            ch["critical_path_impact"] = impact["critical_path_impact"]
+            ch["affected_tasks"] = impact["changed_tasks"]
 
         # Excel 출력
         ChangeManagementGenerator._write_excel(output_path, changes, cpm)
@@ -220,7 +302,17 @@ class ChangeManagementGenerator:
             "critical_path_png": str(png_path) if png_path else None,
             "critical_path_html": str(html_path) if html_path else None,
             "project_duration_days": cpm["project_duration"],
-            "critical_path": cpm["critical_path"]
+            "critical_path": cpm["critical_path"],
+            "cpm_mode": recalc["mode"],
+            "change_impacts": [
+                {
+                    "change_id": ch.get("change_id") or ch.get("id"),
+                    "schedule_delta_days": ch.get("schedule_delta_days", 0),
+                    "critical_path_impact": ch.get("critical_path_impact", False),
+                    "affected_tasks": ch.get("affected_tasks", []),
+                }
+                for ch in changes
+            ],
         }
 
     @staticmethod
@@ -231,7 +323,12 @@ class ChangeManagementGenerator:
                 "id": node.get("id") or node.get("name"),
                 "name": node.get("name"),
                 "duration": node.get("duration", 1),
-                "predecessors": node.get("dependencies") or node.get("predecessors") or []
+                "predecessors": node.get("dependencies") or node.get("predecessors") or [],
+                "links": node.get("links") or [],
+                # 3점 추정(있으면) - 리스크 Monte Carlo 입력
+                **{k: node[k] for k in ("optimistic", "most_likely", "pessimistic") if node.get(k) is not None},
+                # 담당자/투입량(있으면) - 자원 평준화 입력
+                **{k: node[k] for k in ("assignee", "role", "story_points", "units") if node.get(k) is not None},
             })
             for c in node.get("children", []) or []:
                 walk(c)
@@ -239,12 +336,6 @@ class ChangeManagementGenerator:
             walk(n)
         return nodes
 
-    @staticmethod
-    def _parse_days(impact_text: str) -> int:
-        import re
-        m = re.search(r'([+-]?\d+)\s*일', impact_text or "")
-        return int(m.group(1)) if m else 0
-
     @staticmethod
     def _write_excel(path: Path, changes: List[Dict[str, Any]], cpm: Dict[str, Any]):
         wb = openpyxl.Workbook()
@@ -270,7 +361,8 @@ class ChangeManagementGenerator:
                 ch.get("requester"),
                 ch.get("requested_at"),
                 ch.get("status") or ch.get("decision"),
-                ch.get("impact"),
+                ch.get("impact") if not isinstance(ch.get("impact"), (dict, list))
+                else json.dumps(ch.get("impact"), ensure_ascii=False),
                 ch.get("schedule_delta_days", 0),
                 "Y" if ch.get("critical_path_impact") else "N",
                 ch.get("approver"),
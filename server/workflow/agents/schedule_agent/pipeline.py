@@ -5,6 +5,7 @@ from pathlib import Path
 from typing import Any, Dict
 
 from server.utils.config import get_llm
+from server.utils.llm_http import ainvoke_llm
 from server.workflow.agents.schedule_agent.prompts import (
     RTM_PROMPT, WBS_ENRICH_PROMPT, CHANGE_MGMT_PROMPT
 )
@@ -65,8 +66,8 @@ class ScheduleAgent:
                 prompt = RTM_PROMPT.format(requirements_json=req_str)
 
                 logger.info(f"[SCHEDULE] 🤖 RTM 생성 프롬프트 호출")
-                resp = await asyncio.to_thread(
-                    self.llm.invoke,
+                resp = await ainvoke_llm(
+                    self.llm,
                     [{"role": "user", "content": prompt}],
                 )
                 raw = self._safe_extract_raw(resp)
@@ -95,8 +96,8 @@ class ScheduleAgent:
             )
             logger.info(f"[SCHEDULE] 🤖 WBS 일정보완 프롬프트 호출")
             try:
-                resp = await asyncio.to_thread(
-                    self.llm.invoke,
+                resp = await ainvoke_llm(
+                    self.llm,
                     [{"role": "user", "content": prompt}],
                 )
                 raw = self._safe_extract_raw(resp)
@@ -133,8 +134,8 @@ class ScheduleAgent:
             change_prompt = CHANGE_MGMT_PROMPT.format(
                 change_requests=json.dumps(change_requests, ensure_ascii=False, indent=2)
             )
-            _ = await asyncio.to_thread(
-                self.llm.invoke,
+            _ = await ainvoke_llm(
+                self.llm,
                 [{"role": "user", "content": change_prompt}],
             )
         except Exception as e:
@@ -154,9 +155,25 @@ class ScheduleAgent:
         results["outputs"]["critical_path_html"] = cm_out.get("critical_path_html")   # 1112 ★ 추가
         results["outputs"]["critical_path"] = cm_out.get("critical_path")
         results["outputs"]["project_duration_days"] = cm_out.get("project_duration_days")
+        results["change_impacts"] = cm_out.get("change_impacts", [])
 
         logger.info(f"[SCHEDULE] ✅ CPM 계산 완료: Critical Path={cm_out.get('critical_path')}")
 
+        # ------------------------------------------------------------------
+        # 3️⃣-b 자원 평준화 (옵션: payload.resource_leveling)
+        # ------------------------------------------------------------------
+        leveling = payload.get("resource_leveling")
+        if leveling:
+            opts = leveling if isinstance(leveling, dict) else {}
+            try:
+                results["resource_leveling"] = await asyncio.to_thread(
+                    self._level_resources, project_id, wbs_enriched, opts, sched_dir, payload.get("calendar")
+                )
+                results["outputs"]["resource_leveling_json"] = results["resource_leveling"].get("path")
+            except Exception as e:
+                logger.error(f"[SCHEDULE] 자원 평준화 실패: {e}")
+                results["resource_leveling"] = {"status": "error", "message": str(e)}
+
         # ------------------------------------------------------------------
         # 4️⃣ 최종 manifest 기록
         # ------------------------------------------------------------------
@@ -171,6 +188,9 @@ class ScheduleAgent:
             "cpm": {
                 "duration_days": cm_out.get("project_duration_days"),
                 "critical_path": cm_out.get("critical_path", []),
+                "mode": cm_out.get("cpm_mode"),
+                "change_impacts": cm_out.get("change_impacts", []),
+                "leveled_duration_days": (results.get("resource_leveling") or {}).get("leveled_duration"),
                 "html": results["outputs"].get("critical_path_html"),
                 "png": results["outputs"].get("critical_path_png"),
             },
@@ -208,6 +228,32 @@ class ScheduleAgent:
         logger.info(f"[SCHEDULE] 📦 전체 산출물 및 CPM 저장 완료: {manifest_path}")
         return results
 
+    # ----------------------------------------------------------------------
+    @staticmethod
+    def _level_resources(project_id, wbs: Dict[str, Any], opts: Dict[str, Any],
+                         out_dir: Path, calendar: Dict[str, Any] | None = None) -> Dict[str, Any]:
+        """WBS(없으면 pm_tasks) 작업을 담당자 capacity 안에서 재배치 → 전체 결과는 JSON, 요약 반환"""
+        from server.workflow.agents.schedule_agent.resource_leveling import level_resources
+
+        tasks = ChangeManagementGenerator._flatten_wbs(wbs) if wbs else []
+        if not tasks and str(project_id).isdigit():
+            from server.db import pm_crud
+            tasks = pm_crud.load_task_network(int(project_id))
+
+        out = level_resources(
+            tasks,
+            resources=opts.get("resources"),
+            priority=opts.get("priority") or "lst",
+            calendar=opts.get("calendar") or calendar,
+        )
+        if out.get("status") != "ok":
+            return out
+        path = out_dir / "resource_leveling.json"
+        path.write_text(json.dumps(out, ensure_ascii=False), encoding="utf-8")
+        summary = {k: v for k, v in out.items() if k != "schedule"}
+        summary["path"] = str(path)
+        return summary
+
     # ----------------------------------------------------------------------
     def _safe_extract_raw(self, resp: Any) -> str:
         """LLM 응답에서 텍스트 안전 추출"""
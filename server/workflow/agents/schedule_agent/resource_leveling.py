@@ -0,0 +1,346 @@
+# server/workflow/agents/schedule_agent/resource_leveling.py
+"""
+자원 평준화 (Resource-Constrained Scheduling)
+
+- CPM 은 자원 무한 가정 → 담당자(assignee)별 가용량(capacity) 안에서 다시 배치
+- 우선순위 규칙 serial SGS: 선행이 모두 배치된 작업을 heap(ready queue)에서 우선순위 순으로 꺼내
+  선후행(FS/SS/FF/SF + lag) 하한 이후 가장 이른 가용 시점에 배치
+- 담당자 타임라인 = 정렬된 slot 해제시각 목록(capacity 명) + 불가 구간(휴가 등) 캘린더
+- 작업당 O(log n + capacity) → 전체 O(n log n), 5만 작업도 대화형 응답 가능
+- 시간 단위는 CPM 과 같은 작업일(0 = 착수일), calendar 가 있으면 날짜로 변환
+"""
+from __future__ import annotations
+
+import heapq
+import logging
+import math
+import os
+import time
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from server.workflow.agents.schedule_agent.cpm_links import forward_es, task_links
+from server.workflow.agents.schedule_agent.outputs.change_mgmt import CPMEngine
+
+logger = logging.getLogger("schedule.leveling")
+
+LEVEL_DEFAULT_CAPACITY = float(os.getenv("LEVEL_DEFAULT_CAPACITY", "1.0"))
+LEVEL_DAYS_PER_POINT = float(os.getenv("LEVEL_DAYS_PER_POINT", "1.0"))
+LEVEL_TASK_DETAIL_LIMIT = int(os.getenv("LEVEL_TASK_DETAIL_LIMIT", "100"))
+
+# 우선순위 규칙 (값이 작을수록 먼저 배치)
+PRIORITY_RULES = ("lst", "lft", "float", "spt", "order")
+
+
+# ---------------- 작업일 캘린더 ----------------
+class WorkCalendar:
+    """작업일 index ↔ 날짜 (work_week: ISO 요일 1=월 ~ 7=일, holidays: YYYY-MM-DD)"""
+
+    def __init__(self, start_date: Optional[date | str] = None,
+                 work_week: Optional[Iterable[int]] = None, holidays: Optional[Iterable[str]] = None):
+        self.start = _as_date(start_date)
+        self.work_week = set(work_week or [1, 2, 3, 4, 5]) or {1, 2, 3, 4, 5}
+        self.holidays = {_as_date(h) for h in (holidays or []) if h}
+        self._days: List[date] = []
+        self._cursor = self.start
+
+    def _extend(self, until_index: int = -1, until_date: Optional[date] = None) -> None:
+        while len(self._days) <= until_index or (until_date is not None and (not self._days or self._days[-1] < until_date)):
+            d = self._cursor
+            self._cursor += timedelta(days=1)
+            if d.isoweekday() in self.work_week and d not in self.holidays:
+                self._days.append(d)
+
+    def date_of(self, index: int) -> date:
+        self._extend(until_index=index)
+        return self._days[index]
+
+    def index_of(self, d: date | str) -> int:
+        """d 이후 첫 작업일의 index"""
+        d = _as_date(d)
+        if d <= self.start:
+            return 0
+        self._extend(until_date=d)
+        return bisect_left(self._days, d)
+
+
+def _as_date(v) -> date:
+    if isinstance(v, datetime):
+        return v.date()
+    if isinstance(v, date):
+        return v
+    if isinstance(v, str) and v:
+        try:
+            return date.fromisoformat(v[:10])
+        except ValueError:
+            logger.warning("[LEVEL] 날짜 형식 오류(%s) → 오늘 기준", v)
+    return date.today()
+
+
+# ---------------- 담당자 타임라인 ----------------
+class _Resource:
+    """
+    담당자 1명(또는 역할)의 가용 타임라인
+    - slots: capacity 만큼의 동시 작업 slot 해제시각 (정렬 목록)
+    - rate: slot 당 투입률 (capacity 0.5 → 기간 2배)
+    - blocks: 불가 구간 [start, end) (병합·정렬)
+    """
+
+    __slots__ = ("name", "capacity", "rate", "slots", "b_start", "b_end")
+
+    def __init__(self, name: str, capacity: float, blocks: List[Tuple[int, int]]):
+        self.name = name
+        self.capacity = max(float(capacity), 0.01)
+        n = max(int(self.capacity), 1)
+        self.rate = self.capacity / n
+        self.slots = [0] * n
+        merged: List[List[int]] = []
+        for s, e in sorted(blocks):
+            if e <= s:
+                continue
+            if merged and s <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], e)
+            else:
+                merged.append([s, e])
+        self.b_start = [s for s, _ in merged]
+        self.b_end = [e for _, e in merged]
+
+    def duration(self, d: int) -> int:
+        return d if self.rate >= 1 else math.ceil(d / self.rate)
+
+    def place(self, est: int, d: int, k: int) -> int:
+        """est 이후 k 개 slot 을 d 일 연속 확보할 수 있는 가장 이른 시작일 → 배치 후 반환"""
+        slots = self.slots
+        k = min(k, len(slots))
+        i = bisect_right(slots, est)
+        if i >= k:
+            # est 에 이미 비어 있는 slot 중 가장 늦게 풀린 k 개 (유휴 구간 최소화)
+            chosen = i - k
+            start = est
+        else:
+            chosen = 0
+            start = max(est, slots[k - 1])
+        # 불가 구간과 겹치면 그 구간 끝으로 미룸
+        j = bisect_right(self.b_end, start)
+        while j < len(self.b_start) and self.b_start[j] < start + d:
+            start = max(start, self.b_end[j])
+            j += 1
+        del slots[chosen:chosen + k]
+        for _ in range(k):
+            insort(slots, start + d)
+        return start
+
+
+def _resource_specs(resources: Any, cal: WorkCalendar) -> Dict[str, Dict[str, Any]]:
+    """
+    resources:
+      {"홍길동": 1, "개발팀": {"capacity": 3, "unavailable": [["2026-11-02", "2026-11-06"], [10, 12]]}}
+      또는 [{"role"|"name"|"assignee": ..., "capacity_pct": 100 | "capacity": 1, "unavailable": [...]}]
+    unavailable: 날짜 또는 작업일 index 구간 (양끝 포함)
+    """
+    if isinstance(resources, list):
+        items = {}
+        for r in resources:
+            r = r.model_dump() if hasattr(r, "model_dump") else dict(r)
+            name = r.get("name") or r.get("assignee") or r.get("role")
+            if name:
+                items[str(name)] = r
+        resources = items
+    specs: Dict[str, Dict[str, Any]] = {}
+    for name, r in (resources or {}).items():
+        if not isinstance(r, dict):
+            r = {"capacity": r}
+        cap = r.get("capacity")
+        if cap is None and r.get("capacity_pct") is not None:
+            cap = float(r["capacity_pct"]) / 100
+        blocks = []
+        for rng in r.get("unavailable") or r.get("calendar") or []:
+            a, b = (rng, rng) if not isinstance(rng, (list, tuple)) else (rng[0], rng[-1])
+            s = a if isinstance(a, int) else cal.index_of(a)
+            e = (b + 1) if isinstance(b, int) else cal.index_of(_as_date(b) + timedelta(days=1))
+            blocks.append((s, e))
+        specs[str(name)] = {"capacity": LEVEL_DEFAULT_CAPACITY if cap is None else float(cap), "blocks": blocks}
+    return specs
+
+
+def _histogram(intervals: List[Tuple[int, int, float]]) -> List[Tuple[int, int, float]]:
+    """(start, finish, units) 목록 → 부하가 일정한 구간 [(from, to, load)] (sweep, O(m log m))"""
+    events: Dict[int, float] = {}
+    for s, f, u in intervals:
+        if f > s:
+            events[s] = events.get(s, 0.0) + u
+            events[f] = events.get(f, 0.0) - u
+    out: List[Tuple[int, int, float]] = []
+    load, prev = 0.0, None
+    for t in sorted(events):
+        if prev is not None and t > prev and load > 1e-9:
+            if out and out[-1][1] == prev and abs(out[-1][2] - load) < 1e-9:
+                out[-1] = (out[-1][0], t, load)
+            else:
+                out.append((prev, t, round(load, 4)))
+        load += events[t]
+        prev = t
+    return out
+
+
+# ---------------- public API ----------------
+def level_resources(
+    tasks: List[Dict[str, Any]],
+    resources: Any = None,
+    priority: str = "lst",
+    calendar: Optional[Dict[str, Any]] = None,
+    default_capacity: float = LEVEL_DEFAULT_CAPACITY,
+    detail_limit: int = LEVEL_TASK_DETAIL_LIMIT,
+) -> Dict[str, Any]:
+    """
+    tasks: _flatten_wbs / load_task_network 형태 (id, duration, predecessors|links, assignee, story_points, units)
+    resources: 담당자별 capacity / 불가 구간 (_resource_specs 참고), 없는 담당자는 default_capacity
+    priority: lst | lft | float | spt | order
+    반환: 평준화 일정(작업별 start/finish/delay), 담당자별 부하 히스토그램(평준화 전/후), 기간 비교
+    """
+    if priority not in PRIORITY_RULES:
+        raise ValueError(f"priority must be one of {PRIORITY_RULES}")
+    t0 = time.perf_counter()
+    cal = WorkCalendar(**{k: (calendar or {}).get(k) for k in ("start_date", "work_week", "holidays")})
+    if not tasks:
+        return {"status": "skipped", "reason": "no tasks"}
+
+    # 1) 입력 정규화 (기간 없으면 story_points 기준)
+    ids: List[str] = []
+    dur: Dict[str, int] = {}
+    assignee: Dict[str, Optional[str]] = {}
+    units: Dict[str, float] = {}
+    index: Dict[str, int] = {}
+    for t in tasks:
+        tid = str(t["id"])
+        if tid in index:
+            continue
+        index[tid] = len(ids)
+        ids.append(tid)
+        d = t.get("duration")
+        if d is None and t.get("story_points") is not None:
+            d = math.ceil(float(t["story_points"]) * LEVEL_DAYS_PER_POINT)
+        dur[tid] = max(int(d or 0), 0) or 1
+        a = t.get("assignee") or t.get("owner") or t.get("role")
+        assignee[tid] = str(a) if a else None
+        units[tid] = max(float(t.get("units", 1) or 1), 0.0)
+    links = {str(t["id"]): [l for l in task_links(t) if l[0] in index] for t in tasks}
+
+    # 2) CPM (자원 무한) → 우선순위 값 + 평준화 전 기준
+    cpm = CPMEngine.build_dag_and_schedule([{
+        "id": i, "duration": dur[i],
+        "predecessors": [{"id": p, "type": typ, "lag": lag} for p, typ, lag in links[i]],
+    } for i in ids])
+    order, _ = CPMEngine._topo(ids, [(p, n) for n in ids for p, _, _ in links[n]])
+    rank = {n: i for i, n in enumerate(order)}
+    links = {n: [l for l in links[n] if rank[l[0]] < rank[n]] for n in ids}
+
+    if priority == "lst":
+        key = cpm["LS"]
+    elif priority == "lft":
+        key = cpm["LF"]
+    elif priority == "float":
+        key = cpm["FLOAT"]
+    elif priority == "spt":
+        key = dur
+    else:
+        key = index
+
+    # 3) 담당자 타임라인
+    specs = _resource_specs(resources, cal)
+    pool: Dict[str, _Resource] = {}
+    for name in {a for a in assignee.values() if a}:
+        spec = specs.get(name, {"capacity": default_capacity, "blocks": []})
+        pool[name] = _Resource(name, spec["capacity"], spec["blocks"])
+
+    # 4) serial SGS: ready queue = (우선순위, CPM ES, 입력순서) heap
+    succs: Dict[str, List[str]] = {n: [] for n in ids}
+    waiting = {n: len(links[n]) for n in ids}
+    for n in ids:
+        for p, _, _ in links[n]:
+            succs[p].append(n)
+    ready = [(key[n], cpm["ES"][n], index[n], n) for n in ids if waiting[n] == 0]
+    heapq.heapify(ready)
+    S: Dict[str, int] = {}
+    F: Dict[str, int] = {}
+    over_units = 0
+    while ready:
+        _, _, _, n = heapq.heappop(ready)
+        res = pool.get(assignee[n]) if assignee[n] else None
+        d = res.duration(dur[n]) if res else dur[n]
+        est = max([forward_es(typ, lag, S[p], F[p], d) for p, typ, lag in links[n]] + [0])
+        if res is not None:
+            k = max(math.ceil(units[n]), 1)
+            if k > len(res.slots):
+                over_units += 1
+            S[n] = res.place(est, d, k)
+        else:
+            S[n] = est
+        F[n] = S[n] + d
+        for s in succs[n]:
+            waiting[s] -= 1
+            if waiting[s] == 0:
+                heapq.heappush(ready, (key[s], cpm["ES"][s], index[s], s))
+    if over_units:
+        logger.warning("[LEVEL] 담당자 capacity 보다 투입 단위가 큰 작업 %d개 → capacity 로 제한", over_units)
+
+    # 5) 담당자별 부하 (평준화 전/후)
+    by_res: Dict[str, List[str]] = {}
+    for n in ids:
+        if assignee[n]:
+            by_res.setdefault(assignee[n], []).append(n)
+    duration = max(F.values()) if F else 0
+    resources_out: Dict[str, Any] = {}
+    for name, members in sorted(by_res.items()):
+        res = pool[name]
+        cap_units = float(len(res.slots))
+        before = _histogram([(cpm["ES"][n], cpm["EF"][n], min(units[n], cap_units)) for n in members])
+        after = _histogram([(S[n], F[n], min(units[n], cap_units)) for n in members])
+        busy = sum((f - s) * u for s, f, u in after)
+        resources_out[name] = {
+            "capacity": res.capacity,
+            "tasks": len(members),
+            "peak_before": max((u for _, _, u in before), default=0.0),
+            "peak_after": max((u for _, _, u in after), default=0.0),
+            "overallocated_days_before": sum(t - s for s, t, u in before if u > cap_units + 1e-9),
+            "utilization": round(busy / (cap_units * duration), 4) if duration else 0.0,
+            "histogram": [{"from": s, "to": t, "load": u} for s, t, u in after],
+        }
+
+    delays = sorted(((S[n] - cpm["ES"][n], n) for n in ids), reverse=True)
+    delayed = [(dl, n) for dl, n in delays if dl > 0]
+    elapsed = round((time.perf_counter() - t0) * 1000, 1)
+    logger.info(
+        "[LEVEL] %d작업 / 담당자 %d명 (%s) %.1fms → 기간 %d일 (CPM %d일), 지연 작업 %d개",
+        len(ids), len(pool), priority, elapsed, duration, cpm["project_duration"], len(delayed),
+    )
+
+    def row(n: str) -> Dict[str, Any]:
+        return {
+            "id": n, "assignee": assignee[n], "start": S[n], "finish": F[n],
+            "cpm_start": cpm["ES"][n], "delay": S[n] - cpm["ES"][n],
+            "start_date": cal.date_of(S[n]).isoformat(),
+            "finish_date": cal.date_of(max(F[n] - 1, S[n])).isoformat(),
+        }
+
+    return {
+        "status": "ok",
+        "priority": priority,
+        "tasks": len(ids),
+        "resources_count": len(pool),
+        "elapsed_ms": elapsed,
+        "cpm_duration": cpm["project_duration"],
+        "leveled_duration": duration,
+        "delay_days": duration - cpm["project_duration"],
+        "start_date": cal.start.isoformat(),
+        "finish_date": cal.date_of(max(duration - 1, 0)).isoformat(),
+        "delayed_tasks": len(delayed),
+        "top_delayed": [row(n) for _, n in delayed[:detail_limit]],
+        "resources": resources_out,
+        "schedule": {n: (S[n], F[n]) for n in ids},
+        "cycles": cpm.get("cycles", []),
+    }
+
+
+__all__ = ["level_resources", "WorkCalendar", "PRIORITY_RULES", "LEVEL_DEFAULT_CAPACITY"]
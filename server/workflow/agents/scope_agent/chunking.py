@@ -0,0 +1,332 @@
+# server/workflow/agents/scope_agent/chunking.py
+"""
+긴 RFP용 섹션 인지 청커 + 요구사항 병합(map-reduce의 reduce 단계)
+
+- doc_reader.read_texts 가 붙이는 `=== FILE: name ===` 헤더 단위로 먼저 나누고
+- 파일 안에서는 문단/제목/마크다운 표 블록을 깨지 않게 chunk_size 이하로 묶는다
+- 너무 큰 표는 행 단위로 자르되 헤더 행을 각 조각에 반복한다
+- 청크별 추출 결과는 제목+설명의 문자 bigram 코사인 유사도로 중복 제거 후 하나로 합친다
+"""
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+_FILE_HEADER = re.compile(r"^=== FILE: (.+?) ===[ \t]*$", re.M)
+# 마크다운 제목, "1.", "1.2)", "가.", "Ⅲ." 형태의 번호 제목
+_HEADING = re.compile(r"^\s*(#{1,6}\s|\d+(\.\d+)*[.)]\s|[가-하][.)]\s|[IVXⅠ-Ⅻ]+[.)]\s)")
+_TABLE_SEP = re.compile(r"^\s*\|(\s*:?-{3,}:?\s*\|)+\s*$")
+
+
+@dataclass
+class DocChunk:
+    index: int
+    text: str
+    start: int          # 원문 내 시작 offset (overlap 제외)
+    end: int            # 원문 내 끝 offset
+    file: Optional[str] = None
+
+    @property
+    def span(self) -> str:
+        label = f"{self.file} " if self.file else ""
+        return f"chunk#{self.index} {label}[{self.start}:{self.end}]"
+
+
+@dataclass
+class _Block:
+    start: int
+    end: int
+    kind: str           # text | table
+    heading: bool = False
+
+
+# ---------------------------------------------------------------------
+# 분할
+# ---------------------------------------------------------------------
+def _file_sections(text: str) -> List[Tuple[Optional[str], int, int]]:
+    """(file_name, start, end) 목록. 헤더가 없으면 전체를 하나의 섹션으로."""
+    heads = list(_FILE_HEADER.finditer(text))
+    if not heads:
+        return [(None, 0, len(text))]
+    out: List[Tuple[Optional[str], int, int]] = []
+    if text[: heads[0].start()].strip():
+        out.append((None, 0, heads[0].start()))
+    for i, m in enumerate(heads):
+        end = heads[i + 1].start() if i + 1 < len(heads) else len(text)
+        out.append((m.group(1).strip(), m.end(), end))
+    return out
+
+
+def _blocks(text: str, start: int, end: int) -> List[_Block]:
+    blocks: List[_Block] = []
+    cur: Optional[_Block] = None
+    pos = start
+    for line in text[start:end].splitlines(keepends=True):
+        lstart, pos = pos, pos + len(line)
+        stripped = line.strip()
+        if not stripped:
+            if cur is not None:
+                blocks.append(cur)
+                cur = None
+            continue
+        kind = "table" if stripped.startswith("|") else "text"
+        # "### Table N" 캡션은 바로 뒤 표와 한 블록으로 묶는다
+        if kind == "table" and cur is not None and cur.kind == "text" \
+                and text[cur.start:cur.end].lstrip().startswith("### Table"):
+            cur.kind, cur.end = "table", pos
+            continue
+        is_heading = kind == "text" and bool(_HEADING.match(line))
+        if cur is None or cur.kind != kind or is_heading:
+            if cur is not None:
+                blocks.append(cur)
+            cur = _Block(lstart, pos, kind, heading=is_heading)
+        else:
+            cur.end = pos
+    if cur is not None:
+        blocks.append(cur)
+    return blocks
+
+
+def _split_oversized(text: str, block: _Block, chunk_size: int) -> List[Tuple[str, int, int]]:
+    """chunk_size를 넘는 블록을 (text, start, end) 조각으로 자른다."""
+    lines = text[block.start:block.end].splitlines(keepends=True)
+    header = ""
+    caption = 1 if lines and lines[0].lstrip().startswith("###") else 0
+    if block.kind == "table" and len(lines) >= caption + 2 and _TABLE_SEP.match(lines[caption + 1]):
+        header = "".join(lines[:caption + 2])
+        lines = lines[caption + 2:]
+        offset = block.start + len(header)
+    else:
+        offset = block.start
+
+    pieces: List[Tuple[str, int, int]] = []
+    buf, buf_start = "", offset
+    for line in lines:
+        # 한 줄 자체가 너무 길면 문자 단위로 자른다
+        while len(header) + len(line) > chunk_size:
+            cut = max(chunk_size - len(header), 1)
+            if buf:
+                pieces.append((header + buf, buf_start, offset))
+                buf, buf_start = "", offset
+            pieces.append((header + line[:cut], offset, offset + cut))
+            offset += cut
+            line = line[cut:]
+            buf_start = offset
+        if buf and len(header) + len(buf) + len(line) > chunk_size:
+            pieces.append((header + buf, buf_start, offset))
+            buf, buf_start = "", offset
+        buf += line
+        offset += len(line)
+    if buf:
+        pieces.append((header + buf, buf_start, offset))
+    return pieces
+
+
+def _overlap_tail(text: str, overlap: int) -> str:
+    if overlap <= 0 or not text:
+        return ""
+    tail = text[-overlap:]
+    nl = tail.find("\n")
+    # 줄 중간에서 시작하지 않도록 첫 개행 이후부터 사용
+    return tail[nl + 1:] if 0 <= nl < len(tail) - 1 else tail
+
+
+def _file_pieces(text: str, fstart: int, fend: int, chunk_size: int) -> List[Tuple[str, int, int]]:
+    """파일 섹션 하나를 블록 경계 기준 (body, start, end) 조각으로 묶는다 (overlap 미적용)."""
+    pieces: List[Tuple[str, int, int]] = []
+    buf: List[Tuple[str, int, int]] = []
+    buf_len = 0
+
+    def flush() -> None:
+        nonlocal buf, buf_len
+        if buf:
+            pieces.append(("".join(t for t, _, _ in buf), buf[0][1], buf[-1][2]))
+        buf, buf_len = [], 0
+
+    for b in _blocks(text, fstart, fend):
+        size = b.end - b.start
+        if size > chunk_size:
+            flush()
+            pieces.extend(_split_oversized(text, b, chunk_size))
+            continue
+        if buf and (buf_len + size > chunk_size or (b.heading and buf_len >= chunk_size // 2)):
+            flush()
+        sep = "\n" if buf else ""
+        buf.append((sep + text[b.start:b.end], b.start, b.end))
+        buf_len += size + len(sep)
+    flush()
+    return pieces
+
+
+def _normalize_sizes(chunk_size: int, overlap: int) -> Tuple[int, int]:
+    chunk_size = max(int(chunk_size or 0), 200)
+    overlap = max(min(int(overlap or 0), chunk_size // 2), 0)
+    return chunk_size, overlap
+
+
+def chunk_document(text: str, chunk_size: int = 6000, overlap: int = 400) -> List[DocChunk]:
+    """
+    섹션/표 경계를 존중하는 청크 분할.
+    - 청크는 파일 경계를 넘지 않는다
+    - 제목 블록은 현재 청크가 절반 이상 찼을 때 새 청크의 시작점으로 우선 사용
+    - overlap 문자만큼 직전 청크의 꼬리(줄 단위)를 앞에 붙인다
+    """
+    chunk_size, overlap = _normalize_sizes(chunk_size, overlap)
+    chunks: List[DocChunk] = []
+
+    for fname, fstart, fend in _file_sections(text):
+        prev = ""
+        for body, s, e in _file_pieces(text, fstart, fend, chunk_size):
+            if not body.strip():
+                continue
+            tail = _overlap_tail(prev, overlap)
+            chunk_text = (tail + "\n" + body) if tail else body
+            if fname:
+                chunk_text = f"=== FILE: {fname} ===\n{chunk_text}"
+            chunks.append(DocChunk(index=len(chunks) + 1, text=chunk_text, start=s, end=e, file=fname))
+            prev = body
+    return chunks
+
+
+def iter_document_chunks(segments: Iterable[str], chunk_size: int = 6000, overlap: int = 400,
+                         file: Optional[str] = None, start_index: int = 1) -> Iterator[DocChunk]:
+    """
+    조각(예: PDF 페이지) 스트림을 받아 청크가 확정되는 대로 yield 하는 점진 청커.
+    - 버퍼가 chunk_size 의 2배를 넘으면 블록 단위로 나눠 마지막 조각만 남기고 내보낸다
+      (마지막 조각은 다음 조각과 이어질 수 있으므로 보류)
+    - 조각은 "\n" 으로 이어 붙임 → 전체를 한 번에 chunk_document 한 것과 같은 경계 규칙
+    - start/end 는 스트림 전체 기준 offset, file 이 있으면 각 청크에 "=== FILE ===" 헤더
+    """
+    chunk_size, overlap = _normalize_sizes(chunk_size, overlap)
+    index = start_index
+    base = 0            # buf[0] 의 전체 offset
+    buf = ""
+    prev = ""
+    started = False
+
+    def emit(pieces: List[Tuple[str, int, int]]) -> Iterator[DocChunk]:
+        nonlocal index, prev
+        for body, s, e in pieces:
+            if not body.strip():
+                continue
+            tail = _overlap_tail(prev, overlap)
+            chunk_text = (tail + "\n" + body) if tail else body
+            if file:
+                chunk_text = f"=== FILE: {file} ===\n{chunk_text}"
+            yield DocChunk(index=index, text=chunk_text, start=base + s, end=base + e, file=file)
+            index += 1
+            prev = body
+
+    for seg in segments:
+        buf += ("\n" if started else "") + (seg or "")
+        started = True
+        if len(buf) < chunk_size * 2:
+            continue
+        pieces = _file_pieces(buf, 0, len(buf), chunk_size)
+        if len(pieces) < 2:
+            continue
+        keep_from = pieces[-1][1]
+        yield from emit(pieces[:-1])
+        base += keep_from
+        buf = buf[keep_from:]
+
+    if buf.strip():
+        yield from emit(_file_pieces(buf, 0, len(buf), chunk_size))
+
+
+# ---------------------------------------------------------------------
+# 병합 / 중복 제거
+# ---------------------------------------------------------------------
+_NORM = re.compile(r"[\s\W_]+", re.U)
+
+
+def _bigrams(s: str) -> Counter:
+    s = _NORM.sub("", (s or "").lower())
+    if len(s) < 2:
+        return Counter([s]) if s else Counter()
+    return Counter(s[i:i + 2] for i in range(len(s) - 1))
+
+
+def _cosine(a: Counter, b: Counter) -> float:
+    if not a or not b:
+        return 0.0
+    if len(a) > len(b):
+        a, b = b, a
+    dot = sum(v * b.get(k, 0) for k, v in a.items())
+    if not dot:
+        return 0.0
+    na = math.sqrt(sum(v * v for v in a.values()))
+    nb = math.sqrt(sum(v * v for v in b.values()))
+    return dot / (na * nb)
+
+
+def _req_signature(r: Dict[str, Any]) -> Counter:
+    return _bigrams(f"{r.get('title') or ''} {r.get('description') or ''}")
+
+
+def merge_requirements(
+    groups: Iterable[Tuple[DocChunk, List[Dict[str, Any]]]],
+    similarity: float = 0.85,
+) -> List[Dict[str, Any]]:
+    """
+    청크별 요구사항을 청크 순서대로 합치고 의미상 중복(bigram 코사인 ≥ similarity)을 제거.
+    - 중복이면 먼저 나온 항목을 유지하고 acceptance_criteria / source_span 을 합친다
+    - 서로 다른 요구사항이 같은 req_id를 가지면 뒤쪽 항목의 req_id에 청크 번호를 붙인다
+    """
+    kept: List[Dict[str, Any]] = []
+    sigs: List[Counter] = []
+    seen_ids: Dict[str, int] = {}
+
+    for chunk, reqs in groups:
+        for r in reqs or []:
+            if not isinstance(r, dict):
+                continue
+            r = dict(r)
+            span = chunk.span
+            if r.get("source_span"):
+                span = f"{span} {r['source_span']}"
+            r["source_span"] = span
+
+            sig = _req_signature(r)
+            dup_idx = next((i for i, s in enumerate(sigs) if _cosine(sig, s) >= similarity), None)
+            if dup_idx is not None:
+                base = kept[dup_idx]
+                ac = list(base.get("acceptance_criteria") or [])
+                for c in r.get("acceptance_criteria") or []:
+                    if c not in ac:
+                        ac.append(c)
+                if ac:
+                    base["acceptance_criteria"] = ac
+                if span not in base["source_span"]:
+                    base["source_span"] = f"{base['source_span']}; {span}"
+                if len(str(r.get("description") or "")) > len(str(base.get("description") or "")):
+                    base["description"] = r.get("description")
+                continue
+
+            rid = r.get("req_id")
+            if rid:
+                if rid in seen_ids:
+                    r["req_id"] = f"{rid}-C{chunk.index}"
+                seen_ids[r["req_id"]] = len(kept)
+            kept.append(r)
+            sigs.append(sig)
+    return kept
+
+
+def merge_functions(groups: Iterable[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    out: List[Dict[str, Any]] = []
+    names = set()
+    for funcs in groups:
+        for f in funcs or []:
+            name = (f.get("name") or f.get("title")) if isinstance(f, dict) else f
+            key = _NORM.sub("", str(name or "").lower())
+            if key and key not in names:
+                names.add(key)
+                out.append(f)
+    return out
+
+
+__all__ = ["DocChunk", "chunk_document", "iter_document_chunks", "merge_requirements", "merge_functions"]
@@ -4,9 +4,6 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from langchain_openai import OpenAIEmbeddings
-from langchain_community.vectorstores import FAISS
-
 from server.workflow.agents.scope_agent.prompts import build_scope_prompt
 from server.workflow.agents.scope_agent.prompts import (
     PROJECT_CHARTER_PROMPT, TAILORING_PROMPT
@@ -20,6 +17,17 @@ from server.workflow.agents.scope_agent.outputs.tailoring import TailoringGenera
 from server.workflow.agents.scope_agent.outputs.project_plan import ProjectPlanGenerator  # 신규 연결
 from server.workflow.agents.scope_agent.tot_strategy_selector import ToT_StrategySelector
 from server.workflow.agents.scope_agent.self_refine import SelfRefineEngine
+from server.workflow.agents.scope_agent.chunking import (
+    chunk_document, iter_document_chunks, merge_requirements, merge_functions,
+)
+from server.utils.doc_reader import DocReadError, iter_text_segments, resolve_path
+from server.utils.llm_http import ainvoke_llm
+from server.utils.llm_governor import llm_priority
+from server.utils.llm_hedge import llm_call_class
+from server.workflow.agents.scope_agent.prompt_index import get_prompt_index
+from server.workflow.agents.scope_agent.prompt_budget import (
+    assemble_prompt, compress_prompt as budget_compress, fit_document,
+)
 
 
 logger = logging.getLogger("scope.agent")
@@ -27,23 +35,15 @@ logger = logging.getLogger("scope.agent")
 # DB imports (optional)
 try:
     from server.db.database import SessionLocal
-    from server.db import pm_models
+    from server.db import pm_models, pm_crud
     _DB_AVAILABLE = True
 except Exception as e:
     logger.warning("[ScopeAgent] DB import failed: %s", e)
     SessionLocal = None
     pm_models = None
+    pm_crud = None
     _DB_AVAILABLE = False
 
-# --- LangChain v0.2+ 호환 import (fallback 포함) ---
-try:
-    from langchain_openai import OpenAIEmbeddings, AzureOpenAIEmbeddings
-    from langchain_community.vectorstores import FAISS
-except Exception:
-    # 구버전 호환
-    from langchain.embeddings import OpenAIEmbeddings  # type: ignore
-    from langchain.vectorstores import FAISS  # type: ignore
-
 # ---------------------------------------------------------------------
 # LLM getter
 # ---------------------------------------------------------------------
@@ -254,86 +254,110 @@ def _ensure_req_ids(reqs: List[dict]) -> List[dict]:
     return out
 
 # ---------------------------------------------------------------------
-# 1111 PromptManager: RAG + 압축 + 캐싱
+# PMP 산출물 병렬 생성 (풀에서 실행되므로 pickle 가능한 최상위 함수로 둔다)
+# ---------------------------------------------------------------------
+_PMP_GENERATORS = {
+    "project_charter_docx": ProjectCharterGenerator,
+    "scope_statement_excel": ScopeStatementGenerator,
+    "rtm_excel": RTMExcelGenerator,
+    "wbs_excel": WBSExcelGenerator,
+    "tailoring_excel": TailoringGenerator,
+    "project_plan_excel": ProjectPlanGenerator,
+}
+PMP_MAX_WORKERS = int(os.getenv("PMP_MAX_WORKERS", "4"))
+_PMP_EXECUTORS: Dict[str, Any] = {}
+
+
+def _run_pmp_generator(name: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    t0 = time.perf_counter()
+    out = _PMP_GENERATORS[name].generate(**kwargs)
+    return {
+        "path": str(out or kwargs.get("output_path")),
+        "elapsed_ms": round((time.perf_counter() - t0) * 1000, 1),
+    }
+
+
+def _get_pmp_executor(kind: str = "thread"):
+    """프로세스 공용 bounded 풀 (요청 간 공유해 동시 직렬화 작업 수를 제한)"""
+    kind = "process" if str(kind).lower() == "process" else "thread"
+    ex = _PMP_EXECUTORS.get(kind)
+    if ex is None:
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+        if kind == "process":
+            ex = ProcessPoolExecutor(max_workers=PMP_MAX_WORKERS)
+        else:
+            ex = ThreadPoolExecutor(max_workers=PMP_MAX_WORKERS, thread_name_prefix="pmp-out")
+        _PMP_EXECUTORS[kind] = ex
+    return ex
+
+# 긴 RFP 청크 분할 추출 기본값 (options로 요청별 override)
+SCOPE_CHUNK_SIZE = int(os.getenv("SCOPE_CHUNK_SIZE", "6000"))
+SCOPE_CHUNK_OVERLAP = int(os.getenv("SCOPE_CHUNK_OVERLAP", "400"))
+SCOPE_CHUNK_CONCURRENCY = int(os.getenv("SCOPE_CHUNK_CONCURRENCY", "4"))
+
+# ---------------------------------------------------------------------
+# 1111 PromptManager: RAG + 토큰 예산 조립 + 로컬 압축
 # ---------------------------------------------------------------------
 class PromptManager:
     def __init__(self):
         self.llm = get_llm()
-        self.vectorstore = None
         self._init_vectorstore()
 
     def _init_vectorstore(self):
-        """ templates/ 및 rules 폴더를 벡터화. 키 없으면 RAG 비활성 """
-        texts, metas = [], []
-        for p in Path("templates").rglob("*.txt"):
-            t = p.read_text(encoding="utf-8", errors="ignore")
-            texts.append(t); metas.append({"name": str(p.relative_to("templates"))})
-        for p in Path("rules").rglob("*.txt"):
-            t = p.read_text(encoding="utf-8", errors="ignore")
-            texts.append(t); metas.append({"name": str(p.relative_to("rules"))})
-        if not texts: 
-            logger.info("[PROMPT-RAG] 텍스트가 없어 RAG 생략")
-            self.vectorstore = None    
-            return
-        
-        # 1111 🔑 환경 변수 감지 (Azure 우선)
-        azure_key = os.getenv("AZURE_OPENAI_API_KEY")
-        azure_ep  = os.getenv("AZURE_OPENAI_ENDPOINT")
-        azure_ver = os.getenv("OPENAI_API_VERSION") or os.getenv("AZURE_OPENAI_API_VERSION")
-        azure_embed_deploy = os.getenv("AZURE_OPENAI_EMBEDDING_DEPLOYMENT")  # 예: text-embedding-3-large
-
-        openai_key = os.getenv("OPENAI_API_KEY")
-        try:
-            if azure_key and azure_ep and azure_ver and azure_embed_deploy:
-                emb = AzureOpenAIEmbeddings(
-                    azure_endpoint=azure_ep,
-                    api_key=azure_key,
-                    api_version=azure_ver,
-                    deployment=azure_embed_deploy,
-                )
-                logger.info("[PROMPT-RAG] AzureOpenAIEmbeddings 사용")
-            elif openai_key:
-                emb = OpenAIEmbeddings(  # langchain_openai
-                    model=os.getenv("OPENAI_EMBED_MODEL", "text-embedding-3-large"),
-                    api_key=openai_key,
-                )
-                logger.info("[PROMPT-RAG] OpenAIEmbeddings 사용")
-            else:
-                logger.warning("[PROMPT-RAG] 임베딩 키 없음 → RAG 비활성")
-                self.vectorstore = None
-                return
+        """ templates/ 및 rules 인덱스를 프로세스 공용 영속 인덱스에서 가져옴 (VECTOR_DIR, 변경분만 재임베딩) """
+        get_prompt_index()
 
-            self.vectorstore = FAISS.from_texts(texts, metadatas=metas, embedding=emb)
-            logger.info(f"[PROMPT-RAG] 벡터스토어 초기화 완료 ({len(texts)} docs)")
-        except Exception as e:
-            logger.warning(f"[PROMPT-RAG] 초기화 실패 → RAG 비활성: {e}")
-            self.vectorstore = None
+    @property
+    def vectorstore(self):
+        # 재구축 엔드포인트 호출 후에도 최신 인덱스를 보도록 매번 공용 인스턴스를 참조
+        return get_prompt_index()
 
     def build_rag_prompt(self, text: str, base_prompt=None, k=3) -> str:
-        """사용자 문서와 의미적으로 유사한 템플릿/룰을 찾아 프롬프트 생성"""
-        if not self.vectorstore:
-            return base_prompt or build_scope_prompt(text)
-        results = self.vectorstore.similarity_search(text, k=k)
-        retrieved = "\n\n".join(r.page_content for r in results)
+        """사용자 문서와 의미적으로 유사한 템플릿/룰을 찾아 섹션별 토큰 예산 안에서 프롬프트 생성"""
+        store = self.vectorstore
+        if not store:
+            # RAG 비활성 시에도 정상 동작 (문서만 예산에 맞춰 압축)
+            if base_prompt:
+                prompt, _ = assemble_prompt(text, system=base_prompt)
+            else:
+                prompt, _ = fit_document(text, build_scope_prompt)
+            return prompt
         base = base_prompt or "당신은 PMP 표준을 준수하는 PM 분석가입니다."
-        if not self.vectorstore:
-            # RAG 비활성 시에도 정상 동작
-            return f"{base}\n\n문서:\n{text[:8000]}"
-        results = self.vectorstore.similarity_search(text, k=k)
-        retrieved = "\n\n".join(r.page_content for r in results)
-        return f"{base}\n\n{retrieved}\n\n문서:\n{text[:8000]}"
+        try:
+            scored = sorted(store.similarity_search_with_score(text, k=k), key=lambda r: r[1])  # L2 거리 오름차순
+            results = [doc for doc, _ in scored]
+        except Exception:
+            results = store.similarity_search(text, k=k)
+        groups: Dict[str, List[str]] = {"rules": [], "fewshot": [], "rag": []}
+        for r in results:
+            src = str((getattr(r, "metadata", None) or {}).get("source", ""))
+            if src.startswith("rules/"):
+                groups["rules"].append(r.page_content)
+            elif "/fewshot/" in src or "/examples/" in src:
+                groups["fewshot"].append(r.page_content)
+            else:
+                groups["rag"].append(r.page_content)
+        prompt, _ = assemble_prompt(text, system=base, **groups)
+        return prompt
+
+    def build_retry_prompt(self, text: str, last_json: Any) -> str:
+        """이전 결과 개선 프롬프트: 이전 JSON(앞 1500자) + 문서를 토큰 예산에 맞춰 조립"""
+        base = f"이전 결과 개선:\n{json.dumps(last_json, ensure_ascii=False)[:1500]}"
+        prompt, _ = fit_document(text, lambda doc: f"{base}\n\n{doc}")
+        return prompt
 
     def compress_prompt(self, prompt: str) -> str:
-        if not self.llm or len(prompt) < 10000:
-            return prompt
+        """
+        LLM 호출 없이 로컬 추출 압축 (쪽 번호/머리말/표 정리) + 토큰 예산 초과분 절단.
+        build_rag_prompt / build_retry_prompt 결과는 이미 예산 조립됐으므로 다시 넣지 않는다
+        """
         try:
-            msg = [{"role": "user", "content": f"아래 프롬프트를 50% 길이로 압축:\n{prompt}"}]
-            resp = self.llm.invoke(msg)
-            return _safe_extract_raw(resp)
+            out, _ = budget_compress(prompt)
+            return out
         except Exception as e:
             logger.warning(f"[PROMPT-RAG] 압축 실패: {e}")
             return prompt
-        
+
 
 # ---------------------------------------------------------------------
 # ScopeAgent (기존 기능 유지 + 개선 통합)
@@ -343,6 +367,13 @@ class ScopeAgent:
        추가 옵션 (payload['options']):
          - confidence_threshold: float (0..1), default=0.75
          - max_attempts: int, default=3
+         - bypass_cache: bool, default=False (True면 LLM 응답 캐시 우회, pm_graph.run_pipeline에서 적용)
+         - pmp_executor: "thread" | "process", default="thread" (PMP 산출물 병렬 생성 풀)
+         - chunk_size / overlap: int (문자 수), default=SCOPE_CHUNK_SIZE / SCOPE_CHUNK_OVERLAP
+           문서가 chunk_size보다 길면 섹션 단위로 나눠 청크별 추출 후 병합(map-reduce)
+         - chunk_concurrency: int, default=SCOPE_CHUNK_CONCURRENCY (동시 청크 추출 수)
+         - chunk_max_attempts: int, default=min(max_attempts, 2) (청크별 신뢰도 재시도 횟수)
+         - dedupe_similarity: float, default=0.85 (청크 간 요구사항 중복 판정 임계값)
     """
 
     def __init__(self, data_dir: Optional[str] = None):
@@ -366,7 +397,11 @@ class ScopeAgent:
                 {"role": "system", "content": "You are a PM analyst."},
                 {"role": "user", "content": prompt, "cache_control": {"type": "ephemeral"}}
             ]
-            return await asyncio.to_thread(self.llm.invoke, msgs)
+            # 네이티브 async (공유 커넥션 풀) — 호출당 스레드를 점유하지 않음
+            # 요구사항 추출은 사용자가 기다리는 경로 → governor 큐 최우선
+            # scope_extract 클래스로 지연 히스토그램 분리 (p99 꼬리 → LLM_HEDGE_ENABLED 시 hedge 대상)
+            with llm_priority("interactive"), llm_call_class("scope_extract"):
+                return await ainvoke_llm(self.llm, msgs)
         else:
             return await asyncio.to_thread(self.llm, prompt)
         
@@ -374,10 +409,17 @@ class ScopeAgent:
     # 1117 Self-Refine용 LLM 호출 래퍼
     def _llm_call_wrapper(self, prompt: str) -> str:
         """
-        Self-Refine용 LLM 호출 래퍼
+        Self-Refine용 LLM 호출 래퍼 (sync). 이벤트 루프 스레드에서 부르면 governor 대기 동안 루프가 멈추므로
+        async 코드에서는 await asyncio.to_thread(self.refine_engine.refine_loop, ...) 로 실행
         """  # :contentReference[oaicite:18]{index=18}
         if not self.llm:
             raise ValueError("LLM not available")
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise RuntimeError("Self-Refine LLM call on event loop thread; run refine_loop via asyncio.to_thread")
 
         try:
             response = self.llm.invoke(prompt)
@@ -399,9 +441,9 @@ class ScopeAgent:
         while attempt < max_attempts:
             attempt += 1
             logger.info(f"[SCOPE] 시도 {attempt}/{max_attempts}")
+            # 재시도도 같은 (청크) 텍스트 전체를 토큰 예산 안에서 사용 (앞 6000자만 보지 않도록)
             prompt = self.pmgr.build_rag_prompt(text) if not last_json else \
-                f"이전 결과 개선:\n{json.dumps(last_json, ensure_ascii=False)[:1500]}\n\n{text[:6000]}"
-            prompt = self.pmgr.compress_prompt(prompt)
+                self.pmgr.build_retry_prompt(text, last_json)
             try:
                 resp = await self._call_llm(prompt)
                 raw = _safe_extract_raw(resp)
@@ -418,6 +460,141 @@ class ScopeAgent:
         logger.warning("[SCOPE] 최대 시도 도달. 마지막 결과 반환.")
         return last_json or {"requirements": []}, last_raw
 
+    async def _extract_items_chunked(self, text: str, threshold=0.75, max_attempts=3,
+                                     options: Optional[Dict[str, Any]] = None):
+        """
+        긴 문서용 map-reduce 추출.
+        chunk_size 이하 문서는 기존 단일 호출 경로를 그대로 사용하고,
+        그보다 길면 섹션 인지 청크별로 동시에 추출한 뒤 중복을 제거해 병합한다.
+        """
+        options = options or {}
+        chunk_size = int(options.get("chunk_size") or SCOPE_CHUNK_SIZE)
+        overlap = int(options.get("overlap") if options.get("overlap") is not None else SCOPE_CHUNK_OVERLAP)
+        if len(text) <= chunk_size:
+            items, raw = await self._extract_items_with_confidence(text, threshold, max_attempts)
+            return items, raw, {"chunks": 1}
+
+        chunks = chunk_document(text, chunk_size=chunk_size, overlap=overlap)
+        concurrency = max(int(options.get("chunk_concurrency") or SCOPE_CHUNK_CONCURRENCY), 1)
+        attempts = int(options.get("chunk_max_attempts") or min(max_attempts, 2))
+        sem = asyncio.Semaphore(concurrency)
+        t0 = time.perf_counter()
+        logger.info("[SCOPE] 청크 분할 추출: chars=%d chunks=%d concurrency=%d",
+                    len(text), len(chunks), concurrency)
+
+        async def _one(chunk):
+            async with sem:
+                try:
+                    return await self._extract_items_with_confidence(chunk.text, threshold, attempts)
+                except Exception as e:
+                    logger.error("[SCOPE] %s 추출 실패: %s", chunk.span, e)
+                    return {"requirements": []}, ""
+
+        results = await asyncio.gather(*(_one(c) for c in chunks))
+        items, raw, report = self._merge_chunk_results(chunks, results, options)
+        report.update(chunk_size=chunk_size, overlap=overlap, concurrency=concurrency,
+                      elapsed_ms=round((time.perf_counter() - t0) * 1000, 1))
+        logger.info("[SCOPE] 청크 병합 완료: %s", report)
+        return items, raw, report
+
+    def _merge_chunk_results(self, chunks, results, options: Dict[str, Any]):
+        """청크별 추출 결과 → (병합 items, raw, report 일부)"""
+        groups = [(c, (items or {}).get("requirements") or []) for c, (items, _) in zip(chunks, results)]
+        raw_count = sum(len(reqs) for _, reqs in groups)
+        merged = merge_requirements(groups, similarity=float(options.get("dedupe_similarity", 0.85)))
+        functions = merge_functions((items or {}).get("functions") or [] for items, _ in results)
+        raw = "\n".join(f"--- {c.span} ---\n{r}" for c, (_, r) in zip(chunks, results) if r)
+        report = {
+            "chunks": len(chunks),
+            "raw_requirements": raw_count,
+            "merged_requirements": len(merged),
+        }
+        return {"requirements": merged, "functions": functions}, raw, report
+
+    async def _extract_items_streamed(self, paths: List[Path], threshold=0.75, max_attempts=3,
+                                      options: Optional[Dict[str, Any]] = None):
+        """
+        문서 파일 스트리밍 map-reduce 추출.
+        스레드에서 파일을 조각(PDF 는 페이지 구간 병렬) 단위로 읽으며 점진 청커로 청크를 확정하고,
+        청크가 나오는 즉시 LLM 추출을 시작한다 → 마지막 페이지 파싱 전에 앞 청크 추출이 진행된다.
+        """
+        options = options or {}
+        chunk_size = int(options.get("chunk_size") or SCOPE_CHUNK_SIZE)
+        overlap = int(options.get("overlap") if options.get("overlap") is not None else SCOPE_CHUNK_OVERLAP)
+        concurrency = max(int(options.get("chunk_concurrency") or SCOPE_CHUNK_CONCURRENCY), 1)
+        attempts = int(options.get("chunk_max_attempts") or min(max_attempts, 2))
+        sem = asyncio.Semaphore(concurrency)
+        loop = asyncio.get_running_loop()
+        q: asyncio.Queue = asyncio.Queue()
+        done = object()
+        t0 = time.perf_counter()
+
+        def produce() -> None:
+            try:
+                index = 1
+                for p in paths:
+                    for ch in iter_document_chunks(iter_text_segments(p), chunk_size, overlap,
+                                                   file=p.name, start_index=index):
+                        index = ch.index + 1
+                        loop.call_soon_threadsafe(q.put_nowait, ch)
+                loop.call_soon_threadsafe(q.put_nowait, done)
+            except Exception as e:
+                loop.call_soon_threadsafe(q.put_nowait, e)
+
+        async def _one(chunk):
+            async with sem:
+                try:
+                    return await self._extract_items_with_confidence(chunk.text, threshold, attempts)
+                except Exception as e:
+                    logger.error("[SCOPE] %s 추출 실패: %s", chunk.span, e)
+                    return {"requirements": []}, ""
+
+        producer = asyncio.ensure_future(asyncio.to_thread(produce))
+        chunks, tasks = [], []
+        first_chunk_ms = None
+        try:
+            while True:
+                item = await q.get()
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                if first_chunk_ms is None:
+                    first_chunk_ms = round((time.perf_counter() - t0) * 1000, 1)
+                chunks.append(item)
+                tasks.append(asyncio.ensure_future(_one(item)))
+            read_ms = round((time.perf_counter() - t0) * 1000, 1)
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            for t in tasks:
+                t.cancel()
+            raise
+        finally:
+            await asyncio.gather(producer, return_exceptions=True)
+
+        if not chunks:
+            raise DocReadError("문서에서 텍스트를 추출하지 못했습니다.")
+        items, raw, report = self._merge_chunk_results(chunks, results, options)
+        report.update(
+            streamed=True, files=[p.name for p in paths], chunk_size=chunk_size, overlap=overlap,
+            concurrency=concurrency, first_chunk_ms=first_chunk_ms, read_ms=read_ms,
+            elapsed_ms=round((time.perf_counter() - t0) * 1000, 1),
+        )
+        logger.info("[SCOPE] 스트리밍 청크 병합 완료: %s", report)
+        return items, raw, report
+
+    def _resolve_documents(self, project_id: Any, documents: List[Any]) -> List[Path]:
+        roots = [Path(self.data_dir) / str(project_id) / "inputs", Path(self.data_dir) / "inputs", Path(self.data_dir)]
+        paths = []
+        for d in documents:
+            path = d.get("path") if isinstance(d, dict) else getattr(d, "path", None)
+            rp = resolve_path(path, search_roots=roots) if path else None
+            if rp:
+                paths.append(rp)
+            else:
+                logger.warning("[SCOPE] 문서 경로를 찾을 수 없음: %s", path)
+        return paths
+
     async def pipeline(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         project_id = payload.get("project_id") or payload.get("project_name") or "Unknown"
         text = payload.get("text") or ""
@@ -428,32 +605,24 @@ class ScopeAgent:
         tot_constraints: Dict = options.get("tot_constraints", {}) or {}
         user_refine_iterations: Optional[int] = options.get("refine_iterations")
 
-        # if no text but documents - read first file path if exists (best-effort)
-        if not text and documents:
-            first = documents[0]
-            path = None
-            if isinstance(first, dict):
-                path = first.get("path")
-            else:
-                path = getattr(first, "path", None)
-            if path:
-                p = Path(path)
-                if not p.exists():
-                    # maybe relative to data/inputs
-                    alt = Path("data/inputs") / Path(path).name
-                    if alt.exists():
-                        p = alt
-                if p.exists():
-                    try:
-                        # simple read for txt; for docx/pdf we expect upper layer to convert
-                        text = p.read_text(encoding="utf-8", errors="ignore")
-                    except Exception:
-                        text = ""
-
         logger.info("🔵 [SCOPE] 요청: project_id=%s, methodology=%s", project_id, payload.get("methodology"))
 
-        # Run extraction with confidence loop
-        items, raw_resp = await self._extract_items_with_confidence(text, confidence_threshold, max_attempts)
+        if not text and documents:
+            # 텍스트 없이 문서 경로만 온 경우: 파일을 읽으면서 청크별 추출을 바로 시작 (PDF 페이지 스트리밍)
+            paths = self._resolve_documents(project_id, documents)
+            if not paths:
+                return {"status": "error", "project_id": project_id, "message": "문서 파일을 찾을 수 없습니다"}
+            try:
+                items, raw_resp, extraction_report = await self._extract_items_streamed(
+                    paths, confidence_threshold, max_attempts, options
+                )
+            except DocReadError as e:
+                return {"status": "error", "project_id": project_id, "message": str(e)}
+        else:
+            # Run extraction with confidence loop
+            items, raw_resp, extraction_report = await self._extract_items_chunked(
+                text, confidence_threshold, max_attempts, options
+            )
 
         # Ensure req_ids
         reqs = items.get("requirements", [])
@@ -481,9 +650,12 @@ class ScopeAgent:
 
         # attempt DB save (best-effort)
         saved = 0
+        db_counts = None
         if _DB_AVAILABLE:
             try:
-                saved = self._save_requirements_db(project_id, items)
+                # 단일 writer 큐에서 commit → 대기는 스레드에서 (이벤트 루프 비블로킹)
+                db_counts = await asyncio.to_thread(self._save_requirements_db, project_id, items)
+                saved = db_counts["total"]
             except Exception as e:
                 logger.exception("[SCOPE] DB save failed: %s", e)
                 saved = 0
@@ -491,7 +663,7 @@ class ScopeAgent:
             logger.debug("[SCOPE] DB not available, skipping DB save")
 
         # PMP outputs (scope_statement excel etc.) - keep existing hooks
-        pmp_outputs = await self._generate_pmp_outputs(project_id, items, wbs, options, out_dir)
+        pmp_outputs, pmp_report = await self._generate_pmp_outputs(project_id, items, wbs, options, out_dir)
 
         # 1112
         # === Scope manifest (연결점) ===
@@ -511,7 +683,9 @@ class ScopeAgent:
                 "scope_statement": str(out_dir / f"{project_id}_범위기술서.xlsx"),
                 "rtm": str(out_dir / f"{project_id}_요구사항추적표.xlsx"),
                 "project_plan": str(out_dir / f"{project_id}_사업수행계획서.xlsx"),
-            },                
+            },
+            "pmp_report": pmp_report,
+            "extraction": extraction_report,
             "stats": {
                 "requirements": len(items.get("requirements", [])),
                 "functional": sum(1 for r in items.get("requirements", []) if r.get("type") in ("functional","기능")),
@@ -547,7 +721,10 @@ class ScopeAgent:
             "rtm_csv": str(rtm_csv),
             "srs_path": str(srs_path),
             "pmp_outputs": pmp_outputs,
+            "pmp_report": pmp_report,
+            "extraction": extraction_report,
             "db_saved_requirements": saved,
+            "db_requirements": db_counts,
             "_llm_raw_response": str(raw_resp)[:2000],
         }
         logger.info("✅ [SCOPE] 응답완료: %s (requirements=%d, saved=%d)", project_id, len(items.get("requirements", [])), saved)
@@ -618,63 +795,23 @@ class ScopeAgent:
         nodes[0]["children"] = phases
         return {"nodes": nodes, "depth": depth}
 
-    def _save_requirements_db(self, project_id: str, items: Dict[str, Any]) -> int:
+    def _save_requirements_db(self, project_id: str, items: Dict[str, Any]) -> Dict[str, int]:
         """
-        DB에 요구사항 저장(간단 구현). 반환: 저장된 레코드 수.
+        DB에 요구사항 일괄 upsert (단일 트랜잭션). 반환: {"inserted", "updated", "total"}
         안전 장치: req_id가 비어있으면 자동생성 후 저장.
         """
         if not _DB_AVAILABLE:
             logger.debug("[SCOPE] DB not available")
-            return 0
-        db = SessionLocal()
-        saved = 0
+            return {"inserted": 0, "updated": 0, "total": 0}
         try:
-            reqs = items.get("requirements", []) or []
-            for r in reqs:
-                req_id = r.get("req_id")
-                title = r.get("title") or r.get("description")[:200]
-                description = r.get("description")
-                rtype = r.get("type") or r.get("category") or "functional"
-                priority = r.get("priority") or "Medium"
-                source_doc = r.get("source_span") or None
-
-                if not req_id:
-                    req_id = f"AUTO-{int(time.time())}-{saved+1}"
-                    logger.debug("[SCOPE] 자동 req_id 생성: %s", req_id)
-
-                # upsert-like: try find existing by project_id + req_id
-                existing = db.query(pm_models.PM_Requirement).filter_by(project_id=project_id, req_id=req_id).first()
-                if existing:
-                    existing.title = title
-                    existing.description = description
-                    existing.priority = priority
-                    existing.type = rtype
-                    existing.source_doc = source_doc
-                else:
-                    obj = pm_models.PM_Requirement(
-                        project_id=project_id,
-                        req_id=req_id,
-                        title=title,
-                        description=description,
-                        priority=priority,
-                        status="new",
-                        source_doc=source_doc,
-                        created_at=datetime.utcnow()
-                    )
-                    db.add(obj)
-                saved += 1
-            db.commit()
-            logger.info("[SCOPE] DB 저장 완료: %d 레코드", saved)
-            return saved
+            counts = pm_crud.bulk_upsert_requirements(
+                project_id, items.get("requirements", []) or [], status="new"
+            )
+            logger.info("[SCOPE] DB 저장 완료: 신규 %d / 갱신 %d", counts["inserted"], counts["updated"])
+            return counts
         except Exception as e:
             logger.exception("[SCOPE] Saving to DB failed: %s", e)
-            try:
-                db.rollback()
-            except Exception:
-                pass
-            return 0
-        finally:
-            db.close()
+            return {"inserted": 0, "updated": 0, "total": 0}
 
     # SRS / Charter / PMP outputs (existing hooks)
     def _generate_srs(self, project_id: Any, items: Dict[str, Any], out_path: Path):
@@ -703,79 +840,78 @@ class ScopeAgent:
     #         logger.debug("ScopeStatementGenerator not available: %s", e)
     #     return outputs
     async def _generate_pmp_outputs(self, project_id: str, items: dict, wbs_data: dict, options: dict, out_dir: Path):
-        """Scope 분석 결과를 기반으로 실제 문서 산출물 생성"""
-        try:
-            reqs = items.get("requirements", [])
-            logger.info(f"[SCOPE] 📦 산출물 생성 시작 - {len(reqs)}개 요구사항")
-            req_summary = "\n".join([
-                f"- {r['req_id']}: {r['title']} ({r['type']}, {r['priority']})"
-                for r in reqs[:10]
-            ])
-            charter_base = PROJECT_CHARTER_PROMPT.format(
-                project_name=project_id,
-                sponsor=options.get("sponsor", "미정"),
-                background=options.get("background", "회사 내부 요청"),
-                objectives=options.get("objectives", "명확한 요구사항 도출 및 시스템 품질 확보"),
-                requirements_summary=req_summary
-            )
-            # 1️⃣ 프로젝트 헌장 (Word)
-            charter_path = out_dir / f"{project_id}_프로젝트헌장.docx"
-            ProjectCharterGenerator.generate(
-                project_name=project_id,
-                requirements=reqs,
-                wbs_data=wbs_data,
-                output_path=charter_path
-            )
-            logger.info(f"[SCOPE] ✅ 프로젝트 헌장 생성: {charter_path}")
+        """
+        Scope 분석 결과를 기반으로 6종 PMP 산출물을 병렬 생성.
+        - 이벤트 루프를 막지 않도록 bounded 스레드/프로세스 풀에서 실행
+          (options.pmp_executor = "thread"(기본) | "process")
+        - 산출물별 성공/실패를 따로 기록 (하나가 실패해도 나머지는 유지)
 
-            # 2️⃣ 범위 기술서 (Excel)
-            scope_stmt_path = out_dir / f"{project_id}_범위기술서.xlsx"
-            ScopeStatementGenerator.generate(
-                project_name=project_id,
-                wbs_data=wbs_data,
-                requirements=reqs,
-                output_path=scope_stmt_path
-            )
-            logger.info(f"[SCOPE] ✅ 범위 기술서 생성: {scope_stmt_path}")
+        Returns:
+            (pmp_outputs, pmp_report)
+            pmp_outputs: {산출물키: 경로 or None}
+            pmp_report:  {산출물키: {"status", "path", "elapsed_ms", "error"}}
+        """
+        reqs = items.get("requirements", [])
+        logger.info(f"[SCOPE] 📦 산출물 생성 시작 - {len(reqs)}개 요구사항")
 
+        jobs = {
+            # 1️⃣ 프로젝트 헌장 (Word)
+            "project_charter_docx": dict(
+                project_name=project_id, requirements=reqs, wbs_data=wbs_data,
+                output_path=out_dir / f"{project_id}_프로젝트헌장.docx",
+            ),
+            # 2️⃣ 범위 기술서 (Excel)
+            "scope_statement_excel": dict(
+                project_name=project_id, wbs_data=wbs_data, requirements=reqs,
+                output_path=out_dir / f"{project_id}_범위기술서.xlsx",
+            ),
             # 3️⃣ 요구사항 추적표 (RTM)
-            rtm_path = out_dir / f"{project_id}_요구사항추적표.xlsx"
-            RTMExcelGenerator.generate(
+            "rtm_excel": dict(
                 requirements=reqs,
-                output_path=rtm_path
-            )
-            logger.info(f"[SCOPE] ✅ RTM 생성: {rtm_path}")
-
+                output_path=out_dir / f"{project_id}_요구사항추적표.xlsx",
+            ),
             # 4️⃣ WBS Excel
-            wbs_excel_path = out_dir / f"{project_id}_WBS.xlsx"
-            WBSExcelGenerator.generate(
+            "wbs_excel": dict(
                 wbs_data=wbs_data,
-                output_path=wbs_excel_path
-            )
-            logger.info(f"[SCOPE] ✅ WBS Excel 생성: {wbs_excel_path}")
-
+                output_path=out_dir / f"{project_id}_WBS.xlsx",
+            ),
             # 5️⃣ Tailoring (방법론별)
-            tailoring_path = out_dir / f"{project_id}_테일러링.xlsx"
-            TailoringGenerator.generate(
-                methodology=options.get("methodology", "waterfall"),
-                requirements=reqs, 
-                output_path=tailoring_path
-            )
-            logger.info(f"[SCOPE] ✅ Tailoring 생성: {tailoring_path}")
-
+            "tailoring_excel": dict(
+                methodology=options.get("methodology", "waterfall"), requirements=reqs,
+                output_path=out_dir / f"{project_id}_테일러링.xlsx",
+            ),
             # 6️⃣ 사업수행계획서 (Project Plan)
-            plan_path = out_dir / f"{project_id}_사업수행계획서.xlsx"
-            ProjectPlanGenerator.generate(
-                project_name=project_id,
-                requirements=reqs,
-                wbs_data=wbs_data,
-                options=options,
-                output_path=plan_path
-            )
-            logger.info(f"[SCOPE] ✅ 사업수행계획서 생성: {plan_path}")
+            "project_plan_excel": dict(
+                project_name=project_id, requirements=reqs, wbs_data=wbs_data, options=options,
+                output_path=out_dir / f"{project_id}_사업수행계획서.xlsx",
+            ),
+        }
 
-        except Exception as e:
-            logger.error(f"[SCOPE] ❌ 산출물 생성 중 오류: {e}")
+        executor = _get_pmp_executor(options.get("pmp_executor", "thread"))
+        loop = asyncio.get_running_loop()
+        t0 = time.perf_counter()
+        futures = [loop.run_in_executor(executor, _run_pmp_generator, name, kwargs) for name, kwargs in jobs.items()]
+        results = await asyncio.gather(*futures, return_exceptions=True)
+
+        pmp_outputs: Dict[str, Optional[str]] = {}
+        pmp_report: Dict[str, Dict[str, Any]] = {}
+        for name, res in zip(jobs.keys(), results):
+            if isinstance(res, BaseException):
+                logger.error(f"[SCOPE] ❌ {name} 생성 실패: {res}")
+                pmp_outputs[name] = None
+                pmp_report[name] = {"status": "error", "path": None, "elapsed_ms": None, "error": repr(res)}
+            else:
+                logger.info(f"[SCOPE] ✅ {name} 생성: {res['path']} ({res['elapsed_ms']}ms)")
+                pmp_outputs[name] = res["path"]
+                pmp_report[name] = {"status": "ok", "error": None, **res}
+
+        failed = [n for n, r in pmp_report.items() if r["status"] != "ok"]
+        logger.info(
+            "[SCOPE] 📦 산출물 생성 완료: %d/%d 성공, 총 %.0fms%s",
+            len(jobs) - len(failed), len(jobs), (time.perf_counter() - t0) * 1000,
+            f" (실패: {failed})" if failed else "",
+        )
+        return pmp_outputs, pmp_report
         
 
     async def _synthesize_wbs_draft(self, items, depth=3):
@@ -817,10 +953,9 @@ class ScopeAgent:
                 objectives=options.get("objectives", "명확한 요구사항 도출 및 시스템 품질 확보")
             )
             charter_prompt = self.pmgr.build_rag_prompt(charter_base)
-            charter_prompt = self.pmgr.compress_prompt(charter_prompt)
 
-            resp = await asyncio.to_thread(
-                self.llm.invoke,
+            resp = await ainvoke_llm(
+                self.llm,
                 [
                     {"role": "system", "content": "You are a PMO documentation expert."},
                     {"role": "user", "content": charter_prompt}
@@ -850,10 +985,9 @@ class ScopeAgent:
                 duration=options.get("duration", "6")
 )
             tailoring_prompt = self.pmgr.build_rag_prompt(tailoring_base)
-            tailoring_prompt = self.pmgr.compress_prompt(tailoring_prompt)
 
-            resp = await asyncio.to_thread(
-                self.llm.invoke,
+            resp = await ainvoke_llm(
+                self.llm,
                 [
                     {"role": "system", "content": "You are a PMP process tailoring expert."},
                     {"role": "user", "content": tailoring_prompt}
@@ -873,10 +1007,9 @@ class ScopeAgent:
                 req_text = json.dumps(req_json["requirements"][:20], ensure_ascii=False, indent=2)
                 wbs_prompt = WBS_SYNTH_PROMPT.format(requirements_json=req_text)
                 wbs_prompt = self.pmgr.build_rag_prompt(wbs_prompt)
-                wbs_prompt = self.pmgr.compress_prompt(wbs_prompt)
 
-                resp = await asyncio.to_thread(
-                    self.llm.invoke,
+                resp = await ainvoke_llm(
+                    self.llm,
                     [
                         {"role": "system", "content": "You are a project scheduling expert."},
                         {"role": "user", "content": wbs_prompt}
@@ -914,7 +1047,7 @@ class ScopeChainPipeline:
         logger.info(f"📄 요구사항 추출 완료: {len(requirements)}개")
         
         # 2️⃣ 품질 검증
-        valid = self.quality_agent.validate(reqs, text, project_meta)
+        valid = await asyncio.to_thread(self.quality_agent.validate, reqs, text, project_meta)
         logger.info(f"✅ 품질 점수: {validation['score']} ({validation['grade']})")
 
         if not valid.get("pass", True):
@@ -0,0 +1,321 @@
+# server/workflow/agents/scope_agent/prompt_budget.py
+"""
+PromptManager용 토큰 예산 프롬프트 조립 + 로컬 추출 압축 (LLM 호출 없음)
+
+- 토큰 수는 llm_governor.count_tokens (tiktoken, BPE 파일이 없으면 문자 근사) 로 셈
+- 섹션별 상한: system / rules / fewshot / rag, document 는 전체 예산에서 나머지
+  · 검색 결과는 관련도 순으로 채우고 넘치면 관련도 낮은 스니펫부터 제외 (1순위도 안 들어가면 잘라서 넣음)
+- 압축 (문자 단위 자르기 대신):
+  · 문서: 쪽 경계(폼피드 / 쪽 번호 줄) 위·아래에서 여러 쪽 반복되는 머리말/꼬리말은 첫 1개만 유지, 쪽 번호 줄 삭제
+    (본문 안에서 반복되는 문장·숫자만 있는 줄은 그대로 둠)
+  · 표: 구분선(|---|, ─── 등) 제거, 셀 공백 정리, 빈 행 / 중복 행 제거
+  · 연속 공백 / 빈 줄 정리
+- 요청마다 압축 전/후 토큰 수와 절약량을 로그로 남기고 prompt_budget_stats() 로 누적/최근 내역 제공
+"""
+from __future__ import annotations
+
+import logging
+import os
+import re
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from server.utils.llm_governor import count_tokens
+
+logger = logging.getLogger("scope.prompt_budget")
+
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "8000"))
+PROMPT_BUDGET_SYSTEM = int(os.getenv("PROMPT_BUDGET_SYSTEM", "400"))
+PROMPT_BUDGET_RULES = int(os.getenv("PROMPT_BUDGET_RULES", "600"))
+PROMPT_BUDGET_FEWSHOT = int(os.getenv("PROMPT_BUDGET_FEWSHOT", "1200"))
+PROMPT_BUDGET_RAG = int(os.getenv("PROMPT_BUDGET_RAG", "1000"))
+PROMPT_DEDUPE_MIN_CHARS = int(os.getenv("PROMPT_DEDUPE_MIN_CHARS", "6"))  # 이보다 짧은 머리말/꼬리말은 유지
+PROMPT_BOILERPLATE_EDGE_LINES = int(os.getenv("PROMPT_BOILERPLATE_EDGE_LINES", "2"))  # 쪽 위/아래 몇 줄을 머리말/꼬리말로 볼지
+PROMPT_BOILERPLATE_MIN_PAGES = int(os.getenv("PROMPT_BOILERPLATE_MIN_PAGES", "2"))  # 이 쪽 수 이상 반복돼야 머리말/꼬리말
+
+_TRUNCATED = "\n...(이하 생략)"
+# 쪽 번호 줄: "- 3 -", "3/10", "3 / 10", "page 3", "Page 3 of 10", "p. 3", "3 페이지", "3쪽" (숫자만 있는 줄은 본문 값일 수 있어 제외)
+_PAGE_NO = re.compile(
+    r"^\s*(-\s*\d+\s*-|\d+\s*/\s*\d+|page\s*\d+(\s*(of|/)\s*\d+)?|p\.\s*\d+|\d+\s*(페이지|쪽))\s*$", re.I
+)
+_TABLE_SEP = re.compile(r"^\s*\|?(\s*:?-{3,}:?\s*\|)+\s*:?-*:?\s*\|?\s*$")
+_RULE_LINE = re.compile(r"^\s*[-=_─━═┄┈+|*·]{3,}\s*$")
+_MULTI_SPACE = re.compile(r"[ \t　]{2,}")
+# JSON/코드 모양 줄은 반복돼도 구조가 깨지지 않게 유지
+_STRUCTURAL = re.compile(r'^\s*([{}\[\]"\'`]|```)|[,{\[]\s*$')
+
+
+# ---------------------------------------------------------------------
+# 로컬 추출 압축
+# ---------------------------------------------------------------------
+def _collapse_table_row(line: str) -> str:
+    cells = [c.strip() for c in line.strip().strip("|").split("|")]
+    return "| " + " | ".join(cells) + " |"
+
+
+def _is_page_break(line: str) -> bool:
+    return "\f" in line or bool(_PAGE_NO.match(line.strip()))
+
+
+def _boilerplate_lines(lines: List[str]) -> set:
+    """
+    쪽 경계(폼피드 / 쪽 번호 줄)로 나눈 각 쪽의 위·아래 EDGE 줄 중 여러 쪽에서 반복되는 줄 = 머리말/꼬리말.
+    반환: 지울 줄 index (첫 등장은 유지). 쪽 경계가 없으면 빈 집합 (본문 반복 문장은 건드리지 않음)
+    """
+    pages: List[List[int]] = [[]]
+    for i, line in enumerate(lines):
+        if _is_page_break(line):
+            pages.append([])
+        else:
+            pages[-1].append(i)
+    pages = [p for p in pages if p]
+    if len(pages) < 2:
+        return set()
+
+    def _key(i: int) -> Optional[str]:
+        st = lines[i].strip()
+        if (len(st) < PROMPT_DEDUPE_MIN_CHARS or _RULE_LINE.match(st) or _TABLE_SEP.match(st)
+                or _STRUCTURAL.search(st) or st.startswith("|")):
+            return None
+        return _MULTI_SPACE.sub(" ", st).lower()
+
+    n = PROMPT_BOILERPLATE_EDGE_LINES
+    edges: Dict[str, List[int]] = {}
+    for page in pages:
+        body = [i for i in page if lines[i].strip() and not _RULE_LINE.match(lines[i])]
+        if n <= 0 or len(body) <= 2 * n:
+            continue  # 위/아래 가장자리와 본문이 겹치는 짧은 쪽은 판단하지 않음
+        for i in dict.fromkeys(body[:n] + body[-n:]):
+            k = _key(i)
+            if k:
+                edges.setdefault(k, []).append(i)
+    drop: set = set()
+    for idxs in edges.values():
+        if len(idxs) >= PROMPT_BOILERPLATE_MIN_PAGES:
+            drop.update(idxs[1:])
+    return drop
+
+
+def compress_text(text: str, dedupe: bool = True) -> str:
+    """
+    쪽 번호 / 머리말·꼬리말(쪽 경계에서 반복되는 줄) / 표 구분선 / 중복 표 행 / 여분 공백 제거.
+    dedupe=False 면 쪽 번호·머리말 정리는 생략 (few-shot 등 템플릿용)
+    """
+    # splitlines() 는 \f 를 줄바꿈으로 삼켜 쪽 경계가 사라짐 → \n 으로만 분리
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").replace("\f", "\n\f\n").split("\n")
+    drop = _boilerplate_lines(lines) if dedupe else set()
+    out: List[str] = []
+    table_rows: set = set()
+    in_code = False
+    blank = False
+    for i, raw in enumerate(lines):
+        line = raw.rstrip()
+        stripped = line.strip()
+        if stripped.startswith("```"):
+            in_code = not in_code
+        if in_code or stripped.startswith("```"):
+            out.append(line)
+            blank = False
+            continue
+        if "\f" in raw:
+            continue
+        if not stripped:
+            table_rows.clear()
+            if not blank and out:
+                out.append("")
+            blank = True
+            continue
+        if _TABLE_SEP.match(line) or _RULE_LINE.match(line):
+            continue
+        if dedupe and (i in drop or _PAGE_NO.match(stripped)):
+            continue
+        if stripped.startswith("|") and stripped.count("|") >= 2:
+            row = _collapse_table_row(stripped)
+            if not row.replace("|", "").strip() or row in table_rows:
+                continue  # 빈 행 / 같은 표 안 중복 행
+            table_rows.add(row)
+            out.append(row)
+            blank = False
+            continue
+        table_rows.clear()
+        indent = line[: len(line) - len(line.lstrip())]
+        out.append(indent + _MULTI_SPACE.sub(" ", stripped))
+        blank = False
+    while out and not out[-1]:
+        out.pop()
+    return "\n".join(out)
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """max_tokens 이하가 되도록 뒤를 자름 (가능하면 줄 경계에서). 토크나이저 종류와 무관하게 이분 탐색"""
+    if max_tokens <= 0:
+        return ""
+    if count_tokens(text) <= max_tokens:
+        return text
+    room = max_tokens - count_tokens(_TRUNCATED)
+    if room <= 0:
+        return ""
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if count_tokens(text[:mid]) <= room:
+            lo = mid
+        else:
+            hi = mid - 1
+    cut = text[:lo]
+    nl = cut.rfind("\n")
+    if nl >= len(cut) * 0.8:
+        cut = cut[:nl]
+    return cut.rstrip() + _TRUNCATED
+
+
+# ---------------------------------------------------------------------
+# 섹션별 예산 조립
+# ---------------------------------------------------------------------
+@dataclass
+class _Section:
+    name: str
+    before: int = 0
+    after: int = 0
+    items: int = 0
+    dropped: int = 0
+    parts: List[str] = field(default_factory=list)
+
+    def report(self) -> Dict[str, int]:
+        return {"before": self.before, "after": self.after, "items": self.items, "dropped": self.dropped}
+
+
+def _fill(name: str, texts: Sequence[str], cap: int, dedupe: bool) -> _Section:
+    """관련도 순 texts 를 cap 안에서 채움. 넘치는 건 뒤(관련도 낮은 쪽)부터 제외"""
+    sec = _Section(name)
+    texts = [t for t in texts if t and t.strip()]
+    sec.before = sum(count_tokens(t) for t in texts)
+    left = cap
+    for t in texts:
+        c = compress_text(t, dedupe=dedupe)
+        n = count_tokens(c)
+        if n > left:
+            if sec.parts:
+                sec.dropped += 1
+                continue
+            c = truncate_tokens(c, left)  # 가장 관련도 높은 1개는 잘라서라도 포함
+            n = count_tokens(c)
+            if not c:
+                sec.dropped += 1
+                continue
+        sec.parts.append(c)
+        sec.items += 1
+        left -= n
+    sec.after = cap - left
+    return sec
+
+
+def assemble_prompt(
+    document: str,
+    system: str = "",
+    rules: Sequence[str] = (),
+    fewshot: Sequence[str] = (),
+    rag: Sequence[str] = (),
+    budget: Optional[int] = None,
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    (prompt, report). rules/fewshot/rag 는 관련도 높은 순.
+    레이아웃: system → rules → fewshot → rag → "문서:" + document (document 는 남은 예산 전부)
+    """
+    budget = budget or PROMPT_TOKEN_BUDGET
+    sections = [
+        _fill("system", [system], PROMPT_BUDGET_SYSTEM, dedupe=False),
+        _fill("rules", rules, PROMPT_BUDGET_RULES, dedupe=False),
+        _fill("fewshot", fewshot, PROMPT_BUDGET_FEWSHOT, dedupe=False),
+        _fill("rag", rag, PROMPT_BUDGET_RAG, dedupe=False),
+    ]
+    head = "\n\n".join(p for s in sections for p in s.parts)
+    doc_cap = max(budget - count_tokens(head) - count_tokens("\n\n문서:\n"), 0)
+    doc = _Section("document")
+    doc.before = count_tokens(document)
+    compressed = compress_text(document)
+    body = truncate_tokens(compressed, doc_cap)
+    doc.after = count_tokens(body)
+    doc.items = 1 if body else 0
+    sections.append(doc)
+
+    prompt = f"{head}\n\n문서:\n{body}" if head else f"문서:\n{body}"
+    report = _record("assemble", sum(s.before for s in sections), count_tokens(prompt), budget)
+    report["sections"] = {s.name: s.report() for s in sections}
+    # 문서 절약분 중 로컬 압축(반복 줄/표 정리) 몫 — 나머지는 예산 초과 절단
+    report["sections"]["document"]["compressed"] = count_tokens(compressed)
+    return prompt, report
+
+
+def compress_prompt(prompt: str, budget: Optional[int] = None) -> Tuple[str, Dict[str, Any]]:
+    """이미 만들어진 프롬프트 통째 압축: compress_text + 예산 초과분 뒤에서 자름"""
+    budget = budget or PROMPT_TOKEN_BUDGET
+    out = truncate_tokens(compress_text(prompt), budget)
+    return out, _record("compress", count_tokens(prompt), count_tokens(out), budget)
+
+
+def fit_document(document: str, wrap: Callable[[str], str], budget: Optional[int] = None) -> Tuple[str, Dict[str, Any]]:
+    """wrap(document) 형태의 고정 템플릿 프롬프트에서 document 만 압축/절단해 예산에 맞춤"""
+    budget = budget or PROMPT_TOKEN_BUDGET
+    fixed = count_tokens(wrap(""))
+    prompt = wrap(truncate_tokens(compress_text(document), max(budget - fixed, 0)))
+    return prompt, _record("fit", fixed + count_tokens(document), count_tokens(prompt), budget)
+
+
+# ---------------------------------------------------------------------
+# 지표
+# ---------------------------------------------------------------------
+_STATS_LOCK = threading.Lock()
+_STATS: Dict[str, int] = {"prompts": 0, "tokens_before": 0, "tokens_after": 0, "over_budget": 0}
+_RECENT: Deque[Dict[str, Any]] = deque(maxlen=int(os.getenv("PROMPT_BUDGET_RECENT", "50")))
+
+
+def _record(kind: str, before: int, after: int, budget: int) -> Dict[str, Any]:
+    saved = max(before - after, 0)
+    report = {
+        "kind": kind,
+        "tokens_before": before,
+        "tokens_after": after,
+        "tokens_saved": saved,
+        "saved_ratio": round(saved / before, 4) if before else 0.0,
+        "budget": budget,
+    }
+    with _STATS_LOCK:
+        _STATS["prompts"] += 1
+        _STATS["tokens_before"] += before
+        _STATS["tokens_after"] += after
+        if before > budget:
+            _STATS["over_budget"] += 1
+        _RECENT.append(report)
+    logger.info("[PROMPT-BUDGET] %s tokens %d → %d (saved %d, %.0f%%, budget %d)",
+                kind, before, after, saved, report["saved_ratio"] * 100, budget)
+    return report
+
+
+def prompt_budget_stats() -> Dict[str, Any]:
+    with _STATS_LOCK:
+        totals = dict(_STATS)
+        recent = list(_RECENT)
+    before = totals["tokens_before"]
+    saved = max(before - totals["tokens_after"], 0)
+    return {
+        "budget": PROMPT_TOKEN_BUDGET,
+        "section_caps": {"system": PROMPT_BUDGET_SYSTEM, "rules": PROMPT_BUDGET_RULES,
+                         "fewshot": PROMPT_BUDGET_FEWSHOT, "rag": PROMPT_BUDGET_RAG},
+        **totals,
+        "tokens_saved": saved,
+        "saved_ratio": round(saved / before, 4) if before else 0.0,
+        "recent": recent,
+    }
+
+
+__all__ = [
+    "compress_text",
+    "truncate_tokens",
+    "assemble_prompt",
+    "compress_prompt",
+    "fit_document",
+    "prompt_budget_stats",
+]
@@ -0,0 +1,232 @@
+# server/workflow/agents/scope_agent/prompt_index.py
+"""
+PromptManager용 templates/ + rules/ FAISS 인덱스 (프로세스 공용, 디스크 영속)
+
+- settings.VECTOR_DIR 에 index.faiss / index.pkl / manifest.json 으로 저장
+- manifest 에 파일별 sha256 을 기록해 변경/추가된 파일만 다시 임베딩, 삭제된 파일은 인덱스에서 제거
+- 변경이 없으면 임베딩 호출 없이 mmap(read-only) 으로 로드
+- 프로세스당 1회만 동기화하고, 이후 PromptManager 생성은 같은 인스턴스를 재사용
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from langchain_openai import OpenAIEmbeddings, AzureOpenAIEmbeddings
+    from langchain_community.vectorstores import FAISS
+except Exception:
+    # 구버전 호환
+    from langchain.embeddings import OpenAIEmbeddings  # type: ignore
+    from langchain.vectorstores import FAISS  # type: ignore
+    AzureOpenAIEmbeddings = None  # type: ignore
+
+from server.utils.llm_coalesce import coalesce_embeddings
+
+logger = logging.getLogger("scope.prompt_index")
+
+SOURCE_DIRS = ("templates", "rules")
+MANIFEST_VERSION = 1
+
+_LOCK = threading.Lock()
+_STATE: Dict[str, Any] = {"store": None, "synced": False, "report": {}}
+
+
+def _vector_dir() -> Path:
+    try:
+        from server.utils.config import settings
+        return Path(settings.VECTOR_DIR)
+    except Exception:
+        return Path(os.getenv("VECTOR_DIR", "vectorstore/scope"))
+
+
+def _build_embeddings() -> Tuple[Any, Optional[str]]:
+    """(embeddings, embedding_id). 키가 없으면 (None, None) → RAG 비활성 (Azure 우선)"""
+    azure_key = os.getenv("AZURE_OPENAI_API_KEY")
+    azure_ep = os.getenv("AZURE_OPENAI_ENDPOINT")
+    azure_ver = os.getenv("OPENAI_API_VERSION") or os.getenv("AZURE_OPENAI_API_VERSION")
+    azure_embed_deploy = os.getenv("AZURE_OPENAI_EMBEDDING_DEPLOYMENT")  # 예: text-embedding-3-large
+    openai_key = os.getenv("OPENAI_API_KEY")
+
+    if azure_key and azure_ep and azure_ver and azure_embed_deploy and AzureOpenAIEmbeddings:
+        emb = AzureOpenAIEmbeddings(
+            azure_endpoint=azure_ep,
+            api_key=azure_key,
+            api_version=azure_ver,
+            deployment=azure_embed_deploy,
+        )
+        return coalesce_embeddings(emb), f"azure:{azure_embed_deploy}"
+    if openai_key:
+        model = os.getenv("OPENAI_EMBED_MODEL", "text-embedding-3-large")
+        return coalesce_embeddings(OpenAIEmbeddings(model=model, api_key=openai_key)), f"openai:{model}"
+    return None, None
+
+
+def _scan_sources() -> Dict[str, Dict[str, str]]:
+    """{rel_path: {"sha256", "text", "name"}}"""
+    out: Dict[str, Dict[str, str]] = {}
+    for root in SOURCE_DIRS:
+        base = Path(root)
+        for p in sorted(base.rglob("*.txt")):
+            data = p.read_bytes()
+            out[p.as_posix()] = {
+                "sha256": hashlib.sha256(data).hexdigest(),
+                "text": data.decode("utf-8", errors="ignore"),
+                "name": str(p.relative_to(base)),
+            }
+    return out
+
+
+def _doc_id(rel: str, sha: str) -> str:
+    return f"{rel}@{sha[:16]}"
+
+
+def _read_manifest(vdir: Path) -> Dict[str, Any]:
+    try:
+        return json.loads((vdir / "manifest.json").read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+
+
+def _write_manifest(vdir: Path, manifest: Dict[str, Any]) -> None:
+    tmp = vdir / "manifest.json.tmp"
+    tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, vdir / "manifest.json")
+
+
+def _load_local(vdir: Path, emb: Any, mmap: bool):
+    """FAISS.save_local 산출물 로드. mmap=True면 read-only 메모리 매핑 (미지원 인덱스는 일반 로드)"""
+    import faiss
+
+    path = str(vdir / "index.faiss")
+    index = None
+    if mmap:
+        try:
+            index = faiss.read_index(path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+        except Exception as e:
+            logger.debug("[PROMPT-RAG] mmap 로드 불가 → 일반 로드: %s", e)
+    if index is None:
+        index = faiss.read_index(path)
+    with open(vdir / "index.pkl", "rb") as fh:
+        docstore, index_to_docstore_id = pickle.load(fh)
+    return FAISS(
+        embedding_function=emb,
+        index=index,
+        docstore=docstore,
+        index_to_docstore_id=index_to_docstore_id,
+    )
+
+
+def _sync(force: bool = False) -> Tuple[Any, Dict[str, Any]]:
+    t0 = time.perf_counter()
+    vdir = _vector_dir()
+    sources = _scan_sources()
+    if not sources:
+        logger.info("[PROMPT-RAG] 텍스트가 없어 RAG 생략")
+        return None, {"status": "empty"}
+
+    emb, emb_id = _build_embeddings()
+    if emb is None:
+        logger.warning("[PROMPT-RAG] 임베딩 키 없음 → RAG 비활성")
+        return None, {"status": "disabled"}
+
+    manifest = _read_manifest(vdir)
+    has_index = (vdir / "index.faiss").exists() and (vdir / "index.pkl").exists()
+    reusable = (
+        not force and has_index
+        and manifest.get("version") == MANIFEST_VERSION
+        and manifest.get("embedding") == emb_id
+    )
+    old_files: Dict[str, Dict[str, Any]] = manifest.get("files", {}) if reusable else {}
+
+    added = [r for r, s in sources.items() if old_files.get(r, {}).get("sha256") != s["sha256"]]
+    removed = [r for r, meta in old_files.items() if r not in sources or r in added]
+    report = {
+        "status": "ok",
+        "embedding": emb_id,
+        "vector_dir": str(vdir),
+        "docs": len(sources),
+        "embedded": len(added),
+        "removed": len([r for r in removed if r not in sources]),
+        "rebuilt": not reusable,
+    }
+
+    if reusable and not added and not removed:
+        store = _load_local(vdir, emb, mmap=True)
+        report["elapsed_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+        logger.info("[PROMPT-RAG] 인덱스 로드 (변경 없음): %s", report)
+        return store, report
+
+    def _payload(rels: List[str]):
+        texts = [sources[r]["text"] for r in rels]
+        metas = [{"name": sources[r]["name"], "source": r} for r in rels]
+        ids = [_doc_id(r, sources[r]["sha256"]) for r in rels]
+        return texts, metas, ids
+
+    if reusable:
+        store = _load_local(vdir, emb, mmap=False)
+        stale_ids = [old_files[r]["id"] for r in removed if old_files[r].get("id")]
+        if stale_ids:
+            store.delete(ids=stale_ids)
+        if added:
+            texts, metas, ids = _payload(added)
+            store.add_texts(texts, metadatas=metas, ids=ids)
+    else:
+        texts, metas, ids = _payload(list(sources))
+        store = FAISS.from_texts(texts, metadatas=metas, embedding=emb, ids=ids)
+
+    vdir.mkdir(parents=True, exist_ok=True)
+    store.save_local(str(vdir))
+    _write_manifest(vdir, {
+        "version": MANIFEST_VERSION,
+        "embedding": emb_id,
+        "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "files": {r: {"sha256": s["sha256"], "id": _doc_id(r, s["sha256"])} for r, s in sources.items()},
+    })
+    report["elapsed_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+    logger.info("[PROMPT-RAG] 인덱스 갱신: %s", report)
+    return store, report
+
+
+def get_prompt_index():
+    """프로세스 공용 벡터스토어 (최초 호출 시 1회 동기화). 비활성/실패 시 None"""
+    if _STATE["synced"]:
+        return _STATE["store"]
+    with _LOCK:
+        if not _STATE["synced"]:
+            try:
+                _STATE["store"], _STATE["report"] = _sync()
+            except Exception as e:
+                logger.warning(f"[PROMPT-RAG] 초기화 실패 → RAG 비활성: {e}")
+                _STATE["store"], _STATE["report"] = None, {"status": "error", "error": str(e)}
+            _STATE["synced"] = True
+    return _STATE["store"]
+
+
+def rebuild_prompt_index(force: bool = False) -> Dict[str, Any]:
+    """
+    디스크 변경분을 다시 반영 (force=True면 전체 재임베딩).
+    이미 생성된 PromptManager 들도 다음 검색부터 새 인덱스를 사용한다.
+    """
+    with _LOCK:
+        try:
+            _STATE["store"], _STATE["report"] = _sync(force=force)
+        except Exception as e:
+            logger.exception("[PROMPT-RAG] 재구축 실패: %s", e)
+            _STATE["report"] = {"status": "error", "error": str(e)}
+        _STATE["synced"] = True
+    return dict(_STATE["report"])
+
+
+def prompt_index_status() -> Dict[str, Any]:
+    return {"synced": _STATE["synced"], "loaded": _STATE["store"] is not None, **_STATE["report"]}
+
+
+__all__ = ["get_prompt_index", "rebuild_prompt_index", "prompt_index_status"]
@@ -3,6 +3,8 @@ from typing import Dict, List, Any, Optional
 import logging
 import json
 
+from server.utils.llm_governor import llm_priority
+
 logger = logging.getLogger("scope.refine")
 
 
@@ -16,6 +18,7 @@ class SelfRefineEngine:
 
     - llm_caller: prompt(str)를 받아 응답(str)을 리턴하는 함수
       (ScopeAgent에서 self._llm_call_wrapper로 주입):contentReference[oaicite:12]{index=12}
+    - refine_loop 는 sync LLM 호출을 반복 → async 코드에서는 asyncio.to_thread 로 실행
     """
 
     def __init__(self, llm_caller: Optional[Any] = None) -> None:
@@ -198,4 +201,6 @@ class SelfRefineEngine:
     def _call_llm(self, prompt: str) -> str:
         if not self.llm_caller:
             raise ValueError("llm_caller is not set")
-        return self.llm_caller(prompt)
+        # critique/refine 은 백그라운드 보강 → governor 큐에서 추출 요청보다 뒤
+        with llm_priority("background"):
+            return self.llm_caller(prompt)
@@ -0,0 +1,337 @@
+# server/workflow/job_queue.py
+"""
+장시간 워크플로우(ReWOO proposal, Scope→Schedule)용 비동기 Job 큐
+
+- submit → job id 즉시 반환, bounded worker(JOB_WORKERS)가 순서대로 실행
+- 단계별 진행 상황(scope/cost/schedule/risk)과 산출물 경로를 pm_jobs 테이블에 기록
+- 같은 프로세스의 구독자에게는 이벤트를 즉시 push, 다른 프로세스는 DB polling 으로 따라감
+- 재시작 시 queued 작업은 다시 큐에 넣고, 죽은 프로세스가 잡고 있던 running 작업은 failed 처리
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+try:
+    from server.db.database import SessionLocal
+    from server.db import pm_models
+    from server.db.writer import get_writer
+    _DB_AVAILABLE = True
+except Exception as e:  # pragma: no cover - DB 없는 환경
+    logging.getLogger("pm.jobs").warning("[JOBS] DB import failed: %s", e)
+    SessionLocal = None
+    pm_models = None
+    get_writer = None
+    _DB_AVAILABLE = False
+
+logger = logging.getLogger("pm.jobs")
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+TERMINAL = ("succeeded", "failed")
+
+# progress(step, status, result=None, **info)
+ProgressFn = Callable[..., None]
+Runner = Callable[[Dict[str, Any], ProgressFn], Awaitable[Dict[str, Any]]]
+
+_ARTIFACT_SUFFIXES = {".json", ".csv", ".md", ".xlsx", ".docx", ".pdf", ".png", ".html", ".txt"}
+
+
+def collect_artifacts(result: Any) -> Dict[str, str]:
+    """단계 결과에서 파일 경로로 보이는 값만 추려냄 (최상위 + pmp_outputs / outputs)"""
+    out: Dict[str, str] = {}
+    if not isinstance(result, dict):
+        return out
+
+    def _take(prefix: str, d: Dict[str, Any]) -> None:
+        for k, v in d.items():
+            if isinstance(v, str) and Path(v).suffix.lower() in _ARTIFACT_SUFFIXES:
+                out[f"{prefix}{k}"] = v
+
+    _take("", result)
+    for sub in ("pmp_outputs", "outputs"):
+        if isinstance(result.get(sub), dict):
+            _take(f"{sub}.", result[sub])
+    return out
+
+
+def _jsonable(obj: Any) -> Any:
+    return json.loads(json.dumps(obj, ensure_ascii=False, default=str))
+
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+        return True
+    except OSError:
+        return False
+
+
+def _row_to_dict(row) -> Dict[str, Any]:
+    return {
+        "job_id": row.id,
+        "kind": row.kind,
+        "status": row.status,
+        "project_id": row.project_id,
+        "steps": row.steps or {},
+        "result": row.result,
+        "error": row.error,
+        "created_at": row.created_at.isoformat() if row.created_at else None,
+        "started_at": row.started_at.isoformat() if row.started_at else None,
+        "finished_at": row.finished_at.isoformat() if row.finished_at else None,
+    }
+
+
+class JobManager:
+    def __init__(self, workers: int = JOB_WORKERS):
+        self.workers = max(int(workers), 1)
+        self._runners: Dict[str, Runner] = {}
+        self._steps: Dict[str, List[str]] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._subs: Dict[str, List[asyncio.Queue]] = {}
+        self._lock = threading.Lock()
+
+    # ---------------- registry ----------------
+    def register(self, kind: str, runner: Runner, steps: List[str]) -> None:
+        self._runners[kind] = runner
+        self._steps[kind] = list(steps)
+
+    # ---------------- lifecycle ----------------
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        for job_id in await asyncio.to_thread(self._recover):
+            self._queue.put_nowait(job_id)
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        logger.info("[JOBS] worker %d개 시작 (대기 작업 %d)", self.workers, self._queue.qsize())
+
+    async def stop(self) -> None:
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def _recover(self) -> List[str]:
+        if not _DB_AVAILABLE:
+            return []
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(pm_models.PM_Job)
+                .filter(pm_models.PM_Job.status.in_(("queued", "running")))
+                .order_by(pm_models.PM_Job.created_at)
+                .all()
+            )
+            requeue = []
+            for r in rows:
+                if r.status == "queued":
+                    requeue.append(r.id)
+                elif not _pid_alive(r.owner_pid) or r.owner_pid == os.getpid():
+                    r.status, r.error, r.finished_at = "failed", "interrupted by server restart", datetime.utcnow()
+            db.commit()
+            return requeue
+        finally:
+            db.close()
+
+    # ---------------- submit / query ----------------
+    async def submit(self, kind: str, payload: Dict[str, Any], project_id: Optional[str] = None) -> str:
+        if kind not in self._runners:
+            raise ValueError(f"unknown job kind: {kind}")
+        if not _DB_AVAILABLE:
+            raise RuntimeError("job queue requires the database")
+        await self.start()
+        job_id = uuid.uuid4().hex
+        steps = {s: {"status": "pending"} for s in self._steps[kind]}
+
+        def _insert():
+            db = SessionLocal()
+            try:
+                db.add(pm_models.PM_Job(
+                    id=job_id, kind=kind, status="queued", project_id=project_id,
+                    payload=_jsonable(payload), steps=steps, created_at=datetime.utcnow(),
+                ))
+                db.commit()
+            finally:
+                db.close()
+
+        await asyncio.to_thread(_insert)
+        self._queue.put_nowait(job_id)
+        logger.info("[JOBS] 접수 %s (%s) queue=%d", job_id, kind, self._queue.qsize())
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        if not _DB_AVAILABLE:
+            return None
+        db = SessionLocal()
+        try:
+            row = db.get(pm_models.PM_Job, job_id)
+            return _row_to_dict(row) if row else None
+        finally:
+            db.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "running": bool(self._tasks),
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "subscribers": sum(len(v) for v in self._subs.values()),
+        }
+
+    # ---------------- events ----------------
+    def _publish(self, job_id: str, event: Dict[str, Any]) -> None:
+        loop = self._loop
+        subs = list(self._subs.get(job_id, []))
+        if not loop or not subs:
+            return
+        for q in subs:
+            loop.call_soon_threadsafe(q.put_nowait, event)
+
+    async def events(self, job_id: str, poll_sec: float = 2.0) -> AsyncIterator[Dict[str, Any]]:
+        """스냅샷 → 진행 이벤트 → 종료 이벤트 순으로 yield (다른 프로세스 작업은 DB polling)"""
+        snap = await asyncio.to_thread(self.get, job_id)
+        if snap is None:
+            yield {"type": "error", "job_id": job_id, "error": "job not found"}
+            return
+        yield {"type": "snapshot", **snap}
+        if snap["status"] in TERMINAL:
+            return
+
+        q: asyncio.Queue = asyncio.Queue()
+        self._subs.setdefault(job_id, []).append(q)
+        last = (snap["status"], json.dumps(snap["steps"], sort_keys=True))
+        try:
+            while True:
+                try:
+                    ev = await asyncio.wait_for(q.get(), timeout=poll_sec)
+                    yield ev
+                    if ev.get("type") == "done":
+                        return
+                    continue
+                except asyncio.TimeoutError:
+                    pass
+                snap = await asyncio.to_thread(self.get, job_id)
+                if snap is None:
+                    return
+                cur = (snap["status"], json.dumps(snap["steps"], sort_keys=True))
+                if snap["status"] in TERMINAL:
+                    yield {"type": "done", **snap}
+                    return
+                if cur != last:
+                    last = cur
+                    yield {"type": "snapshot", **snap}
+                else:
+                    yield {"type": "ping", "job_id": job_id}
+        finally:
+            subs = self._subs.get(job_id, [])
+            if q in subs:
+                subs.remove(q)
+            if not subs:
+                self._subs.pop(job_id, None)
+
+    # ---------------- execution ----------------
+    @staticmethod
+    def _write_fields(db, job_id: str, fields: Dict[str, Any]) -> None:
+        """writer 큐 작업: pm_jobs 행 필드 갱신 (commit 은 writer 가 묶어서)"""
+        row = db.get(pm_models.PM_Job, job_id)
+        if row is None:
+            return
+        for k, v in fields.items():
+            setattr(row, k, v)
+
+    def _claim(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """queued → running 원자적 전환 (여러 프로세스가 같은 작업을 잡지 않도록)"""
+        db = SessionLocal()
+        try:
+            n = (
+                db.query(pm_models.PM_Job)
+                .filter(pm_models.PM_Job.id == job_id, pm_models.PM_Job.status == "queued")
+                .update({"status": "running", "started_at": datetime.utcnow(), "owner_pid": os.getpid()},
+                        synchronize_session=False)
+            )
+            db.commit()
+            if not n:
+                return None
+            row = db.get(pm_models.PM_Job, job_id)
+            return {"kind": row.kind, "payload": row.payload or {}, "steps": dict(row.steps or {})}
+        finally:
+            db.close()
+
+    def _progress_fn(self, job_id: str, steps: Dict[str, Any]) -> ProgressFn:
+        def _log_failure(fut) -> None:
+            if not fut.cancelled() and fut.exception() is not None:
+                logger.warning("[JOBS] %s 진행상황 저장 실패: %s", job_id, fut.exception())
+
+        def progress(step: str, status: str, result: Any = None, **info) -> None:
+            with self._lock:
+                st = dict(steps.get(step) or {})
+                st["status"] = status
+                now = time.time()
+                if status == "running":
+                    st["started_at"] = datetime.utcnow().isoformat()
+                    st["_t0"] = now
+                elif "_t0" in st:
+                    st["elapsed_ms"] = round((now - st.pop("_t0")) * 1000, 1)
+                if result is not None:
+                    arts = collect_artifacts(result)
+                    if arts:
+                        st["artifacts"] = arts
+                st.update(_jsonable(info))
+                steps[step] = st
+                persisted = {k: {kk: vv for kk, vv in v.items() if kk != "_t0"} for k, v in steps.items()}
+                # progress 는 이벤트 루프 스레드에서도 불림 → DB 쓰기는 writer 큐로 넘기고 기다리지 않음
+                # (lock 안에서 넣어 병렬 단계끼리도 스냅샷 순서 = 쓰기 순서)
+                fut = get_writer().submit(self._write_fields, job_id, {"steps": persisted})
+            fut.add_done_callback(_log_failure)
+            self._publish(job_id, {"type": "step", "job_id": job_id, "step": step, **persisted[step]})
+        return progress
+
+    async def _worker(self, idx: int) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except Exception as e:  # 방어적: worker는 죽지 않는다
+                logger.exception("[JOBS] worker-%d 예외: %s", idx, e)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str) -> None:
+        job = await asyncio.to_thread(self._claim, job_id)
+        if job is None:
+            return
+        runner = self._runners.get(job["kind"])
+        self._publish(job_id, {"type": "status", "job_id": job_id, "status": "running"})
+        t0 = time.perf_counter()
+        steps = job["steps"]
+        try:
+            if runner is None:
+                raise RuntimeError(f"no runner for kind {job['kind']}")
+            result = await runner(job["payload"], self._progress_fn(job_id, steps))
+            fields = {"status": "succeeded", "result": _jsonable(result), "error": None}
+        except Exception as e:
+            logger.exception("[JOBS] %s 실패: %s", job_id, e)
+            fields = {"status": "failed", "error": str(e)}
+        fields["finished_at"] = datetime.utcnow()
+        # 같은 writer 큐 → 앞서 넣은 진행상황 쓰기가 모두 반영된 뒤 종료 상태 기록
+        await get_writer().run(self._write_fields, job_id, fields)
+        logger.info("[JOBS] %s %s (%.1fs)", job_id, fields["status"], time.perf_counter() - t0)
+        snap = await asyncio.to_thread(self.get, job_id)
+        self._publish(job_id, {"type": "done", **(snap or {"job_id": job_id, "status": fields["status"]})})
+
+
+job_manager = JobManager()
+
+__all__ = ["JobManager", "job_manager", "collect_artifacts", "TERMINAL"]
@@ -5,11 +5,14 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import os
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
+from server.utils import llm_cache
 from server.workflow.agents.scope_agent.pipeline import ScopeAgent
 from server.workflow.agents.cost_agent.cost_agent import CostAgent
 from server.workflow.agents.schedule_agent.pipeline import ScheduleAgent
@@ -33,6 +36,11 @@ except Exception:
 logger = logging.getLogger(__name__)
 
 
+# 단계별 기본 타임아웃/재시도 (payload["step_options"][step_id] 로 override)
+STEP_TIMEOUT_SEC = float(os.getenv("META_STEP_TIMEOUT_SEC", "900"))
+STEP_RETRIES = int(os.getenv("META_STEP_RETRIES", "0"))
+
+
 # ---------------- Planner structures ----------------
 
 @dataclass
@@ -42,6 +50,8 @@ class PlannerStep:
     deps: List[str] = field(default_factory=list)
     enabled: bool = True
     config: Dict[str, Any] = field(default_factory=dict)
+    timeout_sec: Optional[float] = None   # None이면 무제한
+    retries: int = 0                      # 실패/타임아웃 시 재시도 횟수
 
 
 @dataclass
@@ -61,6 +71,8 @@ class MetaPlanner:
 
     Worker:
       - Scope → (Quality Check) → Cost → Schedule → (Risk) → (Integrator)
+      - execute_plan(): deps 기반 병렬 실행 (Cost ∥ Schedule), 단계별 timeout/retry,
+        단계별 wall time / 파이프라인 critical path 를 manifest["pipeline_timings"] 에 기록
 
     Solver:
       - Proposal Manifest로 통합 후 파일 저장
@@ -137,6 +149,13 @@ class MetaPlanner:
                 )
             )
 
+        step_opts = payload.get("step_options", {}) or {}
+        for st in steps:
+            opt = step_opts.get(st.id, {}) or {}
+            timeout = opt.get("timeout_sec", STEP_TIMEOUT_SEC)
+            st.timeout_sec = float(timeout) if timeout else None
+            st.retries = int(opt.get("retries", STEP_RETRIES))
+
         logger.info("[MetaPlanner] Plan 생성: %s", [s.id for s in steps])
         return PlannerPlan(project_id=project_id, steps=steps)
 
@@ -177,7 +196,9 @@ class MetaPlanner:
         if self.quality_agent is not None and options.get("run_quality_check"):
             try:
                 logger.info("[MetaPlanner] ▶ QualityAgent 품질 검증 실행")
-                qres = self.quality_agent.validate(
+                # validate 는 sync LLM 호출 → 루프 밖 스레드에서 (governor 큐 대기가 루프를 막지 않도록)
+                qres = await asyncio.to_thread(
+                    self.quality_agent.validate,
                     scope_result.get("requirements", []),
                     rfp_text,
                     metadata={"project_id": project_id},
@@ -276,6 +297,7 @@ class MetaPlanner:
         schedule_result: Dict[str, Any],
         risk_result: Optional[Dict[str, Any]] = None,
         integrator_result: Optional[Dict[str, Any]] = None,
+        timings: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         manifest: Dict[str, Any] = {
             "project_id": project_id,
@@ -288,6 +310,8 @@ class MetaPlanner:
             manifest["risk"] = risk_result
         if integrator_result is not None:
             manifest["integrator"] = integrator_result
+        if timings is not None:
+            manifest["pipeline_timings"] = timings
 
         out_dir = self.data_dir / project_id
         out_dir.mkdir(parents=True, exist_ok=True)
@@ -301,7 +325,159 @@ class MetaPlanner:
 
     # ---------------- High-level entry ----------------
 
-    async def generate(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+    async def generate(
+        self,
+        payload: Dict[str, Any],
+        progress: Optional[Callable[..., None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        progress(step, status, result=None, **info): 단계별 진행 콜백 (job_queue 에서 사용)
+          status = "running" | "done" | "failed" | "skipped"
+        """
+        # scope_options/schedule_options.bypass_cache=True 이면 LLM 응답 캐시 우회
+        with llm_cache.bypass(llm_cache.bypass_requested(payload)):
+            return await self._generate(payload, progress)
+
+    @staticmethod
+    def _notify(progress, step: str, status: str, result: Any = None, **info) -> None:
+        if progress is None:
+            return
+        try:
+            progress(step, status, result, **info)
+        except Exception as e:
+            logger.warning("[MetaPlanner] progress 콜백 실패 (%s/%s): %s", step, status, e)
+
+    def _step_call(self, step: PlannerStep, project_id: str, payload: Dict[str, Any],
+                   results: Dict[str, Any]):
+        """PlannerStep → (callable, args, kwargs). 의존 단계 결과는 results 에서 꺼낸다."""
+        if step.agent == "scope":
+            return self.run_scope, (project_id, payload, step.config), {}
+        if step.agent == "cost":
+            return self.run_cost, (results["scope"],), {}
+        if step.agent == "schedule":
+            return self.run_schedule, (project_id, payload, step.config), {}
+        if step.agent == "risk":
+            return self.run_risk, (project_id, results["scope"], results["cost"], results["schedule"]), {}
+        if step.agent == "integrator":
+            return (
+                self.run_integrator,
+                (results["scope"], results["cost"], results["schedule"]),
+                {"db_session": payload.get("db_session")},
+            )
+        raise ValueError(f"unknown planner agent: {step.agent}")
+
+    async def _run_step(self, step: PlannerStep, fn: Callable[..., Any], args, kwargs,
+                        progress, timing: Dict[str, Any]) -> Any:
+        """단일 단계 실행: sync agent는 스레드로 offload, 타임아웃/재시도 적용"""
+        self._notify(progress, step.id, "running")
+        attempts = max(int(step.retries), 0) + 1
+        last_err: Optional[BaseException] = None
+        for attempt in range(1, attempts + 1):
+            timing["attempts"] = attempt
+            try:
+                if asyncio.iscoroutinefunction(fn):
+                    coro = fn(*args, **kwargs)
+                else:
+                    # 타임아웃 시 대기만 중단되고 스레드 자체는 끝까지 실행된다
+                    coro = asyncio.to_thread(fn, *args, **kwargs)
+                result = await asyncio.wait_for(coro, timeout=step.timeout_sec)
+                self._notify(progress, step.id, "done", result, attempts=attempt)
+                return result
+            except asyncio.TimeoutError:
+                last_err = TimeoutError(f"step '{step.id}' timed out after {step.timeout_sec}s")
+            except Exception as e:
+                last_err = e
+            logger.warning("[MetaPlanner] %s 실패 (%d/%d): %s", step.id, attempt, attempts, last_err)
+            if attempt < attempts:
+                await asyncio.sleep(min(2 ** (attempt - 1), 10))
+        self._notify(progress, step.id, "failed", error=str(last_err), attempts=attempts)
+        raise last_err
+
+    async def execute_plan(
+        self,
+        plan: PlannerPlan,
+        payload: Dict[str, Any],
+        progress: Optional[Callable[..., None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        의존성 기반 병렬 실행기.
+        deps 가 모두 끝난 단계를 즉시 시작하므로 cost / schedule 은 scope 직후 동시에 실행된다.
+        한 단계가 최종 실패하면 나머지를 취소하고 예외를 전파한다.
+        반환: {"results": {step_id: result}, "timings": {...}}
+        """
+        steps = {st.id: st for st in plan.steps if st.enabled}
+        for st in steps.values():
+            missing = [d for d in st.deps if d not in steps]
+            if missing:
+                raise ValueError(f"step '{st.id}' depends on unknown/disabled steps: {missing}")
+
+        results: Dict[str, Any] = {}
+        timings: Dict[str, Dict[str, Any]] = {sid: {"deps": list(st.deps)} for sid, st in steps.items()}
+        running: Dict[asyncio.Task, str] = {}
+        pending = dict(steps)
+        t0 = time.perf_counter()
+
+        def _launch_ready() -> None:
+            for sid in [sid for sid, st in pending.items() if all(d in results for d in st.deps)]:
+                st = pending.pop(sid)
+                fn, args, kwargs = self._step_call(st, plan.project_id, payload, results)
+                timings[sid]["start_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+                task = asyncio.create_task(self._run_step(st, fn, args, kwargs, progress, timings[sid]))
+                running[task] = sid
+
+        _launch_ready()
+        try:
+            while running:
+                done, _ = await asyncio.wait(list(running), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    sid = running.pop(task)
+                    end_ms = round((time.perf_counter() - t0) * 1000, 1)
+                    timings[sid].update(end_ms=end_ms, elapsed_ms=round(end_ms - timings[sid]["start_ms"], 1))
+                    err = task.exception()
+                    if err is not None:
+                        timings[sid]["status"] = "failed"
+                        raise err
+                    timings[sid]["status"] = "done"
+                    results[sid] = task.result()
+                _launch_ready()
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        total_ms = round((time.perf_counter() - t0) * 1000, 1)
+        return {
+            "results": results,
+            "timings": {
+                "total_ms": total_ms,
+                "sum_step_ms": round(sum(t.get("elapsed_ms", 0.0) for t in timings.values()), 1),
+                "critical_path": self._critical_path(timings),
+                "steps": timings,
+            },
+        }
+
+    @staticmethod
+    def _critical_path(timings: Dict[str, Dict[str, Any]]) -> List[str]:
+        """가장 늦게 끝난 단계에서 시작해, 가장 늦게 끝난 선행 단계를 거꾸로 따라감"""
+        done = {k: v for k, v in timings.items() if "end_ms" in v}
+        if not done:
+            return []
+        cur = max(done, key=lambda k: done[k]["end_ms"])
+        path = [cur]
+        while True:
+            deps = [d for d in done[cur].get("deps", []) if d in done]
+            if not deps:
+                break
+            cur = max(deps, key=lambda d: done[d]["end_ms"])
+            path.append(cur)
+        return list(reversed(path))
+
+    async def _generate(
+        self,
+        payload: Dict[str, Any],
+        progress: Optional[Callable[..., None]] = None,
+    ) -> Dict[str, Any]:
         logger.info("[MetaPlanner] 시작")
         project_id = str(
             payload.get("project_id")
@@ -310,30 +486,24 @@ class MetaPlanner:
         )
 
         plan = self.build_plan(payload)
+        if self.risk_agent is None:
+            self._notify(progress, "risk", "skipped")
 
-        # 순서를 명시적으로 사용 (scope, cost, schedule, risk, integrator)
-        scope_result = await self.run_scope(project_id, payload, plan.steps[0].config)
-        cost_result = self.run_cost(scope_result)
-        schedule_result = self.run_schedule(project_id, payload, plan.steps[2].config)
-
-        risk_result = None
-        if self.risk_agent is not None:
-            risk_result = self.run_risk(project_id, scope_result, cost_result, schedule_result)
-
-        integrator_result = None
-        if self.use_integrator and PM_Integrator is not None:
-            integrator_result = self.run_integrator(
-                scope_result, cost_result, schedule_result,
-                db_session=payload.get("db_session")
-            )
+        executed = await self.execute_plan(plan, payload, progress)
+        results, timings = executed["results"], executed["timings"]
+        logger.info(
+            "[MetaPlanner] 단계 실행 완료: total=%.1fms (순차 합계 %.1fms), critical=%s",
+            timings["total_ms"], timings["sum_step_ms"], timings["critical_path"],
+        )
 
         result = self.solve(
             project_id,
-            scope_result,
-            cost_result,
-            schedule_result,
-            risk_result,
-            integrator_result,
+            results["scope"],
+            results["cost"],
+            results["schedule"],
+            results.get("risk"),
+            results.get("integrator"),
+            timings=timings,
         )
 
         logger.info("[MetaPlanner] 완료")
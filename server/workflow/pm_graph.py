@@ -1,9 +1,10 @@
 # server/workflow/pm_graph.py
 from __future__ import annotations
 import asyncio
+import os
 import re
 from datetime import datetime, date
-from typing import Any, Dict, List, Optional, Union, TYPE_CHECKING
+from typing import Any, Callable, Dict, List, Optional, Union, TYPE_CHECKING
 import logging
 import traceback
 from pathlib import Path
@@ -11,6 +12,8 @@ from pathlib import Path
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
+from server.utils import llm_cache
+
 # ============================================================
 #  Global Config
 # ============================================================
@@ -18,6 +21,9 @@ logger = logging.getLogger("pm.graph")
 
 DATA_DIR = Path("data")
 
+# analyze 응답의 overdue / upcoming_7d 목록 최대 행 수 (전체 건수는 *_total)
+ANALYZE_SUMMARY_LIST_LIMIT = int(os.getenv("ANALYZE_SUMMARY_LIST_LIMIT", "50"))
+
 # Flags
 _SCHEDULE_AVAILABLE = True
 _SCOPE_AVAILABLE = True
@@ -25,13 +31,16 @@ _SCOPE_AVAILABLE = True
 # DB / 모델 import
 try:
     from server.db.database import SessionLocal, get_db  # ✅ get_db 추가
-    from server.db import pm_models
+    from server.db import pm_models, pm_crud
+    from server.db.writer import get_writer
+    from server.db.pm_summary import action_item_summary
     _DB_AVAILABLE = True
 except Exception as e:
     logger.warning("[DB] import failed: %s", e)
     SessionLocal = None
     get_db = None  # ✅ get_db None 처리
     pm_models = None
+    pm_crud = None
     _DB_AVAILABLE = False
 
 # Analyzer
@@ -78,6 +87,14 @@ except Exception as e:
     ScheduleAgent = None
     _SCHEDULE_AVAILABLE = False
 
+# 프로세스 공용 agent warm pool (server/main.py lifespan 에서 warm-up)
+from server.workflow.agent_registry import agent_registry
+
+if ScopeAgent is not None:
+    agent_registry.register("scope", lambda: ScopeAgent(data_dir=str(DATA_DIR)))
+if ScheduleAgent is not None:
+    agent_registry.register("schedule", lambda: ScheduleAgent(data_dir=str(DATA_DIR)))
+
 
 # ===============================
 #  공용 유틸
@@ -207,15 +224,19 @@ async def _run_analyzer_with_timeout(text: str, project_id: int) -> List[Dict[st
             _ANALYZER_INSTANCE = None
             return []
 
-    def _call_agent():
+    async def _call_agent():
         try:
-            return _ANALYZER_INSTANCE.analyze_minutes(text, project_meta={"project_id": project_id})
+            meta = {"project_id": project_id}
+            if hasattr(_ANALYZER_INSTANCE, "aanalyze_minutes"):
+                # 네이티브 async: timeout 시 진행 중인 LLM 요청까지 취소 (스레드에 남지 않음)
+                return await _ANALYZER_INSTANCE.aanalyze_minutes(text, project_meta=meta)
+            return await asyncio.to_thread(_ANALYZER_INSTANCE.analyze_minutes, text, project_meta=meta)
         except Exception as e:
             logger.exception("[ANALYZER] agent analyze_minutes exception: %s", e)
             return []
 
     try:
-        raw = await asyncio.wait_for(asyncio.to_thread(_call_agent), timeout=ANALYZE_TIMEOUT_SEC)
+        raw = await asyncio.wait_for(_call_agent(), timeout=ANALYZE_TIMEOUT_SEC)
     except asyncio.TimeoutError:
         logger.warning(f"[ANALYZER] timeout after {ANALYZE_TIMEOUT_SEC}s; skip items")
         return []
@@ -284,20 +305,7 @@ async def _analyze_handler(payload: Dict[str, Any]) -> Dict[str, Any]:
         logger.debug("[ANALYZE] project_id=%s mode=%s run_scope=%s save_items=%s doc_type=%s", 
                      project_id, mode, run_scope, save_items, doc_type)
 
-        # ------------------------
-        # 1) 문서 저장 (항상)
-        # ------------------------
-        doc = pm_models.PM_Document(
-            project_id=project_id,
-            title=title,
-            content=text,
-            doc_type=doc_type,
-            created_at=_utcnow(),
-            uploaded_at=_utcnow(),
-        )
-        db.add(doc)
-        db.flush()  # doc.id 확보
-        meeting_id = doc.id
+        # 1) 문서 저장은 분석/Scope 이후 action item 과 함께 writer 큐에서 한 번에 (LLM 호출 동안 쓰기 lock 미보유)
 
         # ------------------------
         # 2) Analyzer 실행 (회의록 유형만 수행)
@@ -318,24 +326,24 @@ async def _analyze_handler(payload: Dict[str, Any]) -> Dict[str, Any]:
             try:
                 # ScopeAgent 사용
                 if _SCOPE_AVAILABLE and ScopeAgent is not None:
-                    sa = ScopeAgent(data_dir=str(DATA_DIR))
                     scope_payload = {
                         "project_name": f"Project-{project_id}",
                         "text": text,
                         "methodology": payload.get("methodology", "waterfall"),
+                        # 지정 시에만 전달 (미지정이면 ScopeAgent 기본 청크 크기/겹침 사용)
                         "options": {
-                            "chunk_size": payload.get("chunk_size", 500),
-                            "overlap": payload.get("overlap", 100)
+                            k: payload[k] for k in ("chunk_size", "overlap", "chunk_concurrency")
+                            if payload.get(k) is not None
                         }
                     }
-                    scope_out = await sa.pipeline(scope_payload)
+                    async with agent_registry.acquire("scope") as sa:
+                        scope_out = await sa.pipeline(scope_payload)
                     logger.info("[ANALYZE] Scope completed")
                 else:
                     logger.warning("[ANALYZE] ScopeAgent not available")
 
                 # Schedule
                 if _SCHEDULE_AVAILABLE and ScheduleAgent is not None and scope_out:
-                    sch = ScheduleAgent(data_dir=str(DATA_DIR))
                     wbs_json = scope_out.get("wbs_json") or scope_out.get("wbs_json_path")
                     if wbs_json:
                         sched_payload = {
@@ -345,7 +353,8 @@ async def _analyze_handler(payload: Dict[str, Any]) -> Dict[str, Any]:
                             "calendar": payload.get("calendar", {}),
                             "sprint_length_weeks": payload.get("sprint_length_weeks", 2)
                         }
-                        sched_out = await sch.pipeline(sched_payload)
+                        async with agent_registry.acquire("schedule") as sch:
+                            sched_out = await sch.pipeline(sched_payload)
                         logger.info("[ANALYZE] Schedule completed")
                 else:
                     logger.warning("[ANALYZE] ScheduleAgent not available or no WBS")
@@ -358,6 +367,7 @@ async def _analyze_handler(payload: Dict[str, Any]) -> Dict[str, Any]:
         # ------------------------
         saved = 0
         errors: List[Dict[str, Any]] = []
+        rows: List[Dict[str, Any]] = []
         if save_items and raw_items:
             for idx, raw in enumerate(raw_items, start=1):
                 try:
@@ -366,57 +376,53 @@ async def _analyze_handler(payload: Dict[str, Any]) -> Dict[str, Any]:
                     task = item.get("task") or item.get("title") or item.get("summary") or item.get("description") or ""
                     if not task.strip():
                         continue
-                        
-                    assignee = item.get("assignee") or item.get("owner") or None
-                    priority = item.get("priority") or item.get("prio") or "Medium"
-                    status = item.get("status") or "Open"
-                    due = _parse_date_safe(item.get("due") or item.get("due_date") or item.get("deadline"))
-                    module = item.get("module")
-                    phase = item.get("phase")
+
                     evidence_span = item.get("evidence_span") or item.get("evidence") or None
-                    expected_effort = _safe_float(item.get("expected_effort") or item.get("effort"), logger)
-                    expected_value = _safe_float(item.get("expected_value") or item.get("value"), logger)
-
-                    ai = pm_models.PM_ActionItem(
-                        project_id=project_id,
-                        document_id=doc.id,
-                        meeting_id=meeting_id,
-                        assignee=assignee,
-                        task=task,
-                        due_date=due,
-                        priority=priority,
-                        status=status,
-                        module=module,
-                        phase=phase,
-                        evidence_span=str(evidence_span) if evidence_span is not None else None,
-                        expected_effort=expected_effort,
-                        expected_value=expected_value,
-                        created_at=_utcnow(),
-                    )
-                    db.add(ai)
-                    saved += 1
+                    rows.append({
+                        "project_id": project_id,
+                        "assignee": item.get("assignee") or item.get("owner") or None,
+                        "task": task,
+                        "due_date": _parse_date_safe(item.get("due") or item.get("due_date") or item.get("deadline")),
+                        "priority": item.get("priority") or item.get("prio") or "Medium",
+                        "status": item.get("status") or "Open",
+                        "module": item.get("module"),
+                        "phase": item.get("phase"),
+                        "evidence_span": str(evidence_span) if evidence_span is not None else None,
+                        "expected_effort": _safe_float(item.get("expected_effort") or item.get("effort"), logger),
+                        "expected_value": _safe_float(item.get("expected_value") or item.get("value"), logger),
+                        "created_at": _utcnow(),
+                    })
                 except Exception as e:
                     logger.exception("[ANALYZE] Failed to add action item idx=%s: %s", idx, e)
                     errors.append({"index": idx, "error": repr(e), "raw": str(raw)})
-
-            # commit items
-            try:
-                db.commit()
-            except Exception as e:
-                db.rollback()
-                logger.exception("[ANALYZE] commit failed when saving action items: %s", e)
-                raise RuntimeError(f"commit failed: {e}")
+        elif not save_items:
+            logger.info("[ANALYZE] save_items is False; skipping action item persistence")
         else:
-            if not save_items:
-                logger.info("[ANALYZE] save_items is False; skipping action item persistence")
-            else:
-                logger.info("[ANALYZE] no raw_items to save")
-            try:
-                db.commit()
-            except Exception as e:
-                db.rollback()
-                logger.exception("[ANALYZE] commit failed for doc only: %s", e)
-                raise RuntimeError(f"commit failed: {e}")
+            logger.info("[ANALYZE] no raw_items to save")
+
+        # 문서 + action item 을 writer 큐의 한 트랜잭션으로 (executemany 1회)
+        def _persist(wdb: Session):
+            doc = pm_models.PM_Document(
+                project_id=project_id,
+                title=title,
+                content=text,
+                doc_type=doc_type,
+                created_at=_utcnow(),
+                uploaded_at=_utcnow(),
+            )
+            wdb.add(doc)
+            wdb.flush()  # doc.id 확보
+            n = pm_crud.insert_action_items(
+                wdb, [{**r, "document_id": doc.id, "meeting_id": doc.id} for r in rows]
+            )
+            return doc.id, n
+
+        try:
+            doc_id, saved = await get_writer().run(_persist)
+        except Exception as e:
+            logger.exception("[ANALYZE] commit failed when saving document/action items: %s", e)
+            raise RuntimeError(f"commit failed: {e}")
+        meeting_id = doc_id
 
         # ------------------------
         # 5) Action Item 요약 생성
@@ -431,66 +437,31 @@ async def _analyze_handler(payload: Dict[str, Any]) -> Dict[str, Any]:
         }
 
         try:
-            items_q = db.query(pm_models.PM_ActionItem).filter(pm_models.PM_ActionItem.project_id == project_id)
-            all_items = items_q.all()
-            open_items = [i for i in all_items if (getattr(i, "status", None) or "Open") == "Open"]
-
-            today = date.today()
-            action_summary["open_total"] = len(open_items)
-
-            # preview (최대 5개)
-            preview = []
-            for i in open_items[:5]:
-                preview.append({
-                    "id": getattr(i, "id", None),
-                    "task": getattr(i, "task", None),
-                    "assignee": getattr(i, "assignee", None),
-                    "due": (getattr(i, "due_date", None).isoformat() if getattr(i, "due_date", None) else None),
-                    "priority": getattr(i, "priority", None),
-                    "status": getattr(i, "status", None),
-                })
-            action_summary["open_preview"] = preview
-
-            overdue = []
-            upcoming = []
-            for i in open_items:
-                d = getattr(i, "due_date", None)
-                pd = None
-                if d:
-                    if isinstance(d, datetime):
-                        pd = d.date()
-                    elif isinstance(d, date):
-                        pd = d
-                    else:
-                        pd = _parse_date_safe(str(d))
-                if pd:
-                    days = (pd - today).days
-                    if days < 0:
-                        overdue.append({
-                            "id": getattr(i, "id", None),
-                            "task": getattr(i, "task", None),
-                            "assignee": getattr(i, "assignee", None),
-                            "due": pd.isoformat(),
-                        })
-                    elif 0 <= days <= 7:
-                        upcoming.append({
-                            "id": getattr(i, "id", None),
-                            "task": getattr(i, "task", None),
-                            "assignee": getattr(i, "assignee", None),
-                            "due": pd.isoformat(),
-                        })
-            action_summary["overdue"] = overdue
-            action_summary["upcoming_7d"] = upcoming
-
-            status_counts = {}
-            priority_counts = {}
-            for i in all_items:
-                st = getattr(i, "status", None) or "Unknown"
-                pr = getattr(i, "priority", None) or "None"
-                status_counts[st] = status_counts.get(st, 0) + 1
-                priority_counts[pr] = priority_counts.get(pr, 0) + 1
-            action_summary["status_counts"] = status_counts
-            action_summary["priority_counts"] = priority_counts
+            # SQL 집계 (전체 행 로드 없음). 기존 응답 형태 유지: open = status 'Open', 다가오는 마감 = 오늘~7일 후(포함)
+            summ = action_item_summary(
+                db, project_id, today=date.today(), open_statuses=("Open",),
+                upcoming_days=8, preview_limit=5, list_limit=ANALYZE_SUMMARY_LIST_LIMIT,
+            )
+
+            def _brief(i: Dict[str, Any], full: bool = False) -> Dict[str, Any]:
+                row = {
+                    "id": i["id"],
+                    "task": i["task"],
+                    "assignee": i["assignee"],
+                    "due": i["due_date"].isoformat() if i["due_date"] else None,
+                }
+                if full:
+                    row.update(priority=i["priority"], status=i["status"])
+                return row
+
+            action_summary["open_total"] = summ["open_total"]
+            action_summary["overdue_total"] = summ["overdue_total"]
+            action_summary["upcoming_7d_total"] = summ["upcoming_total"]
+            action_summary["open_preview"] = [_brief(i, full=True) for i in summ["open_preview"]]
+            action_summary["overdue"] = [_brief(i) for i in summ["overdue"]]
+            action_summary["upcoming_7d"] = [_brief(i) for i in summ["upcoming"]]
+            action_summary["status_counts"] = {(k or "Unknown"): v for k, v in summ["status_counts"].items()}
+            action_summary["priority_counts"] = {(k or "None"): v for k, v in summ["priority_counts"].items()}
 
         except Exception as e:
             logger.exception("[ANALYZE] Failed to build action summary: %s", e)
@@ -501,7 +472,7 @@ async def _analyze_handler(payload: Dict[str, Any]) -> Dict[str, Any]:
         result: Dict[str, Any] = {
             "ok": True,
             "project_id": project_id,
-            "document_id": doc.id,
+            "document_id": doc_id,
             "meeting_id": meeting_id,
             "doc_type": doc_type,
             "saved_action_items": saved,
@@ -515,7 +486,7 @@ async def _analyze_handler(payload: Dict[str, Any]) -> Dict[str, Any]:
         if errors:
             result["errors"] = errors
 
-        logger.info("[ANALYZE] finished project_id=%s doc_id=%s saved=%s items=%s", project_id, doc.id, saved, len(raw_items or []))
+        logger.info("[ANALYZE] finished project_id=%s doc_id=%s saved=%s items=%s", project_id, doc_id, saved, len(raw_items or []))
         return result
 
     except Exception as e:
@@ -565,8 +536,8 @@ async def _scope_handler(payload: Dict[str, Any]) -> Dict[str, Any]:
     if not _SCOPE_AVAILABLE or ScopeAgent is None:
         raise RuntimeError("ScopeAgent not available. Check server/workflow/agents/scope_agent/pipeline.py")
 
-    agent = ScopeAgent(data_dir=str(DATA_DIR))
-    result = await agent.pipeline(payload)
+    async with agent_registry.acquire("scope") as agent:
+        result = await agent.pipeline(payload)
     return result
 
 
@@ -596,10 +567,9 @@ async def _schedule_handler(payload: Dict[str, Any]) -> Dict[str, Any]:
         }
 
     logger.info("[SCHEDULE] ScheduleAgent pipeline 시작")
-    agent = ScheduleAgent(data_dir=str(DATA_DIR))
-    
     try:
-        result = await agent.pipeline(payload)
+        async with agent_registry.acquire("schedule") as agent:
+            result = await agent.pipeline(payload)
         return result
     except Exception as e:
         logger.error("[SCHEDULE_HANDLER] Schedule pipeline failed: %s", e)
@@ -623,25 +593,47 @@ async def _schedule_timeline_handler(payload: Dict[str, Any]) -> Dict[str, Any]:
 # ===============================
 #  Workflow: Scope -> Schedule
 # ===============================
-async def _workflow_scope_then_schedule_handler(payload: Dict[str, Any]) -> Dict[str, Any]:
+async def _workflow_scope_then_schedule_handler(
+    payload: Dict[str, Any],
+    progress: Optional[Callable[..., None]] = None,
+) -> Dict[str, Any]:
+    """progress(step, status, result=None, **info): 단계별 진행 콜백 (job_queue 에서 사용)"""
+    def _notify(step: str, status: str, result: Any = None, **info) -> None:
+        if progress is not None:
+            try:
+                progress(step, status, result, **info)
+            except Exception as e:
+                logger.warning("[WORKFLOW] progress 콜백 실패 (%s/%s): %s", step, status, e)
+
+    async def _step(step: str, handler, step_payload: Dict[str, Any]) -> Dict[str, Any]:
+        _notify(step, "running")
+        try:
+            res = await handler(step_payload)
+        except Exception as e:
+            _notify(step, "failed", error=str(e))
+            raise
+        _notify(step, "done", res)
+        return res
+
     if "scope" in payload and "schedule" in payload:
         scope_payload = payload["scope"]
         schedule_payload = payload["schedule"]
         
-        scope_result = await _scope_handler(scope_payload)
+        scope_result = await _step("scope", _scope_handler, scope_payload)
         
         wbs_json_path = scope_result.get("wbs_json_path") or scope_result.get("wbs_json")
         if wbs_json_path:
             schedule_payload["wbs_json"] = wbs_json_path
         
-        schedule_result = await _schedule_handler(schedule_payload)
+        schedule_result = await _step("schedule", _schedule_handler, schedule_payload)
         
         return {
+            "status": "ok",
             "scope": scope_result,
             "schedule": schedule_result
         }
     else:
-        scope_result = await _scope_handler(payload)
+        scope_result = await _step("scope", _scope_handler, payload)
         wbs_json_path = scope_result.get("wbs_json_path") or scope_result.get("wbs_json")
         
         sched_payload = {
@@ -651,9 +643,10 @@ async def _workflow_scope_then_schedule_handler(payload: Dict[str, Any]) -> Dict
         if wbs_json_path:
             sched_payload["wbs_json"] = wbs_json_path
         
-        schedule_result = await _schedule_handler(sched_payload)
+        schedule_result = await _step("schedule", _schedule_handler, sched_payload)
         
         return {
+            "status": "ok",
             "scope": scope_result,
             "schedule": schedule_result
         }
@@ -668,8 +661,9 @@ def create_review_graph(kind: str = "scope"):
 # ===============================
 
 class _App:
-    def __init__(self, kind: str):
+    def __init__(self, kind: str, progress: Optional[Callable[..., None]] = None):
         self.kind = kind
+        self.progress = progress
 
     async def ainvoke(self, payload: Dict[str, Any]) -> Dict[str, Any]:
 
@@ -697,7 +691,7 @@ class _App:
 
         # --------- Workflow (Scope→Schedule) ---------
         elif self.kind == "workflow_scope_then_schedule":
-            return await _workflow_scope_then_schedule_handler(payload)
+            return await _workflow_scope_then_schedule_handler(payload, self.progress)
 
         # --------- Unknown ----------
         else:
@@ -707,15 +701,22 @@ class _App:
 # ===============================
 #  1116 run_pipeline (단일 통합 버전)
 # ===============================
-async def run_pipeline(kind: str, payload: Any) -> Dict[str, Any]:
+async def run_pipeline(
+    kind: str,
+    payload: Any,
+    progress: Optional[Callable[..., None]] = None,
+) -> Dict[str, Any]:
     """
     - 어떤 입력이 들어와도 dict로 표준화
     - 통합된 _App을 호출
+    - options.bypass_cache=True 이면 이번 요청의 LLM 호출은 응답 캐시를 우회
+    - progress: 단계별 진행 콜백 (workflow 계열만 사용)
     """
     try:
         norm = _to_dict(payload)
-        app = _App(kind)
-        return await app.ainvoke(norm)
+        app = _App(kind, progress)
+        with llm_cache.bypass(llm_cache.bypass_requested(norm)):
+            return await app.ainvoke(norm)
     except Exception as e:
         logger.error("[PIPELINE] Failed: %s", e)
         logger.error(traceback.format_exc())